@@ -6,151 +6,217 @@ Student 3: Application & User Module
 Flask application with database connectivity
 """
 
-from flask import Flask, render_template, request, redirect, url_for, session, flash
-import bcrypt
+from flask import (Flask, request, redirect, url_for, session, flash, jsonify, make_response, g,
+                   Response)
+import flask
 from datetime import datetime, timedelta
+from functools import partial
+import hmac
+import io
 import os
-
-# Import both database connectors
-try:
-    import mysql.connector
-    from mysql.connector import Error as MySQLError
-    MYSQL_AVAILABLE = True
-except ImportError:
-    MYSQL_AVAILABLE = False
-
-try:
-    import psycopg2
-    from psycopg2.extras import RealDictCursor
-    from psycopg2 import Error as PostgreSQLError
-    POSTGRESQL_AVAILABLE = True
-except ImportError:
-    POSTGRESQL_AVAILABLE = False
+import time
+
+from database import (DB_TYPE, Error, get_db_connection, get_cursor, get_pool,
+                      pool_stats, read_your_writes, record_write)
+from matchmaking import MatchEngine, parse_domain_ids
+from materialized_matches import materialized_investors, materialized_startups, refresh_matches
+from report_rollups import REPORTS, run_report
+from csv_export import EXPORTS, stream_export
+from dashboard_loader import load_dashboard
+from dashboard_queries import fetch_investor_dashboard, fetch_startup_dashboard
+from query_registry import execute, fetch_all, fetch_one, insert
+from search import SEARCH_KINDS, SEARCH_MAX_PAGE, search as run_search
+from funding_pages import INSIGHT_DEALS, decode_cursor, domain_counts, fetch_page
+from funding_ingest import FORMATS as INGEST_FORMATS, ingest as ingest_funding
+from reference_cache import cache_stats, domain_name, domains as domain_cache
+from response_cache import cached_page, init_app as init_response_cache
+from static_assets import init_app as init_static_assets
+from login_throttle import check_login, release_login
+from passwords import (PasswordPoolBusy, hash_password, verify_password, needs_rehash,
+                       password_stats, REHASHED)
+from metrics import (begin_request, end_request, gauge, histogram, render_prometheus,
+                     track_phase)
 
 app = Flask(__name__)
 app.secret_key = os.environ.get('FLASK_SECRET_KEY', 'your-secret-key-change-in-production')
 app.permanent_session_lifetime = timedelta(hours=24)
 
-# ============================================
-# Auto-Detect Database Environment
-# ============================================
+# Matchmaking strategy: 'sql' (query per page view), 'memory' (MatchEngine)
+# or 'materialized' (precomputed rows in Matches, see materialized_matches.py)
+MATCH_STRATEGY = os.environ.get('MATCH_STRATEGY', 'sql')
+match_engine = None
+if MATCH_STRATEGY == 'memory':
+    match_engine = MatchEngine(DB_TYPE, max_age=float(os.environ.get('MATCH_ENGINE_MAX_AGE', 60)))
 
-# Check if running on Render (DATABASE_URL environment variable exists)
-DATABASE_URL = os.environ.get('DATABASE_URL')
-
-if DATABASE_URL:
-    # Running on Render (Production) - Use PostgreSQL
-    DB_TYPE = 'postgresql'
-    print("🌐 Running on Render - Using PostgreSQL")
-else:
-    # Running locally - Use MySQL
-    DB_TYPE = 'mysql'
-    DB_CONFIG = {
-        'host': 'localhost',
-        'user': 'root',
-        'password': '',  # No password for local MySQL
-        'database': 'funding_system'
-    }
-    print("🏠 Running locally - Using MySQL")
+# Dashboard queries: 'parts' (a few statements per page, concurrent with
+# DASHBOARD_PARALLEL=1) or 'single' (one statement, see dashboard_queries.py)
+DASHBOARD_STRATEGY = os.environ.get('DASHBOARD_STRATEGY', 'parts')
 
 # ============================================
-# Unified Error Handling for Both Databases
+# Request Instrumentation
 # ============================================
 
-# Create a unified Error class that works for both MySQL and PostgreSQL
-if DB_TYPE == 'postgresql':
-    Error = PostgreSQLError
-else:
-    Error = MySQLError
+# Time per route, split into the phases recorded by track_phase():
+# connect (pool checkout), sql (InstrumentedCursor), password (bcrypt)
+# and render (templates); 'other' is whatever is left
+REQUEST_PHASES = ('connect', 'sql', 'password', 'render', 'other')
+
+def render_template(template, **context):
+    """flask.render_template, timed as the request's 'render' phase"""
+    with track_phase('render'):
+        return flask.render_template(template, **context)
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+    begin_request()
+
+@app.after_request
+def record_request_metrics(response):
+    started = g.pop('request_started', None)
+    if started is None:
+        return response
+    elapsed = time.perf_counter() - started
+    phases = end_request()
+    route = request.url_rule.rule if request.url_rule else 'unmatched'
+    histogram('http_request_seconds', 'Request time per route',
+              labels={'route': route, 'method': request.method,
+                      'status': str(response.status_code)}).observe(elapsed)
+    phases['other'] = max(elapsed - sum(phases.values()), 0.0)
+    for phase in REQUEST_PHASES:
+        histogram('http_request_phase_seconds', 'Request time per route and phase',
+                  labels={'route': route, 'phase': phase}).observe(phases.get(phase, 0.0))
+    return response
+
+# Compresses large text responses; registered after the hook above, so it
+# runs first and its time counts towards the request (response_cache.py)
+init_response_cache(app)
+# Fingerprinted CSS/JS/fonts under /assets/ and asset_url() for the templates
+init_static_assets(app)
+
+@app.before_request
+def read_own_writes():
+    # A session that just wrote reads from the primary, not a lagging replica.
+    # Not for /assets/: reading the session would add Vary: Cookie to them.
+    read_your_writes(0 if request.endpoint == 'asset' else session.get('primary_until'))
 
 # ============================================
-# Database Connection Helper (Auto-Switching)
+# Authentication Functions
 # ============================================
 
-def get_db_connection():
-    """Create and return database connection (auto-detects MySQL or PostgreSQL)"""
+def password_busy(template, **context):
+    """503 + Retry-After when the password pool is saturated"""
+    flash('The server is busy right now. Please try again in a moment.', 'error')
+    response = make_response(render_template(template, **context), 503)
+    response.headers['Retry-After'] = '1'
+    return response
+
+def login_throttled(template, retry_after):
+    """429 + Retry-After when this address or account made too many login attempts"""
+    flash('Too many login attempts. Please wait a minute and try again.', 'error')
+    response = make_response(render_template(template), 429)
+    response.headers['Retry-After'] = str(retry_after)
+    return response
+
+def rehash_if_needed(kind, user_id, password, stored_hash):
+    """Re-hash a just-verified password whose stored cost differs from BCRYPT_ROUNDS"""
+    if not needs_rehash(stored_hash):
+        return
     try:
-        if DB_TYPE == 'postgresql':
-            # PostgreSQL connection for Render
-            connection = psycopg2.connect(DATABASE_URL, cursor_factory=RealDictCursor)
-            return connection
-        else:
-            # MySQL connection for local development
-            connection = mysql.connector.connect(**DB_CONFIG)
-            return connection
-    except Exception as e:
-        print(f"Database connection error: {e}")
-        return None
-
-def get_cursor(connection):
-    """Get cursor based on database type"""
-    if DB_TYPE == 'postgresql':
-        return connection.cursor()  # Already has RealDictCursor
-    else:
-        return connection.cursor(dictionary=True)  # MySQL dictionary cursor
-
-def execute_insert(cursor, query, params):
-    """Execute INSERT and return the new ID (handles both MySQL and PostgreSQL)"""
-    if DB_TYPE == 'postgresql':
-        # PostgreSQL uses RETURNING
-        if 'RETURNING' not in query.upper():
-            # Add RETURNING clause for PostgreSQL
-            if 'startup_id' in query.lower():
-                query += ' RETURNING startup_id'
-            elif 'investor_id' in query.lower():
-                query += ' RETURNING investor_id'
-            elif 'funding_id' in query.lower():
-                query += ' RETURNING funding_id'
-            elif 'match_id' in query.lower():
-                query += ' RETURNING match_id'
-        
-        cursor.execute(query, params)
-        result = cursor.fetchone()
-        return result[list(result.keys())[0]] if result else None
-    else:
-        # MySQL uses lastrowid
-        cursor.execute(query, params)
-        return cursor.lastrowid
+        new_hash = hash_password(password)
+    except PasswordPoolBusy:
+        return  # keep the old hash; the next login tries again
+    with get_db_connection() as conn:
+        if not conn:
+            return
+        cursor = get_cursor(conn)
+        try:
+            # Only if nobody changed the password in the meantime
+            execute(cursor, f'{kind}.rehash', (new_hash, user_id, stored_hash))
+            conn.commit()
+            REHASHED.inc()
+        except Error as e:
+            print(f"Password rehash failed: {e}")
+        finally:
+            cursor.close()
 
 # ============================================
-# Authentication Functions
+# Data Helpers
 # ============================================
 
-def hash_password(password):
-    """Hash password using bcrypt"""
-    try:
-        if isinstance(password, str):
-            password = password.encode('utf-8')
-        salt = bcrypt.gensalt()
-        hashed = bcrypt.hashpw(password, salt)
-        return hashed.decode('utf-8')
-    except Exception as e:
-        print(f"Password hashing error: {e}")
-        raise
+def fetch_domains():
+    """Return all domains for the registration forms (per-worker cache)"""
+    return domain_cache.rows()
+
+def sync_investor_domains(cursor, investor_id, preferred_domains):
+    """Mirror an investor's comma-separated preferred_domains into InvestorDomains"""
+    execute(cursor, 'investor.clear_domains', (investor_id,))
+    domain_ids = sorted(parse_domain_ids(preferred_domains))
+    if domain_ids:
+        placeholders = ', '.join(['%s'] * len(domain_ids))
+        cursor.execute(f"""
+            INSERT INTO InvestorDomains (investor_id, domain_id)
+            SELECT %s, domain_id FROM Domains WHERE domain_id IN ({placeholders})
+        """, (investor_id, *domain_ids))
 
-def verify_password(password, hashed):
-    """Verify password against hash"""
-    try:
-        # Ensure hashed password is bytes
-        if isinstance(hashed, str):
-            hashed = hashed.encode('utf-8')
-        if isinstance(password, str):
-            password = password.encode('utf-8')
-        return bcrypt.checkpw(password, hashed)
-    except Exception as e:
-        print(f"Password verification error: {e}")
-        return False
+# ============================================
+# Matchmaking (SQL, in-memory engine or materialized)
+# ============================================
+
+def find_matched_investors_sql(cursor, startup):
+    """Top 10 investors whose range covers the startup's funding requirement
+
+    Each branch walks idx_investor_rank in dashboard order and probes the
+    InvestorDomains primary key, so it stops after 10 qualifying rows
+    instead of scanning and sorting every investor in range.
+    """
+    domain_id = startup['domain_id']
+    amount = startup['funding_required']
+    return fetch_all(cursor, 'matches.investors_for_startup',
+                     (amount, amount, domain_id, amount, amount, domain_id))
+
+def find_matched_startups_sql(cursor, investor):
+    """Top 10 unfunded startups inside the investor's range
+
+    Same shape as find_matched_investors_sql: both branches read
+    idx_startup_unfunded_recent newest-first and check the investor's
+    InvestorDomains rows by primary key.
+    """
+    investor_id = investor['investor_id']
+    low, high = investor['investment_min'], investor['investment_max']
+    return fetch_all(cursor, 'matches.startups_for_investor',
+                     (low, high, investor_id, low, high, investor_id))
+
+def find_matched_investors(cursor, startup):
+    """Matched investors for the startup dashboard"""
+    if match_engine is not None:
+        match_engine.ensure_fresh(cursor)
+        return match_engine.matched_investors(startup)
+    if MATCH_STRATEGY == 'materialized':
+        return materialized_investors(cursor, startup)
+    return find_matched_investors_sql(cursor, startup)
+
+def find_matched_startups(cursor, investor):
+    """Matched startups for the investor dashboard"""
+    if match_engine is not None:
+        match_engine.ensure_fresh(cursor)
+        return match_engine.matched_startups(investor)
+    if MATCH_STRATEGY == 'materialized':
+        return materialized_startups(cursor, investor)
+    return find_matched_startups_sql(cursor, investor)
 
 # ============================================
 # Routes: Home & Landing
 # ============================================
 
 @app.route('/')
+@cached_page('index.html')
 def index():
     """Landing page"""
     return render_template('index.html')
 
 @app.route('/about')
+@cached_page('about.html')
 def about():
     """About page"""
     return render_template('about.html')
@@ -175,42 +241,44 @@ def startup_register():
         website = request.form.get('website', '')
         
         # Hash password
-        password_hash = hash_password(password)
+        try:
+            password_hash = hash_password(password)
+        except PasswordPoolBusy:
+            return password_busy('startup_register.html', domains=fetch_domains())
         
         # Insert into database
-        conn = get_db_connection()
-        if conn:
-            try:
-                cursor = conn.cursor()
-                query = """
-                    INSERT INTO Startups 
-                    (name, email, password_hash, domain_id, funding_required, 
-                     description, founded_date, location, website)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-                """
-                cursor.execute(query, (name, email, password_hash, domain_id, 
-                                      funding_required, description, founded_date, 
-                                      location, website))
-                conn.commit()
+        with get_db_connection() as conn:
+            if conn:
+                cursor = get_cursor(conn)
+                try:
+                    # The login lookup: case-insensitive, so DUP@x.com cannot sign up next to dup@x.com
+                    if fetch_one(cursor, 'startup.by_email', (email,)):
+                        flash('An account with this email already exists. Please login.', 'error')
+                        return render_template('startup_register.html', domains=fetch_domains())
+                    new_startup_id = insert(cursor, 'startup.insert', (name, email, password_hash, domain_id,
+                                                                       funding_required, description, founded_date,
+                                                                       location, website))
+                    conn.commit()
+                    session['primary_until'] = record_write()
+                    if match_engine is not None:
+                        match_engine.refresh_startup(cursor, new_startup_id)
+                    elif MATCH_STRATEGY == 'materialized':
+                        try:
+                            refresh_matches(conn, 'startup', new_startup_id)
+                        except Error as e:
+                            # Still queued; `materialized_matches.py --refresh` retries it
+                            print(f"Match refresh failed: {e}")
+                    
+                    flash('Registration successful! Please login.', 'success')
+                    return redirect(url_for('startup_login'))
                 
-                flash('Registration successful! Please login.', 'success')
-                return redirect(url_for('startup_login'))
-            
-            except Error as e:
-                flash(f'Registration failed: {str(e)}', 'error')
-            finally:
-                cursor.close()
-                conn.close()
+                except Error as e:
+                    flash(f'Registration failed: {str(e)}', 'error')
+                finally:
+                    cursor.close()
     
     # GET request - show form with domains
-    conn = get_db_connection()
-    domains = []
-    if conn:
-        cursor = get_cursor(conn)
-        cursor.execute("SELECT * FROM Domains")
-        domains = cursor.fetchall()
-        cursor.close()
-        conn.close()
+    domains = fetch_domains()
     
     return render_template('startup_register.html', domains=domains)
 
@@ -221,34 +289,46 @@ def startup_login():
         email = request.form.get('email')
         password = request.form.get('password')
         
-        conn = get_db_connection()
-        if conn:
-            try:
+        # Refuse floods before they cost a lookup and a bcrypt check
+        retry_after = check_login(email)
+        if retry_after is not None:
+            return login_throttled('startup_login.html', retry_after)
+        
+        # Look the account up first and hand the connection back to the
+        # pool before running bcrypt, which is the slow part of a login
+        startup = None
+        looked_up = False
+        with get_db_connection() as conn:
+            if conn:
                 cursor = get_cursor(conn)
-                cursor.execute("""
-                    SELECT startup_id, name, email, password_hash 
-                    FROM Startups WHERE email = %s
-                """, (email,))
-                
-                startup = cursor.fetchone()
-                
-                if startup and verify_password(password, startup['password_hash']):
-                    # Set session
-                    session.permanent = True
-                    session['user_type'] = 'startup'
-                    session['user_id'] = startup['startup_id']
-                    session['user_name'] = startup['name']
-                    
-                    flash(f'Welcome back, {startup["name"]}!', 'success')
-                    return redirect(url_for('startup_dashboard'))
-                else:
-                    flash('Invalid email or password', 'error')
+                try:
+                    startup = fetch_one(cursor, 'startup.by_email', (email,))
+                    looked_up = True
+                except Error as e:
+                    flash(f'Login failed: {str(e)}', 'error')
+                finally:
+                    cursor.close()
+        
+        try:
+            valid = bool(startup) and verify_password(password, startup['password_hash'])
+        except PasswordPoolBusy:
+            release_login(email)            # not checked: does not count
+            return password_busy('startup_login.html')
+        
+        if valid:
+            release_login(email)
+            rehash_if_needed('startup', startup['startup_id'], password, startup['password_hash'])
             
-            except Error as e:
-                flash(f'Login failed: {str(e)}', 'error')
-            finally:
-                cursor.close()
-                conn.close()
+            # Set session
+            session.permanent = True
+            session['user_type'] = 'startup'
+            session['user_id'] = startup['startup_id']
+            session['user_name'] = startup['name']
+            
+            flash(f'Welcome back, {startup["name"]}!', 'success')
+            return redirect(url_for('startup_dashboard'))
+        elif looked_up:
+            flash('Invalid email or password', 'error')
     
     return render_template('startup_login.html')
 
@@ -256,6 +336,35 @@ def startup_login():
 # Routes: Startup Dashboard
 # ============================================
 
+def startup_overview(cursor, startup_id):
+    """Dashboard part: startup details and matched investors (they need the details)"""
+    # total_funding_received is kept by Funding triggers
+    startup = fetch_one(cursor, 'startup.by_id', (startup_id,))
+    if startup:
+        startup['domain_name'] = domain_name(startup['domain_id'])
+    # MATCHMAKING ALGORITHM
+    return {'startup': startup, 'matched_investors': find_matched_investors(cursor, startup)}
+
+def startup_funding(cursor, startup_id):
+    """Dashboard part: first page of the funding history (later pages via /startup/funding)"""
+    funding_history, next_cursor = fetch_page(cursor, 'startup', startup_id)
+    return {'funding_history': funding_history, 'next_cursor': next_cursor,
+            'funding_rounds': fetch_one(cursor, 'startup.funding_rounds', (startup_id,))['rounds']}
+
+def startup_dashboard_single(conn, startup_id):
+    """Every startup dashboard variable from one statement (DASHBOARD_STRATEGY=single)"""
+    cursor = get_cursor(conn)
+    try:
+        context = fetch_startup_dashboard(cursor, startup_id, with_matches=MATCH_STRATEGY == 'sql')
+        startup = context['startup']
+        if startup:
+            startup['domain_name'] = domain_name(startup['domain_id'])
+        if 'matched_investors' not in context:
+            context['matched_investors'] = find_matched_investors(cursor, startup)
+        return context
+    finally:
+        cursor.close()
+
 @app.route('/startup/dashboard')
 def startup_dashboard():
     """Startup dashboard - shows matched investors"""
@@ -265,116 +374,23 @@ def startup_dashboard():
     
     startup_id = session['user_id']
     
-    conn = get_db_connection()
-    if not conn:
-        flash('Database connection error', 'error')
-        return redirect(url_for('index'))
+    with get_db_connection(read_only=True) as conn:
+        if not conn:
+            flash('Database connection error', 'error')
+            return redirect(url_for('index'))
     
-    try:
-        cursor = get_cursor(conn)
-        
-        # Get startup details
-        if DB_TYPE == 'postgresql':
-            cursor.execute("""
-                SELECT s.*, d.domain_name,
-                       COALESCE(SUM(f.amount), 0) AS total_funding_received
-                FROM Startups s
-                JOIN Domains d ON s.domain_id = d.domain_id
-                LEFT JOIN Funding f ON s.startup_id = f.startup_id
-                WHERE s.startup_id = %s
-                GROUP BY s.startup_id, s.name, s.email, s.password_hash, s.domain_id,
-                         s.funding_required, s.description, s.founded_date, s.location,
-                         s.website, s.is_funded, s.created_at, d.domain_name
-            """, (startup_id,))
-        else:
-            cursor.execute("""
-                SELECT s.*, d.domain_name,
-                       COALESCE(SUM(f.amount), 0) AS total_funding_received
-                FROM Startups s
-                JOIN Domains d ON s.domain_id = d.domain_id
-                LEFT JOIN Funding f ON s.startup_id = f.startup_id
-                WHERE s.startup_id = %s
-                GROUP BY s.startup_id
-            """, (startup_id,))
-        startup = cursor.fetchone()
-        
-        # Get matched investors (MATCHMAKING ALGORITHM)
-        if DB_TYPE == 'postgresql':
-            cursor.execute("""
-                SELECT 
-                    i.investor_id,
-                    i.name,
-                    i.investment_min,
-                    i.investment_max,
-                    i.preferred_domains,
-                    i.location,
-                    i.portfolio_size,
-                    CASE 
-                        WHEN (',' || i.preferred_domains || ',') LIKE %s THEN 100
-                        ELSE 50
-                    END AS match_score,
-                    CASE 
-                        WHEN (',' || i.preferred_domains || ',') LIKE %s THEN 'Perfect domain match'
-                        ELSE 'Investment range compatible'
-                    END AS match_reason
-                FROM Investors i
-                WHERE i.investment_min <= %s 
-                  AND i.investment_max >= %s
-                ORDER BY match_score DESC, i.portfolio_size ASC
-                LIMIT 10
-            """, ('%,' + str(startup['domain_id']) + ',%', 
-                  '%,' + str(startup['domain_id']) + ',%',
-                  startup['funding_required'], startup['funding_required']))
-        else:
-            cursor.execute("""
-                SELECT 
-                    i.investor_id,
-                    i.name,
-                    i.investment_min,
-                    i.investment_max,
-                    i.preferred_domains,
-                    i.location,
-                    i.portfolio_size,
-                    CASE 
-                        WHEN FIND_IN_SET(%s, i.preferred_domains) > 0 THEN 100
-                        ELSE 50
-                    END AS match_score,
-                    CASE 
-                        WHEN FIND_IN_SET(%s, i.preferred_domains) > 0 THEN 'Perfect domain match'
-                        ELSE 'Investment range compatible'
-                    END AS match_reason
-                FROM Investors i
-                WHERE i.investment_min <= %s 
-                  AND i.investment_max >= %s
-                ORDER BY match_score DESC, i.portfolio_size ASC
-                LIMIT 10
-            """, (startup['domain_id'], startup['domain_id'], 
-                  startup['funding_required'], startup['funding_required']))
-        
-        matched_investors = cursor.fetchall()
-        
-        # Get funding history
-        cursor.execute("""
-            SELECT f.*, i.name AS investor_name
-            FROM Funding f
-            JOIN Investors i ON f.investor_id = i.investor_id
-            WHERE f.startup_id = %s
-            ORDER BY f.funding_date DESC
-        """, (startup_id,))
-        
-        funding_history = cursor.fetchall()
-        
-        return render_template('startup_dashboard.html', 
-                             startup=startup,
-                             matched_investors=matched_investors,
-                             funding_history=funding_history)
+        try:
+            if DASHBOARD_STRATEGY == 'single':
+                context = startup_dashboard_single(conn, startup_id)
+            else:
+                # Independent parts; concurrent with DASHBOARD_PARALLEL=1
+                context = load_dashboard(conn, [partial(startup_overview, startup_id=startup_id),
+                                                partial(startup_funding, startup_id=startup_id)])
+            return render_template('startup_dashboard.html', **context)
     
-    except Error as e:
-        flash(f'Error loading dashboard: {str(e)}', 'error')
-        return redirect(url_for('index'))
-    finally:
-        cursor.close()
-        conn.close()
+        except Error as e:
+            flash(f'Error loading dashboard: {str(e)}', 'error')
+            return redirect(url_for('index'))
 
 # ============================================
 # Routes: Investor Registration & Login
@@ -393,40 +409,44 @@ def investor_register():
         phone = request.form.get('phone')
         location = request.form.get('location')
         
-        password_hash = hash_password(password)
+        try:
+            password_hash = hash_password(password)
+        except PasswordPoolBusy:
+            return password_busy('investor_register.html', domains=fetch_domains())
         
-        conn = get_db_connection()
-        if conn:
-            try:
-                cursor = conn.cursor()
-                query = """
-                    INSERT INTO Investors 
-                    (name, email, password_hash, investment_min, investment_max, 
-                     preferred_domains, phone, location)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-                """
-                cursor.execute(query, (name, email, password_hash, investment_min, 
-                                      investment_max, preferred_domains, phone, location))
-                conn.commit()
+        with get_db_connection() as conn:
+            if conn:
+                cursor = get_cursor(conn)
+                try:
+                    # The login lookup: case-insensitive, so DUP@x.com cannot sign up next to dup@x.com
+                    if fetch_one(cursor, 'investor.by_email', (email,)):
+                        flash('An account with this email already exists. Please login.', 'error')
+                        return render_template('investor_register.html', domains=fetch_domains())
+                    new_investor_id = insert(cursor, 'investor.insert', (name, email, password_hash, investment_min,
+                                                                         investment_max, preferred_domains, phone,
+                                                                         location))
+                    sync_investor_domains(cursor, new_investor_id, preferred_domains)
+                    conn.commit()
+                    session['primary_until'] = record_write()
+                    if match_engine is not None:
+                        match_engine.refresh_investor(cursor, new_investor_id)
+                    elif MATCH_STRATEGY == 'materialized':
+                        try:
+                            refresh_matches(conn, 'investor', new_investor_id)
+                        except Error as e:
+                            # Still queued; `materialized_matches.py --refresh` retries it
+                            print(f"Match refresh failed: {e}")
+                    
+                    flash('Registration successful! Please login.', 'success')
+                    return redirect(url_for('investor_login'))
                 
-                flash('Registration successful! Please login.', 'success')
-                return redirect(url_for('investor_login'))
-            
-            except Error as e:
-                flash(f'Registration failed: {str(e)}', 'error')
-            finally:
-                cursor.close()
-                conn.close()
+                except Error as e:
+                    flash(f'Registration failed: {str(e)}', 'error')
+                finally:
+                    cursor.close()
     
     # GET request - show form with domains
-    conn = get_db_connection()
-    domains = []
-    if conn:
-        cursor = get_cursor(conn)
-        cursor.execute("SELECT * FROM Domains")
-        domains = cursor.fetchall()
-        cursor.close()
-        conn.close()
+    domains = fetch_domains()
     
     return render_template('investor_register.html', domains=domains)
 
@@ -437,33 +457,45 @@ def investor_login():
         email = request.form.get('email')
         password = request.form.get('password')
         
-        conn = get_db_connection()
-        if conn:
-            try:
+        # Refuse floods before they cost a lookup and a bcrypt check
+        retry_after = check_login(email)
+        if retry_after is not None:
+            return login_throttled('investor_login.html', retry_after)
+        
+        # Look the account up first and hand the connection back to the
+        # pool before running bcrypt, which is the slow part of a login
+        investor = None
+        looked_up = False
+        with get_db_connection() as conn:
+            if conn:
                 cursor = get_cursor(conn)
-                cursor.execute("""
-                    SELECT investor_id, name, email, password_hash 
-                    FROM Investors WHERE email = %s
-                """, (email,))
-                
-                investor = cursor.fetchone()
-                
-                if investor and verify_password(password, investor['password_hash']):
-                    session.permanent = True
-                    session['user_type'] = 'investor'
-                    session['user_id'] = investor['investor_id']
-                    session['user_name'] = investor['name']
-                    
-                    flash(f'Welcome back, {investor["name"]}!', 'success')
-                    return redirect(url_for('investor_dashboard'))
-                else:
-                    flash('Invalid email or password', 'error')
+                try:
+                    investor = fetch_one(cursor, 'investor.by_email', (email,))
+                    looked_up = True
+                except Error as e:
+                    flash(f'Login failed: {str(e)}', 'error')
+                finally:
+                    cursor.close()
+        
+        try:
+            valid = bool(investor) and verify_password(password, investor['password_hash'])
+        except PasswordPoolBusy:
+            release_login(email)            # not checked: does not count
+            return password_busy('investor_login.html')
+        
+        if valid:
+            release_login(email)
+            rehash_if_needed('investor', investor['investor_id'], password, investor['password_hash'])
             
-            except Error as e:
-                flash(f'Login failed: {str(e)}', 'error')
-            finally:
-                cursor.close()
-                conn.close()
+            session.permanent = True
+            session['user_type'] = 'investor'
+            session['user_id'] = investor['investor_id']
+            session['user_name'] = investor['name']
+            
+            flash(f'Welcome back, {investor["name"]}!', 'success')
+            return redirect(url_for('investor_dashboard'))
+        elif looked_up:
+            flash('Invalid email or password', 'error')
     
     return render_template('investor_login.html')
 
@@ -471,6 +503,40 @@ def investor_login():
 # Routes: Investor Dashboard
 # ============================================
 
+def investor_overview(cursor, investor_id):
+    """Dashboard part: investor details and matched startups (they need the details)"""
+    # total_invested / startups_funded are kept by Funding triggers
+    investor = fetch_one(cursor, 'investor.by_id', (investor_id,))
+    return {'investor': investor, 'matched_startups': find_matched_startups(cursor, investor)}
+
+def investor_portfolio(cursor, investor_id):
+    """Dashboard part: first page of the portfolio (later pages via /investor/portfolio)"""
+    portfolio, next_cursor = fetch_page(cursor, 'investor', investor_id)
+    for investment in portfolio:
+        investment['domain_name'] = domain_name(investment['domain_id'])
+    return {'portfolio': portfolio, 'next_cursor': next_cursor}
+
+def investor_insights(cursor, investor_id):
+    """Dashboard part: domain distribution of the latest INSIGHT_DEALS deals"""
+    return {'domain_counts': [(domain_name(domain_id), deals)
+                              for domain_id, deals in domain_counts(cursor, investor_id)],
+            'insight_deals': INSIGHT_DEALS}
+
+def investor_dashboard_single(conn, investor_id):
+    """Every investor dashboard variable from one statement (DASHBOARD_STRATEGY=single)"""
+    cursor = get_cursor(conn)
+    try:
+        context = fetch_investor_dashboard(cursor, investor_id, with_matches=MATCH_STRATEGY == 'sql')
+        if 'matched_startups' not in context:
+            context['matched_startups'] = find_matched_startups(cursor, context['investor'])
+        for investment in context['portfolio']:
+            investment['domain_name'] = domain_name(investment['domain_id'])
+        context['domain_counts'] = [(domain_name(domain_id), deals)
+                                    for domain_id, deals in context['domain_counts']]
+        return context
+    finally:
+        cursor.close()
+
 @app.route('/investor/dashboard')
 def investor_dashboard():
     """Investor dashboard - shows matched startups"""
@@ -480,110 +546,120 @@ def investor_dashboard():
     
     investor_id = session['user_id']
     
-    conn = get_db_connection()
-    if not conn:
-        flash('Database connection error', 'error')
-        return redirect(url_for('index'))
+    with get_db_connection(read_only=True) as conn:
+        if not conn:
+            flash('Database connection error', 'error')
+            return redirect(url_for('index'))
     
+        try:
+            if DASHBOARD_STRATEGY == 'single':
+                context = investor_dashboard_single(conn, investor_id)
+            else:
+                # Independent parts; concurrent with DASHBOARD_PARALLEL=1
+                context = load_dashboard(conn, [partial(investor_overview, investor_id=investor_id),
+                                                partial(investor_portfolio, investor_id=investor_id),
+                                                partial(investor_insights, investor_id=investor_id)])
+            return render_template('investor_dashboard.html', **context)
+    
+        except Error as e:
+            flash(f'Error loading dashboard: {str(e)}', 'error')
+            return redirect(url_for('index'))
+
+# ============================================
+# Routes: Paged Funding Lists
+# ============================================
+
+def funding_page_response(kind, template, rows_name):
+    """Next page of the logged-in user's funding list: rendered rows plus the next cursor"""
+    if session.get('user_type') != kind:
+        return jsonify({'error': 'Please login first'}), 401
+
+    before = request.args.get('before', '')
     try:
+        decode_cursor(before)
+    except ValueError:
+        return jsonify({'error': 'Expected ?before=<YYYY-MM-DD>_<funding_id>'}), 400
+
+    with get_db_connection(read_only=True) as conn:
+        if not conn:
+            return jsonify({'error': 'Database connection error'}), 503
         cursor = get_cursor(conn)
-        
-        # Get investor details
-        if DB_TYPE == 'postgresql':
-            cursor.execute("""
-                SELECT i.*, 
-                       COALESCE(SUM(f.amount), 0) AS total_invested,
-                       COUNT(DISTINCT f.startup_id) AS startups_funded
-                FROM Investors i
-                LEFT JOIN Funding f ON i.investor_id = f.investor_id
-                WHERE i.investor_id = %s
-                GROUP BY i.investor_id, i.name, i.email, i.password_hash, i.investment_min,
-                         i.investment_max, i.preferred_domains, i.phone, i.location,
-                         i.portfolio_size, i.created_at
-            """, (investor_id,))
-        else:
-            cursor.execute("""
-                SELECT i.*, 
-                       COALESCE(SUM(f.amount), 0) AS total_invested,
-                       COUNT(DISTINCT f.startup_id) AS startups_funded
-                FROM Investors i
-                LEFT JOIN Funding f ON i.investor_id = f.investor_id
-                WHERE i.investor_id = %s
-                GROUP BY i.investor_id
-            """, (investor_id,))
-        investor = cursor.fetchone()
-        
-        # Get matched startups
-        if DB_TYPE == 'postgresql':
-            cursor.execute("""
-                SELECT 
-                    s.startup_id,
-                    s.name,
-                    d.domain_name,
-                    s.funding_required,
-                    s.location,
-                    s.description,
-                    s.is_funded,
-                    CASE 
-                        WHEN (',' || %s || ',') LIKE ('%%,' || s.domain_id::text || ',%%') THEN 100
-                        ELSE 50
-                    END AS match_score
-                FROM Startups s
-                JOIN Domains d ON s.domain_id = d.domain_id
-                WHERE s.funding_required BETWEEN %s AND %s
-                  AND s.is_funded = FALSE
-                ORDER BY match_score DESC, s.founded_date DESC
-                LIMIT 10
-            """, (investor['preferred_domains'], investor['investment_min'], 
-                  investor['investment_max']))
-        else:
-            cursor.execute("""
-                SELECT 
-                    s.startup_id,
-                    s.name,
-                    d.domain_name,
-                    s.funding_required,
-                    s.location,
-                    s.description,
-                    s.is_funded,
-                    CASE 
-                        WHEN FIND_IN_SET(s.domain_id, %s) > 0 THEN 100
-                        ELSE 50
-                    END AS match_score
-                FROM Startups s
-                JOIN Domains d ON s.domain_id = d.domain_id
-                WHERE s.funding_required BETWEEN %s AND %s
-                  AND s.is_funded = FALSE
-                ORDER BY match_score DESC, s.founded_date DESC
-                LIMIT 10
-            """, (investor['preferred_domains'], investor['investment_min'], 
-                  investor['investment_max']))
-        
-        matched_startups = cursor.fetchall()
-        
-        # Get portfolio (funded startups)
-        cursor.execute("""
-            SELECT f.*, s.name AS startup_name, d.domain_name
-            FROM Funding f
-            JOIN Startups s ON f.startup_id = s.startup_id
-            JOIN Domains d ON s.domain_id = d.domain_id
-            WHERE f.investor_id = %s
-            ORDER BY f.funding_date DESC
-        """, (investor_id,))
-        
-        portfolio = cursor.fetchall()
-        
-        return render_template('investor_dashboard.html',
-                             investor=investor,
-                             matched_startups=matched_startups,
-                             portfolio=portfolio)
-    
-    except Error as e:
-        flash(f'Error loading dashboard: {str(e)}', 'error')
+        try:
+            rows, next_cursor = fetch_page(cursor, kind, session['user_id'], before=before)
+        except Error as e:
+            return jsonify({'error': f'Error loading page: {str(e)}'}), 500
+        finally:
+            cursor.close()
+
+    for row in rows:
+        if 'domain_id' in row:
+            row['domain_name'] = domain_name(row['domain_id'])
+    return jsonify({'html': render_template(template, **{rows_name: rows}),
+                    'next': next_cursor})
+
+@app.route('/startup/funding')
+def startup_funding_page():
+    """Funding history rows after ?before=<cursor> (the dashboard's "Load more")"""
+    return funding_page_response('startup', 'funding_history_rows.html', 'funding_history')
+
+@app.route('/investor/portfolio')
+def investor_portfolio_page():
+    """Portfolio rows after ?before=<cursor> (the dashboard's "Load more")"""
+    return funding_page_response('investor', 'portfolio_rows.html', 'portfolio')
+
+# ============================================
+# Routes: Search
+# ============================================
+
+def parse_amount(value):
+    """A rupee amount from a form field (None when left empty)"""
+    return float(value) if value.strip() else None
+
+@app.route('/search')
+def search_page():
+    """Full-text search over startups and investors (ranked, paginated)"""
+    if 'user_type' not in session:
+        flash('Please login first', 'error')
         return redirect(url_for('index'))
-    finally:
-        cursor.close()
-        conn.close()
+
+    q = request.args.get('q', '').strip()
+    default_kind = 'startups' if session['user_type'] == 'investor' else 'investors'
+    kind = request.args.get('type', default_kind)
+    funded = request.args.get('funded', '')
+    if kind not in SEARCH_KINDS:
+        kind = default_kind
+    try:
+        funding_min = parse_amount(request.args.get('min', ''))
+        funding_max = parse_amount(request.args.get('max', ''))
+        page = min(max(int(request.args.get('page', 1)), 1), SEARCH_MAX_PAGE)
+    except ValueError:
+        flash('Funding amounts and page must be numbers', 'error')
+        funding_min = funding_max = None
+        page = 1
+
+    results, has_more = [], False
+    if q:
+        with get_db_connection(read_only=True) as conn:
+            if not conn:
+                flash('Database connection error', 'error')
+                return redirect(url_for('index'))
+            cursor = get_cursor(conn)
+            try:
+                results, has_more = run_search(cursor, kind, q, funding_min, funding_max,
+                                               {'yes': True, 'no': False}.get(funded), page=page)
+            except Error as e:
+                flash(f'Error searching: {str(e)}', 'error')
+            finally:
+                cursor.close()
+        for row in results:
+            if 'domain_id' in row:
+                row['domain_name'] = domain_name(row['domain_id'])
+
+    # Current filters, carried over by the previous / next links
+    query = {'q': q, 'type': kind, 'funded': funded,
+             'min': request.args.get('min', ''), 'max': request.args.get('max', '')}
+    return render_template('search.html', q=q, kind=kind, funded=funded, page=page,
+                           results=results, has_more=has_more, query=query)
 
 # ============================================
 # Routes: Logout
@@ -596,21 +672,162 @@ def logout():
     flash('You have been logged out', 'info')
     return redirect(url_for('index'))
 
+# ============================================
+# Routes: Reports & Exports
+# ============================================
+
+@app.route('/reports/<name>')
+def report(name):
+    """One reports.sql analytics report (JSON), served from the rollup tables"""
+    # Per-investor names and totals: logged-in users only, like /export
+    if 'user_type' not in session:
+        return jsonify({'error': 'Login required'}), 401
+
+    if name not in REPORTS:
+        return jsonify({'error': f'Unknown report {name!r}', 'reports': list(REPORTS)}), 404
+
+    with get_db_connection(read_only=True) as conn:
+        if not conn:
+            return jsonify({'error': 'Database connection error'}), 503
+        try:
+            return jsonify(run_report(conn, name))
+        except Error as e:
+            return jsonify({'error': f'Error loading report: {str(e)}'}), 500
+
+@app.route('/export/<filename>')
+def export(filename):
+    """Stream an EXPORT QUERIES result of reports.sql as <name>.csv or <name>.csv.gz"""
+    if 'user_type' not in session:
+        flash('Please login first', 'error')
+        return redirect(url_for('index'))
+
+    name, _, extension = filename.partition('.')
+    if name not in EXPORTS or extension not in ('csv', 'csv.gz'):
+        return jsonify({'error': f'Unknown export {filename!r}',
+                        'exports': [f'{n}.csv' for n in EXPORTS]}), 404
+
+    chunks = stream_export(name, compress=extension == 'csv.gz')
+    try:
+        # Runs the query now, so errors still get a normal response
+        first = next(chunks)
+    except (Error, RuntimeError) as e:
+        flash(f'Error exporting {name}: {str(e)}', 'error')
+        return redirect(url_for('index'))
+
+    def generate():
+        try:
+            yield first
+            yield from chunks
+        finally:
+            chunks.close()
+
+    return Response(generate(),
+                    mimetype='application/gzip' if extension == 'csv.gz' else 'text/csv',
+                    headers={'Content-Disposition': f'attachment; filename={filename}',
+                             'Cache-Control': 'no-store',
+                             'X-Accel-Buffering': 'no'})
+
+# ============================================
+# Routes: Funding Import
+# ============================================
+
+# Bearer token for POST /funding/import; the route is off without one
+FUNDING_IMPORT_TOKEN = os.environ.get('FUNDING_IMPORT_TOKEN', '')
+
+INGEST_MIMETYPES = {'text/csv': 'csv', 'application/x-ndjson': 'jsonl',
+                    'application/jsonl': 'jsonl', 'application/jsonlines': 'jsonl'}
+
+@app.route('/funding/import', methods=['POST'])
+def funding_import():
+    """Bulk funding import: CSV or JSON Lines request body (funding_ingest.py), JSON report"""
+    if not FUNDING_IMPORT_TOKEN:
+        return jsonify({'error': 'Funding import is disabled (FUNDING_IMPORT_TOKEN is not set)'}), 404
+    if not hmac.compare_digest(request.headers.get('Authorization', ''),
+                               f'Bearer {FUNDING_IMPORT_TOKEN}'):
+        return jsonify({'error': 'Invalid or missing import token'}), 401
+
+    fmt = request.args.get('format') or INGEST_MIMETYPES.get(request.mimetype)
+    if fmt not in INGEST_FORMATS:
+        return jsonify({'error': 'Send text/csv or application/x-ndjson, or pass ?format=',
+                        'formats': list(INGEST_FORMATS)}), 415
+
+    # Read as it arrives: the file is never held in memory as a whole
+    body = io.TextIOWrapper(request.stream, encoding='utf-8', newline='')
+    try:
+        report = ingest_funding(body, fmt)
+    except ValueError as e:             # bad header or encoding
+        return jsonify({'error': str(e)}), 400
+    except RuntimeError as e:
+        return jsonify({'error': str(e)}), 503
+    return jsonify(report), 500 if 'failed' in report else 200
+
+# ============================================
+# Routes: Monitoring
+# ============================================
+
+@app.route('/health/db')
+def health_db():
+    """Connection pool and reference cache statistics (JSON) for monitoring"""
+    return jsonify({**pool_stats(), 'reference_cache': cache_stats()})
+
+@app.route('/health/passwords')
+def health_passwords():
+    """Password pool settings and hash/verify latency histograms (JSON)"""
+    return jsonify(password_stats())
+
+@app.route('/metrics')
+def metrics():
+    """Every counter and histogram of this worker, in Prometheus text format"""
+    for key, value in pool_stats().items():
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            gauge(f'db_pool_{key}', f'Connection pool {key.replace("_", " ")}').set(value)
+    return Response(render_prometheus(), mimetype='text/plain; version=0.0.4')
+
 # ============================================
 # Run Application
 # ============================================
 
 def initialize_database():
-    """Initialize database with seed data if empty"""
+    """Seed an empty database, once per schema version (see bootstrap.py)"""
     try:
-        from seed_data import seed_database
+        from bootstrap import ensure_bootstrapped
         print("🔍 Checking database initialization...")
-        seed_database()
+        status = ensure_bootstrapped()
+        if status == 'recorded':
+            print("ℹ️  Database already checked for this schema version. Skipping seed.")
     except Exception as e:
         print(f"⚠️  Could not seed database: {e}")
         print("   (This is normal if database already has data)")
 
 
+def warm_templates():
+    """Load and compile every template into the Jinja environment's cache"""
+    for name in app.jinja_env.list_templates(extensions=['html']):
+        app.jinja_env.get_template(name)
+
+
+def create_app():
+    """App factory for gunicorn: gunicorn 'app:create_app()' (see gunicorn.conf.py)
+
+    Runs the one-time database check and compiles the templates. With
+    --preload that happens once, in the master, and every forked worker
+    starts with them; the master's connections are closed before the fork.
+    """
+    initialize_database()
+    warm_templates()
+    get_pool().close()
+    return app
+
+
+def warm_worker():
+    """Open the pool's connections and load the reference data (after a fork)"""
+    try:
+        get_pool().warm()
+        domain_cache.rows()
+    except Exception as e:
+        print(f"⚠️  Could not warm up the worker: {e}")
+
+
 if __name__ == '__main__':
     # Initialize database with seed data if needed
     initialize_database()
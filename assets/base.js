@@ -0,0 +1,58 @@
+function toggleMobileMenu() {
+    const menu = document.getElementById('navMenu');
+    const button = document.querySelector('.mobile-menu-toggle');
+    menu.classList.toggle('active');
+    button.classList.toggle('active');
+}
+
+function closeMobileMenu() {
+    const menu = document.getElementById('navMenu');
+    const button = document.querySelector('.mobile-menu-toggle');
+    menu.classList.remove('active');
+    button.classList.remove('active');
+}
+
+// Close mobile menu when clicking outside
+document.addEventListener('click', function(event) {
+    const nav = document.querySelector('nav');
+    const navMenu = document.getElementById('navMenu');
+    const toggleButton = document.querySelector('.mobile-menu-toggle');
+
+    if (!nav.contains(event.target) && navMenu.classList.contains('active')) {
+        navMenu.classList.remove('active');
+        toggleButton.classList.remove('active');
+    }
+});
+
+// Close menu on window resize if desktop size
+window.addEventListener('resize', function() {
+    if (window.innerWidth > 768) {
+        const navMenu = document.getElementById('navMenu');
+        const toggleButton = document.querySelector('.mobile-menu-toggle');
+        navMenu.classList.remove('active');
+        toggleButton.classList.remove('active');
+    }
+});
+
+// "Load more" on paged tables: append the next page of rows
+function loadMoreRows(button) {
+    button.disabled = true;
+    fetch(button.dataset.url + '?before=' + encodeURIComponent(button.dataset.before))
+        .then(response => {
+            if (!response.ok) throw new Error(response.statusText);
+            return response.json();
+        })
+        .then(page => {
+            document.getElementById(button.dataset.target).insertAdjacentHTML('beforeend', page.html);
+            if (page.next) {
+                button.dataset.before = page.next;
+                button.disabled = false;
+            } else {
+                button.parentElement.remove();
+            }
+        })
+        .catch(() => {
+            button.textContent = 'Could not load more - try again';
+            button.disabled = false;
+        });
+}
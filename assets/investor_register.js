@@ -0,0 +1,15 @@
+// Convert multiple select to comma-separated string
+document.querySelector('form').addEventListener('submit', function(e) {
+    const select = document.getElementById('preferred_domains');
+    const selected = Array.from(select.selectedOptions).map(opt => opt.value);
+
+    // Create hidden input with comma-separated values
+    const input = document.createElement('input');
+    input.type = 'hidden';
+    input.name = 'preferred_domains';
+    input.value = selected.join(',');
+
+    // Replace select with hidden input
+    select.name = '';
+    this.appendChild(input);
+});
@@ -0,0 +1,178 @@
+"""
+============================================
+DBMS Project: Page Weight Benchmark
+Per-page transfer size and modeled first-render time
+Works with both MySQL and PostgreSQL
+============================================
+
+Requests each page through Flask's test client like a browser that
+accepts gzip and brotli, then follows what the browser would fetch:
+stylesheets and scripts, and the fonts the stylesheets reference. For
+every page it reports:
+
+* html / assets - bytes on the wire for the page and the files it loads
+* first visit   - HTML plus every file, with an empty browser cache
+* next page     - HTML plus the files a browser must fetch again after
+                  visiting another page (immutable files are not)
+* render        - modeled time to first render: the HTML, then the
+                  stylesheets in <head> (they block rendering), over a
+                  network of --rtt-ms round trips and --mbps bandwidth
+                  (defaults: Lighthouse's slow 4G), plus the server's
+                  own time. A new origin costs 3 extra round trips
+                  (DNS, TCP, TLS). Fonts swap in and do not block.
+
+Files on other origins (Google Fonts) cannot be fetched here: they count
+their round trips but no bytes, which flatters the pages that use them.
+
+    python benchmark_assets.py
+    python benchmark_assets.py --rtt-ms 40 --mbps 10
+"""
+
+import argparse
+from html.parser import HTMLParser
+import re
+import statistics
+import time
+from urllib.parse import urljoin, urlsplit
+
+ACCEPT = {'Accept-Encoding': 'gzip, deflate, br'}
+CSS_URL = re.compile(r"url\(\s*['\"]?(?!data:)([^'\")]+)['\"]?\s*\)")
+NEW_ORIGIN_ROUND_TRIPS = 3
+
+
+class _Resources(HTMLParser):
+    """Stylesheets and scripts of a page, and whether they block rendering"""
+
+    def __init__(self):
+        super().__init__()
+        self.in_head = False
+        self.found = []               # (url, kind, blocking)
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == 'head':
+            self.in_head = True
+        elif tag == 'link' and attrs.get('rel') == 'stylesheet' and attrs.get('href'):
+            self.found.append((attrs['href'], 'css', self.in_head))
+        elif tag == 'script' and attrs.get('src'):
+            blocking = self.in_head and 'defer' not in attrs and 'async' not in attrs
+            self.found.append((attrs['src'], 'js', blocking))
+
+    def handle_endtag(self, tag):
+        if tag == 'head':
+            self.in_head = False
+
+
+def _pages(database):
+    """(label, path, session) of every measured page"""
+    with database.get_db_connection() as conn:
+        cursor = database.get_cursor(conn)
+        cursor.execute("SELECT MIN(startup_id) AS startup_id, MIN(investor_id) AS investor_id "
+                       "FROM Funding")
+        ids = cursor.fetchone()
+        cursor.close()
+    startup = {'user_type': 'startup', 'user_id': ids['startup_id'], 'user_name': 'benchmark'}
+    investor = {'user_type': 'investor', 'user_id': ids['investor_id'], 'user_name': 'benchmark'}
+    return [('/', '/', None),
+            ('/about', '/about', None),
+            ('/startup/login', '/startup/login', None),
+            ('/investor/register', '/investor/register', None),
+            ('/startup/dashboard', '/startup/dashboard', startup),
+            ('/investor/dashboard', '/investor/dashboard', investor)]
+
+
+def _immutable(response):
+    return 'immutable' in response.headers.get('Cache-Control', '')
+
+
+def measure_page(client, path, samples):
+    """Bytes and timings of one page and everything it loads"""
+    timings = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        response = client.get(path, headers=ACCEPT)
+        timings.append(time.perf_counter() - started)
+    parser = _Resources()
+    parser.feed(client.get(path).get_data(as_text=True))      # the same page, uncompressed
+    page = {'html': len(response.data), 'server': statistics.median(timings),
+            'files': [], 'origins': set()}
+    pending = [(url, kind, blocking) for url, kind, blocking in parser.found]
+    seen = set()
+    while pending:
+        url, kind, blocking = pending.pop(0)
+        if url in seen:
+            continue
+        seen.add(url)
+        origin = urlsplit(url).netloc
+        if origin:
+            page['origins'].add(origin)
+            page['files'].append({'url': url, 'kind': kind, 'blocking': blocking,
+                                  'bytes': 0, 'immutable': False, 'origin': origin})
+            continue
+        asset = client.get(url, headers=ACCEPT)
+        if asset.status_code != 200:
+            continue                 # not a file: url(#id) inside an inline SVG
+        page['files'].append({'url': url, 'kind': kind, 'blocking': blocking,
+                              'bytes': len(asset.data), 'immutable': _immutable(asset),
+                              'origin': None})
+        if kind == 'css':
+            css = client.get(url).get_data(as_text=True)
+            pending.extend((urljoin(url, ref), 'font', False) for ref in CSS_URL.findall(css))
+    return page
+
+
+def first_render(page, rtt, bytes_per_second, cached):
+    """Modeled seconds to first render; `cached` skips immutable and other-origin files"""
+    seconds = page['server'] + rtt + page['html'] / bytes_per_second
+    blocking = [f for f in page['files']
+                if f['blocking'] and not (cached and (f['immutable'] or f['origin']))]
+    # Blocking stylesheets download in parallel once the HTML names them
+    slowest = 0.0
+    for origin in {f['origin'] for f in blocking}:
+        files = [f for f in blocking if f['origin'] == origin]
+        setup = NEW_ORIGIN_ROUND_TRIPS * rtt if origin else 0.0
+        slowest = max(slowest, setup + rtt + sum(f['bytes'] for f in files) / bytes_per_second)
+    return seconds + slowest
+
+
+def run_benchmark(rtt_ms, mbps, samples):
+    import app as app_module
+    import database
+
+    client = app_module.app.test_client()
+    rtt = rtt_ms / 1000
+    bytes_per_second = mbps * 1_000_000 / 8
+    print(f"🌐 {rtt_ms:g} ms RTT, {mbps:g} Mbit/s, server time: median of {samples} requests\n")
+    print(f"   {'page':<22}{'html':>8}{'assets':>9}{'first visit':>13}{'next page':>11}"
+          f"{'render':>9}{'cached':>9}{'origins':>9}")
+    results = {}
+    for label, path, session in _pages(database):
+        with client.session_transaction() as s:
+            s.clear()
+            s.update(session or {})
+        page = measure_page(client, path, samples)
+        assets = sum(f['bytes'] for f in page['files'])
+        again = sum(f['bytes'] for f in page['files'] if not f['immutable'] and not f['origin'])
+        cold = first_render(page, rtt, bytes_per_second, cached=False)
+        warm = first_render(page, rtt, bytes_per_second, cached=True)
+        results[label] = {'html': page['html'], 'assets': assets,
+                          'first_visit': page['html'] + assets, 'next_page': page['html'] + again,
+                          'render_ms': cold * 1000, 'cached_render_ms': warm * 1000,
+                          'origins': sorted(page['origins'])}
+        print(f"   {label:<22}{page['html']:>8,}{assets:>9,}{page['html'] + assets:>13,}"
+              f"{page['html'] + again:>11,}{cold * 1000:>7,.0f}ms{warm * 1000:>7,.0f}ms"
+              f"{len(page['origins']) + 1:>9}")
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Per-page transfer size and modeled first-render time')
+    parser.add_argument('--rtt-ms', type=float, default=150, help='network round trip (ms)')
+    parser.add_argument('--mbps', type=float, default=1.6, help='download bandwidth (Mbit/s)')
+    parser.add_argument('--samples', type=int, default=20, help='requests per page for server time')
+    args = parser.parse_args()
+
+    print("=" * 50)
+    print("📦 Startup Funding System - Page Weight Benchmark")
+    print("=" * 50)
+    run_benchmark(args.rtt_ms, args.mbps, args.samples)
@@ -0,0 +1,250 @@
+"""
+============================================
+DBMS Project: Dashboard Benchmark
+End-to-end dashboard latency, sequential vs concurrent loading
+Works with both MySQL and PostgreSQL
+============================================
+
+A local database answers in well under a millisecond, which hides what
+the dashboard loading modes are for: on a real network every statement
+pays a round trip. This benchmark puts a TCP proxy between the app and
+the database that delays every packet by half of --rtt-ms in each
+direction. It then requests the startup and investor dashboards through
+Flask's test client in each mode:
+
+* sequential - every part of the page on the request's connection
+* parallel   - DASHBOARD_PARALLEL=1 (dashboard_loader.py)
+* single     - DASHBOARD_STRATEGY=single, one statement (dashboard_queries.py)
+
+For every sample it also checks that each mode renders the dashboard with
+the same template context as sequential mode: same values of the same
+types, so a Decimal that came back as a float counts as a difference.
+CPU is the app process's CPU time per request; with --rtt-ms above 0 it
+includes the proxy's threads.
+
+    python benchmark_dashboards.py                  # 20 ms RTT, 50 requests per mode
+    python benchmark_dashboards.py --rtt-ms 5 --requests 200
+    python benchmark_dashboards.py --rtt-ms 0 --modes sequential,single
+"""
+
+import argparse
+from collections.abc import Mapping
+import os
+import queue
+import random
+import socket
+import sys
+import threading
+import time
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# ============================================
+# Latency Proxy
+# ============================================
+
+class LatencyProxy:
+    """Forwards TCP connections to the database, delaying each chunk by `delay` seconds"""
+
+    def __init__(self, upstream, delay):
+        self.upstream = upstream      # (host, port) or a unix socket path
+        self.delay = delay
+        self._server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._server.bind(('127.0.0.1', 0))
+        self._server.listen(64)
+        self.port = self._server.getsockname()[1]
+        threading.Thread(target=self._accept, daemon=True).start()
+
+    def _connect_upstream(self):
+        if isinstance(self.upstream, str):
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        else:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.connect(self.upstream)
+        return sock
+
+    def _accept(self):
+        while True:
+            client, _ = self._server.accept()
+            client.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            server = self._connect_upstream()
+            for source, target in ((client, server), (server, client)):
+                chunks = queue.Queue()
+                threading.Thread(target=self._read, args=(source, chunks), daemon=True).start()
+                threading.Thread(target=self._write, args=(target, chunks), daemon=True).start()
+
+    def _read(self, source, chunks):
+        while True:
+            try:
+                data = source.recv(65536)
+            except OSError:
+                data = b''
+            chunks.put((time.monotonic() + self.delay, data))
+            if not data:
+                return
+
+    @staticmethod
+    def _write(target, chunks):
+        while True:
+            due, data = chunks.get()
+            wait = due - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            try:
+                if not data:
+                    target.shutdown(socket.SHUT_WR)
+                    return
+                target.sendall(data)
+            except OSError:
+                return
+
+
+def _proxy_postgresql(url, delay):
+    """Start a proxy for a DATABASE_URL; returns the URL that goes through it"""
+    parts = urlsplit(url)
+    params = dict(parse_qsl(parts.query))
+    host = params.pop('host', None) or parts.hostname or 'localhost'
+    port = params.get('port') or parts.port or 5432
+    params.pop('port', None)
+    upstream = f"{host}/.s.PGSQL.{port}" if host.startswith('/') else (host, int(port))
+    proxy = LatencyProxy(upstream, delay)
+    userinfo = parts.netloc.rsplit('@', 1)[0] + '@' if '@' in parts.netloc else ''
+    return urlunsplit((parts.scheme, f"{userinfo}127.0.0.1:{proxy.port}", parts.path,
+                       urlencode(params), parts.fragment))
+
+# ============================================
+# Measurement
+# ============================================
+
+MODES = ('sequential', 'parallel', 'single')
+
+
+def _percentile(sorted_values, q):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, max(0, int(round(q * len(sorted_values))) - 1))]
+
+
+def _sample_ids(database, count, seed):
+    """Random startups and investors that have funding rows"""
+    rng = random.Random(seed)
+    with database.get_db_connection() as conn:
+        cursor = database.get_cursor(conn)
+        samples = {}
+        for kind, column in (('startup', 'startup_id'), ('investor', 'investor_id')):
+            cursor.execute(f"SELECT MIN({column}) AS lo, MAX({column}) AS hi FROM Funding")
+            bounds = cursor.fetchone()
+            ids = []
+            for _ in range(count):
+                cursor.execute(f"SELECT {column} AS id FROM Funding WHERE {column} >= %s "
+                               f"ORDER BY {column} LIMIT 1", (rng.randint(bounds['lo'], bounds['hi']),))
+                ids.append(cursor.fetchone()['id'])
+            samples[kind] = ids
+        cursor.close()
+    return samples
+
+
+def _same(a, b):
+    """Equal values of the same types (Decimal('1.5') == 1.5, but not here)"""
+    if isinstance(a, Mapping) and isinstance(b, Mapping):
+        return a.keys() == b.keys() and all(_same(a[k], b[k]) for k in a)
+    if isinstance(a, (list, tuple)) and isinstance(b, (list, tuple)):
+        return type(a) is type(b) and len(a) == len(b) and all(map(_same, a, b))
+    return type(a) is type(b) and a == b
+
+
+def run_benchmark(requests, rtt_ms, modes=MODES, seed=7):
+    import flask
+    import database
+    import dashboard_loader
+    import app as app_module
+
+    client = app_module.app.test_client()
+    rendered = []
+    flask.template_rendered.connect(lambda sender, template, context, **extra:
+                                    rendered.append((template.name, context)),
+                                    app_module.app, weak=False)
+
+    def dashboard(kind, user_id, mode):
+        app_module.DASHBOARD_STRATEGY = 'single' if mode == 'single' else 'parts'
+        dashboard_loader.DASHBOARD_PARALLEL = mode == 'parallel'
+        with client.session_transaction() as session:
+            session.clear()
+            session.update({'user_type': kind, 'user_id': user_id, 'user_name': 'benchmark'})
+        rendered.clear()
+        started, cpu_started = time.perf_counter(), time.process_time()
+        response = client.get(f'/{kind}/dashboard')
+        elapsed, cpu = time.perf_counter() - started, time.process_time() - cpu_started
+        if response.status_code != 200 or not rendered:
+            raise RuntimeError(f"/{kind}/dashboard for {user_id} answered {response.status_code}")
+        template, context = rendered[-1]
+        # Only what the route passed in (not request, session, g, ...)
+        return elapsed, cpu, {k: v for k, v in context.items()
+                              if k not in ('request', 'session', 'g', 'config', 'get_flashed_messages', 'url_for')}
+
+    samples = _sample_ids(database, requests, seed)
+    print(f"🔁 {requests} requests per dashboard and mode, simulated RTT {rtt_ms:.0f} ms\n")
+    print(f"   {'dashboard':<12}{'mode':<12}{'p50':>10}{'p95':>10}{'mean':>10}{'CPU':>10}")
+    mismatches = 0
+    results = {}
+    for kind in ('startup', 'investor'):
+        ids = samples[kind]
+        for mode in modes:                      # warm up connections, caches and threads
+            for user_id in ids[:3]:
+                dashboard(kind, user_id, mode)
+        timings = {mode: [] for mode in modes}
+        cpu = {mode: 0.0 for mode in modes}
+        for user_id in ids:
+            reference = None
+            for mode in modes:
+                elapsed, cpu_time, context = dashboard(kind, user_id, mode)
+                timings[mode].append(elapsed)
+                cpu[mode] += cpu_time
+                if reference is None:
+                    reference = (mode, context)
+                elif not _same(reference[1], context):
+                    mismatches += 1
+                    print(f"  ✗ {kind} {user_id}: template context differs between {reference[0]} and {mode}")
+        for mode, values in timings.items():
+            values.sort()
+            results[(kind, mode)] = values
+            print(f"   {kind:<12}{mode:<12}{_percentile(values, 0.5) * 1000:>8.1f}ms"
+                  f"{_percentile(values, 0.95) * 1000:>8.1f}ms{sum(values) / len(values) * 1000:>8.1f}ms"
+                  f"{cpu[mode] / len(values) * 1000:>8.1f}ms")
+    print()
+    if mismatches:
+        print(f"❌ {mismatches} dashboards rendered different contexts")
+    else:
+        print("✅ Every mode rendered the same template context for every sample")
+    return results, mismatches
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Dashboard latency: sequential vs concurrent loading')
+    parser.add_argument('--rtt-ms', type=float, default=20.0, help='simulated database round trip')
+    parser.add_argument('--requests', type=int, default=50, help='requests per dashboard and mode')
+    parser.add_argument('--modes', default=','.join(MODES),
+                        help='comma-separated modes; the first is the reference context')
+    args = parser.parse_args()
+    modes = tuple(mode.strip() for mode in args.modes.split(',') if mode.strip())
+    unknown = set(modes) - set(MODES)
+    if unknown:
+        parser.error(f"unknown modes: {', '.join(sorted(unknown))} (choose from {', '.join(MODES)})")
+
+    print("=" * 50)
+    print("⏱️  Startup Funding System - Dashboard Benchmark")
+    print("=" * 50)
+    delay = args.rtt_ms / 2000
+    if delay <= 0:
+        pass                                    # straight to the database
+    elif os.environ.get('DATABASE_URL'):
+        os.environ['DATABASE_URL'] = _proxy_postgresql(os.environ['DATABASE_URL'], delay)
+    else:
+        import database
+        proxy = LatencyProxy((database.DB_CONFIG['host'], database.DB_CONFIG.get('port', 3306)), delay)
+        database.DB_CONFIG.update(host='127.0.0.1', port=proxy.port)
+
+    _, mismatches = run_benchmark(args.requests, args.rtt_ms, modes)
+    sys.exit(1 if mismatches else 0)
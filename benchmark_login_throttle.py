@@ -0,0 +1,158 @@
+"""
+============================================
+DBMS Project: Login Throttle Benchmark
+Overhead per login attempt, and the CPU a throttled burst saves
+Works with both MySQL and PostgreSQL
+============================================
+
+Two measurements of login_throttle.py:
+
+* overhead - time of one check (take) and one give-back (release) per
+             backend: memory, local (SQLite file) and database (the
+             LoginThrottle table, migration 010). Limits are raised so
+             nothing is refused. Keys rotate over --keys addresses
+             (198.18.0.0/15, the benchmarking range) and accounts.
+* burst    - --attempts wrong-password logins from one address, through
+             Flask's test client, with the throttle off and on (memory
+             buckets). It reports process CPU time, wall time, refused
+             attempts and bcrypt checks. "one account" targets a real
+             account, so every admitted attempt runs bcrypt. "many
+             accounts" sprays unknown emails, so each admitted attempt
+             costs a database lookup.
+
+The burst needs an account with a real bcrypt hash. The benchmark
+registers throttle-benchmark@example.test and deletes it afterwards.
+
+    python benchmark_login_throttle.py
+    python benchmark_login_throttle.py --attempts 100 --checks 5000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+EMAIL = 'throttle-benchmark@example.test'
+PASSWORD = 'benchmark-password'
+UNLIMITED = {'ip': (1e12, 1e12), 'email': (1e12, 1e12)}
+
+
+def _percentile(sorted_values, q):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    rank = max(1, int(round(q * len(sorted_values) + 0.5)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def measure_overhead(checks, keys):
+    import login_throttle
+
+    print(f"⏱️  Overhead: {checks} checks per backend over {keys} addresses / accounts (µs)\n")
+    print(f"   {'backend':<10}{'take p50':>10}{'take p95':>10}{'release p50':>13}{'release p95':>13}")
+    results = {}
+    local_path = os.path.join(tempfile.mkdtemp(), 'login_throttle.sqlite3')
+    for name in ('memory', 'local', 'database'):
+        backend = (login_throttle.LocalBuckets(local_path) if name == 'local'
+                   else login_throttle.BACKENDS[name]())
+        throttle = login_throttle.LoginThrottle(backend, limits=UNLIMITED)
+        takes, releases = [], []
+        try:
+            for i in range(checks):
+                ip, email = f'198.18.{i % keys // 250}.{i % 250}', f'user{i % keys}@benchmark.test'
+                started = time.perf_counter()
+                throttle.take(ip, email)
+                takes.append(time.perf_counter() - started)
+                started = time.perf_counter()
+                throttle.refund(ip, email)
+                releases.append(time.perf_counter() - started)
+        finally:
+            if name == 'database':
+                _delete_buckets('%@benchmark.test')
+        takes.sort()
+        releases.sort()
+        row = {'take_p50_us': _percentile(takes, 0.5) * 1e6, 'take_p95_us': _percentile(takes, 0.95) * 1e6,
+               'release_p50_us': _percentile(releases, 0.5) * 1e6,
+               'release_p95_us': _percentile(releases, 0.95) * 1e6}
+        results[name] = row
+        print(f"   {name:<10}{row['take_p50_us']:>10,.0f}{row['take_p95_us']:>10,.0f}"
+              f"{row['release_p50_us']:>13,.0f}{row['release_p95_us']:>13,.0f}")
+    return results
+
+
+def _delete_buckets(email_pattern):
+    from database import get_db_connection, get_cursor
+    with get_db_connection() as conn:
+        cursor = get_cursor(conn)
+        cursor.execute("DELETE FROM LoginThrottle WHERE bucket_key LIKE %s OR bucket_key LIKE %s",
+                       ('email:' + email_pattern, 'ip:198.18.%'))
+        conn.commit()
+        cursor.close()
+
+
+def _burst(client, emails, attempts):
+    """(CPU s, wall s, refused, bcrypt checks) of `attempts` failed logins from one address"""
+    import passwords
+
+    verified = passwords.VERIFY_SECONDS.snapshot()['count']
+    refused = 0
+    cpu, wall = time.process_time(), time.perf_counter()
+    for i in range(attempts):
+        response = client.post('/startup/login', data={'email': emails[i % len(emails)],
+                                                       'password': 'wrong-password'},
+                               environ_base={'REMOTE_ADDR': '203.0.113.7'})
+        refused += response.status_code == 429
+    cpu, wall = time.process_time() - cpu, time.perf_counter() - wall
+    return cpu, wall, refused, passwords.VERIFY_SECONDS.snapshot()['count'] - verified
+
+
+def measure_burst(attempts):
+    import app as app_module
+    import login_throttle
+    from database import get_db_connection, get_cursor
+
+    client = app_module.app.test_client()
+    client.post('/startup/register', data={
+        'name': 'Throttle Benchmark', 'email': EMAIL, 'password': PASSWORD, 'domain_id': 1,
+        'funding_required': 1000000, 'description': 'benchmark_login_throttle.py',
+        'founded_date': '2024-01-01', 'location': 'Pune', 'website': ''})
+    scenarios = (('one account', [EMAIL]),
+                 ('many accounts', [f'nobody{i}@benchmark.test' for i in range(attempts)]))
+    print(f"\n🔐 Burst: {attempts} wrong-password logins from one address\n")
+    print(f"   {'scenario':<16}{'throttle':<10}{'refused':>9}{'bcrypt':>8}{'CPU s':>8}"
+          f"{'wall s':>8}{'CPU ms/attempt':>16}")
+    results = {}
+    try:
+        for label, emails in scenarios:
+            for enabled in (False, True):
+                login_throttle.LOGIN_THROTTLE = enabled
+                login_throttle._throttle = login_throttle.LoginThrottle(login_throttle.MemoryBuckets())
+                cpu, wall, refused, checks = _burst(client, emails, attempts)
+                results[(label, enabled)] = {'refused': refused, 'bcrypt_checks': checks,
+                                             'cpu_s': cpu, 'wall_s': wall}
+                print(f"   {label:<16}{'on' if enabled else 'off':<10}{refused:>9}{checks:>8}"
+                      f"{cpu:>8.2f}{wall:>8.2f}{cpu * 1000 / attempts:>16.1f}")
+            off, on = results[(label, False)], results[(label, True)]
+            if off['cpu_s']:
+                print(f"   {'':<16}→ {1 - on['cpu_s'] / off['cpu_s']:.0%} less CPU")
+    finally:
+        with get_db_connection() as conn:
+            cursor = get_cursor(conn)
+            cursor.execute("DELETE FROM Startups WHERE email = %s", (EMAIL,))
+            conn.commit()
+            cursor.close()
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Login throttle overhead and the CPU it saves')
+    parser.add_argument('--checks', type=int, default=2000, help='checks per backend (overhead)')
+    parser.add_argument('--keys', type=int, default=500, help='distinct addresses / accounts (overhead)')
+    parser.add_argument('--attempts', type=int, default=60, help='failed logins per burst')
+    args = parser.parse_args()
+
+    print("=" * 50)
+    print("🛡️  Startup Funding System - Login Throttle Benchmark")
+    print("=" * 50)
+    measure_overhead(args.checks, args.keys)
+    measure_burst(args.attempts)
@@ -0,0 +1,109 @@
+"""
+============================================
+DBMS Project: Page Benchmark
+Requests/s and bytes on the wire, with and without the response cache
+Works with both MySQL and PostgreSQL
+============================================
+
+Requests pages through Flask's test client, like a browser that accepts
+gzip and brotli, in two modes:
+
+* plain      - PAGE_CACHE=0, COMPRESS_RESPONSES=0: render every page, send it as is
+* compressed - PAGE_CACHE=0: render and compress every response
+* cached     - the page cache and on-the-fly compression (response_cache.py)
+
+Pages: the anonymous landing and about pages, a revalidation of the
+landing page (If-None-Match, as a browser sends for a page in its cache),
+and a logged-in startup dashboard and report as dynamic responses.
+Requests/s is single-threaded, in-process: it measures the app's own work
+per request, without network or WSGI server overhead.
+
+    python benchmark_pages.py                   # 2000 requests per page and mode
+    python benchmark_pages.py --requests 500
+"""
+
+import argparse
+import time
+
+MODES = ('plain', 'compressed', 'cached')
+ACCEPT = {'Accept-Encoding': 'gzip, deflate, br'}
+
+
+def _pages(database):
+    """(label, path, session, extra headers) of every benchmarked page"""
+    with database.get_db_connection() as conn:
+        cursor = database.get_cursor(conn)
+        cursor.execute("SELECT MIN(startup_id) AS id FROM Funding")
+        startup_id = cursor.fetchone()['id']
+        cursor.close()
+    startup = {'user_type': 'startup', 'user_id': startup_id, 'user_name': 'benchmark'}
+    return [('/ (anonymous)', '/', None, {}),
+            ('/about (anonymous)', '/about', None, {}),
+            ('/ (revalidate)', '/', None, 'etag'),
+            ('/startup/dashboard', '/startup/dashboard', startup, {}),
+            ('/reports/domains', '/reports/domains', startup, {})]
+
+
+def run_benchmark(requests):
+    import app as app_module
+    import database
+    import response_cache
+
+    client = app_module.app.test_client()
+
+    def request(path, headers):
+        return client.get(path, headers={**ACCEPT, **headers})
+
+    def set_mode(mode):
+        # The cache is filled once per page in the warm-up, then only hit
+        response_cache.PAGE_CACHE = mode == 'cached'
+        response_cache.COMPRESS_RESPONSES = mode != 'plain'
+
+    print(f"🔁 {requests} requests per page and mode"
+          f"{'' if response_cache.BROTLI_AVAILABLE else ' (brotli not installed: gzip only)'}\n")
+    print(f"   {'page':<24}{'mode':<12}{'status':>7}{'encoding':>10}{'bytes':>9}{'req/s':>9}")
+    results = {}
+    rounds = 10
+    batch = max(1, requests // rounds)
+    for label, path, session, headers in _pages(database):
+        with client.session_transaction() as s:
+            s.clear()
+            s.update(session or {})
+        runs = {}
+        for mode in MODES:
+            set_mode(mode)
+            if headers == 'etag':
+                # What the browser cached from its last visit
+                etag = request(path, {}).headers.get('ETag')
+                extra = {'If-None-Match': etag} if etag else {}
+            else:
+                extra = headers
+            runs[mode] = [extra, request(path, extra), 0.0]     # warm up (and fill the cache)
+        # Modes take turns, so a noisy moment does not land on one mode only
+        for _ in range(rounds):
+            for mode in MODES:
+                set_mode(mode)
+                extra = runs[mode][0]
+                started = time.perf_counter()
+                for _ in range(batch):
+                    runs[mode][1] = request(path, extra)
+                runs[mode][2] += time.perf_counter() - started
+        for mode in MODES:
+            _, response, elapsed = runs[mode]
+            rate = batch * rounds / elapsed
+            results[(label, mode)] = (response.status_code, len(response.data), rate)
+            print(f"   {label:<24}{mode:<12}{response.status_code:>7}"
+                  f"{response.headers.get('Content-Encoding', '-'):>10}{len(response.data):>9,}"
+                  f"{rate:>9,.0f}")
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Page requests/s and bytes with and without the response cache')
+    parser.add_argument('--requests', type=int, default=2000, help='requests per page and mode')
+    args = parser.parse_args()
+
+    print("=" * 50)
+    print("⏱️  Startup Funding System - Page Benchmark")
+    print("=" * 50)
+    run_benchmark(args.requests)
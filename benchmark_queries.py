@@ -0,0 +1,610 @@
+"""
+============================================
+DBMS Project: Query Benchmark Suite
+Latency, rows examined and plans for every named SQL path
+Works with both MySQL and PostgreSQL
+============================================
+
+Benchmarks the dashboard/matchmaking queries of app.py, the /search
+queries of search.py, the lookup, search and history queries of
+queries.sql and every report in reports.sql (reports_postgresql.sql on
+PostgreSQL).
+
+For each query it runs a few warmup executions, then times repeated
+executions (execute + fetch) with a different sample startup/investor
+each time. It records:
+
+* p50/p95/p99/mean latency and rows returned
+* rows examined: per-node rows read from EXPLAIN ANALYZE on PostgreSQL,
+  the Handler_read_* delta of one execution on MySQL
+* the plan (EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) / EXPLAIN FORMAT=JSON)
+
+Results are written as JSON and compared with a stored baseline. A query
+is flagged when its p95 or its rows examined grows by more than
+--tolerance (default 25%) at the same scale.
+
+    python benchmark_queries.py --scales 100k            # data already loaded
+    python benchmark_queries.py --build --scales 1k,100k,1M
+    python benchmark_queries.py --save-baseline          # accept these numbers
+    python benchmark_queries.py --only "app.*" --compare-prepared --repetitions 200
+
+--build empties Startups, Investors, Funding and Matches and reloads them
+with bulk_seed.py for each scale. Only use it on a disposable database.
+"""
+
+import argparse
+import fnmatch
+import json
+import os
+import random
+import re
+import sys
+import time
+from datetime import datetime
+
+import database
+from database import DB_TYPE, get_db_connection, get_cursor
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_OUTPUT = os.path.join(BASE_DIR, 'benchmark_results.json')
+DEFAULT_BASELINE = os.path.join(BASE_DIR, 'benchmark_baseline.json')
+
+SAMPLE_SIZE = 50            # sample startups / investors used as parameters
+MIN_DELTA_MS = 1.0          # p95 changes below this are noise, never regressions
+FETCH_CHUNK = 5000
+
+# bulk_seed.py row counts per scale: investors = startups / 10,
+# funding = 5 x startups, matches = 2 x startups
+SCALE_UNITS = {'k': 1000, 'm': 1000000}
+
+# ============================================
+# Query Catalog
+# ============================================
+
+def load_sql_blocks(path):
+    """{title: statement} for the SELECT statements of a .sql file
+
+    The title is the first comment line above the statement, ignoring
+    "====" banner lines (so reports.sql yields "REPORT 3: ...").
+    """
+    with open(path, encoding='utf-8') as f:
+        lines = f.read().splitlines()
+
+    blocks, title, in_comments, statement = {}, None, False, []
+    for line in lines:
+        stripped = line.strip()
+        if not statement:
+            if stripped.startswith('--'):
+                if not in_comments:
+                    title, in_comments = None, True     # a new comment group
+                text = stripped.lstrip('-').strip()
+                if text and not text.startswith('=') and title is None:
+                    title = text
+                continue
+            in_comments = False
+            if not stripped:
+                continue
+        statement.append(line)
+        if stripped.split('--')[0].rstrip().endswith(';'):
+            sql = '\n'.join(statement).strip().rstrip(';').strip()
+            if title and re.match(r'^\(?\s*(SELECT|WITH)\b', sql, re.IGNORECASE):
+                blocks[title] = sql
+            title, statement = None, []
+    return blocks
+
+
+def _slug(title, limit=40):
+    return re.sub(r'[^a-z0-9]+', '_', title.lower())[:limit].strip('_')
+
+
+def _sql_runner(sql, params=None):
+    """A query runner that executes `sql` (with ? placeholders) and fetches every row
+
+    Rows are fetched in chunks and only counted, so a report returning
+    millions of rows does not have to fit in memory as dicts.
+    """
+    if '?' in sql:
+        sql = sql.replace('%', '%%').replace('?', '%s')
+
+    def run(cursor, sample):
+        if params is None:
+            cursor.execute(sql)
+        else:
+            cursor.execute(sql, params(sample))
+        count = 0
+        while True:
+            chunk = cursor.fetchmany(FETCH_CHUNK)
+            if not chunk:
+                return count
+            count += len(chunk)
+    return run
+
+
+def _funding_window(sample):
+    amount = sample['startup']['funding_required']
+    return (amount * 9 // 10, amount * 11 // 10)
+
+
+# queries.sql statements worth benchmarking, with their parameters
+QUERIES_SQL_PARAMS = {
+    'Startup Login (retrieve by email)': lambda s: (s['startup']['email'],),
+    'Investor Login (retrieve by email)': lambda s: (s['investor']['email'],),
+    'Get Startup Profile': lambda s: (s['startup']['startup_id'],),
+    'Get Investor Profile': lambda s: (s['investor']['investor_id'],),
+    'Find Top Investors for a Startup (Domain + Investment Range Match)': lambda s: (
+        s['startup']['funding_required'], s['startup']['funding_required'], s['startup']['domain_id'],
+        s['startup']['funding_required'], s['startup']['funding_required'], s['startup']['domain_id']),
+    'Find Top Startups for an Investor': lambda s: (
+        s['investor']['investment_min'], s['investor']['investment_max'], s['investor']['investor_id'],
+        s['investor']['investment_min'], s['investor']['investment_max'], s['investor']['investor_id']),
+    'Search Startups by Domain': lambda s: (s['startup']['domain_name'],),
+    'Search Investors by Investment Range': lambda s: (
+        s['startup']['funding_required'], s['startup']['funding_required']),
+    'Search Startups by Funding Requirement': _funding_window,
+    'Advanced Search: Find AI Startups needing 1-5 Crore': None,
+    'Get Funding History for Startup': lambda s: (s['startup']['startup_id'],),
+    'Get Funding History for Investor': lambda s: (s['investor']['investor_id'],),
+}
+
+
+def build_catalog():
+    """[(name, source, runner)] - runner(cursor, sample) executes, fetches and
+    returns the rows (or their count)"""
+    # Imported here: app.py builds the Flask app on import
+    import app
+    from dashboard_queries import fetch_investor_dashboard, fetch_startup_dashboard
+    from funding_pages import domain_counts, fetch_page
+    from materialized_matches import materialized_investors, materialized_startups
+    from query_registry import fetch_one
+    from report_rollups import REPORT_QUERIES
+    from search import search
+
+    catalog = [
+        # Login and dashboard paths of app.py, through query_registry.py and the app's own functions
+        ('app.startup_login', 'query_registry.py',
+         lambda cursor, s: [fetch_one(cursor, 'startup.by_email', (s['startup']['email'],))]),
+        ('app.investor_login', 'query_registry.py',
+         lambda cursor, s: [fetch_one(cursor, 'investor.by_email', (s['investor']['email'],))]),
+        ('app.startup_profile', 'query_registry.py',
+         lambda cursor, s: [fetch_one(cursor, 'startup.by_id', (s['startup']['startup_id'],))]),
+        ('app.investor_profile', 'query_registry.py',
+         lambda cursor, s: [fetch_one(cursor, 'investor.by_id', (s['investor']['investor_id'],))]),
+        ('app.startup_funding_rounds', 'query_registry.py',
+         lambda cursor, s: [fetch_one(cursor, 'startup.funding_rounds', (s['startup']['startup_id'],))]),
+        ('app.match_investors_sql', 'app.py',
+         lambda cursor, s: app.find_matched_investors_sql(cursor, s['startup'])),
+        ('app.match_startups_sql', 'app.py',
+         lambda cursor, s: app.find_matched_startups_sql(cursor, s['investor'])),
+        ('app.match_investors_materialized', 'materialized_matches.py',
+         lambda cursor, s: materialized_investors(cursor, s['startup'])),
+        ('app.match_startups_materialized', 'materialized_matches.py',
+         lambda cursor, s: materialized_startups(cursor, s['investor'])),
+        ('app.startup_funding_history', 'funding_pages.py',
+         lambda cursor, s: len(fetch_page(cursor, 'startup', s['startup']['startup_id'])[0])),
+        ('app.investor_portfolio', 'funding_pages.py',
+         lambda cursor, s: len(fetch_page(cursor, 'investor', s['investor']['investor_id'])[0])),
+        ('app.investor_domain_counts', 'funding_pages.py',
+         lambda cursor, s: len(domain_counts(cursor, s['investor']['investor_id']))),
+        # DASHBOARD_STRATEGY=single: the whole dashboard in one statement
+        ('app.startup_dashboard_single', 'dashboard_queries.py',
+         lambda cursor, s: len(fetch_startup_dashboard(cursor, s['startup']['startup_id'])['funding_history'])),
+        ('app.investor_dashboard_single', 'dashboard_queries.py',
+         lambda cursor, s: len(fetch_investor_dashboard(cursor, s['investor']['investor_id'])['portfolio'])),
+        # /search: a name word; name + location with filters; a whole city (broadest)
+        ('search.startups_name', 'search.py',
+         lambda cursor, s: len(search(cursor, 'startups', s['startup']['name'].split()[0])[0])),
+        ('search.startups_filtered', 'search.py',
+         lambda cursor, s: len(search(cursor, 'startups',
+                                      f"{s['startup']['name'].split()[0]} {s['startup']['location'] or ''}",
+                                      *_funding_window(s), is_funded=False)[0])),
+        ('search.startups_location', 'search.py',
+         lambda cursor, s: len(search(cursor, 'startups', s['startup']['location'] or 'startup')[0])),
+        ('search.investors_location', 'search.py',
+         lambda cursor, s: len(search(cursor, 'investors', s['investor']['location'] or 'ventures',
+                                      *_funding_window(s))[0])),
+    ]
+
+    queries = load_sql_blocks(os.path.join(BASE_DIR, 'queries.sql'))
+    for title, params in QUERIES_SQL_PARAMS.items():
+        if title in queries:
+            catalog.append((f"queries.{_slug(title)}", 'queries.sql', _sql_runner(queries[title], params)))
+        else:
+            print(f"⚠️  queries.sql has no statement titled {title!r}")
+
+    reports_file = 'reports_postgresql.sql' if DB_TYPE == 'postgresql' else 'reports.sql'
+    for title, sql in load_sql_blocks(os.path.join(BASE_DIR, reports_file)).items():
+        catalog.append((f"reports.{_slug(title)}", reports_file, _sql_runner(sql)))
+
+    # The same reports served from the rollup tables (/reports/<name>)
+    for name, sql in REPORT_QUERIES.items():
+        catalog.append((f"rollups.{name}", 'report_rollups.py', _sql_runner(sql)))
+    return catalog
+
+# ============================================
+# Measurement
+# ============================================
+
+class _RecordingCursor:
+    """Passes everything through to the real cursor and keeps the statements it ran"""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self.statements = []
+        if DB_TYPE == 'mysql':
+            # Prepared statements would run on the connection's own cursors,
+            # out of sight; send them as text here (same plan on MySQL)
+            self.connection = None
+
+    def execute(self, sql, params=None):
+        self.statements.append((sql, params))
+        if params is None:
+            return self._cursor.execute(sql)
+        return self._cursor.execute(sql, params)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+def _percentile(sorted_values, q):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    rank = max(1, int(round(q * len(sorted_values) + 0.5)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def _pg_rows_examined(node):
+    """Rows produced or filtered away by every scan node of a JSON plan"""
+    total = 0
+    if 'Relation Name' in node or node.get('Node Type', '').endswith('Scan'):
+        loops = node.get('Actual Loops', 1)
+        total += (node.get('Actual Rows', 0) + node.get('Rows Removed by Filter', 0)
+                  + node.get('Rows Removed by Index Recheck', 0)) * loops
+    for child in node.get('Plans', []):
+        total += _pg_rows_examined(child)
+    return total
+
+
+def _handler_reads(cursor):
+    cursor.execute("SHOW SESSION STATUS LIKE 'Handler_read%'")
+    return sum(int(row['Value']) for row in cursor.fetchall())
+
+
+def explain(cursor, statements):
+    """(plans, rows_examined) for the statements one execution ran"""
+    plans, examined = [], 0
+    for sql, params in statements:
+        # EXECUTE: a prepared statement (query_registry.py); EXPLAIN shows the plan it uses
+        if not re.match(r'^\s*\(?\s*(SELECT|WITH|EXECUTE)\b', sql, re.IGNORECASE):
+            continue
+        prefix = ("EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " if DB_TYPE == 'postgresql'
+                  else "EXPLAIN FORMAT=JSON ")
+        if params is None:
+            cursor.execute(prefix + sql)
+        else:
+            cursor.execute(prefix + sql, params)
+        row = cursor.fetchone()
+        plan = list(row.values())[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        if DB_TYPE == 'postgresql':
+            plan = plan[0]
+            examined += _pg_rows_examined(plan['Plan'])
+        plans.append(plan)
+    return plans, examined
+
+
+def measure(conn, runner, samples, warmup, repetitions, max_seconds):
+    """Time one catalog entry; returns its result record"""
+    cursor = get_cursor(conn)
+    try:
+        started = time.perf_counter()
+        for i in range(warmup):
+            runner(cursor, samples[i % len(samples)])
+            if time.perf_counter() - started > max_seconds:
+                break
+        conn.rollback()
+
+        timings, rows = [], 0
+        started = time.perf_counter()
+        for i in range(repetitions):
+            t0 = time.perf_counter()
+            result = runner(cursor, samples[i % len(samples)])
+            timings.append((time.perf_counter() - t0) * 1000)
+            rows += result if isinstance(result, int) else len(result or [])
+            if time.perf_counter() - started > max_seconds:
+                break
+        conn.rollback()
+
+        # One more execution for the statements, plans and rows examined
+        recorder = _RecordingCursor(cursor)
+        if DB_TYPE == 'mysql':
+            before = _handler_reads(cursor)
+            runner(recorder, samples[0])
+            examined = _handler_reads(cursor) - before
+            plans, _ = explain(cursor, recorder.statements)
+        else:
+            runner(recorder, samples[0])
+            plans, examined = explain(cursor, recorder.statements)
+        conn.rollback()
+    finally:
+        cursor.close()
+
+    timings.sort()
+    return {
+        'repetitions': len(timings),
+        'p50_ms': round(_percentile(timings, 0.50), 3),
+        'p95_ms': round(_percentile(timings, 0.95), 3),
+        'p99_ms': round(_percentile(timings, 0.99), 3),
+        'mean_ms': round(sum(timings) / len(timings), 3),
+        'max_ms': round(timings[-1], 3),
+        'rows_returned': round(rows / len(timings), 1),
+        'rows_examined': examined,
+        'statements': len(recorder.statements),
+        'plan': plans,
+    }
+
+
+def compare_prepared(conn, catalog, samples, repetitions):
+    """p50 of each entry with SQL_PREPARE off and on, interleaved run by run
+
+    Alternating the two modes keeps cache warmth and machine noise out of
+    the difference, which is then the parse/plan time that prepared
+    statements save.
+    """
+    import query_registry
+    print(f"\n   {'query':<52} {'text':>9} {'prepared':>9} {'saved':>9}")
+    cursor = get_cursor(conn)
+    try:
+        for name, source, runner in catalog:
+            timings = {False: [], True: []}
+            for i in range(repetitions + 1):
+                for prepared in (False, True):
+                    query_registry.SQL_PREPARE = prepared
+                    t0 = time.perf_counter()
+                    runner(cursor, samples[i % len(samples)])
+                    if i:                           # the first round prepares
+                        timings[prepared].append((time.perf_counter() - t0) * 1000)
+            conn.rollback()
+            text, prepared = (sorted(timings[False]), sorted(timings[True]))
+            text_p50, prepared_p50 = _percentile(text, 0.5), _percentile(prepared, 0.5)
+            print(f"   {name:<52} {text_p50:>7.2f}ms {prepared_p50:>7.2f}ms "
+                  f"{(text_p50 - prepared_p50) / text_p50:>9.0%}")
+    finally:
+        query_registry.SQL_PREPARE = True
+        cursor.close()
+
+
+def load_samples(conn, seed):
+    """SAMPLE_SIZE random (startup, investor) parameter pairs"""
+    rng = random.Random(seed)
+    cursor = get_cursor(conn)
+    try:
+        cursor.execute("SELECT MIN(startup_id) AS lo, MAX(startup_id) AS hi FROM Startups")
+        startup_range = cursor.fetchone()
+        cursor.execute("SELECT MIN(investor_id) AS lo, MAX(investor_id) AS hi FROM Investors")
+        investor_range = cursor.fetchone()
+        if startup_range['lo'] is None or investor_range['lo'] is None:
+            return []
+
+        samples = []
+        for _ in range(SAMPLE_SIZE):
+            cursor.execute("""
+                SELECT s.*, d.domain_name FROM Startups s
+                JOIN Domains d ON d.domain_id = s.domain_id
+                WHERE s.startup_id >= %s ORDER BY s.startup_id LIMIT 1
+            """, (rng.randint(startup_range['lo'], startup_range['hi']),))
+            startup = cursor.fetchone()
+            cursor.execute("SELECT * FROM Investors WHERE investor_id >= %s ORDER BY investor_id LIMIT 1",
+                           (rng.randint(investor_range['lo'], investor_range['hi']),))
+            samples.append({'startup': startup, 'investor': cursor.fetchone()})
+        conn.rollback()
+        return samples
+    finally:
+        cursor.close()
+
+
+def table_counts(conn):
+    cursor = get_cursor(conn)
+    try:
+        counts = {}
+        for table in ('Startups', 'Investors', 'InvestorDomains', 'Funding', 'Matches'):
+            cursor.execute(f"SELECT COUNT(*) AS n FROM {table}")
+            counts[table] = cursor.fetchone()['n']
+        conn.rollback()
+        return counts
+    finally:
+        cursor.close()
+
+
+def server_version(conn):
+    cursor = get_cursor(conn)
+    try:
+        cursor.execute("SELECT version() AS v" if DB_TYPE == 'postgresql' else "SELECT VERSION() AS v")
+        return cursor.fetchone()['v']
+    finally:
+        cursor.close()
+
+# ============================================
+# Dataset Builds
+# ============================================
+
+def parse_scale(label):
+    match = re.match(r'^(\d+)([kKmM]?)$', label.strip())
+    if not match:
+        raise ValueError(f"bad scale {label!r} (use e.g. 1k, 100k, 1M)")
+    return int(match.group(1)) * SCALE_UNITS.get(match.group(2).lower(), 1)
+
+
+def build_dataset(startups, seed):
+    """Empty the data tables and bulk-load `startups` startups (and friends)"""
+    from bulk_seed import bulk_seed
+
+    with get_db_connection() as conn:
+        if not conn:
+            raise RuntimeError("Could not connect to database")
+        cursor = get_cursor(conn)
+        try:
+            if DB_TYPE == 'postgresql':
+                cursor.execute("TRUNCATE Matches, Funding, InvestorDomains, MatchRefreshQueue, "
+                               "Startups, Investors RESTART IDENTITY")
+            else:
+                cursor.execute("SET foreign_key_checks = 0")
+                for table in ('Matches', 'Funding', 'InvestorDomains', 'MatchRefreshQueue',
+                              'Startups', 'Investors'):
+                    cursor.execute(f"TRUNCATE TABLE {table}")
+                cursor.execute("SET foreign_key_checks = 1")
+            conn.commit()
+        finally:
+            cursor.close()
+
+    bulk_seed(startups, max(startups // 10, 10), startups * 5, startups * 2,
+              seed=seed, defer_indexes=True)
+
+# ============================================
+# Baseline Comparison
+# ============================================
+
+def compare(results, baseline, tolerance):
+    """[(scale, query, what, old, new)] for every regression"""
+    regressions = []
+    for scale, run in results['scales'].items():
+        old_run = baseline.get('scales', {}).get(scale)
+        if not old_run:
+            continue
+        for name, new in run['queries'].items():
+            old = old_run['queries'].get(name)
+            if not old:
+                continue
+            if (new['p95_ms'] > old['p95_ms'] * (1 + tolerance)
+                    and new['p95_ms'] - old['p95_ms'] > MIN_DELTA_MS):
+                regressions.append((scale, name, 'p95_ms', old['p95_ms'], new['p95_ms']))
+            if new['rows_examined'] > old['rows_examined'] * (1 + tolerance) + 100:
+                regressions.append((scale, name, 'rows_examined', old['rows_examined'],
+                                    new['rows_examined']))
+    return regressions
+
+
+def run_benchmarks(scale_label, catalog, args):
+    with get_db_connection() as conn:
+        if not conn:
+            raise RuntimeError("Could not connect to database")
+        samples = load_samples(conn, args.seed)
+        if not samples:
+            raise RuntimeError("Startups / Investors are empty - load data first (bulk_seed.py)")
+        run = {
+            'counts': table_counts(conn),
+            'queries': {},
+        }
+        print(f"\n📏 Scale {scale_label}: " +
+              ', '.join(f"{table} {count:,}" for table, count in run['counts'].items()))
+        print(f"   {'query':<52} {'p50':>9} {'p95':>9} {'p99':>9} {'rows':>9} {'examined':>11}")
+        for name, source, runner in catalog:
+            try:
+                record = measure(conn, runner, samples, args.warmup, args.repetitions,
+                                 args.max_seconds)
+            except Exception as e:
+                conn.rollback()
+                print(f"   ❌ {name}: {e}")
+                continue
+            record['source'] = source
+            run['queries'][name] = record
+            print(f"   {name:<52} {record['p50_ms']:>7.2f}ms {record['p95_ms']:>7.2f}ms "
+                  f"{record['p99_ms']:>7.2f}ms {record['rows_returned']:>9,.0f} "
+                  f"{record['rows_examined']:>11,}")
+        return run
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark the named queries of app.py, queries.sql and reports')
+    parser.add_argument('--scales', default=None,
+                        help='startup counts to build with --build, e.g. 1k,100k,1M; '
+                             'without --build, the label of the data already loaded')
+    parser.add_argument('--build', action='store_true',
+                        help='empty the data tables and bulk-load each scale (disposable databases only)')
+    parser.add_argument('--only', default=None, help='glob on query names, e.g. "reports.*"')
+    parser.add_argument('--warmup', type=int, default=3)
+    parser.add_argument('--repetitions', type=int, default=20)
+    parser.add_argument('--max-seconds', type=float, default=30,
+                        help='stop repeating a query after this long (large reports)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', default=DEFAULT_OUTPUT)
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--save-baseline', action='store_true', help='write the results as the new baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='allowed growth of p95 / rows examined before flagging (0.25 = 25%%)')
+    parser.add_argument('--compare-prepared', action='store_true',
+                        help='only compare plain-text and prepared execution (query_registry.py)')
+    args = parser.parse_args()
+
+    print("=" * 50)
+    print("⏱️  Startup Funding System - Query Benchmarks")
+    print("=" * 50)
+
+    # Time the queries, not the instrumentation (and keep slow-SQL logs quiet)
+    database.SQL_METRICS = False
+
+    if args.scales and not args.build and ',' in args.scales:
+        print("❌ Several scales need --build (disposable databases only)")
+        sys.exit(2)
+
+    catalog = build_catalog()
+    if args.only:
+        catalog = [entry for entry in catalog if fnmatch.fnmatch(entry[0], args.only)]
+    print(f"🗂️  {len(catalog)} queries on {DB_TYPE}")
+
+    if args.compare_prepared:
+        with get_db_connection() as conn:
+            if not conn:
+                print("❌ Could not connect to database")
+                sys.exit(1)
+            compare_prepared(conn, catalog, load_samples(conn, args.seed), args.repetitions)
+        sys.exit(0)
+
+    with get_db_connection() as conn:
+        version = server_version(conn) if conn else None
+    results = {
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'db_type': DB_TYPE,
+        'server_version': version,
+        'settings': {'warmup': args.warmup, 'repetitions': args.repetitions,
+                     'max_seconds': args.max_seconds, 'seed': args.seed},
+        'scales': {},
+    }
+
+    for label in (args.scales.split(',') if args.scales else ['current']):
+        label = label.strip()
+        if args.build:
+            startups = parse_scale(label)
+            print(f"\n🌱 Building {label} dataset ({startups:,} startups)...")
+            build_dataset(startups, args.seed)
+        results['scales'][label] = run_benchmarks(label, catalog, args)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2, default=str)
+    print(f"\n💾 Results written to {args.output}")
+
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, default=str)
+        print(f"📌 Saved as baseline: {args.baseline}")
+        sys.exit(0)
+
+    if not os.path.exists(args.baseline):
+        print("ℹ️  No baseline yet - run with --save-baseline to store one")
+        sys.exit(0)
+
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)
+    if baseline.get('db_type') != DB_TYPE:
+        print(f"⚠️  Baseline is for {baseline.get('db_type')}, not {DB_TYPE} - not comparing")
+        sys.exit(0)
+
+    regressions = compare(results, baseline, args.tolerance)
+    if not regressions:
+        print(f"✅ No regressions against {args.baseline} (tolerance {args.tolerance:.0%})")
+        sys.exit(0)
+    print(f"❌ {len(regressions)} regression(s) against {args.baseline}:")
+    for scale, name, what, old, new in regressions:
+        print(f"   • [{scale}] {name}: {what} {old:,} → {new:,}")
+    sys.exit(1)
@@ -0,0 +1,178 @@
+"""
+============================================
+DBMS Project: Startup Benchmark
+Import-to-first-response time of a fresh app process
+Works with both MySQL and PostgreSQL
+============================================
+
+Starts fresh Python processes and times how long a new worker takes
+before it can answer a page that reads the database
+(/startup/register: templates, a pool connection, the Domains cache):
+
+* import     - `import app` (Flask, the database driver, every module)
+* create_app - the factory: one-time database check, template
+               compilation. A preloading master runs it once, before
+               forking its workers.
+* warm       - warm_worker(): pool connections and the Domains cache,
+               what gunicorn.conf.py runs in every forked worker
+* first      - the first request itself, through Flask's test client
+* worker     - what one more worker costs before its first response:
+    plain   - import + first: `gunicorn app:app` imports the app in every
+              worker, whose first request then connects, compiles the
+              templates and loads the reference data
+    factory - warm + first: the worker is forked from a preloaded master
+
+With --gunicorn it also starts real gunicorn servers (app:app without
+gunicorn.conf.py, then 'app:create_app()' with it) and times the spawn
+until the first HTTP 200 and the first requests per worker.
+
+    python benchmark_startup.py
+    python benchmark_startup.py --runs 10 --gunicorn --workers 2
+"""
+
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PAGE = '/startup/register'
+MODES = ('plain', 'factory')
+
+# Runs in a fresh interpreter; prints the timings in milliseconds
+_CHILD = r'''
+import sys, time
+marks = [time.perf_counter()]
+import app
+marks.append(time.perf_counter())
+if sys.argv[1] == 'factory':
+    app.create_app()
+    marks.append(time.perf_counter())
+    app.warm_worker()
+    marks.append(time.perf_counter())
+else:
+    marks += [marks[-1]] * 2
+status = app.app.test_client().get(sys.argv[2]).status_code
+marks.append(time.perf_counter())
+print('STARTUP', status, *(round((b - a) * 1000, 2) for a, b in zip(marks, marks[1:])))
+'''
+
+
+def _run_child(mode):
+    result = subprocess.run([sys.executable, '-c', _CHILD, mode, PAGE], cwd=BASE_DIR,
+                            capture_output=True, text=True)
+    for line in result.stdout.splitlines():
+        if line.startswith('STARTUP '):
+            status, *timings = line.split()[1:]
+            return int(status), [float(t) for t in timings]
+    raise RuntimeError(f"{mode}: no timings\n{result.stdout}{result.stderr}")
+
+
+def measure_process(runs):
+    print(f"🐍 Fresh interpreter, median of {runs} runs (ms)\n")
+    print(f"   {'mode':<10}{'status':>7}{'import':>9}{'create_app':>12}{'warm':>8}{'first':>8}"
+          f"{'worker':>9}")
+    results = {}
+    _run_child('plain')                     # warm the OS file cache, and the manifest
+    for mode in MODES:
+        samples = [_run_child(mode) for _ in range(runs)]
+        imported, created, warmed, first = (statistics.median(s[1][i] for s in samples)
+                                            for i in range(4))
+        worker = (imported if mode == 'plain' else warmed) + first
+        results[mode] = {'status': samples[-1][0], 'import_ms': imported,
+                         'create_app_ms': created, 'warm_ms': warmed, 'first_ms': first,
+                         'worker_ms': worker}
+        print(f"   {mode:<10}{samples[-1][0]:>7}{imported:>9.1f}{created:>12.1f}{warmed:>8.1f}"
+              f"{first:>8.1f}{worker:>9.1f}")
+    return results
+
+# ============================================
+# Under gunicorn
+# ============================================
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def _get(url):
+    started = time.perf_counter()
+    with urllib.request.urlopen(url, timeout=30) as response:
+        response.read()
+        return response.status, time.perf_counter() - started
+
+
+def _gunicorn(target, config, workers, requests):
+    """(seconds from spawn to the first 200, seconds of the first `requests` requests)"""
+    port = _free_port()
+    url = f'http://127.0.0.1:{port}{PAGE}'
+    command = [sys.executable, '-m', 'gunicorn', target, '--config', config,
+               '--bind', f'127.0.0.1:{port}', '--workers', str(workers)]
+    started = time.perf_counter()
+    server = subprocess.Popen(command, cwd=BASE_DIR, stdout=subprocess.DEVNULL,
+                              stderr=subprocess.DEVNULL)
+    try:
+        while True:
+            if server.poll() is not None:
+                raise RuntimeError(f"gunicorn {target} exited with {server.returncode}")
+            try:
+                status, _ = _get(url)
+            except OSError:
+                time.sleep(0.005)
+                continue
+            if status == 200:
+                break
+        ready = time.perf_counter() - started
+        # Sync workers take turns accepting, so these reach every worker
+        return ready, [_get(url)[1] for _ in range(requests)]
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def measure_gunicorn(runs, workers):
+    try:
+        import gunicorn  # noqa: F401
+    except ImportError:
+        print("⚠️  gunicorn is not installed: skipping the server runs")
+        return {}
+    print(f"\n🦄 gunicorn, {workers} worker(s), median of {runs} runs (ms)\n")
+    print(f"   {'command':<34}{'first 200':>11}{'next requests (max)':>21}")
+    with tempfile.NamedTemporaryFile('w', suffix='.py', delete=False) as empty:
+        empty.write('# no settings: how app:app started before gunicorn.conf.py\n')
+    setups = (('app:app', empty.name),
+              ("'app:create_app()' --preload", os.path.join(BASE_DIR, 'gunicorn.conf.py')))
+    results = {}
+    try:
+        for label, config in setups:
+            target = label.split()[0].strip("'")
+            samples = [_gunicorn(target, config, workers, requests=workers * 2)
+                       for _ in range(runs)]
+            ready = statistics.median(s[0] for s in samples) * 1000
+            slowest = statistics.median(max(s[1]) for s in samples) * 1000
+            results[label] = {'first_response_ms': ready, 'slowest_next_ms': slowest}
+            print(f"   {label:<34}{ready:>11.1f}{slowest:>21.1f}")
+    finally:
+        os.unlink(empty.name)
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Import-to-first-response time of a fresh app process')
+    parser.add_argument('--runs', type=int, default=5, help='fresh processes per mode')
+    parser.add_argument('--gunicorn', action='store_true', help='also time real gunicorn servers')
+    parser.add_argument('--workers', type=int, default=2, help='gunicorn workers')
+    args = parser.parse_args()
+
+    print("=" * 50)
+    print("🚀 Startup Funding System - Startup Benchmark")
+    print("=" * 50)
+    measure_process(args.runs)
+    if args.gunicorn:
+        measure_gunicorn(args.runs, args.workers)
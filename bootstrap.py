@@ -0,0 +1,120 @@
+"""
+============================================
+DBMS Project: Bootstrap Check
+One-time schema / seed check, recorded in the SetupMarkers table
+Works with both MySQL and PostgreSQL
+============================================
+
+app.py used to seed on every start: import seed_data, open a connection
+and count Domains before serving. The check now runs once per schema
+version:
+
+* The marker row (SetupMarkers, migration 009) holds the newest
+  migration the check passed with. When it matches the migrations on
+  disk, starting costs one primary-key lookup.
+* Otherwise the check looks for unapplied migrations (it only warns:
+  `python migrate.py` applies them), seeds an empty database, and
+  records the marker once both are in order.
+
+Deploying a new migration changes the expected version, so the first
+start after `python migrate.py` checks again.
+
+    python bootstrap.py             # check, skipping it if already recorded
+    python bootstrap.py --force     # check even if recorded
+"""
+
+import sys
+
+from database import DB_TYPE, Error, get_db_connection, get_cursor
+from migrate import applied_versions, list_migrations
+
+MARKER = 'bootstrap'
+
+
+def _recorded_version(conn, cursor):
+    """Version the check last passed with; None if never (or no SetupMarkers table yet)"""
+    try:
+        cursor.execute("SELECT version FROM SetupMarkers WHERE marker = %s", (MARKER,))
+        row = cursor.fetchone()
+    except Error:
+        conn.rollback()              # PostgreSQL: the failed SELECT aborted the transaction
+        return None
+    return row['version'] if row else None
+
+
+def _record(conn, cursor, version):
+    if DB_TYPE == 'postgresql':
+        cursor.execute("""
+            INSERT INTO SetupMarkers (marker, version) VALUES (%s, %s)
+            ON CONFLICT (marker) DO UPDATE
+            SET version = EXCLUDED.version, recorded_at = CURRENT_TIMESTAMP
+        """, (MARKER, version))
+    else:
+        cursor.execute("""
+            INSERT INTO SetupMarkers (marker, version) VALUES (%s, %s)
+            ON DUPLICATE KEY UPDATE version = VALUES(version), recorded_at = CURRENT_TIMESTAMP
+        """, (MARKER, version))
+    conn.commit()
+
+
+def ensure_bootstrapped(force=False):
+    """Run the schema / seed check unless it already passed for this schema.
+
+    Returns 'recorded' (skipped: the marker matches), 'checked' (ran and
+    recorded the marker), 'pending' (migrations to apply first) or
+    'failed' (no connection, or seeding failed).
+    """
+    migrations = list_migrations()
+    expected = migrations[-1][0] if migrations else ''
+    with get_db_connection() as conn:
+        if not conn:
+            return 'failed'
+        cursor = get_cursor(conn)
+        try:
+            if not force and _recorded_version(conn, cursor) == expected:
+                return 'recorded'
+            try:
+                done = applied_versions(cursor)
+            except Error:
+                conn.rollback()
+                done = set()
+            pending = [version for version, _ in migrations if version not in done]
+        finally:
+            cursor.close()
+        conn.rollback()                  # hand the connection back idle
+    if pending:
+        print(f"⚠️  {len(pending)} migration(s) not applied ({', '.join(pending)}): "
+              f"run `python migrate.py`")
+        return 'pending'
+
+    # seed_data skips an already seeded database itself
+    from seed_data import seed_database
+    if not seed_database():
+        return 'failed'
+
+    with get_db_connection() as conn:
+        if not conn:
+            return 'failed'
+        cursor = get_cursor(conn)
+        try:
+            _record(conn, cursor, expected)
+        except Error as e:
+            conn.rollback()
+            print(f"⚠️  Could not record the bootstrap marker: {e}")
+            return 'failed'
+        finally:
+            cursor.close()
+    return 'checked'
+
+
+if __name__ == '__main__':
+    print("=" * 50)
+    print("🔍 Startup Funding System - Bootstrap Check")
+    print("=" * 50)
+    status = ensure_bootstrapped(force='--force' in sys.argv)
+    messages = {'recorded': "✅ Already checked for this schema version (use --force to re-run)",
+                'checked': "✅ Schema and seed data are in place; marker recorded",
+                'pending': "❌ Apply the pending migrations first",
+                'failed': "❌ Bootstrap check failed"}
+    print(messages[status])
+    sys.exit(0 if status in ('recorded', 'checked') else 1)
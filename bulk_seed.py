@@ -0,0 +1,563 @@
+"""
+============================================
+DBMS Project: Bulk Seed / Synthetic Data Generator
+Loads large, realistic staging datasets in minutes
+Works with both MySQL and PostgreSQL
+============================================
+
+seed_data.py inserts a handful of demo rows one statement at a time.
+This script generates N startups, investors, funding rows and matches
+with realistic distributions and loads them in large batches:
+
+* PostgreSQL: COPY ... FROM STDIN, all in one transaction. User triggers
+  on the loaded tables are disabled for the load. Secondary indexes and
+  foreign keys are dropped and rebuilt afterwards when the table is small
+  compared to the load (or always with --defer-indexes).
+* MySQL: multi-row INSERT (or LOAD DATA LOCAL INFILE with --load-data),
+  with foreign_key_checks / unique_checks off for the session. MySQL
+  cannot disable triggers, so the triggers on the loaded tables are
+  dropped and re-created from information_schema.
+
+The trigger work is replaced by one set-based pass at the end: funded
+flags and funding totals (see funding_totals.py) are computed with
+GROUP BY over the new Funding rows, and the report rollups (see
+report_rollups.py) are rebuilt. MatchRefreshQueue is not filled, so
+run `python materialized_matches.py` afterwards if MATCH_STRATEGY is
+materialized.
+
+Every synthetic account shares one precomputed bcrypt hash of
+BULK_SEED_PASSWORD (default "password123").
+
+    python bulk_seed.py --startups 1000000 --investors 100000 --funding 5000000 --matches 2000000
+"""
+
+import argparse
+import io
+import math
+import os
+import random
+import tempfile
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date
+
+from database import DB_TYPE, DB_CONFIG, get_db_connection, get_cursor
+from passwords import hash_password
+from report_rollups import rebuild_rollups
+
+BATCH_SIZE = int(os.environ.get('BULK_SEED_BATCH_SIZE', 100000))
+MAINTENANCE_WORK_MEM = os.environ.get('BULK_SEED_MAINTENANCE_WORK_MEM', '512MB')
+PASSWORD = os.environ.get('BULK_SEED_PASSWORD', 'password123')
+
+LOADED_TABLES = ('Startups', 'Investors', 'InvestorDomains', 'Funding', 'Matches')
+
+# ============================================
+# Distributions
+# ============================================
+
+DEFAULT_DOMAINS = ['AI/ML', 'FinTech', 'HealthTech', 'EdTech',
+                   'E-Commerce', 'SaaS', 'CleanTech', 'FoodTech']
+
+# Relative share of startups per domain (unknown domains get 5)
+DOMAIN_WEIGHTS = {'AI/ML': 18, 'FinTech': 17, 'SaaS': 16, 'HealthTech': 12,
+                  'E-Commerce': 12, 'EdTech': 10, 'CleanTech': 8, 'FoodTech': 7}
+
+CITY_WEIGHTS = {'Bangalore': 28, 'Mumbai': 16, 'Delhi': 12, 'Hyderabad': 9, 'Gurgaon': 8,
+                'Pune': 8, 'Chennai': 7, 'Noida': 5, 'Ahmedabad': 4, 'Kolkata': 3}
+
+# (round, share of deals, fraction of funding_required raised)
+ROUNDS = [('Seed', 40, (0.05, 0.25)), ('Pre-Series A', 20, (0.10, 0.35)),
+          ('Series A', 22, (0.20, 0.50)), ('Series B', 12, (0.30, 0.70)),
+          ('Series C', 6, (0.40, 0.90))]
+
+NAME_PREFIXES = ['Nova', 'Quantum', 'Bright', 'Swift', 'Green', 'Blue', 'Smart', 'Prime',
+                 'Urban', 'Zen', 'Pixel', 'Cloud', 'Data', 'Agri', 'Med', 'Fin', 'Edu', 'Kart']
+NAME_SUFFIXES = ['Labs', 'Works', 'Hub', 'AI', 'Pay', 'Health', 'Learn', 'Cart', 'Grid',
+                 'Logic', 'Stack', 'Flow', 'Sense', 'Bridge', 'Verse', 'Kit']
+FIRM_SUFFIXES = ['Capital', 'Ventures', 'Partners', 'Angels', 'Fund', 'Investments']
+
+MATCH_REASONS = {100: 'Perfect domain match', 50: 'Investment range compatible'}
+
+FUNDED_SHARE = 0.35         # share of startups that receive any funding
+INVESTOR_SKEW = 0.8         # Zipf exponent: a few investors do most deals
+
+
+def _rounded(value, step):
+    return max(step, int(round(value / step)) * step)
+
+
+def _cumulative(weights):
+    total, out = 0, []
+    for w in weights:
+        total += w
+        out.append(total)
+    return out
+
+# ============================================
+# Backend writers
+# ============================================
+
+def _text_lines(rows):
+    # Generated values never contain tabs, newlines, backslashes or NULLs,
+    # so the COPY / LOAD DATA text format needs no escaping
+    return ['\t'.join(map(str, row)) + '\n' for row in rows]
+
+
+class _PostgresWriter:
+    """COPY batches into the current transaction"""
+
+    def __init__(self, cursor):
+        self.cursor = cursor
+
+    def write(self, table, columns, rows):
+        buf = io.StringIO(''.join(_text_lines(rows)))
+        self.cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN", buf)
+
+
+class _MySQLWriter:
+    """Multi-row INSERT batches, or LOAD DATA LOCAL INFILE"""
+
+    def __init__(self, cursor, load_data=False):
+        self.cursor = cursor
+        self.load_data = load_data
+
+    def write(self, table, columns, rows):
+        if not self.load_data:
+            # mysql.connector folds executemany() INSERTs into one multi-row statement
+            placeholders = ', '.join(['%s'] * len(columns))
+            self.cursor.executemany(
+                f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})", rows)
+            return
+        with tempfile.NamedTemporaryFile('w', suffix='.tsv', delete=False, encoding='utf-8') as f:
+            f.writelines(_text_lines(rows))
+            path = f.name
+        try:
+            self.cursor.execute(
+                f"LOAD DATA LOCAL INFILE %s INTO TABLE {table} "
+                f"FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\' LINES TERMINATED BY '\\n' "
+                f"({', '.join(columns)})", (path,))
+        finally:
+            os.unlink(path)
+
+# ============================================
+# Deferring trigger / index work
+# ============================================
+
+def _pg_defer(cursor, rows_to_load, force_indexes):
+    """Disable user triggers, drop secondary indexes and foreign keys; return the DDL to rebuild"""
+    cursor.execute(f"SET LOCAL maintenance_work_mem = '{MAINTENANCE_WORK_MEM}'")
+    rebuild = []
+    for table in LOADED_TABLES:
+        cursor.execute(f"ALTER TABLE {table} DISABLE TRIGGER USER")
+        cursor.execute("SELECT reltuples::BIGINT AS estimate FROM pg_class WHERE oid = %s::regclass",
+                       (table.lower(),))
+        existing = max(cursor.fetchone()['estimate'], 0)
+        if not force_indexes and existing >= rows_to_load.get(table, 0):
+            continue
+        # Plain secondary indexes only: primary keys / UNIQUE back constraints
+        cursor.execute("""
+            SELECT c.relname AS name, pg_get_indexdef(c.oid) AS ddl
+            FROM pg_index x
+            JOIN pg_class c ON c.oid = x.indexrelid
+            WHERE x.indrelid = %s::regclass AND NOT x.indisunique AND NOT x.indisprimary
+        """, (table.lower(),))
+        for index in cursor.fetchall():
+            cursor.execute(f"DROP INDEX {index['name']}")
+            rebuild.append(index)
+        # Foreign keys are checked by per-row system triggers that DISABLE
+        # TRIGGER USER leaves on; re-adding them validates in one join
+        cursor.execute("""
+            SELECT conname AS name,
+                   format('ALTER TABLE %%s ADD CONSTRAINT %%I %%s', conrelid::regclass,
+                          conname, pg_get_constraintdef(oid)) AS ddl
+            FROM pg_constraint
+            WHERE conrelid = %s::regclass AND contype = 'f'
+        """, (table.lower(),))
+        for constraint in cursor.fetchall():
+            cursor.execute(f"ALTER TABLE {table} DROP CONSTRAINT {constraint['name']}")
+            rebuild.append(constraint)
+    return rebuild
+
+
+def _pg_restore(cursor, rebuild):
+    for item in rebuild:
+        started = time.perf_counter()
+        cursor.execute(item['ddl'])
+        print(f"     ↻ {item['name']} rebuilt in {time.perf_counter() - started:.1f}s")
+    for table in LOADED_TABLES:
+        cursor.execute(f"ALTER TABLE {table} ENABLE TRIGGER USER")
+    for table, column in (('Startups', 'startup_id'), ('Investors', 'investor_id'),
+                          ('Funding', 'funding_id'), ('Matches', 'match_id')):
+        cursor.execute(f"SELECT setval(pg_get_serial_sequence('{table.lower()}', '{column}'), "
+                       f"(SELECT COALESCE(MAX({column}), 1) FROM {table}))")
+
+
+def _mysql_defer(cursor):
+    """Drop the triggers on the loaded tables; return what is needed to re-create them"""
+    cursor.execute("SET foreign_key_checks = 0")
+    cursor.execute("SET unique_checks = 0")
+    placeholders = ', '.join(['%s'] * len(LOADED_TABLES))
+    cursor.execute(f"""
+        SELECT TRIGGER_NAME, ACTION_TIMING, EVENT_MANIPULATION, EVENT_OBJECT_TABLE, ACTION_STATEMENT
+        FROM information_schema.TRIGGERS
+        WHERE TRIGGER_SCHEMA = DATABASE() AND EVENT_OBJECT_TABLE IN ({placeholders})
+        ORDER BY EVENT_OBJECT_TABLE, ACTION_ORDER
+    """, LOADED_TABLES)
+    triggers = cursor.fetchall()
+    for trigger in triggers:
+        cursor.execute(f"DROP TRIGGER {trigger['TRIGGER_NAME']}")
+    return triggers
+
+
+def _mysql_restore(cursor, triggers):
+    for trigger in triggers:
+        cursor.execute(f"CREATE TRIGGER {trigger['TRIGGER_NAME']} {trigger['ACTION_TIMING']} "
+                       f"{trigger['EVENT_MANIPULATION']} ON {trigger['EVENT_OBJECT_TABLE']} "
+                       f"FOR EACH ROW {trigger['ACTION_STATEMENT']}")
+    cursor.execute("SET unique_checks = 1")
+    cursor.execute("SET foreign_key_checks = 1")
+
+# ============================================
+# Generators
+# ============================================
+
+class SyntheticData:
+    """Generates the rows; keeps just enough per-row state for later tables"""
+
+    def __init__(self, domains, first_startup_id, first_investor_id, password_hash, seed=None):
+        self.rng = random.Random(seed)
+        self.domain_ids = [d['domain_id'] for d in domains]
+        self.domain_cum = _cumulative(DOMAIN_WEIGHTS.get(d['domain_name'], 5) for d in domains)
+        self.cities = list(CITY_WEIGHTS)
+        self.city_cum = _cumulative(CITY_WEIGHTS.values())
+        self.round_cum = _cumulative(share for _, share, _ in ROUNDS)
+        self.first_startup_id = first_startup_id
+        self.first_investor_id = first_investor_id
+        self.password_hash = password_hash
+        self.today = date.today().toordinal()
+
+        # Per-startup state needed by the funding and match generators
+        self.founded = array('i')
+        self.required = array('d')
+        self.startup_domain = array('i')
+        # Per-investor state
+        self.inv_min = array('d')
+        self.inv_max = array('d')
+        self.inv_domains = []
+
+    def _batches(self, count, make_row):
+        for start in range(0, count, BATCH_SIZE):
+            yield [make_row(i) for i in range(start, min(count, start + BATCH_SIZE))]
+
+    def startups(self, count):
+        rng, domain_ids, cities = self.rng, self.domain_ids, self.cities
+        domain_picks = rng.choices(range(len(domain_ids)), cum_weights=self.domain_cum, k=count)
+        city_picks = rng.choices(range(len(cities)), cum_weights=self.city_cum, k=count)
+
+        def row(i):
+            startup_id = self.first_startup_id + i
+            # Log-normal around 50 L, clipped to 5 L .. 50 Cr
+            required = _rounded(min(max(rng.lognormvariate(math.log(5e6), 0.9), 5e5), 5e8), 10000)
+            # Mostly recent companies, none older than 15 years
+            founded = self.today - min(int(rng.expovariate(1 / 900)), 15 * 365)
+            domain_id = domain_ids[domain_picks[i]]
+            self.founded.append(founded)
+            self.required.append(required)
+            self.startup_domain.append(domain_id)
+            name = f"{rng.choice(NAME_PREFIXES)}{rng.choice(NAME_SUFFIXES)} {startup_id}"
+            return (startup_id, name, f"startup{startup_id}@bulk.example.com", self.password_hash,
+                    domain_id, required, f"{name} - synthetic startup",
+                    date.fromordinal(founded).isoformat(), cities[city_picks[i]],
+                    f"https://startup{startup_id}.example.com")
+
+        return self._batches(count, row)
+
+    def investors(self, count):
+        rng, domain_ids, cities = self.rng, self.domain_ids, self.cities
+        city_picks = rng.choices(range(len(cities)), cum_weights=self.city_cum, k=count)
+
+        def row(i):
+            investor_id = self.first_investor_id + i
+            low = _rounded(min(max(rng.lognormvariate(math.log(2e6), 0.8), 1e5), 1e8), 100000)
+            high = _rounded(low * rng.uniform(2, 10), 100000)
+            wanted = rng.choices((1, 2, 3, 4), weights=(20, 35, 30, 15))[0]
+            preferred = set()
+            while len(preferred) < min(wanted, len(domain_ids)):
+                preferred.add(domain_ids[rng.choices(range(len(domain_ids)),
+                                                     cum_weights=self.domain_cum)[0]])
+            preferred = sorted(preferred)
+            self.inv_min.append(low)
+            self.inv_max.append(high)
+            self.inv_domains.append(preferred)
+            name = f"{rng.choice(NAME_PREFIXES)} {rng.choice(FIRM_SUFFIXES)} {investor_id}"
+            return (investor_id, name, f"investor{investor_id}@bulk.example.com", self.password_hash,
+                    low, high, ','.join(map(str, preferred)),
+                    f"+91-9{rng.randrange(10 ** 9):09d}", cities[city_picks[i]])
+
+        return self._batches(count, row)
+
+    def investor_domains(self):
+        rows = [(self.first_investor_id + i, domain_id)
+                for i, preferred in enumerate(self.inv_domains) for domain_id in preferred]
+        for start in range(0, len(rows), BATCH_SIZE):
+            yield rows[start:start + BATCH_SIZE]
+
+    def funding(self, count):
+        rng = self.rng
+        n_startups, n_investors = len(self.founded), len(self.inv_min)
+        funded = rng.sample(range(n_startups), max(1, int(n_startups * FUNDED_SHARE)))
+        investor_cum = _cumulative(1 / (rank + 1) ** INVESTOR_SKEW for rank in range(n_investors))
+        round_cum = self.round_cum
+        iso_dates = {}
+
+        for start in range(0, count, BATCH_SIZE):
+            size = min(count, start + BATCH_SIZE) - start
+            investors = rng.choices(range(n_investors), cum_weights=investor_cum, k=size)
+            rounds = rng.choices(range(len(ROUNDS)), cum_weights=round_cum, k=size)
+            batch = []
+            for k in range(size):
+                s = funded[int(rng.random() * len(funded))]
+                name, _, (low, high) = ROUNDS[rounds[k]]
+                fraction = low + (high - low) * rng.random()
+                amount = max(10000, int(self.required[s] * fraction / 10000 + 0.5) * 10000)
+                founded = self.founded[s]
+                funded_on = founded + int(rng.random() * (self.today - founded + 1))
+                day = iso_dates.get(funded_on)
+                if day is None:
+                    day = iso_dates[funded_on] = date.fromordinal(funded_on).isoformat()
+                batch.append((self.first_investor_id + investors[k], self.first_startup_id + s,
+                              amount, day, name))
+            yield batch
+
+    def matches(self, count):
+        """Pairs the range fits: 100 with a preferred domain, 50 without"""
+        rng = self.rng
+        by_domain = {}
+        for s, domain_id in enumerate(self.startup_domain):
+            by_domain.setdefault(domain_id, []).append((self.required[s], s))
+        buckets = {}
+        for domain_id, entries in by_domain.items():
+            entries.sort()
+            buckets[domain_id] = (array('d', (e[0] for e in entries)), array('i', (e[1] for e in entries)))
+
+        seen = set()
+        batch = []
+        attempts = 0
+        n_investors = len(self.inv_min)
+        while len(seen) < count and attempts < count * 5 and n_investors:
+            attempts += 1
+            i = int(rng.random() * n_investors)
+            preferred = self.inv_domains[i]
+            if rng.random() < 0.7:
+                domain_id, score = rng.choice(preferred), 100
+            else:
+                others = [d for d in self.domain_ids if d not in preferred]
+                if not others:
+                    continue
+                domain_id, score = rng.choice(others), 50
+            if domain_id not in buckets:
+                continue
+            amounts, ids = buckets[domain_id]
+            lo, hi = bisect_left(amounts, self.inv_min[i]), bisect_right(amounts, self.inv_max[i])
+            if lo >= hi:
+                continue
+            investor_id = self.first_investor_id + i
+            startup_id = self.first_startup_id + ids[lo + int(rng.random() * (hi - lo))]
+            key = investor_id << 32 | startup_id
+            if key in seen:
+                continue
+            seen.add(key)
+            batch.append((investor_id, startup_id, score, MATCH_REASONS[score]))
+            if len(batch) >= BATCH_SIZE:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+# ============================================
+# Loader
+# ============================================
+
+STARTUP_COLUMNS = ('startup_id', 'name', 'email', 'password_hash', 'domain_id', 'funding_required',
+                   'description', 'founded_date', 'location', 'website')
+INVESTOR_COLUMNS = ('investor_id', 'name', 'email', 'password_hash', 'investment_min',
+                    'investment_max', 'preferred_domains', 'phone', 'location')
+FUNDING_COLUMNS = ('investor_id', 'startup_id', 'amount', 'funding_date', 'funding_round')
+MATCH_COLUMNS = ('investor_id', 'startup_id', 'match_score', 'match_reason')
+
+
+def _ensure_domains(conn, cursor):
+    cursor.execute("SELECT domain_id, domain_name FROM Domains ORDER BY domain_id")
+    domains = cursor.fetchall()
+    if not domains:
+        cursor.executemany("INSERT INTO Domains (domain_name) VALUES (%s)",
+                           [(name,) for name in DEFAULT_DOMAINS])
+        conn.commit()
+        cursor.execute("SELECT domain_id, domain_name FROM Domains ORDER BY domain_id")
+        domains = cursor.fetchall()
+    return domains
+
+
+def _next_id(cursor, table, column):
+    cursor.execute(f"SELECT COALESCE(MAX({column}), 0) + 1 AS next_id FROM {table}")
+    return cursor.fetchone()['next_id']
+
+
+def _finalize_totals(cursor, first_startup_id, first_investor_id):
+    """One GROUP BY pass instead of the per-row Funding triggers"""
+    if DB_TYPE == 'postgresql':
+        cursor.execute("""
+            UPDATE Startups s
+            SET is_funded = TRUE, total_funding_received = f.total
+            FROM (SELECT startup_id, SUM(amount) AS total FROM Funding
+                  WHERE startup_id >= %s GROUP BY startup_id) f
+            WHERE s.startup_id = f.startup_id
+        """, (first_startup_id,))
+        cursor.execute("""
+            UPDATE Investors i
+            SET total_invested = f.total, portfolio_size = f.deals, startups_funded = f.startups
+            FROM (SELECT investor_id, SUM(amount) AS total, COUNT(*) AS deals,
+                         COUNT(DISTINCT startup_id) AS startups
+                  FROM Funding WHERE investor_id >= %s GROUP BY investor_id) f
+            WHERE i.investor_id = f.investor_id
+        """, (first_investor_id,))
+    else:
+        cursor.execute("""
+            UPDATE Startups s
+            JOIN (SELECT startup_id, SUM(amount) AS total FROM Funding
+                  WHERE startup_id >= %s GROUP BY startup_id) f ON f.startup_id = s.startup_id
+            SET s.is_funded = TRUE, s.total_funding_received = f.total
+        """, (first_startup_id,))
+        cursor.execute("""
+            UPDATE Investors i
+            JOIN (SELECT investor_id, SUM(amount) AS total, COUNT(*) AS deals,
+                         COUNT(DISTINCT startup_id) AS startups
+                  FROM Funding WHERE investor_id >= %s GROUP BY investor_id) f
+              ON f.investor_id = i.investor_id
+            SET i.total_invested = f.total, i.portfolio_size = f.deals, i.startups_funded = f.startups
+        """, (first_investor_id,))
+
+
+def _load_table(writer, label, table, columns, batches, report):
+    started = time.perf_counter()
+    rows = 0
+    for batch in batches:
+        writer.write(table, columns, batch)
+        rows += len(batch)
+    elapsed = time.perf_counter() - started
+    report.append((label, rows, elapsed))
+    rate = rows / elapsed if elapsed else 0
+    print(f"   ✓ {label:<16} {rows:>10,} rows in {elapsed:7.1f}s  ({rate:,.0f} rows/s)")
+
+
+def bulk_seed(startups, investors, funding, matches, seed=None,
+              defer_indexes=False, load_data=False):
+    """Generate and load the requested row counts; returns [(table, rows, seconds)]"""
+    report = []
+    started = time.perf_counter()
+    password_hash = hash_password(PASSWORD)   # one bcrypt for every synthetic account
+
+    if DB_TYPE == 'mysql' and load_data:
+        import mysql.connector
+        conn = mysql.connector.connect(**DB_CONFIG, allow_local_infile=True)
+        try:
+            return _run(conn, report, started, password_hash, startups, investors, funding,
+                        matches, seed, defer_indexes, load_data)
+        finally:
+            conn.close()
+
+    with get_db_connection() as conn:
+        if not conn:
+            raise RuntimeError("Could not connect to database")
+        return _run(conn, report, started, password_hash, startups, investors, funding,
+                    matches, seed, defer_indexes, load_data)
+
+
+def _run(conn, report, started, password_hash, startups, investors, funding, matches,
+         seed, defer_indexes, load_data):
+    cursor = get_cursor(conn)
+    deferred = None
+    try:
+        domains = _ensure_domains(conn, cursor)
+        first_startup_id = _next_id(cursor, 'Startups', 'startup_id')
+        first_investor_id = _next_id(cursor, 'Investors', 'investor_id')
+        data = SyntheticData(domains, first_startup_id, first_investor_id, password_hash, seed)
+
+        rows_to_load = {'Startups': startups, 'Investors': investors, 'Funding': funding,
+                        'Matches': matches, 'InvestorDomains': investors * 2}
+        if DB_TYPE == 'postgresql':
+            writer = _PostgresWriter(cursor)
+            deferred = _pg_defer(cursor, rows_to_load, defer_indexes)
+        else:
+            # Runs DDL (autocommit); restored in the finally block below
+            writer = _MySQLWriter(cursor, load_data)
+            deferred = _mysql_defer(cursor)
+
+        print(f"  → Loading from startup_id {first_startup_id}, investor_id {first_investor_id}")
+        _load_table(writer, 'Startups', 'Startups', STARTUP_COLUMNS, data.startups(startups), report)
+        _load_table(writer, 'Investors', 'Investors', INVESTOR_COLUMNS, data.investors(investors), report)
+        _load_table(writer, 'InvestorDomains', 'InvestorDomains', ('investor_id', 'domain_id'),
+                    data.investor_domains(), report)
+        if startups and investors:
+            _load_table(writer, 'Funding', 'Funding', FUNDING_COLUMNS, data.funding(funding), report)
+            _load_table(writer, 'Matches', 'Matches', MATCH_COLUMNS, data.matches(matches), report)
+
+        step = time.perf_counter()
+        _finalize_totals(cursor, first_startup_id, first_investor_id)
+        report.append(('funding totals', None, time.perf_counter() - step))
+        print(f"   ✓ funding totals / funded flags in {time.perf_counter() - step:.1f}s")
+
+        step = time.perf_counter()
+        if DB_TYPE == 'postgresql':
+            _pg_restore(cursor, deferred)
+            conn.commit()
+            deferred = None
+            for table in LOADED_TABLES:
+                cursor.execute(f"ANALYZE {table}")
+            conn.commit()
+        else:
+            conn.commit()
+        report.append(('indexes + analyze', None, time.perf_counter() - step))
+        print(f"   ✓ indexes, triggers and statistics in {time.perf_counter() - step:.1f}s")
+
+        step = time.perf_counter()
+        rebuild_rollups(conn)
+        report.append(('report rollups', None, time.perf_counter() - step))
+        print(f"   ✓ report rollups in {time.perf_counter() - step:.1f}s")
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        if DB_TYPE == 'mysql' and deferred is not None:
+            _mysql_restore(cursor, deferred)
+        cursor.close()
+
+    total = time.perf_counter() - started
+    report.append(('total', sum(r[1] or 0 for r in report), total))
+    return report
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Load synthetic startups, investors, funding and matches')
+    parser.add_argument('--startups', type=int, default=10000)
+    parser.add_argument('--investors', type=int, default=2000)
+    parser.add_argument('--funding', type=int, default=30000)
+    parser.add_argument('--matches', type=int, default=20000)
+    parser.add_argument('--seed', type=int, default=None, help='random seed (repeatable data)')
+    parser.add_argument('--defer-indexes', action='store_true',
+                        help='always drop and rebuild secondary indexes and foreign keys (PostgreSQL)')
+    parser.add_argument('--load-data', action='store_true',
+                        help='use LOAD DATA LOCAL INFILE instead of multi-row INSERT (MySQL)')
+    args = parser.parse_args()
+
+    print("=" * 50)
+    print("🌱 Startup Funding System - Bulk Seed")
+    print("=" * 50)
+    report = bulk_seed(args.startups, args.investors, args.funding, args.matches, seed=args.seed,
+                       defer_indexes=args.defer_indexes, load_data=args.load_data)
+    rows, seconds = report[-1][1], report[-1][2]
+    print(f"✅ Loaded {rows:,} rows in {seconds:.1f}s ({rows / seconds:,.0f} rows/s overall)")
+    print("   Synthetic logins: startup<ID>@bulk.example.com / investor<ID>@bulk.example.com, "
+          f"password {PASSWORD!r}")
+    print("   Run `python materialized_matches.py` if MATCH_STRATEGY=materialized")
@@ -0,0 +1,303 @@
+"""
+============================================
+DBMS Project: Query Plan Checks
+Fails when a query's plan falls back to a full scan or a large sort
+Works with both MySQL and PostgreSQL
+============================================
+
+EXPLAINs every query of the benchmark catalog (benchmark_queries.py:
+the login, profile, dashboard and matchmaking paths of app.py, /search,
+queries.sql, the reports and their rollups) with a few sample startups /
+investors, and looks for two things in each plan:
+
+* full scan - a Seq Scan (MySQL: access type ALL) reading more than
+              --max-rows rows. Domains and the rollup tables pass on size.
+* sort      - a Sort / Incremental Sort (MySQL: filesort) of more than
+              --max-rows rows. The merge of two LIMIT 10 match branches
+              passes on size.
+
+EXPECTED lists the queries allowed a finding, with the reason. Any other
+finding is a plan regression: the script prints where it is and exits 1,
+so it can gate a deploy after `python migrate.py` or an index change.
+
+AVOIDED_INDEXES guards the PostgreSQL query-text workarounds (the OFFSET 0
+fences, "funding_required + 0"): each names an index the plan it avoids
+reads through. A query whose plan uses one fails however few rows it
+reads.
+
+Plans depend on the data and its statistics. The script runs ANALYZE
+first: a table that was never analyzed (a fresh deploy, before
+autovacuum) plans as if it were tiny, and the dashboard then takes the
+partial index the workaround keeps it off. Check at production scale.
+PostgreSQL plans come from EXPLAIN ANALYZE (actual rows); MySQL plans
+are estimates.
+
+    python check_query_plans.py
+    python check_query_plans.py --only "app.*" --verbose
+    python check_query_plans.py --build 200k      # disposable databases only
+"""
+
+import argparse
+import fnmatch
+import sys
+
+import database
+from benchmark_queries import (_RecordingCursor, build_catalog, build_dataset, explain,
+                               load_samples, parse_scale, table_counts)
+from database import DB_TYPE, get_db_connection, get_cursor
+
+DEFAULT_MAX_ROWS = 1000
+DEFAULT_SAMPLES = 5
+
+_UNPAGED = "unpaged list: every matching row is returned, sorting them beats an index-order scan"
+
+# Findings that are the design, not a regression: {query glob: {kind: reason}}
+EXPECTED = {
+    'reports.*': {
+        'full scan': "full-table report / export; the app serves reports from the rollups",
+        'sort': "full-table report / export; the app serves reports from the rollups",
+    },
+    'search.*': {
+        'sort': "ranked by ts_rank / MATCH relevance, which no index holds in order",
+    },
+    'queries.search_*': {'sort': _UNPAGED},
+    'queries.advanced_search_*': {'sort': _UNPAGED},
+    'queries.search_investors_by_investment_range': {
+        'full scan': "investment_min <= x AND investment_max >= x: wide ranges cover most investors",
+    },
+}
+
+# PostgreSQL plans the workarounds exist to avoid: {query glob: [(index, workaround)]}.
+# Without a fence the EXISTS probe becomes a join through idx_startup_domain,
+# reading every startup of the investor's domains, and sorts them.
+AVOIDED_INDEXES = {
+    'app.match_startups_sql': [
+        ('idx_startup_domain', "the OFFSET 0 fence of matches.startups_for_investor (query_registry.py)"),
+    ],
+    'queries.find_top_startups_for_an_investor': [
+        ('idx_startup_domain', "the LIMIT 1 OFFSET 0 fence of its EXISTS probes (queries.sql)"),
+    ],
+    'app.investor_dashboard_single': [
+        ('idx_startup_domain', "the OFFSET 0 fence of its match probes (dashboard_queries.py)"),
+        ('idx_startup_unfunded_amount', "funding_required + 0 in its matches (dashboard_queries.py)"),
+    ],
+}
+
+# ============================================
+# Plan Findings
+# ============================================
+
+def _pg_findings(node, findings):
+    """[(kind, where, rows)] of a PostgreSQL JSON plan node and its children"""
+    children = node.get('Plans', [])
+    node_type = node.get('Node Type', '')
+    if node_type == 'Seq Scan':
+        rows = (node.get('Actual Rows', 0) + node.get('Rows Removed by Filter', 0)) * node.get('Actual Loops', 1)
+        findings.append(('full scan', node.get('Relation Name'), rows))
+    elif node_type in ('Sort', 'Incremental Sort'):
+        rows = sum(child.get('Actual Rows', 0) * child.get('Actual Loops', 1) for child in children)
+        findings.append(('sort', ', '.join(node.get('Sort Key', [])), rows))
+    for child in children:
+        _pg_findings(child, findings)
+    return findings
+
+
+def _mysql_tables(node):
+    """Every "table" entry below a MySQL JSON plan node"""
+    if isinstance(node, dict):
+        if 'table' in node and isinstance(node['table'], dict):
+            yield node['table']
+        for value in node.values():
+            yield from _mysql_tables(value)
+    elif isinstance(node, list):
+        for value in node:
+            yield from _mysql_tables(value)
+
+
+def _mysql_findings(node, findings):
+    """[(kind, where, rows)] of a MySQL EXPLAIN FORMAT=JSON plan (estimated rows)"""
+    if isinstance(node, dict):
+        if node.get('access_type') == 'ALL':
+            findings.append(('full scan', node.get('table_name'), node.get('rows_examined_per_scan', 0)))
+        for key in ('ordering_operation', 'grouping_operation', 'duplicates_removal'):
+            operation = node.get(key)
+            if isinstance(operation, dict) and operation.get('using_filesort'):
+                rows = max((table.get('rows_produced_per_join', 0)
+                            for table in _mysql_tables(operation)), default=0)
+                findings.append(('sort', key, rows))
+        for value in node.values():
+            _mysql_findings(value, findings)
+    elif isinstance(node, list):
+        for value in node:
+            _mysql_findings(value, findings)
+    return findings
+
+
+def _pg_indexes(node, indexes):
+    """Every index a PostgreSQL JSON plan node and its children read"""
+    if 'Index Name' in node:
+        indexes.add(node['Index Name'])
+    for child in node.get('Plans', []):
+        _pg_indexes(child, indexes)
+    return indexes
+
+
+def plan_indexes(plans):
+    """Names of the indexes a query's plans read (PostgreSQL)"""
+    indexes = set()
+    for plan in plans:
+        _pg_indexes(plan['Plan'], indexes)
+    return indexes
+
+
+def plan_findings(plans):
+    """[(kind, where, rows)] of every full scan and sort in a query's plans"""
+    findings = []
+    for plan in plans:
+        if DB_TYPE == 'postgresql':
+            _pg_findings(plan['Plan'], findings)
+        else:
+            _mysql_findings(plan, findings)
+    return findings
+
+
+def expected_reason(name, kind):
+    for pattern, kinds in EXPECTED.items():
+        if fnmatch.fnmatch(name, pattern) and kind in kinds:
+            return kinds[kind]
+    return None
+
+
+def avoided_indexes(name):
+    """[(index, workaround)] the plans of query `name` must not read (PostgreSQL only)"""
+    if DB_TYPE != 'postgresql':
+        return []
+    return [avoided for pattern, indexes in AVOIDED_INDEXES.items()
+            if fnmatch.fnmatch(name, pattern) for avoided in indexes]
+
+# ============================================
+# Checks
+# ============================================
+
+def analyze_tables(conn):
+    """Refresh the planner statistics of every table, as autovacuum / InnoDB would"""
+    cursor = get_cursor(conn)
+    try:
+        if DB_TYPE == 'postgresql':
+            cursor.execute("ANALYZE")
+        else:
+            cursor.execute("SHOW FULL TABLES WHERE Table_type = 'BASE TABLE'")
+            tables = [list(row.values())[0] for row in cursor.fetchall()]
+            cursor.execute(f"ANALYZE TABLE {', '.join(tables)}")
+            cursor.fetchall()
+        conn.commit()
+    finally:
+        cursor.close()
+
+
+def check_query(conn, runner, samples):
+    """({(kind, where): most rows seen}, indexes read) over one execution per sample"""
+    worst, indexes = {}, set()
+    cursor = get_cursor(conn)
+    try:
+        for sample in samples:
+            recorder = _RecordingCursor(cursor)
+            runner(recorder, sample)
+            plans, _ = explain(cursor, recorder.statements)
+            conn.rollback()
+            for kind, where, rows in plan_findings(plans):
+                worst[(kind, where)] = max(worst.get((kind, where), 0), rows)
+            if DB_TYPE == 'postgresql':
+                indexes |= plan_indexes(plans)
+    finally:
+        cursor.close()
+    return worst, indexes
+
+
+def check_plans(catalog, samples, max_rows, verbose=False):
+    """[(query, kind, where, rows)] of every unexpected finding over max_rows"""
+    regressions = []
+    with get_db_connection() as conn:
+        if not conn:
+            raise RuntimeError("Could not connect to database")
+        for name, source, runner in catalog:
+            try:
+                worst, indexes = check_query(conn, runner, samples)
+            except Exception as e:
+                conn.rollback()
+                print(f"   ❌ {name}: {e}")
+                regressions.append((name, 'error', str(e), 0))
+                continue
+            flagged = [(kind, where, rows) for (kind, where), rows in sorted(worst.items())
+                       if rows > max_rows]
+            unexpected = [finding for finding in flagged if not expected_reason(name, finding[0])]
+            avoided = [(index, workaround) for index, workaround in avoided_indexes(name)
+                       if index in indexes]
+            print(f"   {'❌' if unexpected or avoided else '✅'} {name}")
+            for index, workaround in avoided:
+                print(f"      • reads {index} (avoided by {workaround})")
+                regressions.append((name, 'avoided index', index, 0))
+            for kind, where, rows in flagged:
+                reason = expected_reason(name, kind)
+                if reason is None:
+                    print(f"      • {kind}: {where} ({rows:,} rows)")
+                    regressions.append((name, kind, where, rows))
+                elif verbose:
+                    print(f"      · {kind}: {where} ({rows:,} rows) - expected: {reason}")
+    return regressions
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Fail on full scans and large sorts in the query plans')
+    parser.add_argument('--only', default=None, help='glob on query names, e.g. "app.*"')
+    parser.add_argument('--max-rows', type=int, default=DEFAULT_MAX_ROWS,
+                        help='rows a full scan or sort may touch before it counts')
+    parser.add_argument('--samples', type=int, default=DEFAULT_SAMPLES,
+                        help='sample startups / investors to explain each query with')
+    parser.add_argument('--build', default=None,
+                        help='empty the data tables and bulk-load this scale first, e.g. 200k '
+                             '(disposable databases only)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--verbose', action='store_true', help='also list the expected findings')
+    args = parser.parse_args()
+
+    print("=" * 50)
+    print("🔬 Startup Funding System - Query Plan Checks")
+    print("=" * 50)
+
+    database.SQL_METRICS = False
+
+    if args.build:
+        startups = parse_scale(args.build)
+        print(f"\n🌱 Building {args.build} dataset ({startups:,} startups)...")
+        build_dataset(startups, args.seed)
+
+    catalog = build_catalog()
+    if args.only:
+        catalog = [entry for entry in catalog if fnmatch.fnmatch(entry[0], args.only)]
+
+    with get_db_connection() as conn:
+        if not conn:
+            print("❌ Could not connect to database")
+            sys.exit(1)
+        print("\n📊 ANALYZE (planner statistics)...")
+        analyze_tables(conn)
+        samples = load_samples(conn, args.seed)[:args.samples]
+        counts = table_counts(conn)
+    if not samples:
+        print("❌ Startups / Investors are empty - load data first (bulk_seed.py)")
+        sys.exit(1)
+
+    print(f"🗂️  {len(catalog)} queries on {DB_TYPE}, {len(samples)} samples each, "
+          f"limit {args.max_rows:,} rows")
+    print("📏 " + ', '.join(f"{table} {count:,}" for table, count in counts.items()) + "\n")
+
+    regressions = check_plans(catalog, samples, args.max_rows, args.verbose)
+    if not regressions:
+        print(f"\n✅ No full scans or sorts over {args.max_rows:,} rows outside EXPECTED, "
+              f"no AVOIDED_INDEXES read")
+        sys.exit(0)
+    print(f"\n❌ {len(regressions)} plan regression(s):")
+    for name, kind, where, rows in regressions:
+        print(f"   • {name}: {kind} {where}" + (f" ({rows:,} rows)" if rows else ''))
+    sys.exit(1)
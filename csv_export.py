@@ -0,0 +1,130 @@
+"""
+============================================
+DBMS Project: CSV Export
+Streams the reports.sql export queries as CSV (optionally gzip-compressed)
+Works with both MySQL and PostgreSQL
+============================================
+
+The EXPORT QUERIES of reports.sql (startups, investors, funding records)
+can be far larger than a worker's memory. stream_export() never holds
+more than one batch of rows:
+
+* PostgreSQL reads through a named (server-side) cursor, MySQL through
+  an unbuffered cursor (database.get_streaming_cursor), EXPORT_BATCH_SIZE
+  rows per fetch.
+* Each batch is written as CSV (and through one gzip stream with
+  compress=True) and yielded straight away, so the download starts as
+  soon as the first batch arrives, not when the query has finished.
+
+app.py serves it as /export/<name>.csv and /export/<name>.csv.gz. The
+connection stays checked out of the pool until the download ends.
+
+    python csv_export.py funding           # writes funding.csv
+    python csv_export.py funding --gzip    # writes funding.csv.gz
+"""
+
+import csv
+import io
+import os
+import sys
+import time
+import zlib
+
+from database import get_db_connection, get_streaming_cursor
+
+EXPORT_BATCH_SIZE = int(os.environ.get('EXPORT_BATCH_SIZE', 2000))
+GZIP_LEVEL = int(os.environ.get('EXPORT_GZIP_LEVEL', 6))
+
+# Same queries as the EXPORT QUERIES section of reports.sql
+EXPORTS = {
+    'startups': "SELECT * FROM v_startup_details",
+    'investors': "SELECT * FROM v_investor_portfolio",
+    'funding': """
+        SELECT
+            f.*,
+            s.name AS startup_name,
+            i.name AS investor_name
+        FROM Funding f
+        JOIN Startups s ON f.startup_id = s.startup_id
+        JOIN Investors i ON f.investor_id = i.investor_id
+    """,
+}
+
+
+def stream_export(name, compress=False, batch_size=EXPORT_BATCH_SIZE):
+    """Yield one export as chunks of CSV bytes (a gzip stream if compress)
+
+    The first chunk is the header row. Raises RuntimeError (before the
+    first chunk) when no database connection is available.
+    """
+    sql = EXPORTS[name]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS) if compress else None
+
+    def take(flush=False):
+        data = buffer.getvalue().encode('utf-8')
+        buffer.seek(0)
+        buffer.truncate()
+        if compressor is None:
+            return data
+        data = compressor.compress(data)
+        # Sync flush after the header, so the client gets bytes right away
+        return data + compressor.flush(zlib.Z_SYNC_FLUSH) if flush else data
+
+    with get_db_connection(read_only=True) as conn:
+        if not conn:
+            raise RuntimeError("Could not connect to database")
+        cursor = get_streaming_cursor(conn, name=f'export_{name}')
+        try:
+            cursor.execute(sql)
+            # A named cursor only has a description once the first FETCH ran
+            rows = cursor.fetchmany(batch_size)
+            writer.writerow(column[0] for column in cursor.description)
+            yield take(flush=True)
+
+            while rows:
+                writer.writerows(rows)
+                chunk = take()
+                if chunk:
+                    yield chunk
+                rows = cursor.fetchmany(batch_size)
+
+            if compressor is not None:
+                yield compressor.flush()
+        finally:
+            try:
+                cursor.close()
+            except Exception:
+                pass  # MySQL: unread rows after an aborted download; the pool discards the connection
+
+
+if __name__ == '__main__':
+    args = [a for a in sys.argv[1:] if not a.startswith('--')]
+    compress = '--gzip' in sys.argv
+    if len(args) != 1 or args[0] not in EXPORTS:
+        print(f"Usage: python csv_export.py {{{'|'.join(EXPORTS)}}} [--gzip]")
+        sys.exit(2)
+
+    print("=" * 50)
+    print("📤 Startup Funding System - CSV Export")
+    print("=" * 50)
+    name = args[0]
+    path = f"{name}.csv" + ('.gz' if compress else '')
+    started = time.perf_counter()
+    first_byte = None
+    size = 0
+    with open(path, 'wb') as output:
+        for chunk in stream_export(name, compress=compress):
+            if first_byte is None:
+                first_byte = time.perf_counter() - started
+            output.write(chunk)
+            size += len(chunk)
+    elapsed = time.perf_counter() - started
+    print(f"✅ Wrote {path}: {size / 1e6:,.1f} MB in {elapsed:.1f}s "
+          f"(first byte after {first_byte * 1000:.0f} ms)")
+    try:
+        import resource   # not on Windows
+        print(f"   Peak memory {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MB")
+    except ImportError:
+        pass
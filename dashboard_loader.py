@@ -0,0 +1,133 @@
+"""
+============================================
+DBMS Project: Dashboard Loader
+Runs the independent parts of a dashboard page concurrently
+Works with both MySQL and PostgreSQL
+============================================
+
+A dashboard page needs a few independent groups of queries: the profile
+and its matches (the match query needs the profile), and the funding
+history / portfolio. Run one after another on one connection, the page
+waits for the sum of their database round trips.
+
+With DASHBOARD_PARALLEL=1, load_dashboard() runs the first part on the
+request's connection and every other part on a small thread pool, each
+with its own pooled connection, so the page waits for the slowest part
+instead of the sum:
+
+* Helper threads only take a connection that is free right now
+  (acquire(timeout=0)). When the pool is busy, the part runs afterwards
+  on the request's connection, exactly as in sequential mode. A busy pool
+  therefore never makes a page wait longer for a connection than before.
+* Parts are plain functions of a cursor returning a dict of template
+  variables, so both modes build the same template context.
+* The time spent waiting for helper threads counts as the request's
+  'sql' phase (metrics.py).
+
+`python benchmark_dashboards.py` compares both modes behind a simulated
+network round trip.
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from database import get_cursor, pool_for
+from metrics import counter, histogram, track_phase
+
+DASHBOARD_PARALLEL = os.environ.get('DASHBOARD_PARALLEL', '0') != '0'
+POOL_SIZE = int(os.environ.get('DASHBOARD_POOL_SIZE', 8))
+
+PART_SECONDS = histogram('dashboard_part_seconds', 'Time of one dashboard part on a helper thread')
+FALLBACKS = counter('dashboard_part_fallbacks_total',
+                    'Parts run on the request connection because no spare connection was free')
+
+
+class DashboardLoader:
+    """Per-process thread pool that runs dashboard parts on their own connections"""
+
+    def __init__(self, pool_size=POOL_SIZE):
+        self.pool_size = pool_size
+        self._lock = threading.Lock()
+        self._executor = None
+        self._pid = None
+
+    def _get_executor(self):
+        # Threads do not survive a gunicorn fork; start a fresh pool per worker
+        with self._lock:
+            if self._executor is None or self._pid != os.getpid():
+                self._executor = ThreadPoolExecutor(max_workers=self.pool_size,
+                                                    thread_name_prefix='dashboard')
+                self._pid = os.getpid()
+            return self._executor
+
+    def _run_part(self, pool, part):
+        """Run one part on a spare connection of `pool`; None if there is none"""
+        try:
+            conn = pool.acquire(timeout=0)
+        except Exception:
+            return None
+        started = time.perf_counter()
+        try:
+            cursor = get_cursor(conn)
+            try:
+                result = part(cursor)
+            finally:
+                cursor.close()
+        except Exception:
+            pool.release(conn)
+            raise
+        finally:
+            PART_SECONDS.observe(time.perf_counter() - started)
+        # The release rolls back (one more round trip): do it after handing back the result
+        self._get_executor().submit(pool.release, conn)
+        return result
+
+    def load(self, conn, parts, parallel=None):
+        """Merged dicts of every part(cursor); parts[0] runs on `conn`
+
+        Raises the first error a part raised (after all parts finished).
+        """
+        parallel = DASHBOARD_PARALLEL if parallel is None else parallel
+        context = {}
+        if not parallel or len(parts) < 2:
+            cursor = get_cursor(conn)
+            try:
+                for part in parts:
+                    context.update(part(cursor))
+            finally:
+                cursor.close()
+            return context
+
+        executor = self._get_executor()
+        # The server of the request's connection: every part reads the same replica
+        pool = pool_for(conn)
+        futures = [executor.submit(self._run_part, pool, part) for part in parts[1:]]
+        cursor = get_cursor(conn)
+        try:
+            context.update(parts[0](cursor))
+            leftover = []
+            with track_phase('sql'):
+                for part, future in zip(parts[1:], futures):
+                    result = future.result()
+                    if result is None:
+                        leftover.append(part)
+                    else:
+                        context.update(result)
+            for part in leftover:
+                FALLBACKS.inc()
+                context.update(part(cursor))
+        finally:
+            cursor.close()
+            for future in futures:
+                future.exception()      # no part is still running when we return
+        return context
+
+
+loader = DashboardLoader()
+
+
+def load_dashboard(conn, parts, parallel=None):
+    """Template variables of a dashboard: every part's dict, merged in order"""
+    return loader.load(conn, parts, parallel)
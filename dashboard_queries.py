@@ -0,0 +1,311 @@
+"""
+============================================
+DBMS Project: Single-Statement Dashboards
+Every dashboard variable from one SQL statement (DASHBOARD_STRATEGY=single)
+Works with both MySQL and PostgreSQL
+============================================
+
+By default a dashboard sends several statements: the profile, its
+matches, the first page of funding rows, the round count / domain
+distribution. Each one is a network round trip.
+
+With DASHBOARD_STRATEGY=single, the dashboard sends one statement instead.
+A CTE pipeline builds each list, and the final SELECT returns the profile
+row with every list folded into a JSON array column:
+
+* PostgreSQL: json_agg(json_build_object(...) ORDER BY pos)
+* MySQL 8.0+: JSON_ARRAYAGG(JSON_OBJECT(...)). MySQL does not promise an
+  order inside JSON_ARRAYAGG, so every element carries its ROW_NUMBER()
+  `pos` and the rows are sorted here.
+
+The JSON is decoded back into the types the drivers return for the same
+columns: DECIMAL -> Decimal, DATE -> date, DATETIME -> datetime. The
+template context is therefore the same as the multi-statement path.
+`python benchmark_dashboards.py` checks that for every sample it runs.
+
+The matches CTEs repeat matches.investors_for_startup and
+matches.startups_for_investor (query_registry.py). The lists repeat
+funding_pages.py. Keep them in step. The matches are only folded in with
+MATCH_STRATEGY=sql; the other strategies do not read them from these
+queries.
+"""
+
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from functools import lru_cache
+
+from database import DB_TYPE
+from funding_pages import INSIGHT_DEALS, PAGE_SIZE, encode_cursor
+
+# Funding.* in column order (the JSON arrays cannot use f.*)
+FUNDING_COLUMNS = ('funding_id', 'investor_id', 'startup_id', 'amount', 'funding_date',
+                   'funding_round', 'notes', 'created_at')
+
+# PostgreSQL: keeps the EXISTS probes below from being planned as a join.
+# The range comes from the profile row, unknown when the plan is made, so
+# the planner would take it for selective and join via the domain index,
+# reading every startup of the investor's domains (750 ms instead of 4 ms
+# at 1M startups). OFFSET 0 keeps walking idx_startup_unfunded_recent.
+_FENCE = ' OFFSET 0' if DB_TYPE == 'postgresql' else ''
+# Same reason: with the range unknown, idx_startup_unfunded_amount
+# (migration 011) looks selective. The plan "+ 0" avoids: Bitmap Heap Scan
+# on idx_startup_unfunded_amount over every unfunded startup in range, then
+# a top-N Sort, instead of the newest-first walk (5 ms instead of 0.13 ms at
+# 20k startups). "+ 0" only keeps the range out of that index's condition:
+# the partial index still matches "is_funded = FALSE", and without
+# statistics (never ANALYZEd) the planner may still scan all of it.
+# check_query_plans.py (which runs ANALYZE first) fails if
+# app.investor_dashboard_single reads idx_startup_domain or
+# idx_startup_unfunded_amount.
+_FUNDING_REQUIRED = 's.funding_required + 0' if DB_TYPE == 'postgresql' else 's.funding_required'
+
+# JSON has no date type; these columns come back as ISO strings
+_DATE_COLUMNS = ('funding_date', 'founded_date')
+_DATETIME_COLUMNS = ('created_at',)
+
+# ============================================
+# Statements
+# ============================================
+
+_STARTUP_MATCHES = """
+    matches AS (
+        SELECT m.*, ROW_NUMBER() OVER (ORDER BY m.match_score DESC, m.portfolio_size ASC,
+                                               m.investor_id ASC) AS pos
+        FROM ((SELECT i.investor_id, i.name, i.investment_min, i.investment_max,
+                      i.preferred_domains, i.location, i.portfolio_size,
+                      100 AS match_score,
+                      'Perfect domain match' AS match_reason
+               FROM Investors i
+               WHERE i.investment_min <= (SELECT funding_required FROM profile)
+                 AND i.investment_max >= (SELECT funding_required FROM profile)
+                 AND EXISTS (SELECT 1 FROM InvestorDomains idm
+                             WHERE idm.investor_id = i.investor_id
+                               AND idm.domain_id = (SELECT domain_id FROM profile))
+               ORDER BY i.portfolio_size ASC, i.investor_id ASC
+               LIMIT 10)
+              UNION ALL
+              (SELECT i.investor_id, i.name, i.investment_min, i.investment_max,
+                      i.preferred_domains, i.location, i.portfolio_size,
+                      50 AS match_score,
+                      'Investment range compatible' AS match_reason
+               FROM Investors i
+               WHERE i.investment_min <= (SELECT funding_required FROM profile)
+                 AND i.investment_max >= (SELECT funding_required FROM profile)
+                 AND NOT EXISTS (SELECT 1 FROM InvestorDomains idm
+                                 WHERE idm.investor_id = i.investor_id
+                                   AND idm.domain_id = (SELECT domain_id FROM profile))
+               ORDER BY i.portfolio_size ASC, i.investor_id ASC
+               LIMIT 10)
+              ORDER BY match_score DESC, portfolio_size ASC, investor_id ASC
+              LIMIT 10) m
+    ),"""
+
+_STARTUP = """
+    WITH profile AS (
+        SELECT * FROM Startups WHERE startup_id = %s
+    ),{matches}
+    history AS (
+        SELECT h.*, ROW_NUMBER() OVER (ORDER BY h.funding_date DESC, h.funding_id DESC) AS pos
+        FROM (SELECT f.*, i.name AS investor_name
+              FROM Funding f
+              JOIN Investors i ON f.investor_id = i.investor_id
+              WHERE f.startup_id = %s
+              ORDER BY f.funding_date DESC, f.funding_id DESC
+              LIMIT %s) h
+    )
+    SELECT p.*,{matches_column}
+           {history} AS funding_history,
+           (SELECT COUNT(*) FROM Funding WHERE startup_id = p.startup_id) AS funding_rounds
+    FROM profile p
+"""
+
+_INVESTOR_MATCHES = """
+    matches AS (
+        SELECT m.*, ROW_NUMBER() OVER (ORDER BY m.match_score DESC, m.founded_date DESC,
+                                               m.startup_id ASC) AS pos
+        FROM ((SELECT s.startup_id, s.name, d.domain_name, s.funding_required,
+                      s.location, s.description, s.is_funded, s.founded_date,
+                      100 AS match_score
+               FROM Startups s
+               JOIN Domains d ON d.domain_id = s.domain_id
+               WHERE {funding_required} BETWEEN (SELECT investment_min FROM profile)
+                                            AND (SELECT investment_max FROM profile)
+                 AND s.is_funded = FALSE
+                 AND EXISTS (SELECT 1 FROM InvestorDomains idm
+                             WHERE idm.investor_id = %s AND idm.domain_id = s.domain_id{fence})
+               ORDER BY s.founded_date DESC, s.startup_id ASC
+               LIMIT 10)
+              UNION ALL
+              (SELECT s.startup_id, s.name, d.domain_name, s.funding_required,
+                      s.location, s.description, s.is_funded, s.founded_date,
+                      50 AS match_score
+               FROM Startups s
+               JOIN Domains d ON d.domain_id = s.domain_id
+               WHERE {funding_required} BETWEEN (SELECT investment_min FROM profile)
+                                            AND (SELECT investment_max FROM profile)
+                 AND s.is_funded = FALSE
+                 AND NOT EXISTS (SELECT 1 FROM InvestorDomains idm
+                                 WHERE idm.investor_id = %s AND idm.domain_id = s.domain_id{fence})
+               ORDER BY s.founded_date DESC, s.startup_id ASC
+               LIMIT 10)
+              ORDER BY match_score DESC, founded_date DESC, startup_id ASC
+              LIMIT 10) m
+    ),"""
+
+_INVESTOR = """
+    WITH profile AS (
+        SELECT * FROM Investors WHERE investor_id = %s
+    ),{matches}
+    portfolio AS (
+        SELECT h.*, ROW_NUMBER() OVER (ORDER BY h.funding_date DESC, h.funding_id DESC) AS pos
+        FROM (SELECT f.*, s.name AS startup_name, s.domain_id
+              FROM Funding f
+              JOIN Startups s ON f.startup_id = s.startup_id
+              WHERE f.investor_id = %s
+              ORDER BY f.funding_date DESC, f.funding_id DESC
+              LIMIT %s) h
+    ),
+    insights AS (
+        SELECT c.*, ROW_NUMBER() OVER (ORDER BY c.deals DESC, c.domain_id ASC) AS pos
+        FROM (SELECT s.domain_id, COUNT(*) AS deals
+              FROM (SELECT startup_id FROM Funding
+                    WHERE investor_id = %s
+                    ORDER BY funding_date DESC, funding_id DESC
+                    LIMIT %s) f
+              JOIN Startups s ON f.startup_id = s.startup_id
+              GROUP BY s.domain_id) c
+    )
+    SELECT p.*,{matches_column}
+           {portfolio} AS portfolio,
+           {insights} AS domain_counts
+    FROM profile p
+"""
+
+_MATCHED_INVESTOR_COLUMNS = ('investor_id', 'name', 'investment_min', 'investment_max',
+                             'preferred_domains', 'location', 'portfolio_size',
+                             'match_score', 'match_reason')
+_MATCHED_STARTUP_COLUMNS = ('startup_id', 'name', 'domain_name', 'funding_required',
+                            'location', 'description', 'is_funded', 'founded_date',
+                            'match_score')
+
+
+def _json_array(source, columns):
+    """Scalar subquery: the rows of CTE `source` as a JSON array (text), with `pos`"""
+    pairs = ', '.join(f"'{column}', x.{column}" for column in ('pos',) + tuple(columns))
+    if DB_TYPE == 'postgresql':
+        # ::text - psycopg2 would otherwise decode numbers as floats
+        return f"(SELECT json_agg(json_build_object({pairs}) ORDER BY x.pos)::text FROM {source} x)"
+    return f"(SELECT JSON_ARRAYAGG(JSON_OBJECT({pairs})) FROM {source} x)"
+
+
+@lru_cache(maxsize=None)
+def _statement(kind, with_matches):
+    """The SQL of one dashboard (built once per kind and match mode)"""
+    if kind == 'startup':
+        template, matches = _STARTUP, _STARTUP_MATCHES
+        matches_column = ('matched_investors', _MATCHED_INVESTOR_COLUMNS)
+        lists = {'history': _json_array('history', FUNDING_COLUMNS + ('investor_name',))}
+    else:
+        template, matches = _INVESTOR, _INVESTOR_MATCHES.format(fence=_FENCE, funding_required=_FUNDING_REQUIRED)
+        matches_column = ('matched_startups', _MATCHED_STARTUP_COLUMNS)
+        lists = {'portfolio': _json_array('portfolio', FUNDING_COLUMNS + ('startup_name', 'domain_id')),
+                 'insights': _json_array('insights', ('domain_id', 'deals'))}
+    if with_matches:
+        name, columns = matches_column
+        lists.update(matches=matches,
+                     matches_column=f"\n           {_json_array('matches', columns)} AS {name},")
+    else:
+        lists.update(matches='', matches_column='')
+    return template.format(**lists)
+
+# ============================================
+# Decoding
+# ============================================
+
+def _rows(value):
+    """Decode one JSON array column into rows typed like the driver's"""
+    if value is None:               # json_agg / JSON_ARRAYAGG of no rows
+        return []
+    if isinstance(value, (bytes, bytearray)):
+        value = value.decode('utf-8')
+    rows = json.loads(value, parse_float=Decimal)
+    rows.sort(key=lambda row: row['pos'])
+    for row in rows:
+        del row['pos']
+        for column in _DATE_COLUMNS:
+            if row.get(column) is not None:
+                row[column] = date.fromisoformat(row[column])
+        for column in _DATETIME_COLUMNS:
+            if row.get(column) is not None:
+                row[column] = datetime.fromisoformat(row[column])
+    return rows
+
+
+def _first_page(rows, page_size):
+    """(rows, next_cursor) like funding_pages.fetch_page()"""
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        return rows, encode_cursor(rows[-1])
+    return rows, None
+
+# ============================================
+# Public API
+# ============================================
+
+def fetch_startup_dashboard(cursor, startup_id, with_matches=True, page_size=PAGE_SIZE):
+    """startup, matched_investors, funding_history, next_cursor, funding_rounds
+
+    Without with_matches, matched_investors is left out for the caller to
+    fill in. startup is None (and every list empty) if there is no such
+    startup. domain_name is not set; it comes from the reference cache.
+    """
+    # One extra row tells whether there is a next page
+    params = [startup_id, startup_id, page_size + 1]
+    cursor.execute(_statement('startup', with_matches), params)
+    row = cursor.fetchone()
+    if row is None:
+        context = {'startup': None, 'funding_history': [], 'next_cursor': None, 'funding_rounds': 0}
+        if with_matches:
+            context['matched_investors'] = []
+        return context
+
+    startup = dict(row)
+    context = {'funding_rounds': startup.pop('funding_rounds')}
+    context['funding_history'], context['next_cursor'] = _first_page(
+        _rows(startup.pop('funding_history')), page_size)
+    if with_matches:
+        context['matched_investors'] = _rows(startup.pop('matched_investors'))
+    context['startup'] = startup
+    return context
+
+
+def fetch_investor_dashboard(cursor, investor_id, with_matches=True, page_size=PAGE_SIZE,
+                             insight_deals=INSIGHT_DEALS):
+    """investor, matched_startups, portfolio, next_cursor, domain_counts, insight_deals
+
+    domain_counts is [(domain_id, deals)] like funding_pages.domain_counts().
+    As in fetch_startup_dashboard, matched_startups is left out without
+    with_matches and names are left to the reference cache.
+    """
+    params = [investor_id]
+    if with_matches:
+        params += [investor_id, investor_id]
+    params += [investor_id, page_size + 1, investor_id, insight_deals]
+    cursor.execute(_statement('investor', with_matches), params)
+    row = cursor.fetchone()
+    if row is None:
+        context = {'investor': None, 'portfolio': [], 'next_cursor': None,
+                   'domain_counts': [], 'insight_deals': insight_deals}
+        if with_matches:
+            context['matched_startups'] = []
+        return context
+
+    investor = dict(row)
+    context = {'domain_counts': [(r['domain_id'], r['deals']) for r in _rows(investor.pop('domain_counts'))],
+               'insight_deals': insight_deals}
+    context['portfolio'], context['next_cursor'] = _first_page(_rows(investor.pop('portfolio')), page_size)
+    if with_matches:
+        context['matched_startups'] = _rows(investor.pop('matched_startups'))
+    context['investor'] = investor
+    return context
@@ -0,0 +1,874 @@
+"""
+============================================
+DBMS Project: Database Access Layer
+Connection pooling shared by app.py and the helper scripts
+Works with both MySQL and PostgreSQL
+============================================
+"""
+
+import hashlib
+import itertools
+import os
+import re
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import partial
+
+from metrics import counter, gauge, histogram, track_phase
+
+# ============================================
+# Auto-Detect Database Environment
+# ============================================
+
+# Check if running on Render (DATABASE_URL environment variable exists)
+DATABASE_URL = os.environ.get('DATABASE_URL')
+
+if DATABASE_URL:
+    # Running on Render (Production) - Use PostgreSQL
+    DB_TYPE = 'postgresql'
+    DB_CONFIG = None
+    print("🌐 Running on Render - Using PostgreSQL")
+else:
+    # Running locally - Use MySQL
+    DB_TYPE = 'mysql'
+    DB_CONFIG = {
+        'host': 'localhost',
+        'user': 'root',
+        'password': '',  # No password for local MySQL
+        'database': 'funding_system'
+    }
+    print("🏠 Running locally - Using MySQL")
+
+# ============================================
+# Database Connector (only the selected one is imported)
+# ============================================
+
+# Importing mysql.connector costs ~40 ms of every worker's startup, and a
+# deployment only ever talks to one backend; the other need not be installed
+if DB_TYPE == 'postgresql':
+    import psycopg2
+    import psycopg2.extensions
+    from psycopg2.extras import RealDictCursor
+    from psycopg2 import Error as PostgreSQLError
+    # Create a unified Error class that works for both MySQL and PostgreSQL
+    Error = PostgreSQLError
+else:
+    import mysql.connector
+    from mysql.connector import Error as MySQLError
+    Error = MySQLError
+
+# ============================================
+# Pool Settings (override with environment variables)
+# ============================================
+
+POOL_MIN_SIZE = int(os.environ.get('DB_POOL_MIN_SIZE', 1))
+POOL_MAX_SIZE = int(os.environ.get('DB_POOL_MAX_SIZE', 10))
+POOL_TIMEOUT = float(os.environ.get('DB_POOL_TIMEOUT', 5))               # seconds to wait for a free connection
+POOL_MAX_USES = int(os.environ.get('DB_POOL_MAX_USES', 5000))            # recycle after this many checkouts
+POOL_MAX_AGE = float(os.environ.get('DB_POOL_MAX_AGE', 1800))            # recycle after this many seconds
+POOL_VALIDATE_AFTER = float(os.environ.get('DB_POOL_VALIDATE_AFTER', 1))  # ping connections idle longer than this
+
+# Read replicas (optional, see ReplicaSet): space-separated PostgreSQL URLs,
+# or comma-separated MySQL host[:port]s that share DB_CONFIG's credentials
+REPLICA_URLS = os.environ.get('DATABASE_REPLICA_URLS', '').split()
+REPLICA_HOSTS = [h.strip() for h in os.environ.get('DB_REPLICA_HOSTS', '').split(',') if h.strip()]
+REPLICA_MAX_LAG = float(os.environ.get('DB_REPLICA_MAX_LAG', 5))                # seconds behind before a replica is skipped
+REPLICA_STICKY_SECONDS = float(os.environ.get('DB_REPLICA_STICKY_SECONDS', 10))  # reads on the primary after a write
+REPLICA_CHECK_INTERVAL = float(os.environ.get('DB_REPLICA_CHECK_INTERVAL', 2))  # seconds between health checks
+REPLICA_CONNECT_TIMEOUT = int(os.environ.get('DB_REPLICA_CONNECT_TIMEOUT', 2))   # give up on a replica after this
+
+
+# SQL instrumentation (see InstrumentedCursor)
+SQL_METRICS = os.environ.get('SQL_METRICS', '1') != '0'
+SQL_SLOW_MS = float(os.environ.get('SQL_SLOW_MS', 500))                 # log statements slower than this
+SQL_EXPLAIN_SLOW = os.environ.get('SQL_EXPLAIN_SLOW', '1') != '0'        # ... together with their EXPLAIN
+
+
+class PoolTimeout(Exception):
+    """Raised when no connection becomes free within the checkout timeout"""
+
+
+class _PooledConnection:
+    """Book-keeping for one physical connection owned by the pool"""
+
+    __slots__ = ('conn', 'created_at', 'last_used', 'uses')
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+        self.uses = 0
+
+
+class ConnectionPool:
+    """Thread-safe, per-process pool of database connections.
+
+    The pool does not know anything about MySQL or PostgreSQL itself; it is
+    given three callables:
+
+    * connect() - open a new connection
+    * ping(conn) - raise if the connection is no longer usable
+    * reset(conn) - return the connection to a clean state (rollback)
+
+    Connections are validated on checkout when they have been idle for more
+    than `validate_after` seconds, and are closed instead of being reused
+    once they reach `max_uses` checkouts or `max_age` seconds.
+    """
+
+    def __init__(self, connect, ping=None, reset=None, min_size=1, max_size=10,
+                 timeout=5.0, max_uses=5000, max_age=1800.0, validate_after=1.0):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self._connect = connect
+        self._ping = ping
+        self._reset = reset
+        self.min_size = min(min_size, max_size)
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_uses = max_uses
+        self.max_age = max_age
+        self.validate_after = validate_after
+
+        self._cond = threading.Condition()
+        self._idle = deque()
+        self._checked_out = {}
+        self._size = 0
+        self._waiting = 0
+        self._pid = os.getpid()
+        self._warmed = False
+        self._counters = {
+            'checkouts': 0,
+            'timeouts': 0,
+            'connections_created': 0,
+            'connections_recycled': 0,
+            'validation_failures': 0,
+            'connect_errors': 0,
+        }
+        self._wait_time_total = 0.0
+
+    # ---------- internal helpers ----------
+
+    def _check_pid(self):
+        """Forget connections inherited from a parent process (gunicorn fork)"""
+        if self._pid != os.getpid():
+            # The sockets belong to the parent; never close them from here
+            self._idle.clear()
+            self._checked_out.clear()
+            self._size = 0
+            self._waiting = 0
+            self._warmed = False
+            self._pid = os.getpid()
+
+    def _expired(self, entry, now):
+        return (self.max_uses and entry.uses >= self.max_uses) or \
+               (self.max_age and now - entry.created_at >= self.max_age)
+
+    def _open(self):
+        try:
+            entry = _PooledConnection(self._connect())
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._counters['connect_errors'] += 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._counters['connections_created'] += 1
+        return entry
+
+    @staticmethod
+    def _close_quietly(conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _is_alive(self, entry, now):
+        if self._ping is None or now - entry.last_used < self.validate_after:
+            return True
+        try:
+            self._ping(entry.conn)
+            return True
+        except Exception:
+            return False
+
+    def _warm(self):
+        """Open min_size connections the first time the pool is used"""
+        with self._cond:
+            if self._warmed:
+                return
+            self._warmed = True
+            missing = max(0, self.min_size - self._size)
+            self._size += missing
+        for _ in range(missing):
+            try:
+                entry = self._open()
+            except Exception:
+                continue
+            with self._cond:
+                self._idle.append(entry)
+                self._cond.notify()
+
+    # ---------- public API ----------
+
+    def warm(self):
+        """Open min_size connections now instead of on the first checkout"""
+        with self._cond:
+            self._check_pid()
+        self._warm()
+
+    def acquire(self, timeout=None):
+        """Check out a validated connection, waiting up to `timeout` seconds
+
+        timeout defaults to the pool's; 0 only takes an idle connection or
+        a free slot and raises PoolTimeout at once otherwise.
+        """
+        with self._cond:
+            self._check_pid()
+        self._warm()
+
+        timeout = self.timeout if timeout is None else timeout
+        started = time.monotonic()
+        deadline = started + timeout
+        entry = None
+        with self._cond:
+            while True:
+                if self._idle:
+                    entry = self._idle.pop()  # LIFO keeps the warmest connections busy
+                    break
+                if self._size < self.max_size:
+                    self._size += 1  # reserve a slot, connect outside the lock
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    if timeout:
+                        self._counters['timeouts'] += 1     # a try-only checkout is not a timeout
+                    raise PoolTimeout(
+                        f"No database connection available after {timeout:.1f}s "
+                        f"(pool size {self.max_size})")
+                self._waiting += 1
+                try:
+                    self._cond.wait(remaining)
+                finally:
+                    self._waiting -= 1
+
+        if entry is None:
+            entry = self._open()
+        else:
+            now = time.monotonic()
+            if self._expired(entry, now):
+                self._close_quietly(entry.conn)
+                with self._cond:
+                    self._counters['connections_recycled'] += 1
+                entry = self._open()
+            elif not self._is_alive(entry, now):
+                self._close_quietly(entry.conn)
+                with self._cond:
+                    self._counters['validation_failures'] += 1
+                entry = self._open()
+
+        entry.uses += 1
+        with self._cond:
+            self._checked_out[id(entry.conn)] = entry
+            self._counters['checkouts'] += 1
+            self._wait_time_total += time.monotonic() - started
+        return entry.conn
+
+    def release(self, conn, discard=False):
+        """Return a connection to the pool (or close it if it is unusable)"""
+        with self._cond:
+            entry = self._checked_out.pop(id(conn), None)
+        if entry is None:
+            # Not ours (or inherited across a fork) - just close it
+            self._close_quietly(conn)
+            return
+
+        if not discard and self._reset is not None:
+            try:
+                self._reset(conn)
+            except Exception:
+                discard = True
+
+        now = time.monotonic()
+        entry.last_used = now
+        if discard or self._expired(entry, now):
+            self._close_quietly(conn)
+            with self._cond:
+                self._size -= 1
+                if not discard:
+                    self._counters['connections_recycled'] += 1
+                self._cond.notify()
+            return
+
+        with self._cond:
+            self._idle.append(entry)
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self):
+        """Context manager wrapper around acquire()/release()"""
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def stats(self):
+        """Snapshot of pool usage for monitoring"""
+        with self._cond:
+            checkouts = self._counters['checkouts']
+            return {
+                'size': self._size,
+                'idle': len(self._idle),
+                'in_use': len(self._checked_out),
+                'waiting': self._waiting,
+                'min_size': self.min_size,
+                'max_size': self.max_size,
+                'avg_wait_ms': round(self._wait_time_total * 1000 / checkouts, 3) if checkouts else 0.0,
+                **self._counters,
+            }
+
+    def close(self):
+        """Close every idle connection (checked-out ones close on release)"""
+        with self._cond:
+            idle, self._idle = list(self._idle), deque()
+            self._size -= len(idle)
+            self._warmed = False
+        for entry in idle:
+            self._close_quietly(entry.conn)
+
+
+# ============================================
+# Backend-specific connect / ping / reset
+# ============================================
+
+def _connect():
+    if DB_TYPE == 'postgresql':
+        # PostgreSQL connection for Render
+        return psycopg2.connect(DATABASE_URL, cursor_factory=RealDictCursor)
+    # MySQL connection for local development
+    return mysql.connector.connect(**DB_CONFIG)
+
+
+def _ping(conn):
+    if DB_TYPE == 'postgresql':
+        if conn.closed:
+            raise PostgreSQLError("connection already closed")
+        cursor = conn.cursor()
+        try:
+            cursor.execute("SELECT 1")
+        finally:
+            cursor.close()
+        conn.rollback()
+    else:
+        conn.ping(reconnect=False)
+
+
+def _reset(conn):
+    if DB_TYPE == 'postgresql' and conn.closed:
+        raise PostgreSQLError("connection already closed")
+    # End whatever transaction the request left open
+    conn.rollback()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """Return the per-process connection pool, creating it on first use"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(
+                    _connect, ping=_ping, reset=_reset,
+                    min_size=POOL_MIN_SIZE,
+                    max_size=POOL_MAX_SIZE,
+                    timeout=POOL_TIMEOUT,
+                    max_uses=POOL_MAX_USES,
+                    max_age=POOL_MAX_AGE,
+                    validate_after=POOL_VALIDATE_AFTER,
+                )
+    return _pool
+
+
+def pool_stats():
+    """Pool statistics for the monitoring endpoint"""
+    stats = get_pool().stats()
+    stats['db_type'] = DB_TYPE
+    replicas = get_replicas()
+    if replicas is not None:
+        stats['replicas'] = replicas.stats()
+    return stats
+
+# ============================================
+# Read Replicas
+# ============================================
+
+# Seconds the replica's replayed data is behind the primary. 0 when it has
+# replayed everything it received (an idle primary sends nothing new).
+_PG_LAG_SQL = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END AS lag
+"""
+
+
+def _connect_replica(target):
+    if DB_TYPE == 'postgresql':
+        return psycopg2.connect(target, cursor_factory=RealDictCursor,
+                                connect_timeout=REPLICA_CONNECT_TIMEOUT)
+    host, _, port = target.partition(':')
+    return mysql.connector.connect(**{**DB_CONFIG, 'host': host, 'port': int(port or 3306),
+                                      'connection_timeout': REPLICA_CONNECT_TIMEOUT})
+
+
+def _replica_lag(conn):
+    """Seconds behind the primary; None when replication is broken"""
+    if DB_TYPE == 'postgresql':
+        cursor = conn.cursor()
+        try:
+            cursor.execute(_PG_LAG_SQL)
+            return float(cursor.fetchone()['lag'])
+        finally:
+            cursor.close()
+    cursor = conn.cursor(dictionary=True)
+    try:
+        try:
+            cursor.execute("SHOW REPLICA STATUS")
+        except MySQLError:
+            cursor.execute("SHOW SLAVE STATUS")             # before MySQL 8.0.22
+        status = cursor.fetchone()
+    finally:
+        cursor.close()
+    if status is None:
+        return 0.0                                          # not replicating: nothing to lag behind
+    lag = status.get('Seconds_Behind_Source', status.get('Seconds_Behind_Master'))
+    return None if lag is None else float(lag)
+
+
+class Replica:
+    """One read replica: its own connection pool and its last health check"""
+
+    def __init__(self, name, pool):
+        self.name = name
+        self.pool = pool
+        self.healthy = False          # until its first check
+        self.lag = None
+        self.error = None
+        self.checked_at = None
+        self.routed = counter('db_replica_checkouts_total', 'Read-only checkouts served by each replica',
+                              labels={'replica': name})
+
+    def mark_down(self, error):
+        self.healthy = False
+        self.error = str(error)
+
+    def check(self):
+        """Ping the replica and measure its lag (on a spare connection, never waits)"""
+        try:
+            conn = self.pool.acquire(timeout=0)
+        except PoolTimeout:
+            return                    # every connection is busy: it is answering queries
+        except Exception as e:
+            self.mark_down(e)
+            return
+        try:
+            lag = _replica_lag(conn)
+            conn.rollback()
+        except Exception as e:
+            self.pool.release(conn, discard=True)
+            self.mark_down(e)
+            return
+        finally:
+            self.checked_at = time.time()
+        self.pool.release(conn)
+        self.lag = lag
+        if lag is None:
+            self.mark_down('replication is not running')
+        elif lag > REPLICA_MAX_LAG:
+            self.mark_down(f'{lag:.1f}s behind the primary (DB_REPLICA_MAX_LAG={REPLICA_MAX_LAG:g})')
+        else:
+            self.healthy, self.error = True, None
+
+    def stats(self):
+        pool = self.pool.stats()
+        return {'name': self.name, 'healthy': self.healthy, 'lag_seconds': self.lag,
+                'error': self.error, 'checked_at': self.checked_at,
+                **{key: pool[key] for key in ('size', 'in_use', 'checkouts', 'connect_errors')}}
+
+
+class ReplicaSet:
+    """The read replicas of this process, used round-robin while healthy
+
+    A background thread (one per worker, started on first use) checks every
+    replica each `check_interval` seconds. A replica is skipped while it
+    does not answer, its replication is broken, or it is more than
+    DB_REPLICA_MAX_LAG seconds behind; a failed connect skips it at once.
+    """
+
+    def __init__(self, replicas, check_interval=REPLICA_CHECK_INTERVAL):
+        self.replicas = replicas
+        self.check_interval = check_interval
+        self._turn = itertools.count()
+        self._lock = threading.Lock()
+        self._checker_pid = None
+
+    def _ensure_checker(self):
+        # Threads do not survive a gunicorn fork; start one per worker
+        if self._checker_pid == os.getpid():
+            return
+        with self._lock:
+            if self._checker_pid != os.getpid():
+                # Check once before the first read, so a lagging replica is never used unchecked
+                for replica in self.replicas:
+                    replica.check()
+                self._checker_pid = os.getpid()
+                threading.Thread(target=self._check_loop, name='replica-check', daemon=True).start()
+
+    def _check_loop(self):
+        while True:
+            time.sleep(self.check_interval)
+            for replica in self.replicas:
+                replica.check()
+
+    def acquire(self):
+        """(replica, connection) from the next healthy replica; (None, None) if none can serve"""
+        self._ensure_checker()
+        start = next(self._turn)
+        rotation = [self.replicas[(start + i) % len(self.replicas)] for i in range(len(self.replicas))]
+        # Prefer a replica with a free connection; wait for the first one otherwise
+        for timeout in (0, None):
+            for replica in rotation:
+                if not replica.healthy:
+                    continue
+                try:
+                    conn = replica.pool.acquire(timeout=timeout)
+                except PoolTimeout:
+                    if timeout is None:
+                        raise
+                    continue
+                except Exception as e:
+                    replica.mark_down(e)
+                    continue
+                replica.routed.inc()
+                return replica, conn
+        return None, None
+
+    def stats(self):
+        return [replica.stats() for replica in self.replicas]
+
+
+_replicas = None
+
+
+def get_replicas():
+    """The per-process ReplicaSet, or None when no replica is configured"""
+    global _replicas
+    targets = REPLICA_URLS if DB_TYPE == 'postgresql' else REPLICA_HOSTS
+    if _replicas is None and targets:
+        with _pool_lock:
+            if _replicas is None:
+                _replicas = ReplicaSet([
+                    Replica(_redact(target), ConnectionPool(
+                        partial(_connect_replica, target), ping=_ping, reset=_reset,
+                        min_size=0,
+                        max_size=POOL_MAX_SIZE,
+                        timeout=POOL_TIMEOUT,
+                        max_uses=POOL_MAX_USES,
+                        max_age=POOL_MAX_AGE,
+                        validate_after=POOL_VALIDATE_AFTER,
+                    ))
+                    for target in targets])
+    return _replicas
+
+
+def _redact(target):
+    """The replica's URL without its password, for /health/db and the metric labels"""
+    return re.sub(r'://([^:/@]+):[^@]*@', r'://\1:***@', target)
+
+
+# Until when (time.time()) this request's reads stay on the primary
+_primary_until = ContextVar('primary_until', default=0.0)
+
+
+def read_your_writes(until):
+    """Keep this request's read-only checkouts on the primary until `until`
+
+    app.py passes what record_write() returned for the session earlier, so
+    a visitor who just registered sees the new row even on a lagging replica.
+    """
+    _primary_until.set(until or 0.0)
+
+
+def record_write():
+    """Note that this request wrote; returns until when its session should read from the primary"""
+    until = time.time() + REPLICA_STICKY_SECONDS
+    _primary_until.set(until)
+    return until
+
+# ============================================
+# Database Connection Helpers (Auto-Switching)
+# ============================================
+
+@contextmanager
+def get_db_connection(read_only=False):
+    """Check out a pooled database connection (auto-detects MySQL or PostgreSQL)
+
+    Usage:
+        with get_db_connection() as conn:
+            if conn:
+                ...
+
+    Yields None when no connection can be obtained, so callers keep their
+    "Database connection error" handling. The connection goes back to the
+    pool (rolled back) when the block exits.
+
+    read_only=True marks a block that only reads and may see data a few
+    seconds old: with read replicas configured it runs on one of them,
+    unless this request's session wrote recently (read_your_writes) or no
+    replica is healthy.
+    """
+    pool, replica = get_pool(), None
+    try:
+        with track_phase('connect', CONNECT_SECONDS):
+            replicas = get_replicas() if read_only else None
+            if replicas is not None:
+                if time.time() < _primary_until.get():
+                    READ_ROUTES['sticky'].inc()
+                else:
+                    replica, conn = replicas.acquire()
+                    READ_ROUTES['replica' if replica else 'unavailable'].inc()
+            if replica is None:
+                conn = pool.acquire()
+            else:
+                pool = replica.pool
+                _on_replica[id(conn)] = replica
+    except Exception as e:
+        print(f"Database connection error: {e}")
+        yield None
+        return
+
+    try:
+        yield conn
+    finally:
+        _on_replica.pop(id(conn), None)
+        pool.release(conn)
+
+
+# id(connection) -> Replica, for the connections checked out of a replica
+_on_replica = {}
+
+
+def is_replica(connection):
+    """True if `connection` came from a read replica (it cannot write)"""
+    return id(connection) in _on_replica
+
+
+def pool_for(connection):
+    """The pool `connection` was checked out of, for more connections to the same server"""
+    replica = _on_replica.get(id(connection))
+    return replica.pool if replica is not None else get_pool()
+
+
+def get_cursor(connection):
+    """Get cursor based on database type (instrumented unless SQL_METRICS=0)"""
+    if DB_TYPE == 'postgresql':
+        cursor = connection.cursor()  # Already has RealDictCursor
+    else:
+        cursor = connection.cursor(dictionary=True)  # MySQL dictionary cursor
+    return InstrumentedCursor(cursor, connection) if SQL_METRICS else cursor
+
+
+def get_streaming_cursor(connection, name='stream'):
+    """Cursor that leaves the result on the server and hands it out in batches
+
+    PostgreSQL: a named (server-side) cursor, which needs the surrounding
+    transaction. MySQL: an unbuffered cursor; read it to the end (or
+    discard the connection) before running anything else on it. Rows are
+    tuples, column names are in cursor.description. Read with fetchmany().
+    """
+    if DB_TYPE == 'postgresql':
+        cursor = connection.cursor(name=name, cursor_factory=psycopg2.extensions.cursor)
+    else:
+        cursor = connection.cursor(buffered=False)
+    return InstrumentedCursor(cursor, connection) if SQL_METRICS else cursor
+
+
+# ============================================
+# SQL Instrumentation
+# ============================================
+
+CONNECT_SECONDS = histogram('db_connection_acquire_seconds', 'Time to check a connection out of the pool')
+READ_ROUTES = {reason: counter('db_read_routes_total', 'Read-only checkouts by where they went',
+                               labels={'route': reason})
+               for reason in ('replica', 'sticky', 'unavailable')}
+
+_LITERALS = [
+    (re.compile(r"'(?:[^']|'')*'"), '?'),                    # string literals
+    (re.compile(r'%s|%\(\w+\)s'), '?'),                       # driver placeholders
+    (re.compile(r'\b\d+(?:\.\d+)?\b'), '?'),                   # numbers
+    (re.compile(r'\(\s*\?(?:\s*,\s*\?)+\s*\)'), '(?+)'),           # IN (?, ?, ...) of any length
+    (re.compile(r'\s+'), ' '),
+]
+_fingerprints = {}
+_FINGERPRINT_CACHE_SIZE = 2000
+ITER_CHUNK = 2000                 # rows per fetchmany() when iterating an instrumented cursor
+
+
+def normalize_sql(sql):
+    """The statement with literals and placeholders replaced by ?"""
+    text = sql.strip()
+    for pattern, replacement in _LITERALS:
+        text = pattern.sub(replacement, text)
+    return text
+
+
+def sql_fingerprint(sql):
+    """(fingerprint, normalized statement) - one fingerprint per statement shape"""
+    cached = _fingerprints.get(sql)
+    if cached is None:
+        normalized = normalize_sql(sql)
+        cached = (hashlib.md5(normalized.encode('utf-8')).hexdigest()[:12], normalized)
+        if len(_fingerprints) >= _FINGERPRINT_CACHE_SIZE:
+            _fingerprints.clear()
+        _fingerprints[sql] = cached
+    return cached
+
+
+class _StatementMetrics:
+    """The metric series of one fingerprint"""
+
+    def __init__(self, fingerprint, normalized):
+        labels = {'fingerprint': fingerprint}
+        self.seconds = histogram('sql_statement_seconds', 'Statement execution time', labels=labels)
+        self.rows = counter('sql_rows_total', 'Rows fetched or affected', labels=labels)
+        self.errors = counter('sql_errors_total', 'Statements that raised', labels=labels)
+        # Maps the fingerprint back to the statement text on the /metrics page
+        gauge('sql_statement_info', 'Normalized statement of each fingerprint',
+              labels={'fingerprint': fingerprint, 'statement': normalized[:300]}).set(1)
+
+
+_statement_metrics = {}
+
+
+def _metrics_for(fingerprint, normalized):
+    metrics = _statement_metrics.get(fingerprint)
+    if metrics is None:
+        metrics = _statement_metrics[fingerprint] = _StatementMetrics(fingerprint, normalized)
+    return metrics
+
+
+class InstrumentedCursor:
+    """Cursor wrapper that times every statement and counts its rows
+
+    Per fingerprint: sql_statement_seconds, sql_rows_total and
+    sql_errors_total. The time also counts as the request's 'sql' phase.
+    Statements slower than SQL_SLOW_MS are logged; SELECTs with their
+    EXPLAIN, which runs on this cursor before its next statement (MySQL
+    cannot run it while the slow statement's rows are still unread).
+    Everything else is passed through to the driver's cursor.
+    """
+
+    def __init__(self, cursor, connection=None):
+        self._cursor = cursor
+        if connection is not None:
+            self.connection = connection    # for query_registry (MySQL cursors do not expose it)
+        self._current = None
+        self._slow = None
+
+    def _run(self, method, sql, params):
+        self._explain_slow()
+        fingerprint, normalized = sql_fingerprint(sql)
+        metrics = _metrics_for(fingerprint, normalized)
+        self._current = metrics
+        started = time.perf_counter()
+        try:
+            with track_phase('sql'):
+                result = method(sql) if params is None else method(sql, params)
+        except Exception:
+            metrics.errors.inc()
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            metrics.seconds.observe(elapsed)
+        rowcount = getattr(self._cursor, 'rowcount', -1)
+        if rowcount and rowcount > 0 and not self._returns_rows():
+            metrics.rows.inc(rowcount)
+        if elapsed * 1000 >= SQL_SLOW_MS:
+            self._slow = (sql, params, elapsed, fingerprint)
+            if not (SQL_EXPLAIN_SLOW and re.match(r'^\s*\(?\s*(SELECT|WITH|EXECUTE)\b', sql, re.IGNORECASE)):
+                self._explain_slow()
+        return result
+
+    def _returns_rows(self):
+        return getattr(self._cursor, 'description', None) is not None
+
+    def _explain_slow(self):
+        if self._slow is None:
+            return
+        sql, params, elapsed, fingerprint = self._slow
+        self._slow = None
+        plan = ''
+        if SQL_EXPLAIN_SLOW and re.match(r'^\s*\(?\s*(SELECT|WITH|EXECUTE)\b', sql, re.IGNORECASE):
+            try:
+                if params is None:
+                    self._cursor.execute('EXPLAIN ' + sql)
+                else:
+                    self._cursor.execute('EXPLAIN ' + sql, params)
+                rows = self._cursor.fetchall()
+                plan = '\n'.join('      ' + ' | '.join(str(v) for v in dict(row).values()) for row in rows)
+            except Exception as e:
+                plan = f"      (EXPLAIN failed: {e})"
+        print(f"🐢 Slow SQL {elapsed * 1000:.0f} ms [{fingerprint}]: {normalize_sql(sql)[:500]}"
+              + (f"\n{plan}" if plan else ''))
+
+    def _count(self, rows):
+        if self._current is not None and rows:
+            self._current.rows.inc(rows)
+
+    def execute(self, sql, params=None):
+        return self._run(self._cursor.execute, sql, params)
+
+    def executemany(self, sql, seq_params):
+        return self._run(self._cursor.executemany, sql, seq_params)
+
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        self._count(1 if row is not None else 0)
+        return row
+
+    def fetchmany(self, size=None):
+        rows = self._cursor.fetchmany() if size is None else self._cursor.fetchmany(size)
+        self._count(len(rows))
+        return rows
+
+    def fetchall(self):
+        rows = self._cursor.fetchall()
+        self._count(len(rows))
+        return rows
+
+    def close(self):
+        try:
+            self._explain_slow()
+        finally:
+            self._cursor.close()
+
+    def __iter__(self):
+        # In chunks, so named / unbuffered cursors (get_streaming_cursor) keep streaming
+        while True:
+            rows = self._cursor.fetchmany(ITER_CHUNK)
+            if not rows:
+                return
+            self._count(len(rows))
+            yield from rows
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
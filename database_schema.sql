@@ -4,11 +4,26 @@
 -- ============================================
 
 -- Drop existing tables if they exist
+DROP TABLE IF EXISTS ReportRollupState;
+DROP TABLE IF EXISTS ReportRollupDeltas;
+DROP TABLE IF EXISTS ReportLocationInvestors;
+DROP TABLE IF EXISTS ReportMonthStartups;
+DROP TABLE IF EXISTS ReportMonthInvestors;
+DROP TABLE IF EXISTS ReportLocationStats;
+DROP TABLE IF EXISTS ReportMonthlyFunding;
+DROP TABLE IF EXISTS ReportDomainStats;
+DROP TABLE IF EXISTS ReferenceDataVersions;
+DROP TABLE IF EXISTS MatchRefreshQueue;
+DROP TABLE IF EXISTS LoginThrottle;
+DROP TABLE IF EXISTS SetupMarkers;
+DROP TABLE IF EXISTS SchemaMigrations;
+DROP TABLE IF EXISTS InvestorDomains;
 DROP TABLE IF EXISTS Matches;
 DROP TABLE IF EXISTS Funding;
 DROP TABLE IF EXISTS Startups;
 DROP TABLE IF EXISTS Investors;
 DROP TABLE IF EXISTS Domains;
+DROP PROCEDURE IF EXISTS apply_funding_delta;
 
 -- ============================================
 -- Table: Domains (Lookup table for normalization)
@@ -44,6 +59,7 @@ CREATE TABLE Startups (
     location VARCHAR(100),
     website VARCHAR(200),
     is_funded BOOLEAN DEFAULT FALSE,
+    total_funding_received DECIMAL(15,2) NOT NULL DEFAULT 0, -- SUM(Funding.amount), kept by triggers
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     
     FOREIGN KEY (domain_id) REFERENCES Domains(domain_id)
@@ -65,6 +81,8 @@ CREATE TABLE Investors (
     phone VARCHAR(20),
     location VARCHAR(100),
     portfolio_size INT DEFAULT 0,
+    total_invested DECIMAL(15,2) NOT NULL DEFAULT 0, -- SUM(Funding.amount), kept by triggers
+    startups_funded INT NOT NULL DEFAULT 0, -- COUNT(DISTINCT Funding.startup_id), kept by triggers
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     
     CONSTRAINT check_investment_range CHECK (investment_max >= investment_min)
@@ -113,15 +131,169 @@ CREATE TABLE Matches (
     UNIQUE KEY unique_match (investor_id, startup_id)
 );
 
+-- ============================================
+-- Table: InvestorDomains (Investor ↔ Domain preferences)
+-- Normalized copy of Investors.preferred_domains used by matchmaking
+-- ============================================
+CREATE TABLE InvestorDomains (
+    investor_id INT NOT NULL,
+    domain_id INT NOT NULL,
+    
+    PRIMARY KEY (investor_id, domain_id),
+    FOREIGN KEY (investor_id) REFERENCES Investors(investor_id)
+        ON DELETE CASCADE
+        ON UPDATE CASCADE,
+    FOREIGN KEY (domain_id) REFERENCES Domains(domain_id)
+        ON DELETE CASCADE
+        ON UPDATE CASCADE
+);
+
+-- ============================================
+-- Table: SchemaMigrations (applied by migrate.py)
+-- ============================================
+CREATE TABLE SchemaMigrations (
+    version VARCHAR(100) PRIMARY KEY,
+    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- ============================================
+-- Table: SetupMarkers (one-time startup checks, see bootstrap.py)
+-- ============================================
+CREATE TABLE SetupMarkers (
+    marker VARCHAR(100) PRIMARY KEY,
+    version VARCHAR(100) NOT NULL,
+    recorded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- ============================================
+-- Table: LoginThrottle (login attempt token buckets, see login_throttle.py)
+-- ============================================
+CREATE TABLE LoginThrottle (
+    bucket_key VARCHAR(255) PRIMARY KEY,
+    tokens DOUBLE NOT NULL,
+    updated_at DOUBLE NOT NULL,           -- Unix time of the last change
+
+    INDEX idx_login_throttle_updated (updated_at)
+);
+
+-- ============================================
+-- Table: MatchRefreshQueue (filled by triggers, drained by materialized_matches.py)
+-- ============================================
+CREATE TABLE MatchRefreshQueue (
+    entity_type VARCHAR(10) NOT NULL CHECK (entity_type IN ('startup', 'investor')),
+    entity_id INT NOT NULL,
+    queued_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    
+    PRIMARY KEY (entity_type, entity_id)
+);
+
+-- ============================================
+-- Table: ReferenceDataVersions (bumped by triggers, polled by reference_cache.py)
+-- ============================================
+CREATE TABLE ReferenceDataVersions (
+    table_name VARCHAR(64) PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 1,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+);
+
+INSERT INTO ReferenceDataVersions (table_name) VALUES ('Domains');
+
+-- ============================================
+-- Report rollups (filled from ReportRollupDeltas by report_rollups.py)
+-- ============================================
+CREATE TABLE ReportDomainStats (
+    domain_id INT PRIMARY KEY,
+    total_startups INT NOT NULL DEFAULT 0,
+    funded_startups INT NOT NULL DEFAULT 0,
+    funding_deals INT NOT NULL DEFAULT 0,
+    total_funding DECIMAL(20,2) NOT NULL DEFAULT 0
+);
+
+CREATE TABLE ReportMonthlyFunding (
+    month CHAR(7) PRIMARY KEY, -- 'YYYY-MM'
+    investments INT NOT NULL DEFAULT 0,
+    total_amount DECIMAL(20,2) NOT NULL DEFAULT 0,
+    active_investors INT NOT NULL DEFAULT 0,
+    startups_funded INT NOT NULL DEFAULT 0
+);
+
+-- '' stands for startups without a location
+CREATE TABLE ReportLocationStats (
+    location VARCHAR(100) PRIMARY KEY,
+    total_startups INT NOT NULL DEFAULT 0,
+    total_investors INT NOT NULL DEFAULT 0,
+    funding_deals INT NOT NULL DEFAULT 0,
+    total_funding DECIMAL(20,2) NOT NULL DEFAULT 0
+);
+
+-- Deals per (group, member) pair: the COUNT(DISTINCT ...) columns above
+-- only move when a pair appears or disappears
+CREATE TABLE ReportMonthInvestors (
+    month CHAR(7) NOT NULL,
+    investor_id INT NOT NULL,
+    deals INT NOT NULL,
+    PRIMARY KEY (month, investor_id)
+);
+
+CREATE TABLE ReportMonthStartups (
+    month CHAR(7) NOT NULL,
+    startup_id INT NOT NULL,
+    deals INT NOT NULL,
+    PRIMARY KEY (month, startup_id)
+);
+
+CREATE TABLE ReportLocationInvestors (
+    location VARCHAR(100) NOT NULL,
+    investor_id INT NOT NULL,
+    deals INT NOT NULL,
+    PRIMARY KEY (location, investor_id)
+);
+
+-- One row per change: +1 / -1 of a Funding row, Startup or Investor, with the
+-- attributes it is grouped by at the time of the change
+CREATE TABLE ReportRollupDeltas (
+    delta_id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    kind VARCHAR(10) NOT NULL CHECK (kind IN ('funding', 'startup', 'investor')),
+    sign SMALLINT NOT NULL CHECK (sign IN (-1, 1)),
+    investor_id INT,
+    startup_id INT,
+    domain_id INT,
+    location VARCHAR(100),
+    is_funded BOOLEAN,
+    funding_date DATE,
+    amount DECIMAL(15,2),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- rebuilt_at IS NULL makes the next refresh run a full rebuild
+CREATE TABLE ReportRollupState (
+    rollup_name VARCHAR(30) PRIMARY KEY,
+    total_investors INT NOT NULL DEFAULT 0,
+    rebuilt_at TIMESTAMP NULL,
+    refreshed_at TIMESTAMP NULL
+);
+
+INSERT INTO ReportRollupState (rollup_name) VALUES ('reports');
+
 -- ============================================
 -- Indexes for Performance (Student 1)
 -- ============================================
 CREATE INDEX idx_startup_domain ON Startups(domain_id);
-CREATE INDEX idx_startup_funded ON Startups(is_funded);
 CREATE INDEX idx_investor_investment_range ON Investors(investment_min, investment_max);
-CREATE INDEX idx_funding_investor ON Funding(investor_id);
-CREATE INDEX idx_funding_startup ON Funding(startup_id);
+CREATE INDEX idx_funding_investor_startup ON Funding(investor_id, startup_id);
 CREATE INDEX idx_matches_score ON Matches(match_score DESC);
+CREATE INDEX idx_investor_domains_domain ON InvestorDomains(domain_id, investor_id);
+CREATE INDEX idx_investor_rank ON Investors(portfolio_size, investor_id);
+CREATE INDEX idx_startup_unfunded_recent ON Startups(is_funded, founded_date DESC, startup_id);
+CREATE INDEX idx_matches_startup_score ON Matches(startup_id, match_score DESC);
+CREATE INDEX idx_matches_investor_score ON Matches(investor_id, match_score DESC);
+CREATE INDEX idx_investor_total_invested ON Investors(total_invested);
+CREATE INDEX idx_funding_investor_amount ON Funding(investor_id, amount);
+CREATE INDEX idx_funding_startup_recent ON Funding(startup_id, funding_date DESC, funding_id DESC);
+CREATE INDEX idx_funding_investor_recent ON Funding(investor_id, funding_date DESC, funding_id DESC);
+CREATE INDEX idx_startup_unfunded_amount ON Startups(is_funded, funding_required);
+CREATE FULLTEXT INDEX ft_startup_search ON Startups(name, description, location);
+CREATE FULLTEXT INDEX ft_investor_search ON Investors(name, location);
 
 -- ============================================
 -- Sample Data for Testing
@@ -143,6 +315,29 @@ INSERT INTO Investors (name, email, password_hash, investment_min, investment_ma
     ('Kalaari Capital', 'hello@kalaari.com', '$2b$12$TdFf3dS5P.X5GyS8', 1000000.00, 5000000.00, '1,4', '+91-9876543213', 'Bangalore'),
     ('Blume Ventures', 'contact@blume.vc', '$2b$12$UeGg4eT6Q.Y6HzT9', 1500000.00, 8000000.00, '3,4,5', '+91-9876543214', 'Mumbai');
 
+-- Normalize preferred domains into InvestorDomains
+INSERT INTO InvestorDomains (investor_id, domain_id) VALUES
+    (1, 1), (1, 2), (1, 5),
+    (2, 1), (2, 3),
+    (3, 2), (3, 5),
+    (4, 1), (4, 4),
+    (5, 3), (5, 4), (5, 5);
+
+-- Schema already includes these migrations
+INSERT INTO SchemaMigrations (version) VALUES
+    ('001_investor_domains'),
+    ('002_match_materialization'),
+    ('003_funding_aggregates'),
+    ('004_reference_data_versions'),
+    ('005_report_rollups'),
+    ('006_funding_keyset_indexes'),
+    ('007_full_text_search'),
+    ('008_funding_insert_statement_triggers'),
+    ('009_setup_markers'),
+    ('010_login_throttle'),
+    ('011_access_path_indexes'),
+    ('012_email_case_unique');
+
 -- Insert Sample Funding Records
 INSERT INTO Funding (investor_id, startup_id, amount, funding_date, funding_round, notes) VALUES
     (1, 1, 5000000.00, '2024-06-15', 'Seed', 'Impressed by AI capabilities'),
@@ -154,10 +349,21 @@ INSERT INTO Funding (investor_id, startup_id, amount, funding_date, funding_roun
 -- Update funded status
 UPDATE Startups SET is_funded = TRUE WHERE startup_id IN (1, 2, 3, 4, 5);
 
--- Update investor portfolio size
-UPDATE Investors i SET portfolio_size = (
-    SELECT COUNT(*) FROM Funding f WHERE f.investor_id = i.investor_id
-);
+-- Funding totals (the sample rows are loaded before the triggers exist)
+UPDATE Startups s SET total_funding_received = COALESCE((
+    SELECT SUM(f.amount) FROM Funding f WHERE f.startup_id = s.startup_id
+), 0);
+
+UPDATE Investors i SET
+    total_invested = COALESCE((
+        SELECT SUM(f.amount) FROM Funding f WHERE f.investor_id = i.investor_id
+    ), 0),
+    startups_funded = (
+        SELECT COUNT(DISTINCT f.startup_id) FROM Funding f WHERE f.investor_id = i.investor_id
+    ),
+    portfolio_size = (
+        SELECT COUNT(*) FROM Funding f WHERE f.investor_id = i.investor_id
+    );
 
 -- Insert Sample Matches
 INSERT INTO Matches (investor_id, startup_id, match_score, match_reason) VALUES
@@ -179,11 +385,9 @@ SELECT
     s.funding_required,
     s.location,
     s.is_funded,
-    COALESCE(SUM(f.amount), 0) AS total_funding_received
+    s.total_funding_received
 FROM Startups s
-JOIN Domains d ON s.domain_id = d.domain_id
-LEFT JOIN Funding f ON s.startup_id = f.startup_id
-GROUP BY s.startup_id;
+JOIN Domains d ON s.domain_id = d.domain_id;
 
 CREATE VIEW v_investor_portfolio AS
 SELECT 
@@ -192,10 +396,332 @@ SELECT
     i.investment_min,
     i.investment_max,
     i.portfolio_size,
-    COALESCE(SUM(f.amount), 0) AS total_invested
-FROM Investors i
-LEFT JOIN Funding f ON i.investor_id = f.investor_id
-GROUP BY i.investor_id;
+    i.total_invested
+FROM Investors i;
+
+-- ============================================
+-- Triggers: Funding totals on Startups/Investors (delta, no recount)
+-- ============================================
+
+DELIMITER //
+
+-- Add (p_sign = 1) or remove (p_sign = -1) one Funding row from the totals
+CREATE PROCEDURE apply_funding_delta(
+    IN p_funding_id INT,
+    IN p_investor_id INT,
+    IN p_startup_id INT,
+    IN p_amount DECIMAL(15,2),
+    IN p_sign INT
+)
+BEGIN
+    DECLARE v_other_rows INT;
+
+    UPDATE Startups
+    SET total_funding_received = total_funding_received + p_sign * p_amount
+    WHERE startup_id = p_startup_id;
+
+    -- Locks the investor row first; the locking read below then sees every
+    -- committed Funding row of concurrent transactions for this investor
+    UPDATE Investors
+    SET total_invested = total_invested + p_sign * p_amount,
+        portfolio_size = portfolio_size + p_sign
+    WHERE investor_id = p_investor_id;
+
+    -- startups_funded only moves for the first / last row of a pair
+    SELECT COUNT(*) INTO v_other_rows
+    FROM Funding
+    WHERE investor_id = p_investor_id
+      AND startup_id = p_startup_id
+      AND funding_id <> p_funding_id
+    FOR SHARE;
+
+    IF v_other_rows = 0 THEN
+        UPDATE Investors
+        SET startups_funded = startups_funded + p_sign
+        WHERE investor_id = p_investor_id;
+    END IF;
+END//
+
+-- Rows written by funding_ingest.py (@funding_ingest set) are applied per chunk
+CREATE TRIGGER trg_funding_totals_insert
+AFTER INSERT ON Funding
+FOR EACH ROW
+BEGIN
+    IF @funding_ingest IS NULL THEN
+        CALL apply_funding_delta(NEW.funding_id, NEW.investor_id, NEW.startup_id, NEW.amount, 1);
+    END IF;
+END//
+
+CREATE TRIGGER trg_funding_totals_update
+AFTER UPDATE ON Funding
+FOR EACH ROW
+BEGIN
+    IF NOT (OLD.investor_id <=> NEW.investor_id
+            AND OLD.startup_id <=> NEW.startup_id
+            AND OLD.amount <=> NEW.amount) THEN
+        CALL apply_funding_delta(OLD.funding_id, OLD.investor_id, OLD.startup_id, OLD.amount, -1);
+        CALL apply_funding_delta(NEW.funding_id, NEW.investor_id, NEW.startup_id, NEW.amount, 1);
+    END IF;
+END//
+
+CREATE TRIGGER trg_funding_totals_delete
+AFTER DELETE ON Funding
+FOR EACH ROW
+BEGIN
+    CALL apply_funding_delta(OLD.funding_id, OLD.investor_id, OLD.startup_id, OLD.amount, -1);
+END//
+
+-- MySQL does not fire triggers for ON DELETE CASCADE, so take the
+-- cascaded Funding rows off the other side's totals up front
+CREATE TRIGGER trg_startup_delete_funding_totals
+BEFORE DELETE ON Startups
+FOR EACH ROW
+BEGIN
+    UPDATE Investors i
+    JOIN (SELECT investor_id, SUM(amount) AS amount, COUNT(*) AS deals
+          FROM Funding
+          WHERE startup_id = OLD.startup_id
+          GROUP BY investor_id) f ON f.investor_id = i.investor_id
+    SET i.total_invested = i.total_invested - f.amount,
+        i.portfolio_size = i.portfolio_size - f.deals,
+        i.startups_funded = i.startups_funded - 1;
+END//
+
+CREATE TRIGGER trg_investor_delete_funding_totals
+BEFORE DELETE ON Investors
+FOR EACH ROW
+BEGIN
+    UPDATE Startups s
+    JOIN (SELECT startup_id, SUM(amount) AS amount
+          FROM Funding
+          WHERE investor_id = OLD.investor_id
+          GROUP BY startup_id) f ON f.startup_id = s.startup_id
+    SET s.total_funding_received = s.total_funding_received - f.amount;
+END//
+
+DELIMITER ;
+
+-- ============================================
+-- Triggers: queue Matches refreshes
+-- ============================================
+
+DELIMITER //
+
+CREATE TRIGGER trg_startup_match_insert
+AFTER INSERT ON Startups
+FOR EACH ROW
+BEGIN
+    INSERT IGNORE INTO MatchRefreshQueue (entity_type, entity_id) VALUES ('startup', NEW.startup_id);
+END//
+
+-- Also fires when RecordFunding marks the startup funded
+CREATE TRIGGER trg_startup_match_update
+AFTER UPDATE ON Startups
+FOR EACH ROW
+BEGIN
+    IF NOT (OLD.funding_required <=> NEW.funding_required
+            AND OLD.domain_id <=> NEW.domain_id
+            AND OLD.is_funded <=> NEW.is_funded
+            AND OLD.founded_date <=> NEW.founded_date) THEN
+        INSERT IGNORE INTO MatchRefreshQueue (entity_type, entity_id) VALUES ('startup', NEW.startup_id);
+    END IF;
+END//
+
+CREATE TRIGGER trg_investor_match_insert
+AFTER INSERT ON Investors
+FOR EACH ROW
+BEGIN
+    INSERT IGNORE INTO MatchRefreshQueue (entity_type, entity_id) VALUES ('investor', NEW.investor_id);
+END//
+
+-- portfolio_size changes the investor's rank in every startup list
+CREATE TRIGGER trg_investor_match_update
+AFTER UPDATE ON Investors
+FOR EACH ROW
+BEGIN
+    IF NOT (OLD.investment_min <=> NEW.investment_min
+            AND OLD.investment_max <=> NEW.investment_max
+            AND OLD.portfolio_size <=> NEW.portfolio_size) THEN
+        INSERT IGNORE INTO MatchRefreshQueue (entity_type, entity_id) VALUES ('investor', NEW.investor_id);
+    END IF;
+END//
+
+CREATE TRIGGER trg_investor_domains_match_insert
+AFTER INSERT ON InvestorDomains
+FOR EACH ROW
+BEGIN
+    INSERT IGNORE INTO MatchRefreshQueue (entity_type, entity_id) VALUES ('investor', NEW.investor_id);
+END//
+
+CREATE TRIGGER trg_investor_domains_match_delete
+AFTER DELETE ON InvestorDomains
+FOR EACH ROW
+BEGIN
+    INSERT IGNORE INTO MatchRefreshQueue (entity_type, entity_id) VALUES ('investor', OLD.investor_id);
+END//
+
+DELIMITER ;
+
+-- ============================================
+-- Triggers: reference data versions (reference_cache.py)
+-- ============================================
+
+DELIMITER //
+
+CREATE TRIGGER trg_domains_version_insert
+AFTER INSERT ON Domains
+FOR EACH ROW
+BEGIN
+    UPDATE ReferenceDataVersions SET version = version + 1 WHERE table_name = 'Domains';
+END//
+
+CREATE TRIGGER trg_domains_version_update
+AFTER UPDATE ON Domains
+FOR EACH ROW
+BEGIN
+    UPDATE ReferenceDataVersions SET version = version + 1 WHERE table_name = 'Domains';
+END//
+
+CREATE TRIGGER trg_domains_version_delete
+AFTER DELETE ON Domains
+FOR EACH ROW
+BEGIN
+    UPDATE ReferenceDataVersions SET version = version + 1 WHERE table_name = 'Domains';
+END//
+
+DELIMITER ;
+
+-- ============================================
+-- Triggers: report rollup deltas (report_rollups.py)
+-- ============================================
+
+DELIMITER //
+
+-- MySQL does not fire triggers for ON DELETE CASCADE, so the Startups and
+-- Investors delete triggers log the Funding rows that go with them
+CREATE TRIGGER trg_funding_report_insert
+AFTER INSERT ON Funding
+FOR EACH ROW
+BEGIN
+    IF @funding_ingest IS NULL THEN
+        INSERT INTO ReportRollupDeltas (kind, sign, investor_id, startup_id, domain_id, location,
+                                        funding_date, amount)
+        SELECT 'funding', 1, NEW.investor_id, NEW.startup_id, s.domain_id, s.location,
+               NEW.funding_date, NEW.amount
+        FROM Startups s
+        WHERE s.startup_id = NEW.startup_id;
+    END IF;
+END//
+
+CREATE TRIGGER trg_funding_report_update
+AFTER UPDATE ON Funding
+FOR EACH ROW
+BEGIN
+    IF NOT (OLD.investor_id <=> NEW.investor_id
+            AND OLD.startup_id <=> NEW.startup_id
+            AND OLD.amount <=> NEW.amount
+            AND OLD.funding_date <=> NEW.funding_date) THEN
+        INSERT INTO ReportRollupDeltas (kind, sign, investor_id, startup_id, domain_id, location,
+                                        funding_date, amount)
+        SELECT 'funding', -1, OLD.investor_id, OLD.startup_id, s.domain_id, s.location,
+               OLD.funding_date, OLD.amount
+        FROM Startups s
+        WHERE s.startup_id = OLD.startup_id;
+        INSERT INTO ReportRollupDeltas (kind, sign, investor_id, startup_id, domain_id, location,
+                                        funding_date, amount)
+        SELECT 'funding', 1, NEW.investor_id, NEW.startup_id, s.domain_id, s.location,
+               NEW.funding_date, NEW.amount
+        FROM Startups s
+        WHERE s.startup_id = NEW.startup_id;
+    END IF;
+END//
+
+CREATE TRIGGER trg_funding_report_delete
+AFTER DELETE ON Funding
+FOR EACH ROW
+BEGIN
+    INSERT INTO ReportRollupDeltas (kind, sign, investor_id, startup_id, domain_id, location,
+                                    funding_date, amount)
+    SELECT 'funding', -1, OLD.investor_id, OLD.startup_id, s.domain_id, s.location,
+           OLD.funding_date, OLD.amount
+    FROM Startups s
+    WHERE s.startup_id = OLD.startup_id;
+END//
+
+CREATE TRIGGER trg_startup_report_insert
+AFTER INSERT ON Startups
+FOR EACH ROW
+BEGIN
+    INSERT INTO ReportRollupDeltas (kind, sign, startup_id, domain_id, location, is_funded)
+    VALUES ('startup', 1, NEW.startup_id, NEW.domain_id, NEW.location, NEW.is_funded);
+END//
+
+-- A Funding row locks its startup first (trg_funding_totals_insert), so a
+-- domain or location change and a new deal of the same startup never interleave
+CREATE TRIGGER trg_startup_report_update
+AFTER UPDATE ON Startups
+FOR EACH ROW
+BEGIN
+    IF NOT (OLD.domain_id <=> NEW.domain_id
+            AND OLD.location <=> NEW.location
+            AND OLD.is_funded <=> NEW.is_funded) THEN
+        INSERT INTO ReportRollupDeltas (kind, sign, startup_id, domain_id, location, is_funded)
+        VALUES ('startup', -1, OLD.startup_id, OLD.domain_id, OLD.location, OLD.is_funded),
+               ('startup', 1, NEW.startup_id, NEW.domain_id, NEW.location, NEW.is_funded);
+    END IF;
+    -- Its Funding rows move to the new domain/location with it
+    IF NOT (OLD.domain_id <=> NEW.domain_id AND OLD.location <=> NEW.location) THEN
+        INSERT INTO ReportRollupDeltas (kind, sign, investor_id, startup_id, domain_id, location,
+                                        funding_date, amount)
+        SELECT 'funding', -1, f.investor_id, f.startup_id, OLD.domain_id, OLD.location,
+               f.funding_date, f.amount
+        FROM Funding f
+        WHERE f.startup_id = NEW.startup_id;
+        INSERT INTO ReportRollupDeltas (kind, sign, investor_id, startup_id, domain_id, location,
+                                        funding_date, amount)
+        SELECT 'funding', 1, f.investor_id, f.startup_id, NEW.domain_id, NEW.location,
+               f.funding_date, f.amount
+        FROM Funding f
+        WHERE f.startup_id = NEW.startup_id;
+    END IF;
+END//
+
+CREATE TRIGGER trg_startup_report_delete
+BEFORE DELETE ON Startups
+FOR EACH ROW
+BEGIN
+    INSERT INTO ReportRollupDeltas (kind, sign, startup_id, domain_id, location, is_funded)
+    VALUES ('startup', -1, OLD.startup_id, OLD.domain_id, OLD.location, OLD.is_funded);
+    INSERT INTO ReportRollupDeltas (kind, sign, investor_id, startup_id, domain_id, location,
+                                    funding_date, amount)
+    SELECT 'funding', -1, f.investor_id, f.startup_id, OLD.domain_id, OLD.location,
+           f.funding_date, f.amount
+    FROM Funding f
+    WHERE f.startup_id = OLD.startup_id;
+END//
+
+CREATE TRIGGER trg_investor_report_insert
+AFTER INSERT ON Investors
+FOR EACH ROW
+BEGIN
+    INSERT INTO ReportRollupDeltas (kind, sign, investor_id) VALUES ('investor', 1, NEW.investor_id);
+END//
+
+CREATE TRIGGER trg_investor_report_delete
+BEFORE DELETE ON Investors
+FOR EACH ROW
+BEGIN
+    INSERT INTO ReportRollupDeltas (kind, sign, investor_id) VALUES ('investor', -1, OLD.investor_id);
+    INSERT INTO ReportRollupDeltas (kind, sign, investor_id, startup_id, domain_id, location,
+                                    funding_date, amount)
+    SELECT 'funding', -1, f.investor_id, f.startup_id, s.domain_id, s.location,
+           f.funding_date, f.amount
+    FROM Funding f
+    JOIN Startups s ON s.startup_id = f.startup_id
+    WHERE f.investor_id = OLD.investor_id;
+END//
+
+DELIMITER ;
 
 -- ============================================
 -- Database Schema Complete
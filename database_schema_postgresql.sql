@@ -5,6 +5,20 @@
 -- ============================================
 
 -- Drop existing tables if they exist (CASCADE to handle dependencies)
+DROP TABLE IF EXISTS ReportRollupState CASCADE;
+DROP TABLE IF EXISTS ReportRollupDeltas CASCADE;
+DROP TABLE IF EXISTS ReportLocationInvestors CASCADE;
+DROP TABLE IF EXISTS ReportMonthStartups CASCADE;
+DROP TABLE IF EXISTS ReportMonthInvestors CASCADE;
+DROP TABLE IF EXISTS ReportLocationStats CASCADE;
+DROP TABLE IF EXISTS ReportMonthlyFunding CASCADE;
+DROP TABLE IF EXISTS ReportDomainStats CASCADE;
+DROP TABLE IF EXISTS ReferenceDataVersions CASCADE;
+DROP TABLE IF EXISTS MatchRefreshQueue CASCADE;
+DROP TABLE IF EXISTS LoginThrottle CASCADE;
+DROP TABLE IF EXISTS SetupMarkers CASCADE;
+DROP TABLE IF EXISTS SchemaMigrations CASCADE;
+DROP TABLE IF EXISTS InvestorDomains CASCADE;
 DROP TABLE IF EXISTS Matches CASCADE;
 DROP TABLE IF EXISTS Funding CASCADE;
 DROP TABLE IF EXISTS Startups CASCADE;
@@ -45,7 +59,13 @@ CREATE TABLE Startups (
     location VARCHAR(100),
     website VARCHAR(200),
     is_funded BOOLEAN DEFAULT FALSE,
+    total_funding_received NUMERIC(15,2) NOT NULL DEFAULT 0, -- SUM(Funding.amount), kept by triggers
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    search_vector tsvector GENERATED ALWAYS AS ( -- full-text search (search.py)
+        setweight(to_tsvector('english', COALESCE(name, '')), 'A') ||
+        setweight(to_tsvector('english', COALESCE(description, '')), 'B') ||
+        setweight(to_tsvector('english', COALESCE(location, '')), 'C')
+    ) STORED,
     
     FOREIGN KEY (domain_id) REFERENCES Domains(domain_id)
         ON DELETE RESTRICT
@@ -66,7 +86,13 @@ CREATE TABLE Investors (
     phone VARCHAR(20),
     location VARCHAR(100),
     portfolio_size INTEGER DEFAULT 0,
+    total_invested NUMERIC(15,2) NOT NULL DEFAULT 0, -- SUM(Funding.amount), kept by triggers
+    startups_funded INTEGER NOT NULL DEFAULT 0, -- COUNT(DISTINCT Funding.startup_id), kept by triggers
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    search_vector tsvector GENERATED ALWAYS AS ( -- full-text search (search.py)
+        setweight(to_tsvector('english', COALESCE(name, '')), 'A') ||
+        setweight(to_tsvector('english', COALESCE(location, '')), 'C')
+    ) STORED,
     
     CONSTRAINT check_investment_range CHECK (investment_max >= investment_min)
 );
@@ -114,15 +140,171 @@ CREATE TABLE Matches (
     CONSTRAINT unique_match UNIQUE (investor_id, startup_id)
 );
 
+-- ============================================
+-- Table: InvestorDomains (Investor ↔ Domain preferences)
+-- Normalized copy of Investors.preferred_domains used by matchmaking
+-- ============================================
+CREATE TABLE InvestorDomains (
+    investor_id INTEGER NOT NULL,
+    domain_id INTEGER NOT NULL,
+    
+    PRIMARY KEY (investor_id, domain_id),
+    FOREIGN KEY (investor_id) REFERENCES Investors(investor_id)
+        ON DELETE CASCADE
+        ON UPDATE CASCADE,
+    FOREIGN KEY (domain_id) REFERENCES Domains(domain_id)
+        ON DELETE CASCADE
+        ON UPDATE CASCADE
+);
+
+-- ============================================
+-- Table: SchemaMigrations (applied by migrate.py)
+-- ============================================
+CREATE TABLE SchemaMigrations (
+    version VARCHAR(100) PRIMARY KEY,
+    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- ============================================
+-- Table: SetupMarkers (one-time startup checks, see bootstrap.py)
+-- ============================================
+CREATE TABLE SetupMarkers (
+    marker VARCHAR(100) PRIMARY KEY,
+    version VARCHAR(100) NOT NULL,
+    recorded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- ============================================
+-- Table: LoginThrottle (login attempt token buckets, see login_throttle.py)
+-- ============================================
+CREATE TABLE LoginThrottle (
+    bucket_key VARCHAR(255) PRIMARY KEY,
+    tokens DOUBLE PRECISION NOT NULL,
+    updated_at DOUBLE PRECISION NOT NULL      -- Unix time of the last change
+);
+
+CREATE INDEX idx_login_throttle_updated ON LoginThrottle (updated_at);
+
+-- ============================================
+-- Table: MatchRefreshQueue (filled by triggers, drained by materialized_matches.py)
+-- ============================================
+CREATE TABLE MatchRefreshQueue (
+    entity_type VARCHAR(10) NOT NULL CHECK (entity_type IN ('startup', 'investor')),
+    entity_id INTEGER NOT NULL,
+    queued_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    
+    PRIMARY KEY (entity_type, entity_id)
+);
+
+-- ============================================
+-- Table: ReferenceDataVersions (bumped by triggers, polled by reference_cache.py)
+-- ============================================
+CREATE TABLE ReferenceDataVersions (
+    table_name VARCHAR(64) PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 1,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+INSERT INTO ReferenceDataVersions (table_name) VALUES ('Domains');
+
+-- ============================================
+-- Report rollups (filled from ReportRollupDeltas by report_rollups.py)
+-- ============================================
+CREATE TABLE ReportDomainStats (
+    domain_id INTEGER PRIMARY KEY,
+    total_startups INTEGER NOT NULL DEFAULT 0,
+    funded_startups INTEGER NOT NULL DEFAULT 0,
+    funding_deals INTEGER NOT NULL DEFAULT 0,
+    total_funding NUMERIC(20,2) NOT NULL DEFAULT 0
+);
+
+CREATE TABLE ReportMonthlyFunding (
+    month CHAR(7) PRIMARY KEY, -- 'YYYY-MM'
+    investments INTEGER NOT NULL DEFAULT 0,
+    total_amount NUMERIC(20,2) NOT NULL DEFAULT 0,
+    active_investors INTEGER NOT NULL DEFAULT 0,
+    startups_funded INTEGER NOT NULL DEFAULT 0
+);
+
+-- '' stands for startups without a location
+CREATE TABLE ReportLocationStats (
+    location VARCHAR(100) PRIMARY KEY,
+    total_startups INTEGER NOT NULL DEFAULT 0,
+    total_investors INTEGER NOT NULL DEFAULT 0,
+    funding_deals INTEGER NOT NULL DEFAULT 0,
+    total_funding NUMERIC(20,2) NOT NULL DEFAULT 0
+);
+
+-- Deals per (group, member) pair: the COUNT(DISTINCT ...) columns above
+-- only move when a pair appears or disappears
+CREATE TABLE ReportMonthInvestors (
+    month CHAR(7) NOT NULL,
+    investor_id INTEGER NOT NULL,
+    deals INTEGER NOT NULL,
+    PRIMARY KEY (month, investor_id)
+);
+
+CREATE TABLE ReportMonthStartups (
+    month CHAR(7) NOT NULL,
+    startup_id INTEGER NOT NULL,
+    deals INTEGER NOT NULL,
+    PRIMARY KEY (month, startup_id)
+);
+
+CREATE TABLE ReportLocationInvestors (
+    location VARCHAR(100) NOT NULL,
+    investor_id INTEGER NOT NULL,
+    deals INTEGER NOT NULL,
+    PRIMARY KEY (location, investor_id)
+);
+
+-- One row per change: +1 / -1 of a Funding row, Startup or Investor, with the
+-- attributes it is grouped by at the time of the change
+CREATE TABLE ReportRollupDeltas (
+    delta_id BIGSERIAL PRIMARY KEY,
+    kind VARCHAR(10) NOT NULL CHECK (kind IN ('funding', 'startup', 'investor')),
+    sign SMALLINT NOT NULL CHECK (sign IN (-1, 1)),
+    investor_id INTEGER,
+    startup_id INTEGER,
+    domain_id INTEGER,
+    location VARCHAR(100),
+    is_funded BOOLEAN,
+    funding_date DATE,
+    amount NUMERIC(15,2),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- rebuilt_at IS NULL makes the next refresh run a full rebuild
+CREATE TABLE ReportRollupState (
+    rollup_name VARCHAR(30) PRIMARY KEY,
+    total_investors INTEGER NOT NULL DEFAULT 0,
+    rebuilt_at TIMESTAMP,
+    refreshed_at TIMESTAMP
+);
+
+INSERT INTO ReportRollupState (rollup_name) VALUES ('reports');
+
 -- ============================================
 -- Indexes for Performance (Student 1)
 -- ============================================
 CREATE INDEX idx_startup_domain ON Startups(domain_id);
-CREATE INDEX idx_startup_funded ON Startups(is_funded);
 CREATE INDEX idx_investor_investment_range ON Investors(investment_min, investment_max);
-CREATE INDEX idx_funding_investor ON Funding(investor_id);
-CREATE INDEX idx_funding_startup ON Funding(startup_id);
+CREATE INDEX idx_funding_investor_startup ON Funding(investor_id, startup_id);
 CREATE INDEX idx_matches_score ON Matches(match_score DESC);
+CREATE INDEX idx_investor_domains_domain ON InvestorDomains(domain_id, investor_id);
+CREATE INDEX idx_investor_rank ON Investors(portfolio_size, investor_id);
+CREATE INDEX idx_startup_unfunded_recent ON Startups(is_funded, founded_date DESC, startup_id);
+CREATE INDEX idx_matches_startup_score ON Matches(startup_id, match_score DESC);
+CREATE INDEX idx_matches_investor_score ON Matches(investor_id, match_score DESC);
+CREATE INDEX idx_investor_total_invested ON Investors(total_invested);
+CREATE INDEX idx_funding_investor_amount ON Funding(investor_id, amount);
+CREATE INDEX idx_funding_startup_recent ON Funding(startup_id, funding_date DESC, funding_id DESC);
+CREATE INDEX idx_funding_investor_recent ON Funding(investor_id, funding_date DESC, funding_id DESC);
+CREATE INDEX idx_startup_unfunded_amount ON Startups(funding_required) WHERE is_funded = FALSE;
+CREATE UNIQUE INDEX idx_startup_email_lower_unique ON Startups(LOWER(email));
+CREATE UNIQUE INDEX idx_investor_email_lower_unique ON Investors(LOWER(email));
+CREATE INDEX idx_startup_search ON Startups USING GIN (search_vector);
+CREATE INDEX idx_investor_search ON Investors USING GIN (search_vector);
 
 -- ============================================
 -- Sample Data for Testing
@@ -144,6 +326,29 @@ INSERT INTO Investors (name, email, password_hash, investment_min, investment_ma
     ('Kalaari Capital', 'hello@kalaari.com', '$2b$12$TdFf3dS5P.X5GyS8', 1000000.00, 5000000.00, '1,4', '+91-9876543213', 'Bangalore'),
     ('Blume Ventures', 'contact@blume.vc', '$2b$12$UeGg4eT6Q.Y6HzT9', 1500000.00, 8000000.00, '3,4,5', '+91-9876543214', 'Mumbai');
 
+-- Normalize preferred domains into InvestorDomains
+INSERT INTO InvestorDomains (investor_id, domain_id) VALUES
+    (1, 1), (1, 2), (1, 5),
+    (2, 1), (2, 3),
+    (3, 2), (3, 5),
+    (4, 1), (4, 4),
+    (5, 3), (5, 4), (5, 5);
+
+-- Schema already includes these migrations
+INSERT INTO SchemaMigrations (version) VALUES
+    ('001_investor_domains'),
+    ('002_match_materialization'),
+    ('003_funding_aggregates'),
+    ('004_reference_data_versions'),
+    ('005_report_rollups'),
+    ('006_funding_keyset_indexes'),
+    ('007_full_text_search'),
+    ('008_funding_insert_statement_triggers'),
+    ('009_setup_markers'),
+    ('010_login_throttle'),
+    ('011_access_path_indexes'),
+    ('012_email_case_unique');
+
 -- Insert Sample Funding Records
 INSERT INTO Funding (investor_id, startup_id, amount, funding_date, funding_round, notes) VALUES
     (1, 1, 5000000.00, '2024-06-15', 'Seed', 'Impressed by AI capabilities'),
@@ -155,10 +360,21 @@ INSERT INTO Funding (investor_id, startup_id, amount, funding_date, funding_roun
 -- Update funded status
 UPDATE Startups SET is_funded = TRUE WHERE startup_id IN (1, 2, 3, 4, 5);
 
--- Update investor portfolio size
-UPDATE Investors i SET portfolio_size = (
-    SELECT COUNT(*) FROM Funding f WHERE f.investor_id = i.investor_id
-);
+-- Funding totals (the sample rows are loaded before the triggers exist)
+UPDATE Startups s SET total_funding_received = COALESCE((
+    SELECT SUM(f.amount) FROM Funding f WHERE f.startup_id = s.startup_id
+), 0);
+
+UPDATE Investors i SET
+    total_invested = COALESCE((
+        SELECT SUM(f.amount) FROM Funding f WHERE f.investor_id = i.investor_id
+    ), 0),
+    startups_funded = (
+        SELECT COUNT(DISTINCT f.startup_id) FROM Funding f WHERE f.investor_id = i.investor_id
+    ),
+    portfolio_size = (
+        SELECT COUNT(*) FROM Funding f WHERE f.investor_id = i.investor_id
+    );
 
 -- Insert Sample Matches
 INSERT INTO Matches (investor_id, startup_id, match_score, match_reason) VALUES
@@ -180,11 +396,9 @@ SELECT
     s.funding_required,
     s.location,
     s.is_funded,
-    COALESCE(SUM(f.amount), 0) AS total_funding_received
+    s.total_funding_received
 FROM Startups s
-JOIN Domains d ON s.domain_id = d.domain_id
-LEFT JOIN Funding f ON s.startup_id = f.startup_id
-GROUP BY s.startup_id, s.name, d.domain_name, s.funding_required, s.location, s.is_funded;
+JOIN Domains d ON s.domain_id = d.domain_id;
 
 CREATE VIEW v_investor_portfolio AS
 SELECT 
@@ -193,10 +407,8 @@ SELECT
     i.investment_min,
     i.investment_max,
     i.portfolio_size,
-    COALESCE(SUM(f.amount), 0) AS total_invested
-FROM Investors i
-LEFT JOIN Funding f ON i.investor_id = f.investor_id
-GROUP BY i.investor_id, i.name, i.investment_min, i.investment_max, i.portfolio_size;
+    i.total_invested
+FROM Investors i;
 
 -- ============================================
 -- PostgreSQL-Specific Enhancements
@@ -208,10 +420,16 @@ COMMENT ON TABLE Startups IS 'Stores startup information and funding requirement
 COMMENT ON TABLE Investors IS 'Stores investor profiles and investment preferences';
 COMMENT ON TABLE Funding IS 'Records actual funding transactions';
 COMMENT ON TABLE Matches IS 'Stores potential investor-startup matches based on criteria';
+COMMENT ON TABLE InvestorDomains IS 'Preferred domains per investor (normalized preferred_domains)';
+COMMENT ON TABLE MatchRefreshQueue IS 'Startups/investors whose Matches rows need recomputing';
+COMMENT ON TABLE ReferenceDataVersions IS 'Change counter per cached reference table (see reference_cache.py)';
+COMMENT ON COLUMN Startups.total_funding_received IS 'SUM(Funding.amount), maintained by trg_funding_totals';
+COMMENT ON COLUMN Investors.total_invested IS 'SUM(Funding.amount), maintained by trg_funding_totals';
+COMMENT ON COLUMN Investors.startups_funded IS 'COUNT(DISTINCT Funding.startup_id), maintained by trg_funding_totals';
 
 -- Add comments to important columns
 COMMENT ON COLUMN Startups.funding_required IS 'Amount of funding required in INR';
-COMMENT ON COLUMN Investors.preferred_domains IS 'Comma-separated list of domain IDs';
+COMMENT ON COLUMN Investors.preferred_domains IS 'Comma-separated list of domain IDs (display copy of InvestorDomains)';
 COMMENT ON COLUMN Matches.match_score IS 'Compatibility score from 0-100';
 
 -- ============================================
@@ -229,7 +447,6 @@ DECLARE
     v_investment_min NUMERIC;
     v_investment_max NUMERIC;
     v_startup_domain INTEGER;
-    v_preferred_domains VARCHAR;
 BEGIN
     -- Get startup details
     SELECT funding_required, domain_id 
@@ -237,8 +454,8 @@ BEGIN
     FROM Startups WHERE startup_id = p_startup_id;
     
     -- Get investor details
-    SELECT investment_min, investment_max, preferred_domains
-    INTO v_investment_min, v_investment_max, v_preferred_domains
+    SELECT investment_min, investment_max
+    INTO v_investment_min, v_investment_max
     FROM Investors WHERE investor_id = p_investor_id;
     
     -- Check if funding required is within investment range
@@ -246,8 +463,9 @@ BEGIN
         v_score := v_score + 50;
     END IF;
     
-    -- Check if domain matches preferred domains
-    IF v_preferred_domains LIKE '%' || v_startup_domain::TEXT || '%' THEN
+    -- Check if domain matches preferred domains (exact id, so 1 never matches 11)
+    IF EXISTS (SELECT 1 FROM InvestorDomains
+               WHERE investor_id = p_investor_id AND domain_id = v_startup_domain) THEN
         v_score := v_score + 50;
     END IF;
     
@@ -272,41 +490,333 @@ $$ LANGUAGE plpgsql;
 -- Triggers (PostgreSQL)
 -- ============================================
 
--- Trigger to update portfolio size when funding is added
-CREATE OR REPLACE FUNCTION update_portfolio_size()
+-- Add (p_sign = 1) or remove (p_sign = -1) one Funding row from the totals
+CREATE OR REPLACE FUNCTION apply_funding_delta(
+    p_funding_id INTEGER,
+    p_investor_id INTEGER,
+    p_startup_id INTEGER,
+    p_amount NUMERIC,
+    p_sign INTEGER
+)
+RETURNS VOID AS $$
+BEGIN
+    UPDATE Startups
+    SET total_funding_received = total_funding_received + p_sign * p_amount
+    WHERE startup_id = p_startup_id;
+
+    -- Locks the investor row first, so the check below sees every
+    -- committed Funding row of concurrent transactions for this investor
+    UPDATE Investors
+    SET total_invested = total_invested + p_sign * p_amount,
+        portfolio_size = portfolio_size + p_sign
+    WHERE investor_id = p_investor_id;
+
+    -- startups_funded only moves for the first / last row of a pair
+    IF NOT EXISTS (
+        SELECT 1 FROM Funding
+        WHERE investor_id = p_investor_id
+          AND startup_id = p_startup_id
+          AND funding_id <> p_funding_id
+    ) THEN
+        UPDATE Investors
+        SET startups_funded = startups_funded + p_sign
+        WHERE investor_id = p_investor_id;
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Trigger to keep the Funding totals up to date (deltas, no recount)
+CREATE OR REPLACE FUNCTION maintain_funding_totals()
 RETURNS TRIGGER AS $$
 BEGIN
-    UPDATE Investors 
-    SET portfolio_size = (
-        SELECT COUNT(*) FROM Funding WHERE investor_id = NEW.investor_id
-    )
-    WHERE investor_id = NEW.investor_id;
-    
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM apply_funding_delta(OLD.funding_id, OLD.investor_id, OLD.startup_id, OLD.amount, -1);
+    END IF;
+    IF TG_OP = 'DELETE' THEN
+        RETURN OLD;
+    END IF;
+
+    PERFORM apply_funding_delta(NEW.funding_id, NEW.investor_id, NEW.startup_id, NEW.amount, 1);
     RETURN NEW;
 END;
 $$ LANGUAGE plpgsql;
 
-CREATE TRIGGER trg_update_portfolio_size
+-- BEFORE, not AFTER: row-level AFTER triggers run once the whole statement
+-- is done, so a multi-row DELETE (e.g. ON DELETE CASCADE) would see every
+-- row of a pair gone at once and miscount startups_funded
+CREATE TRIGGER trg_funding_totals
+BEFORE DELETE OR UPDATE OF investor_id, startup_id, amount ON Funding
+FOR EACH ROW
+EXECUTE FUNCTION maintain_funding_totals();
+
+-- Rows added by one INSERT / COPY statement, applied in one pass: each
+-- touched startup and investor is updated once, however many deals the
+-- statement added. UPDATE and DELETE keep the row triggers of migration 003.
+CREATE OR REPLACE FUNCTION apply_funding_inserts()
+RETURNS TRIGGER AS $$
+BEGIN
+    -- Startups, then investors, each in id order: the order a single-row
+    -- insert locks them in, so concurrent imports and deals cannot deadlock
+    PERFORM 1 FROM Startups
+    WHERE startup_id IN (SELECT startup_id FROM new_funding)
+    ORDER BY startup_id
+    FOR NO KEY UPDATE;
+
+    UPDATE Startups s
+    SET total_funding_received = s.total_funding_received + n.amount,
+        is_funded = TRUE
+    FROM (SELECT startup_id, SUM(amount) AS amount
+          FROM new_funding GROUP BY startup_id) n
+    WHERE s.startup_id = n.startup_id;
+
+    PERFORM 1 FROM Investors
+    WHERE investor_id IN (SELECT investor_id FROM new_funding)
+    ORDER BY investor_id
+    FOR NO KEY UPDATE;
+
+    -- The investors are locked by the statement above, so this one sees
+    -- every committed Funding row of concurrent transactions for them. A
+    -- pair adds to startups_funded when its only Funding rows are new ones.
+    UPDATE Investors i
+    SET total_invested = i.total_invested + n.amount,
+        portfolio_size = i.portfolio_size + n.deals,
+        startups_funded = i.startups_funded + n.startups
+    FROM (SELECT p.investor_id, SUM(p.amount) AS amount, SUM(p.deals) AS deals,
+                 COUNT(*) FILTER (WHERE (SELECT COUNT(*) FROM Funding f
+                                         WHERE f.investor_id = p.investor_id
+                                           AND f.startup_id = p.startup_id) = p.deals) AS startups
+          FROM (SELECT investor_id, startup_id, SUM(amount) AS amount, COUNT(*) AS deals
+                FROM new_funding GROUP BY investor_id, startup_id) p
+          GROUP BY p.investor_id) n
+    WHERE i.investor_id = n.investor_id;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER trg_funding_totals_insert
 AFTER INSERT ON Funding
+REFERENCING NEW TABLE AS new_funding
+FOR EACH STATEMENT
+EXECUTE FUNCTION apply_funding_inserts();
+
+-- Queue startups/investors whose Matches rows need recomputing
+CREATE OR REPLACE FUNCTION queue_startup_match_refresh()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO MatchRefreshQueue (entity_type, entity_id)
+    VALUES ('startup', NEW.startup_id)
+    ON CONFLICT DO NOTHING;
+    
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION queue_investor_match_refresh()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO MatchRefreshQueue (entity_type, entity_id)
+    VALUES ('investor', CASE WHEN TG_OP = 'DELETE' THEN OLD.investor_id ELSE NEW.investor_id END)
+    ON CONFLICT DO NOTHING;
+    
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER trg_startup_match_insert
+AFTER INSERT ON Startups
+FOR EACH ROW
+EXECUTE FUNCTION queue_startup_match_refresh();
+
+-- Fires for trg_update_funded_status too (a Funding row marks the startup funded)
+CREATE TRIGGER trg_startup_match_update
+AFTER UPDATE OF funding_required, domain_id, is_funded, founded_date ON Startups
+FOR EACH ROW
+WHEN (OLD.funding_required IS DISTINCT FROM NEW.funding_required
+      OR OLD.domain_id IS DISTINCT FROM NEW.domain_id
+      OR OLD.is_funded IS DISTINCT FROM NEW.is_funded
+      OR OLD.founded_date IS DISTINCT FROM NEW.founded_date)
+EXECUTE FUNCTION queue_startup_match_refresh();
+
+CREATE TRIGGER trg_investor_match_insert
+AFTER INSERT ON Investors
+FOR EACH ROW
+EXECUTE FUNCTION queue_investor_match_refresh();
+
+-- portfolio_size changes the investor's rank in every startup list
+CREATE TRIGGER trg_investor_match_update
+AFTER UPDATE OF investment_min, investment_max, portfolio_size ON Investors
+FOR EACH ROW
+WHEN (OLD.investment_min IS DISTINCT FROM NEW.investment_min
+      OR OLD.investment_max IS DISTINCT FROM NEW.investment_max
+      OR OLD.portfolio_size IS DISTINCT FROM NEW.portfolio_size)
+EXECUTE FUNCTION queue_investor_match_refresh();
+
+CREATE TRIGGER trg_investor_domains_match
+AFTER INSERT OR DELETE ON InvestorDomains
 FOR EACH ROW
-EXECUTE FUNCTION update_portfolio_size();
+EXECUTE FUNCTION queue_investor_match_refresh();
 
--- Trigger to update startup funded status
-CREATE OR REPLACE FUNCTION update_funded_status()
+-- Bump the cached-table version and NOTIFY the app workers
+-- TG_ARGV[0] is the table name used by the cache (NOTIFY payload)
+CREATE OR REPLACE FUNCTION bump_reference_data_version()
 RETURNS TRIGGER AS $$
 BEGIN
-    UPDATE Startups
-    SET is_funded = TRUE
-    WHERE startup_id = NEW.startup_id;
+    UPDATE ReferenceDataVersions
+    SET version = version + 1, updated_at = CURRENT_TIMESTAMP
+    WHERE table_name = TG_ARGV[0];
+
+    -- Delivered when the transaction commits
+    PERFORM pg_notify('reference_data', TG_ARGV[0]);
     
-    RETURN NEW;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER trg_domains_reference_version
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON Domains
+FOR EACH STATEMENT
+EXECUTE FUNCTION bump_reference_data_version('Domains');
+
+-- Report rollup deltas (report_rollups.py)
+CREATE OR REPLACE FUNCTION queue_funding_report_delta()
+RETURNS TRIGGER AS $$
+BEGIN
+    -- During ON DELETE CASCADE the parent row is already gone and its own
+    -- trigger has logged the Funding rows, so nothing is logged here
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        INSERT INTO ReportRollupDeltas (kind, sign, investor_id, startup_id, domain_id, location,
+                                        funding_date, amount)
+        SELECT 'funding', -1, OLD.investor_id, OLD.startup_id, s.domain_id, s.location,
+               OLD.funding_date, OLD.amount
+        FROM Startups s
+        WHERE s.startup_id = OLD.startup_id
+          AND EXISTS (SELECT 1 FROM Investors i WHERE i.investor_id = OLD.investor_id);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO ReportRollupDeltas (kind, sign, investor_id, startup_id, domain_id, location,
+                                        funding_date, amount)
+        SELECT 'funding', 1, NEW.investor_id, NEW.startup_id, s.domain_id, s.location,
+               NEW.funding_date, NEW.amount
+        FROM Startups s
+        WHERE s.startup_id = NEW.startup_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION queue_funding_report_inserts()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO ReportRollupDeltas (kind, sign, investor_id, startup_id, domain_id, location,
+                                    funding_date, amount)
+    SELECT 'funding', 1, n.investor_id, n.startup_id, s.domain_id, s.location,
+           n.funding_date, n.amount
+    FROM new_funding n
+    JOIN Startups s ON s.startup_id = n.startup_id;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION queue_startup_report_delta()
+RETURNS TRIGGER AS $$
+DECLARE
+    v_moved BOOLEAN := TG_OP = 'DELETE'
+        OR (TG_OP = 'UPDATE' AND (OLD.domain_id IS DISTINCT FROM NEW.domain_id
+                                  OR OLD.location IS DISTINCT FROM NEW.location));
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        INSERT INTO ReportRollupDeltas (kind, sign, startup_id, domain_id, location, is_funded)
+        VALUES ('startup', -1, OLD.startup_id, OLD.domain_id, OLD.location, OLD.is_funded);
+    END IF;
+    -- Its Funding rows leave the old domain/location with it
+    IF v_moved THEN
+        INSERT INTO ReportRollupDeltas (kind, sign, investor_id, startup_id, domain_id, location,
+                                        funding_date, amount)
+        SELECT 'funding', -1, f.investor_id, f.startup_id, OLD.domain_id, OLD.location,
+               f.funding_date, f.amount
+        FROM Funding f
+        WHERE f.startup_id = OLD.startup_id;
+    END IF;
+    IF TG_OP = 'DELETE' THEN
+        RETURN OLD;
+    END IF;
+
+    INSERT INTO ReportRollupDeltas (kind, sign, startup_id, domain_id, location, is_funded)
+    VALUES ('startup', 1, NEW.startup_id, NEW.domain_id, NEW.location, NEW.is_funded);
+    IF v_moved THEN
+        INSERT INTO ReportRollupDeltas (kind, sign, investor_id, startup_id, domain_id, location,
+                                        funding_date, amount)
+        SELECT 'funding', 1, f.investor_id, f.startup_id, NEW.domain_id, NEW.location,
+               f.funding_date, f.amount
+        FROM Funding f
+        WHERE f.startup_id = NEW.startup_id;
+    END IF;
+    RETURN NULL;
 END;
 $$ LANGUAGE plpgsql;
 
-CREATE TRIGGER trg_update_funded_status
+CREATE OR REPLACE FUNCTION queue_investor_report_delta()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO ReportRollupDeltas (kind, sign, investor_id) VALUES ('investor', 1, NEW.investor_id);
+        RETURN NULL;
+    END IF;
+
+    INSERT INTO ReportRollupDeltas (kind, sign, investor_id) VALUES ('investor', -1, OLD.investor_id);
+    INSERT INTO ReportRollupDeltas (kind, sign, investor_id, startup_id, domain_id, location,
+                                    funding_date, amount)
+    SELECT 'funding', -1, f.investor_id, f.startup_id, s.domain_id, s.location,
+           f.funding_date, f.amount
+    FROM Funding f
+    JOIN Startups s ON s.startup_id = f.startup_id
+    WHERE f.investor_id = OLD.investor_id;
+    RETURN OLD;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER trg_funding_report_delta
+AFTER DELETE OR UPDATE OF investor_id, startup_id, amount, funding_date ON Funding
+FOR EACH ROW
+EXECUTE FUNCTION queue_funding_report_delta();
+
+CREATE TRIGGER trg_funding_report_insert
 AFTER INSERT ON Funding
+REFERENCING NEW TABLE AS new_funding
+FOR EACH STATEMENT
+EXECUTE FUNCTION queue_funding_report_inserts();
+
+CREATE TRIGGER trg_startup_report_insert
+AFTER INSERT ON Startups
 FOR EACH ROW
-EXECUTE FUNCTION update_funded_status();
+EXECUTE FUNCTION queue_startup_report_delta();
+
+-- A Funding insert locks its startup first (apply_funding_inserts), so a domain
+-- or location change and a new deal of the same startup never interleave
+CREATE TRIGGER trg_startup_report_update
+AFTER UPDATE OF domain_id, location, is_funded ON Startups
+FOR EACH ROW
+WHEN (OLD.domain_id IS DISTINCT FROM NEW.domain_id
+      OR OLD.location IS DISTINCT FROM NEW.location
+      OR OLD.is_funded IS DISTINCT FROM NEW.is_funded)
+EXECUTE FUNCTION queue_startup_report_delta();
+
+-- BEFORE: the Funding rows are still there to be logged
+CREATE TRIGGER trg_startup_report_delete
+BEFORE DELETE ON Startups
+FOR EACH ROW
+EXECUTE FUNCTION queue_startup_report_delta();
+
+CREATE TRIGGER trg_investor_report_insert
+AFTER INSERT ON Investors
+FOR EACH ROW
+EXECUTE FUNCTION queue_investor_report_delta();
+
+CREATE TRIGGER trg_investor_report_delete
+BEFORE DELETE ON Investors
+FOR EACH ROW
+EXECUTE FUNCTION queue_investor_report_delta();
 
 -- ============================================
 -- Verification Queries
@@ -322,7 +832,9 @@ SELECT 'Investors', COUNT(*) FROM Investors
 UNION ALL
 SELECT 'Funding', COUNT(*) FROM Funding
 UNION ALL
-SELECT 'Matches', COUNT(*) FROM Matches;
+SELECT 'Matches', COUNT(*) FROM Matches
+UNION ALL
+SELECT 'InvestorDomains', COUNT(*) FROM InvestorDomains;
 
 -- ============================================
 -- Database Schema Complete (PostgreSQL Version)
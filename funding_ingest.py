@@ -0,0 +1,399 @@
+"""
+============================================
+DBMS Project: Funding Ingest
+Bulk import of funding rounds from CSV or JSON Lines
+Works with both MySQL and PostgreSQL
+============================================
+
+The app and the RecordFunding procedure record one deal per statement,
+and every Funding row used to update its startup and investor on its
+own (totals, funded flag, report deltas). Importing a quarter of CRM
+deals that way costs a handful of statements per deal. This module
+loads them in chunks instead:
+
+* Input is CSV with a header row, or JSON Lines (one object per line),
+  with the columns investor_id, startup_id, amount, funding_date
+  (YYYY-MM-DD) and optionally funding_round (default 'Seed') and notes.
+* Each chunk (FUNDING_INGEST_CHUNK_SIZE rows, default 5000) is validated
+  together: field checks in Python, then one lookup per table for the
+  investor and startup ids. Invalid rows are skipped and reported with
+  their line number.
+* The valid rows of a chunk are written and committed as one
+  transaction:
+  - PostgreSQL: one COPY into Funding. The statement-level triggers of
+    migration 008 apply the whole chunk in one pass per table.
+  - MySQL: a multi-row INSERT into a temporary staging table, the same
+    set-based updates run from there, then one INSERT ... SELECT into
+    Funding. @funding_ingest makes the row triggers skip those rows.
+* A chunk the database refuses (e.g. a startup deleted since the lookup)
+  is rolled back and stops the import, as does a file that turns out
+  not to be UTF-8: the report's `failed` entry names the chunk's first
+  line, and the chunks before it stay committed (`loaded`).
+
+    python funding_ingest.py deals.csv
+    python funding_ingest.py deals.jsonl --chunk-size 10000
+    python funding_ingest.py - --format csv < deals.csv
+    python funding_ingest.py deals.csv --dry-run       # validate only
+
+The app accepts the same files at POST /funding/import (see app.py).
+"""
+
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+import time
+from datetime import date
+from decimal import Decimal, InvalidOperation
+
+from database import DB_TYPE, Error, get_db_connection, get_cursor
+from metrics import counter, histogram
+
+CHUNK_SIZE = int(os.environ.get('FUNDING_INGEST_CHUNK_SIZE', 5000))
+MAX_REPORTED_ERRORS = 100
+
+COLUMNS = ('investor_id', 'startup_id', 'amount', 'funding_date', 'funding_round', 'notes')
+REQUIRED_COLUMNS = COLUMNS[:4]
+FORMATS = ('csv', 'jsonl')
+
+CENT = Decimal('0.01')
+MAX_AMOUNT = Decimal('1e13')        # NUMERIC(15,2)
+MAX_ROUND_LENGTH = 20               # Funding.funding_round VARCHAR(20)
+
+LOADED = counter('funding_ingest_rows_total', 'Funding rows read by funding_ingest.py',
+                 labels={'result': 'loaded'})
+REJECTED = counter('funding_ingest_rows_total', 'Funding rows read by funding_ingest.py',
+                   labels={'result': 'rejected'})
+CHUNK_SECONDS = histogram('funding_ingest_chunk_seconds',
+                          'Validation lookups and write of one funding_ingest.py chunk')
+
+# ============================================
+# Reading & Validation
+# ============================================
+
+def detect_format(filename):
+    """'csv' or 'jsonl' from a file name (None if the extension says neither)"""
+    extension = filename.rsplit('.', 1)[-1].lower() if '.' in filename else ''
+    if extension == 'csv':
+        return 'csv'
+    if extension in ('jsonl', 'ndjson'):
+        return 'jsonl'
+    return None
+
+
+def read_records(stream, fmt):
+    """Yield (line number, dict or error message) for every record of a text stream"""
+    if fmt == 'csv':
+        reader = csv.DictReader(stream)
+        missing = [c for c in REQUIRED_COLUMNS if c not in (reader.fieldnames or ())]
+        if missing:
+            raise ValueError(f"CSV header is missing {', '.join(missing)}")
+        line_number = reader.line_num + 1
+        for record in reader:
+            yield line_number, record           # first line of a (multi-line) record
+            line_number = reader.line_num + 1
+    elif fmt == 'jsonl':
+        for line_number, line in enumerate(stream, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line, parse_float=Decimal)
+            except ValueError as e:
+                yield line_number, f"invalid JSON: {e}"
+                continue
+            yield line_number, record if isinstance(record, dict) else "not a JSON object"
+    else:
+        raise ValueError(f"unknown format {fmt!r} (choose from {', '.join(FORMATS)})")
+
+
+def _text(value):
+    return value.strip() if isinstance(value, str) else value
+
+
+def _positive_int(record, column):
+    value = _text(record.get(column))
+    if value in (None, ''):
+        raise ValueError(f"{column} is missing")
+    try:
+        if isinstance(value, bool):
+            raise TypeError
+        number = int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{column} {value!r} is not a whole number") from None
+    if number <= 0 or (isinstance(value, Decimal) and value != number):
+        raise ValueError(f"{column} {value!r} is not a valid id")
+    return number
+
+
+def validate(record):
+    """Funding row tuple (in COLUMNS order) of one input record; raises ValueError"""
+    investor_id = _positive_int(record, 'investor_id')
+    startup_id = _positive_int(record, 'startup_id')
+
+    value = _text(record.get('amount'))
+    if isinstance(value, bool) or value in (None, ''):
+        raise ValueError("amount is missing")
+    try:
+        amount = Decimal(str(value))
+    except InvalidOperation:
+        raise ValueError(f"amount {value!r} is not a number") from None
+    if not amount.is_finite() or amount <= 0 or amount >= MAX_AMOUNT:
+        raise ValueError(f"amount {value!r} is out of range")
+    if amount != amount.quantize(CENT):
+        raise ValueError(f"amount {value!r} has more than 2 decimal places")
+
+    value = _text(record.get('funding_date'))
+    try:
+        funding_date = date.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"funding_date {value!r} is not a YYYY-MM-DD date") from None
+
+    funding_round = _text(record.get('funding_round')) or 'Seed'
+    if not isinstance(funding_round, str) or len(funding_round) > MAX_ROUND_LENGTH:
+        raise ValueError(f"funding_round {funding_round!r} is not text of at most "
+                         f"{MAX_ROUND_LENGTH} characters")
+    notes = record.get('notes') or None
+    if notes is not None and not isinstance(notes, str):
+        raise ValueError("notes is not text")
+
+    return (investor_id, startup_id, amount.quantize(CENT), funding_date, funding_round, notes)
+
+
+def _existing_ids(cursor, table, column, ids):
+    placeholders = ', '.join(['%s'] * len(ids))
+    cursor.execute(f"SELECT {column} FROM {table} WHERE {column} IN ({placeholders})",
+                   tuple(ids))
+    return {row[column] for row in cursor.fetchall()}
+
+# ============================================
+# Writing
+# ============================================
+
+def _copy_chunk(cursor, rows):
+    """PostgreSQL: one COPY statement; migration 008's triggers see it as one statement"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    for row in rows:
+        writer.writerow(row)            # None -> unquoted empty field -> NULL
+    buffer.seek(0)
+    cursor.copy_expert(f"COPY Funding ({', '.join(COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+                       buffer)
+
+
+def _mysql_chunk(cursor, rows):
+    """MySQL: stage the chunk, apply it set-based, then move it into Funding
+
+    MySQL cannot reopen a temporary table within one statement, so every
+    statement below reads funding_ingest_stage once.
+    """
+    cursor.execute("""
+        CREATE TEMPORARY TABLE IF NOT EXISTS funding_ingest_stage (
+            investor_id INT NOT NULL,
+            startup_id INT NOT NULL,
+            amount DECIMAL(15,2) NOT NULL,
+            funding_date DATE NOT NULL,
+            funding_round VARCHAR(20),
+            notes TEXT
+        )
+    """)
+    cursor.execute("DELETE FROM funding_ingest_stage")
+    # mysql.connector folds executemany() INSERTs into one multi-row statement
+    cursor.executemany(f"""
+        INSERT INTO funding_ingest_stage ({', '.join(COLUMNS)})
+        VALUES ({', '.join(['%s'] * len(COLUMNS))})
+    """, rows)
+
+    # Startups, then investors, each in id order (as apply_funding_delta)
+    cursor.execute("""
+        SELECT startup_id FROM Startups
+        WHERE startup_id IN (SELECT startup_id FROM funding_ingest_stage)
+        ORDER BY startup_id FOR UPDATE
+    """)
+    cursor.fetchall()
+    cursor.execute("""
+        UPDATE Startups s
+        JOIN (SELECT startup_id, SUM(amount) AS amount
+              FROM funding_ingest_stage GROUP BY startup_id) n ON n.startup_id = s.startup_id
+        SET s.total_funding_received = s.total_funding_received + n.amount,
+            s.is_funded = TRUE
+    """)
+    cursor.execute("""
+        SELECT investor_id FROM Investors
+        WHERE investor_id IN (SELECT investor_id FROM funding_ingest_stage)
+        ORDER BY investor_id FOR UPDATE
+    """)
+    cursor.fetchall()
+    cursor.execute("""
+        UPDATE Investors i
+        JOIN (SELECT investor_id, SUM(amount) AS amount, COUNT(*) AS deals
+              FROM funding_ingest_stage GROUP BY investor_id) n ON n.investor_id = i.investor_id
+        SET i.total_invested = i.total_invested + n.amount,
+            i.portfolio_size = i.portfolio_size + n.deals
+    """)
+    # Pairs without any Funding row yet; Funding is read with shared locks
+    # here, so rows committed since this transaction's snapshot count too
+    cursor.execute("""
+        UPDATE Investors i
+        JOIN (SELECT p.investor_id, COUNT(*) AS startups
+              FROM (SELECT DISTINCT investor_id, startup_id FROM funding_ingest_stage) p
+              WHERE NOT EXISTS (SELECT 1 FROM Funding f
+                                WHERE f.investor_id = p.investor_id
+                                  AND f.startup_id = p.startup_id)
+              GROUP BY p.investor_id) n ON n.investor_id = i.investor_id
+        SET i.startups_funded = i.startups_funded + n.startups
+    """)
+    cursor.execute("""
+        INSERT INTO ReportRollupDeltas (kind, sign, investor_id, startup_id, domain_id, location,
+                                        funding_date, amount)
+        SELECT 'funding', 1, n.investor_id, n.startup_id, s.domain_id, s.location,
+               n.funding_date, n.amount
+        FROM funding_ingest_stage n
+        JOIN Startups s ON s.startup_id = n.startup_id
+    """)
+    cursor.execute("SET @funding_ingest = 1")
+    try:
+        cursor.execute(f"""
+            INSERT INTO Funding ({', '.join(COLUMNS)})
+            SELECT {', '.join(COLUMNS)} FROM funding_ingest_stage
+        """)
+    finally:
+        # Pooled connections keep session variables
+        cursor.execute("SET @funding_ingest = NULL")
+
+# ============================================
+# Import
+# ============================================
+
+class FundingIngest:
+    """Validates and writes one import, chunk by chunk, on one connection"""
+
+    def __init__(self, conn, chunk_size=CHUNK_SIZE, dry_run=False):
+        self.conn = conn
+        self.chunk_size = chunk_size
+        self.dry_run = dry_run
+        self.report = {'rows': 0, 'loaded': 0, 'rejected': 0, 'chunks': 0,
+                       'seconds': 0.0, 'rows_per_second': 0.0, 'errors': []}
+
+    def _reject(self, line_number, message):
+        self.report['rejected'] += 1
+        REJECTED.inc()
+        if len(self.report['errors']) < MAX_REPORTED_ERRORS:
+            self.report['errors'].append({'line': line_number, 'error': message})
+
+    def _write_chunk(self, chunk):
+        """Check the chunk's ids in one lookup per table, then write the rest"""
+        started = time.perf_counter()
+        cursor = get_cursor(self.conn)
+        try:
+            investors = _existing_ids(cursor, 'Investors', 'investor_id', {r[0] for _, r in chunk})
+            startups = _existing_ids(cursor, 'Startups', 'startup_id', {r[1] for _, r in chunk})
+            rows = []
+            for line_number, row in chunk:
+                if row[0] not in investors:
+                    self._reject(line_number, f"unknown investor_id {row[0]}")
+                elif row[1] not in startups:
+                    self._reject(line_number, f"unknown startup_id {row[1]}")
+                else:
+                    rows.append(row)
+            if rows and not self.dry_run:
+                if DB_TYPE == 'postgresql':
+                    _copy_chunk(cursor, rows)
+                else:
+                    _mysql_chunk(cursor, rows)
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        finally:
+            cursor.close()
+            CHUNK_SECONDS.observe(time.perf_counter() - started)
+        self.report['loaded'] += len(rows)
+        self.report['chunks'] += 1
+        LOADED.inc(len(rows))
+
+    def run(self, records):
+        """Import (line number, dict or error message) records; returns the report"""
+        started = time.perf_counter()
+        chunk = []
+        try:
+            for line_number, record in records:
+                self.report['rows'] += 1
+                if isinstance(record, str):
+                    self._reject(line_number, record)
+                    continue
+                try:
+                    chunk.append((line_number, validate(record)))
+                except ValueError as e:
+                    self._reject(line_number, str(e))
+                    continue
+                if len(chunk) >= self.chunk_size:
+                    self._write_chunk(chunk)
+                    chunk = []
+            if chunk:
+                self._write_chunk(chunk)
+        except (Error, UnicodeDecodeError) as e:
+            # Nothing from this chunk on is written; the chunks before it stay committed
+            self.report['failed'] = {'line': chunk[0][0] if chunk else None,
+                                     'error': str(e).strip()}
+        finally:
+            self.report['errors'].sort(key=lambda error: error['line'])
+            elapsed = time.perf_counter() - started
+            self.report['seconds'] = round(elapsed, 3)
+            self.report['rows_per_second'] = round(self.report['loaded'] / elapsed, 1) if elapsed else 0.0
+        return self.report
+
+
+def ingest(stream, fmt, chunk_size=CHUNK_SIZE, dry_run=False):
+    """Import a CSV / JSON Lines text stream on a pooled connection; returns the report
+
+    Raises ValueError for an unreadable file (e.g. a CSV header without
+    the required columns).
+    """
+    records = read_records(stream, fmt)
+    with get_db_connection() as conn:
+        if not conn:
+            raise RuntimeError("Could not connect to database")
+        return FundingIngest(conn, chunk_size, dry_run).run(records)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Import funding rounds from CSV or JSON Lines')
+    parser.add_argument('path', help="input file, or - for standard input")
+    parser.add_argument('--format', choices=FORMATS, help='default: from the file extension')
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE,
+                        help='rows per validation batch and transaction')
+    parser.add_argument('--dry-run', action='store_true', help='validate without writing')
+    args = parser.parse_args()
+    fmt = args.format or detect_format(args.path)
+    if fmt is None:
+        parser.error("cannot tell the format from the file name; pass --format")
+
+    print("=" * 50)
+    print("📥 Startup Funding System - Funding Ingest")
+    print("=" * 50)
+    stream = sys.stdin if args.path == '-' else open(args.path, newline='', encoding='utf-8')
+    try:
+        report = ingest(stream, fmt, args.chunk_size, args.dry_run)
+    except (ValueError, RuntimeError) as e:
+        print(f"❌ Import failed: {e}")
+        sys.exit(1)
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+    failed = report.get('failed')
+    if failed:
+        where = f" at the chunk starting on line {failed['line']}" if failed['line'] else ''
+        print(f"❌ Import stopped{where}: {failed['error']}")
+    for error in report['errors']:
+        print(f"   ✗ line {error['line']}: {error['error']}")
+    if report['rejected'] > len(report['errors']):
+        print(f"   … and {report['rejected'] - len(report['errors'])} more")
+    verb = 'Validated' if args.dry_run else 'Loaded'
+    status = '❌' if failed else '⚠️ ' if report['rejected'] else '✅'
+    print(f"{status} {verb} {report['loaded']:,} of {report['rows']:,} rows "
+          f"in {report['chunks']} chunks, {report['seconds']:.1f}s "
+          f"({report['rows_per_second']:,.0f} rows/s); {report['rejected']:,} rejected")
+    sys.exit(1 if failed or report['rejected'] else 0)
@@ -0,0 +1,111 @@
+"""
+============================================
+DBMS Project: Funding Pages
+Keyset (seek) pagination for funding history and investor portfolios
+Works with both MySQL and PostgreSQL
+============================================
+
+The startup dashboard's funding history and the investor dashboard's
+portfolio list Funding rows newest first. Instead of reading every row
+(or paging with OFFSET, which still walks all the skipped rows), a page
+starts right after the last row of the previous one:
+
+    WHERE f.startup_id = %s AND (f.funding_date, f.funding_id) < (%s, %s)
+    ORDER BY f.funding_date DESC, f.funding_id DESC
+    LIMIT PAGE_SIZE + 1
+
+funding_id breaks ties between deals of the same day, so no row is shown
+twice or skipped. Migration 006 adds (startup_id, funding_date, funding_id)
+and (investor_id, funding_date, funding_id) indexes, so every page is one
+index range scan of PAGE_SIZE rows, however long the list is.
+
+The dashboards render the first page; later pages come from
+/startup/funding and /investor/portfolio with ?before=<cursor>, where the
+cursor is the "YYYY-MM-DD_<funding_id>" of the last row shown.
+
+The investor dashboard's domain distribution counts the latest
+INSIGHT_DEALS deals (the same index range), so it stays flat too.
+"""
+
+import os
+from datetime import date
+
+from query_registry import fetch_all, register
+
+PAGE_SIZE = int(os.environ.get('FUNDING_PAGE_SIZE', 25))
+INSIGHT_DEALS = int(os.environ.get('FUNDING_INSIGHT_DEALS', 1000))
+
+LISTS = {
+    # Funding history of one startup
+    'startup': """
+        SELECT f.*, i.name AS investor_name
+        FROM Funding f
+        JOIN Investors i ON f.investor_id = i.investor_id
+        WHERE f.startup_id = %s {seek}
+        ORDER BY f.funding_date DESC, f.funding_id DESC
+        LIMIT %s
+    """,
+    # Portfolio of one investor
+    'investor': """
+        SELECT f.*, s.name AS startup_name, s.domain_id
+        FROM Funding f
+        JOIN Startups s ON f.startup_id = s.startup_id
+        WHERE f.investor_id = %s {seek}
+        ORDER BY f.funding_date DESC, f.funding_id DESC
+        LIMIT %s
+    """,
+}
+
+_SEEK = "AND (f.funding_date, f.funding_id) < (%s, %s)"
+
+# Registered as funding.<kind>_page and funding.<kind>_page_before
+for _kind, _sql in LISTS.items():
+    register(f'funding.{_kind}_page', _sql.format(seek=''), prepare=True)
+    register(f'funding.{_kind}_page_before', _sql.format(seek=_SEEK), prepare=True)
+
+register('funding.investor_domain_counts', """
+    SELECT s.domain_id, COUNT(*) AS deals
+    FROM (SELECT startup_id FROM Funding
+          WHERE investor_id = %s
+          ORDER BY funding_date DESC, funding_id DESC
+          LIMIT %s) f
+    JOIN Startups s ON f.startup_id = s.startup_id
+    GROUP BY s.domain_id
+    ORDER BY deals DESC, s.domain_id
+""", prepare=True)
+
+
+def encode_cursor(row):
+    """Cursor pointing just past this row"""
+    return f"{row['funding_date'].isoformat()}_{row['funding_id']}"
+
+
+def decode_cursor(cursor_text):
+    """(funding_date, funding_id) of a cursor; ValueError if it is malformed"""
+    day, _, funding_id = cursor_text.partition('_')
+    return date.fromisoformat(day), int(funding_id)
+
+
+def fetch_page(cursor, kind, owner_id, before=None, page_size=PAGE_SIZE):
+    """One page of a startup's funding history or an investor's portfolio
+
+    Returns (rows, next_cursor); next_cursor is None on the last page.
+    before is a cursor from an earlier page (None for the first page).
+    """
+    params = [owner_id]
+    if before:
+        params.extend(decode_cursor(before))
+    # One extra row tells whether there is a next page
+    params.append(page_size + 1)
+    rows = fetch_all(cursor, f'funding.{kind}_page_before' if before else f'funding.{kind}_page', params)
+
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        return rows, encode_cursor(rows[-1])
+    return rows, None
+
+
+def domain_counts(cursor, investor_id, limit=INSIGHT_DEALS):
+    """[(domain_id, deals)] over an investor's latest `limit` deals, most deals first"""
+    rows = fetch_all(cursor, 'funding.investor_domain_counts', (investor_id, limit))
+    return [(row['domain_id'], row['deals']) for row in rows]
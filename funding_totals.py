@@ -0,0 +1,149 @@
+"""
+============================================
+DBMS Project: Funding Totals Check
+Verifies the trigger-maintained funding totals against a full recount
+Works with both MySQL and PostgreSQL
+============================================
+
+Migration 003 stores running totals next to each row so the dashboards
+and views no longer LEFT JOIN Funding and GROUP BY on every request:
+
+    Startups.total_funding_received   SUM(Funding.amount)
+    Investors.total_invested          SUM(Funding.amount)
+    Investors.startups_funded         COUNT(DISTINCT Funding.startup_id)
+    Investors.portfolio_size          COUNT(Funding rows)
+
+Triggers on Funding apply every change as a delta (on PostgreSQL, one
+set-based pass per INSERT statement, see migration 008). This
+script recounts everything from Funding and reports rows whose stored
+totals differ (e.g. after a bulk load with triggers disabled):
+
+    python funding_totals.py          # report drift, exit 1 if any
+    python funding_totals.py --fix    # also rewrite the drifted rows
+"""
+
+import sys
+import time
+
+from database import get_db_connection, get_cursor
+
+FIX_BATCH_SIZE = 1000
+
+STARTUP_DRIFT_QUERY = """
+    SELECT s.startup_id, s.total_funding_received,
+           COALESCE(f.total, 0) AS expected_total
+    FROM Startups s
+    LEFT JOIN (SELECT startup_id, SUM(amount) AS total
+               FROM Funding GROUP BY startup_id) f ON f.startup_id = s.startup_id
+    WHERE s.total_funding_received <> COALESCE(f.total, 0)
+    ORDER BY s.startup_id
+"""
+
+INVESTOR_DRIFT_QUERY = """
+    SELECT i.investor_id, i.total_invested, i.startups_funded, i.portfolio_size,
+           COALESCE(f.total, 0) AS expected_total,
+           COALESCE(f.startups, 0) AS expected_startups,
+           COALESCE(f.deals, 0) AS expected_deals
+    FROM Investors i
+    LEFT JOIN (SELECT investor_id, SUM(amount) AS total,
+                      COUNT(DISTINCT startup_id) AS startups, COUNT(*) AS deals
+               FROM Funding GROUP BY investor_id) f ON f.investor_id = i.investor_id
+    WHERE i.total_invested <> COALESCE(f.total, 0)
+       OR i.startups_funded <> COALESCE(f.startups, 0)
+       OR COALESCE(i.portfolio_size, -1) <> COALESCE(f.deals, 0)
+    ORDER BY i.investor_id
+"""
+
+# Same recount as the migration backfill, limited to the given ids
+STARTUP_RECOUNT = """
+    UPDATE Startups s SET total_funding_received = COALESCE((
+        SELECT SUM(f.amount) FROM Funding f WHERE f.startup_id = s.startup_id
+    ), 0)
+    WHERE s.startup_id IN ({ids})
+"""
+
+INVESTOR_RECOUNT = """
+    UPDATE Investors i SET
+        total_invested = COALESCE((
+            SELECT SUM(f.amount) FROM Funding f WHERE f.investor_id = i.investor_id
+        ), 0),
+        startups_funded = (
+            SELECT COUNT(DISTINCT f.startup_id) FROM Funding f WHERE f.investor_id = i.investor_id
+        ),
+        portfolio_size = (
+            SELECT COUNT(*) FROM Funding f WHERE f.investor_id = i.investor_id
+        )
+    WHERE i.investor_id IN ({ids})
+"""
+
+
+def check_totals(cursor):
+    """Return (startup_rows, investor_rows) whose stored totals are wrong"""
+    cursor.execute(STARTUP_DRIFT_QUERY)
+    startups = cursor.fetchall()
+    cursor.execute(INVESTOR_DRIFT_QUERY)
+    investors = cursor.fetchall()
+    return startups, investors
+
+
+def _recount(cursor, sql, ids):
+    for start in range(0, len(ids), FIX_BATCH_SIZE):
+        batch = ids[start:start + FIX_BATCH_SIZE]
+        cursor.execute(sql.format(ids=', '.join(['%s'] * len(batch))), tuple(batch))
+
+
+def repair_totals(conn, startups, investors):
+    """Rewrite the drifted rows from a recount of Funding"""
+    cursor = get_cursor(conn)
+    try:
+        _recount(cursor, STARTUP_RECOUNT, [r['startup_id'] for r in startups])
+        _recount(cursor, INVESTOR_RECOUNT, [r['investor_id'] for r in investors])
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+
+
+def run_check(fix=False):
+    """Recount every total; print and optionally fix the drifted rows"""
+    with get_db_connection() as conn:
+        if not conn:
+            print("❌ Could not connect to database")
+            return False
+        cursor = get_cursor(conn)
+        started = time.perf_counter()
+        startups, investors = check_totals(cursor)
+        elapsed = time.perf_counter() - started
+        cursor.close()
+
+        for row in startups[:20]:
+            print(f"  ✗ startup {row['startup_id']}: total_funding_received "
+                  f"{row['total_funding_received']} (recount {row['expected_total']})")
+        for row in investors[:20]:
+            print(f"  ✗ investor {row['investor_id']}: total_invested {row['total_invested']} "
+                  f"(recount {row['expected_total']}), startups_funded {row['startups_funded']} "
+                  f"(recount {row['expected_startups']}), portfolio_size {row['portfolio_size']} "
+                  f"(recount {row['expected_deals']})")
+
+        if not startups and not investors:
+            print(f"✅ Funding totals match a full recount ({elapsed:.2f}s)")
+            return True
+
+        print(f"❌ {len(startups)} startup(s) and {len(investors)} investor(s) "
+              f"have drifted totals ({elapsed:.2f}s)")
+        if not fix:
+            print("   Run `python funding_totals.py --fix` to rewrite them")
+            return False
+
+        repair_totals(conn, startups, investors)
+        print(f"✅ Rewrote totals for {len(startups)} startup(s) and {len(investors)} investor(s)")
+        return True
+
+
+if __name__ == '__main__':
+    print("=" * 50)
+    print("🧮 Startup Funding System - Funding Totals Check")
+    print("=" * 50)
+    sys.exit(0 if run_check(fix='--fix' in sys.argv) else 1)
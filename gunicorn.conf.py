@@ -0,0 +1,28 @@
+"""
+============================================
+DBMS Project: Gunicorn Settings
+Preloaded app factory, workers warmed up before they serve
+Works with both MySQL and PostgreSQL
+============================================
+
+Gunicorn reads this file from the working directory by itself:
+
+    gunicorn 'app:create_app()' --bind 0.0.0.0:$PORT --timeout 120
+
+* preload_app: the master imports app.py and runs create_app() (the
+  one-time database check, template compilation) before forking, so a
+  new worker only forks: it does not import Flask or the drivers again.
+  GUNICORN_PRELOAD=0 turns it off (each worker then imports the app).
+* post_fork: each worker opens its pool connections and loads the
+  reference data before it accepts its first request.
+"""
+
+import os
+
+preload_app = os.environ.get('GUNICORN_PRELOAD', '1') != '0'
+
+
+def post_fork(server, worker):
+    # Connections cannot be shared across a fork: the worker opens its own
+    from app import warm_worker
+    warm_worker()
@@ -0,0 +1,470 @@
+"""
+============================================
+DBMS Project: HTTP Load Test
+Realistic startup / investor sessions against a running server
+Works with both MySQL and PostgreSQL
+============================================
+
+The benchmark_*.py scripts time queries and pages inside one process.
+This drives the real HTTP routes the way users do, through sessions,
+bcrypt logins, dashboards and Jinja rendering, with many users at once.
+Each virtual user is a startup or an investor (--startup-share). It
+registers its own account once, then repeats a session until the run
+ends:
+
+    GET /{kind}/login -> POST /{kind}/login -> GET /{kind}/dashboard
+    (x --dashboard-views) -> GET /logout
+
+A user pauses between pages for a random think time (exponential, mean
+--think-time seconds; 0 sends the next request at once). --ramp-up
+spreads the users' starts. Cookies are kept per user, so the session
+cookie and read-your-writes work as in a browser. Static assets are not
+fetched: browsers cache them for a year (static_assets.py).
+
+A request fails when it cannot connect, times out, or answers another
+status than the route's expected one (302 after a successful register,
+login or logout, 200 for pages). A 503 from a busy password pool counts
+as an error. The report lists, per route and in total, the requests,
+the error rate, the throughput, and p50/p95/p99/max latency.
+
+Results are written as JSON and compared with a stored baseline. A
+route is flagged when its p95 grows or the throughput drops by more
+than --tolerance (default 25%), or the error rate rises by more than
+one percentage point.
+
+    python loadtest.py --start-server --workers 2 --users 20 --duration 60
+    python loadtest.py --url http://127.0.0.1:8000 --startup-share 0.7 --think-time 0.5
+    python loadtest.py --start-server --save-baseline     # accept these numbers
+    python loadtest.py --cleanup                          # delete the load-test accounts
+
+--start-server runs `gunicorn 'app:create_app()'` against the database
+that DATABASE_URL (or the local MySQL) points to. The registered
+accounts (loadtest-*@example.test) stay there until --cleanup.
+"""
+
+import argparse
+import gzip
+import http.client
+import json
+import os
+import random
+import re
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter, defaultdict
+from datetime import datetime
+from http.cookies import SimpleCookie
+from urllib.parse import urlencode, urlsplit
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_OUTPUT = os.path.join(BASE_DIR, 'loadtest_results.json')
+DEFAULT_BASELINE = os.path.join(BASE_DIR, 'loadtest_baseline.json')
+
+EMAIL_PATTERN = 'loadtest-%@example.test'      # SQL LIKE pattern of every load-test account
+PASSWORD = 'loadtest-password'
+REQUEST_TIMEOUT = 30
+SERVER_START_TIMEOUT = 60
+MIN_DELTA_MS = 5.0          # p95 changes below this are noise, never regressions
+MAX_ERROR_RATE_RISE = 0.01
+
+_OPTION = re.compile(r'<option value="(\d+)"')
+
+
+def _percentile(sorted_values, q):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    rank = max(1, int(round(q * len(sorted_values) + 0.5)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+# ============================================
+# Recording
+# ============================================
+
+class Recorder:
+    """Latencies and errors per route, shared by every virtual user"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = defaultdict(list)      # route -> seconds of its successful requests
+        self.errors = defaultdict(Counter)      # route -> Counter of error kinds
+        self.sessions = 0
+        self.first = None
+        self.last = None
+
+    def record(self, route, started, finished, error=None):
+        with self._lock:
+            self.first = started if self.first is None else min(self.first, started)
+            self.last = finished if self.last is None else max(self.last, finished)
+            if error is None:
+                self.latencies[route].append(finished - started)
+            else:
+                self.errors[route][error] += 1
+
+    def session_done(self):
+        with self._lock:
+            self.sessions += 1
+
+    def summary(self):
+        elapsed = (self.last - self.first) if self.first is not None else 0.0
+        routes = {}
+        for route in sorted(set(self.latencies) | set(self.errors)):
+            times = sorted(self.latencies[route])
+            errors = sum(self.errors[route].values())
+            count = len(times) + errors
+            routes[route] = {
+                'requests': count,
+                'errors': errors,
+                'error_rate': round(errors / count, 4) if count else 0.0,
+                'rps': round(count / elapsed, 2) if elapsed else 0.0,
+                'p50_ms': _ms(_percentile(times, 0.50)),
+                'p95_ms': _ms(_percentile(times, 0.95)),
+                'p99_ms': _ms(_percentile(times, 0.99)),
+                'max_ms': _ms(times[-1] if times else None),
+                'error_kinds': dict(self.errors[route]),
+            }
+        requests = sum(r['requests'] for r in routes.values())
+        errors = sum(r['errors'] for r in routes.values())
+        return {
+            'elapsed_s': round(elapsed, 2),
+            'requests': requests,
+            'errors': errors,
+            'error_rate': round(errors / requests, 4) if requests else 0.0,
+            'rps': round(requests / elapsed, 2) if elapsed else 0.0,
+            'sessions': self.sessions,
+            'routes': routes,
+        }
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 2) if seconds is not None else None
+
+# ============================================
+# Virtual Users
+# ============================================
+
+class Browser:
+    """One user's cookies, sending every request through http.client"""
+
+    def __init__(self, url, recorder):
+        parts = urlsplit(url)
+        self.host, self.port = parts.hostname, parts.port or 80
+        self.recorder = recorder
+        self.cookies = {}
+
+    def request(self, method, path, form=None, expect=200, route=None):
+        """Send one request and record it under `route`; return the body, None on failure"""
+        route = route or f"{method} {path.split('?')[0]}"
+        headers = {'User-Agent': 'loadtest.py', 'Accept-Encoding': 'gzip'}
+        if self.cookies:
+            headers['Cookie'] = '; '.join(f'{k}={v}' for k, v in self.cookies.items())
+        body = None
+        if form is not None:
+            body = urlencode(form)
+            headers['Content-Type'] = 'application/x-www-form-urlencoded'
+        started = time.perf_counter()
+        error = None
+        data = None
+        # A new connection per request: gunicorn's sync workers close it anyway
+        conn = http.client.HTTPConnection(self.host, self.port, timeout=REQUEST_TIMEOUT)
+        try:
+            conn.request(method, path, body=body, headers=headers)
+            response = conn.getresponse()
+            data = response.read()
+            if response.getheader('Content-Encoding') == 'gzip':
+                data = gzip.decompress(data)
+            for header in response.headers.get_all('Set-Cookie') or []:
+                for name, morsel in SimpleCookie(header).items():
+                    if morsel['expires'] and not morsel.value:
+                        self.cookies.pop(name, None)       # Flask deletes an emptied session
+                    else:
+                        self.cookies[name] = morsel.value
+            if response.status != expect:
+                error = f'HTTP {response.status}'
+        except socket.timeout:
+            error = 'timeout'
+        except (OSError, http.client.HTTPException) as e:
+            error = type(e).__name__
+        finally:
+            conn.close()
+        self.recorder.record(route, started, time.perf_counter(), error)
+        return data if error is None else None
+
+
+class VirtualUser(threading.Thread):
+    """A startup or investor registering once, then logging in, viewing and leaving"""
+
+    def __init__(self, number, kind, args, run_id, recorder, deadline, start_at):
+        super().__init__(daemon=True)
+        self.kind = kind
+        self.args = args
+        self.rng = random.Random(args.seed * 100003 + number)
+        self.browser = Browser(args.url, recorder)
+        self.recorder = recorder
+        self.deadline = deadline
+        self.start_at = start_at
+        self.email = f'loadtest-{run_id}-{kind}-{number}@example.test'
+        self.full_name = f'Load Test {kind.title()} {run_id}-{number}'
+        self.registered = False
+
+    def think(self):
+        if self.args.think_time > 0:
+            time.sleep(min(self.rng.expovariate(1 / self.args.think_time),
+                           max(0.0, self.deadline - time.monotonic())))
+
+    def running(self):
+        return time.monotonic() < self.deadline
+
+    def register(self):
+        page = self.browser.request('GET', f'/{self.kind}/register')
+        if page is None:
+            return False
+        domain_ids = _OPTION.findall(page.decode('utf-8', 'replace')) or ['1']
+        self.think()
+        if self.kind == 'startup':
+            form = {'name': self.full_name, 'email': self.email, 'password': PASSWORD,
+                    'domain_id': self.rng.choice(domain_ids),
+                    'funding_required': self.rng.randrange(1, 100) * 100000,
+                    'description': 'Created by loadtest.py', 'founded_date': '2024-01-01',
+                    'location': self.rng.choice(['Bangalore', 'Mumbai', 'Pune', 'Delhi']),
+                    'website': ''}
+        else:
+            low = self.rng.randrange(1, 50) * 100000
+            chosen = self.rng.sample(domain_ids, min(len(domain_ids), self.rng.randint(1, 3)))
+            # As investor_register.js submits the multiple select
+            form = {'name': self.full_name, 'email': self.email, 'password': PASSWORD,
+                    'investment_min': low, 'investment_max': low * self.rng.randint(2, 10),
+                    'preferred_domains': ','.join(chosen), 'phone': '',
+                    'location': self.rng.choice(['Bangalore', 'Mumbai', 'Pune', 'Delhi'])}
+        return self.browser.request('POST', f'/{self.kind}/register', form, expect=302) is not None
+
+    def session(self):
+        """One visit; False if a step failed (the rest of the visit is skipped)"""
+        steps = [('GET', f'/{self.kind}/login', None, 200),
+                 ('POST', f'/{self.kind}/login', {'email': self.email, 'password': PASSWORD}, 302)]
+        steps += [('GET', f'/{self.kind}/dashboard', None, 200)] * self.args.dashboard_views
+        steps += [('GET', '/logout', None, 302)]
+        for method, path, form, expect in steps:
+            if not self.running():
+                return False
+            if self.browser.request(method, path, form, expect) is None:
+                self.browser.cookies.clear()
+                return False
+            self.think()
+        return True
+
+    def run(self):
+        time.sleep(max(0.0, self.start_at - time.monotonic()))
+        while self.running():
+            if not self.registered:
+                self.registered = self.register()
+                if not self.registered:
+                    self.think()
+                    continue
+                self.think()
+            if self.session():
+                self.recorder.session_done()
+
+
+def run_load(args):
+    recorder = Recorder()
+    run_id = int(time.time())
+    started = time.monotonic()
+    deadline = started + args.ramp_up + args.duration
+    rng = random.Random(args.seed)
+    users = []
+    for number in range(args.users):
+        kind = 'startup' if rng.random() < args.startup_share else 'investor'
+        start_at = started + (args.ramp_up * number / args.users if args.users else 0)
+        users.append(VirtualUser(number, kind, args, run_id, recorder, deadline, start_at))
+    kinds = Counter(user.kind for user in users)
+    print(f"👥 {args.users} users ({kinds['startup']} startups, {kinds['investor']} investors), "
+          f"{args.duration:g}s after a {args.ramp_up:g}s ramp-up, think time {args.think_time:g}s")
+    for user in users:
+        user.start()
+    for user in users:
+        user.join()
+    return recorder.summary()
+
+
+def print_summary(summary):
+    print(f"\n   {'route':<26}{'requests':>9}{'errors':>8}{'req/s':>8}"
+          f"{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}")
+    for route, stats in summary['routes'].items():
+        times = ''.join(f"{stats[k]:>7,.0f}ms" if stats[k] is not None else f"{'-':>9}"
+                        for k in ('p50_ms', 'p95_ms', 'p99_ms', 'max_ms'))
+        print(f"   {route:<26}{stats['requests']:>9,}{stats['error_rate']:>8.1%}"
+              f"{stats['rps']:>8.1f}{times}")
+        for kind, count in stats['error_kinds'].items():
+            print(f"      ⚠️  {kind}: {count}")
+    print(f"\n   {summary['requests']:,} requests in {summary['elapsed_s']:.1f}s: "
+          f"{summary['rps']:.1f} req/s, {summary['error_rate']:.2%} errors, "
+          f"{summary['sessions']:,} sessions completed")
+
+# ============================================
+# Local Server
+# ============================================
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def start_server(workers):
+    """Start gunicorn on a free port; return (process, url, log file)"""
+    port = _free_port()
+    log = tempfile.NamedTemporaryFile('w+', prefix='loadtest-gunicorn-', suffix='.log', delete=False)
+    command = [sys.executable, '-m', 'gunicorn', 'app:create_app()',
+               '--bind', f'127.0.0.1:{port}', '--workers', str(workers), '--timeout', '120']
+    server = subprocess.Popen(command, cwd=BASE_DIR, stdout=log, stderr=subprocess.STDOUT)
+    deadline = time.monotonic() + SERVER_START_TIMEOUT
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            break
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+            conn.request('GET', '/health/db')
+            status = conn.getresponse().status
+            conn.close()
+            if status == 200:
+                return server, f'http://127.0.0.1:{port}', log.name
+        except OSError:
+            pass
+        time.sleep(0.1)
+    server.terminate()
+    server.wait()
+    log.seek(0)
+    raise RuntimeError(f"gunicorn did not start:\n{log.read()[-2000:]}")
+
+
+def cleanup():
+    """Delete every load-test account (their sessions, matches and domains cascade)"""
+    from database import get_db_connection, get_cursor
+    with get_db_connection() as conn:
+        if not conn:
+            print("❌ Could not connect to database")
+            return False
+        cursor = get_cursor(conn)
+        try:
+            cursor.execute("DELETE FROM Startups WHERE email LIKE %s", (EMAIL_PATTERN,))
+            startups = cursor.rowcount
+            cursor.execute("DELETE FROM Investors WHERE email LIKE %s", (EMAIL_PATTERN,))
+            investors = cursor.rowcount
+            conn.commit()
+        finally:
+            cursor.close()
+    print(f"🧹 Deleted {startups} startup and {investors} investor load-test accounts")
+    return True
+
+# ============================================
+# Baseline
+# ============================================
+
+def compare(results, baseline, tolerance):
+    """[(route, what, old, new)] for every regression"""
+    regressions = []
+    old, new = baseline['summary'], results['summary']
+    if new['rps'] < old['rps'] * (1 - tolerance):
+        regressions.append(('total', 'rps', old['rps'], new['rps']))
+    if new['error_rate'] > old['error_rate'] + MAX_ERROR_RATE_RISE:
+        regressions.append(('total', 'error_rate', old['error_rate'], new['error_rate']))
+    for route, stats in new['routes'].items():
+        before = old['routes'].get(route)
+        if not before:
+            continue
+        if (before['p95_ms'] is not None and stats['p95_ms'] is not None
+                and stats['p95_ms'] > before['p95_ms'] * (1 + tolerance)
+                and stats['p95_ms'] - before['p95_ms'] > MIN_DELTA_MS):
+            regressions.append((route, 'p95_ms', before['p95_ms'], stats['p95_ms']))
+        if stats['error_rate'] > before['error_rate'] + MAX_ERROR_RATE_RISE:
+            regressions.append((route, 'error_rate', before['error_rate'], stats['error_rate']))
+    return regressions
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='HTTP load test with startup / investor sessions')
+    parser.add_argument('--url', default='http://127.0.0.1:8000', help='server to test')
+    parser.add_argument('--start-server', action='store_true',
+                        help="start gunicorn 'app:create_app()' on a free port and test it")
+    parser.add_argument('--workers', type=int, default=2, help='gunicorn workers (--start-server)')
+    parser.add_argument('--users', type=int, default=10, help='concurrent virtual users')
+    parser.add_argument('--startup-share', type=float, default=0.5,
+                        help='fraction of users that are startups (the rest are investors)')
+    parser.add_argument('--duration', type=float, default=60, help='seconds of load after the ramp-up')
+    parser.add_argument('--ramp-up', type=float, default=5, help='seconds over which users start')
+    parser.add_argument('--think-time', type=float, default=1.0,
+                        help='mean pause between pages in seconds (0: none)')
+    parser.add_argument('--dashboard-views', type=int, default=3, help='dashboard views per session')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', default=DEFAULT_OUTPUT)
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--save-baseline', action='store_true', help='write the results as the new baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='allowed p95 growth / throughput drop before flagging (0.25 = 25%%)')
+    parser.add_argument('--cleanup', action='store_true', help='delete the load-test accounts and exit')
+    args = parser.parse_args()
+
+    print("=" * 50)
+    print("🏋️  Startup Funding System - HTTP Load Test")
+    print("=" * 50)
+
+    if args.cleanup:
+        sys.exit(0 if cleanup() else 1)
+    if not 0 <= args.startup_share <= 1:
+        parser.error('--startup-share must be between 0 and 1')
+
+    server = None
+    if args.start_server:
+        server, args.url, server_log = start_server(args.workers)
+        print(f"🦄 gunicorn with {args.workers} worker(s) at {args.url} (log: {server_log})")
+    try:
+        summary = run_load(args)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+    print_summary(summary)
+
+    settings = {k: getattr(args, k) for k in ('users', 'startup_share', 'duration', 'ramp_up',
+                                              'think_time', 'dashboard_views', 'seed')}
+    settings['workers'] = args.workers if args.start_server else None
+    results = {
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'url': args.url,
+        'settings': settings,
+        'summary': summary,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"\n💾 Results written to {args.output}")
+
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"📌 Saved as baseline: {args.baseline}")
+        sys.exit(0)
+
+    if not os.path.exists(args.baseline):
+        print("ℹ️  No baseline yet - run with --save-baseline to store one")
+        sys.exit(0)
+
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)
+    changed = [k for k, v in settings.items() if baseline['settings'].get(k) != v]
+    if changed:
+        print(f"⚠️  Baseline ran with other settings ({', '.join(changed)}) - not comparing")
+        sys.exit(0)
+
+    regressions = compare(results, baseline, args.tolerance)
+    if not regressions:
+        print(f"✅ No regressions against {args.baseline} (tolerance {args.tolerance:.0%})")
+        sys.exit(0)
+    print(f"❌ {len(regressions)} regression(s) against {args.baseline}:")
+    for route, what, old, new in regressions:
+        print(f"   • {route}: {what} {old:,} → {new:,}")
+    sys.exit(1)
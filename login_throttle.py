@@ -0,0 +1,347 @@
+"""
+============================================
+DBMS Project: Login Throttle
+Token buckets per client address and per account, checked before bcrypt
+Works with both MySQL and PostgreSQL
+============================================
+
+Every POST to /startup/login or /investor/login costs a database lookup
+and, for an existing account, a full bcrypt check (~250 ms of CPU). A
+credential-stuffing burst therefore slows the site down for everyone.
+check_login() runs before that work. It takes one token from two
+buckets:
+
+* ip:<address> - LOGIN_IP_BURST attempts (default 30), refilled at
+  LOGIN_IP_PER_MINUTE (default 10).
+* email:<address> - LOGIN_EMAIL_BURST (default 5), refilled at
+  LOGIN_EMAIL_PER_MINUTE (default 1).
+
+When either bucket is empty the route answers 429 with Retry-After, and
+neither bucket is charged. A successful login gives both tokens back
+(release_login()), as does one the busy password pool could not check,
+so in effect only failed attempts count.
+
+Buckets live in LOGIN_THROTTLE_BACKEND:
+
+* memory   - per worker process (default). N gunicorn workers allow N
+             times the limits.
+* local    - a SQLite file shared by the workers of one machine
+             (LOGIN_THROTTLE_PATH). It stands in for a cache server.
+* database - the LoginThrottle table (migration 010), shared by every
+             machine.
+
+If a shared backend fails, the worker falls back to its memory buckets.
+Behind a proxy, set LOGIN_THROTTLE_PROXIES to the number of proxies that
+append to X-Forwarded-For (1 on Render), so the client's address is
+used rather than the proxy's. LOGIN_THROTTLE=0 turns the throttle off.
+
+    python benchmark_login_throttle.py      # overhead per attempt, CPU saved in a burst
+"""
+
+import math
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+from flask import request
+
+from metrics import counter, histogram
+
+LOGIN_THROTTLE = os.environ.get('LOGIN_THROTTLE', '1') != '0'
+BACKEND = os.environ.get('LOGIN_THROTTLE_BACKEND', 'memory')
+LOCAL_PATH = os.environ.get('LOGIN_THROTTLE_PATH',
+                            os.path.join(tempfile.gettempdir(), 'login_throttle.sqlite3'))
+TRUSTED_PROXIES = int(os.environ.get('LOGIN_THROTTLE_PROXIES', 0))
+MAX_KEYS = int(os.environ.get('LOGIN_THROTTLE_MAX_KEYS', 100000))       # memory buckets per worker
+PURGE_EVERY = 500           # shared backends: drop refilled buckets every this many checks
+
+# scope -> (burst, tokens per second)
+LIMITS = {
+    'ip': (float(os.environ.get('LOGIN_IP_BURST', 30)),
+           float(os.environ.get('LOGIN_IP_PER_MINUTE', 10)) / 60),
+    'email': (float(os.environ.get('LOGIN_EMAIL_BURST', 5)),
+              float(os.environ.get('LOGIN_EMAIL_PER_MINUTE', 1)) / 60),
+}
+
+CHECK_SECONDS = histogram('login_throttle_seconds', 'Time to check and charge the login buckets')
+THROTTLED = {scope: counter('login_throttled_total', 'Login attempts refused before any work',
+                            labels={'scope': scope}) for scope in LIMITS}
+BACKEND_ERRORS = counter('login_throttle_backend_errors_total',
+                         'Shared throttle backend failures (memory buckets used instead)')
+
+
+def _refill(tokens, updated_at, burst, rate, now):
+    return min(burst, tokens + max(0.0, now - updated_at) * rate)
+
+
+def _horizon():
+    """Seconds after which any bucket is full again, the same as no bucket"""
+    return max(burst / rate for burst, rate in LIMITS.values())
+
+# ============================================
+# Backends
+# ============================================
+
+class MemoryBuckets:
+    """Buckets of this worker process, in a dict"""
+
+    name = 'memory'
+
+    def __init__(self, max_keys=MAX_KEYS):
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        self._buckets = {}                      # key -> [tokens, updated_at]
+
+    def take(self, keys, now):
+        """Charge one token from each (key, burst, rate); None, or the refusing key and the wait"""
+        with self._lock:
+            levels = []
+            for key, burst, rate in keys:
+                bucket = self._buckets.get(key)
+                tokens = burst if bucket is None else _refill(bucket[0], bucket[1], burst, rate, now)
+                if tokens < 1:
+                    return key, (1 - tokens) / rate
+                levels.append((key, tokens))
+            for key, tokens in levels:
+                self._buckets[key] = [tokens - 1, now]
+            if len(self._buckets) > self.max_keys:
+                self._prune(now)
+        return None
+
+    def refund(self, keys, now):
+        with self._lock:
+            for key, burst, rate in keys:
+                bucket = self._buckets.get(key)
+                if bucket is not None:
+                    bucket[0] = min(burst, _refill(bucket[0], bucket[1], burst, rate, now) + 1)
+                    bucket[1] = now
+
+    def _prune(self, now):
+        # A bucket untouched for the refill horizon is full: the same as none
+        cutoff = now - _horizon()
+        self._buckets = {k: b for k, b in self._buckets.items() if b[1] >= cutoff}
+        if len(self._buckets) > self.max_keys:
+            # Still too many (a flood of fresh keys): keep the most recent half
+            recent = sorted(self._buckets.items(), key=lambda item: item[1][1])
+            self._buckets = dict(recent[len(recent) // 2:])
+
+
+class _SqlBuckets:
+    """Buckets in a LoginThrottle table, updated in one transaction per check"""
+
+    placeholder = '%s'
+    insert_ignore = None
+    lock_rows = ' FOR UPDATE'
+
+    def __init__(self):
+        self._checks = 0
+
+    def _connection(self):
+        raise NotImplementedError
+
+    def take(self, keys, now):
+        keys = sorted(keys)                       # lock rows in one order: no deadlocks
+        p = self.placeholder
+        with self._connection() as (conn, cursor):
+            cursor.execute(self.insert_ignore.format(values=', '.join([f'({p}, {p}, {p})'] * len(keys))),
+                           [value for key, burst, _ in keys for value in (key, burst, now)])
+            cursor.execute(f"SELECT bucket_key, tokens, updated_at FROM LoginThrottle "
+                           f"WHERE bucket_key IN ({', '.join([p] * len(keys))}) "
+                           f"ORDER BY bucket_key{self.lock_rows}", [key for key, _, _ in keys])
+            rows = {row['bucket_key']: row for row in cursor.fetchall()}
+            levels = []
+            for key, burst, rate in keys:
+                row = rows[key]
+                tokens = _refill(row['tokens'], row['updated_at'], burst, rate, now)
+                if tokens < 1:
+                    conn.rollback()
+                    return key, (1 - tokens) / rate
+                levels.append((key, tokens))
+            for key, tokens in levels:
+                cursor.execute(f"UPDATE LoginThrottle SET tokens = {p}, updated_at = {p} "
+                               f"WHERE bucket_key = {p}", (tokens - 1, now, key))
+            self._checks += 1
+            if self._checks % PURGE_EVERY == 0:
+                cursor.execute(f"DELETE FROM LoginThrottle WHERE updated_at < {p}",
+                               (now - _horizon(),))
+            conn.commit()
+        return None
+
+    def refund(self, keys, now):
+        p = self.placeholder
+        with self._connection() as (conn, cursor):
+            for key, burst, rate in sorted(keys):
+                cursor.execute(f"SELECT tokens, updated_at FROM LoginThrottle "
+                               f"WHERE bucket_key = {p}{self.lock_rows}", (key,))
+                row = cursor.fetchone()
+                if row is not None:
+                    tokens = min(burst, _refill(row['tokens'], row['updated_at'], burst, rate, now) + 1)
+                    cursor.execute(f"UPDATE LoginThrottle SET tokens = {p}, updated_at = {p} "
+                                   f"WHERE bucket_key = {p}", (tokens, now, key))
+            conn.commit()
+
+
+class DatabaseBuckets(_SqlBuckets):
+    """Buckets in the application database: shared by every worker on every machine"""
+
+    name = 'database'
+
+    def __init__(self):
+        super().__init__()
+        from database import DB_TYPE
+        if DB_TYPE == 'postgresql':
+            self.insert_ignore = ("INSERT INTO LoginThrottle (bucket_key, tokens, updated_at) "
+                                  "VALUES {values} ON CONFLICT (bucket_key) DO NOTHING")
+        else:
+            self.insert_ignore = ("INSERT IGNORE INTO LoginThrottle (bucket_key, tokens, updated_at) "
+                                  "VALUES {values}")
+
+    @contextmanager
+    def _connection(self):
+        from database import get_db_connection, get_cursor
+        with get_db_connection() as conn:
+            if not conn:
+                raise ConnectionError("no database connection")
+            cursor = get_cursor(conn)
+            try:
+                yield conn, cursor
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                cursor.close()
+
+
+class LocalBuckets(_SqlBuckets):
+    """Buckets in a SQLite file: shared by the workers of this machine, like a cache server"""
+
+    name = 'local'
+    placeholder = '?'
+    insert_ignore = "INSERT OR IGNORE INTO LoginThrottle (bucket_key, tokens, updated_at) VALUES {values}"
+    lock_rows = ''                  # BEGIN IMMEDIATE already locks the file
+
+    def __init__(self, path=LOCAL_PATH):
+        super().__init__()
+        self.path = path
+        self._local = threading.local()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=5, isolation_level=None,
+                               check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        # Throttle state, not data: no fsync per check (a crash only resets it)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=OFF")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS LoginThrottle (
+                bucket_key TEXT PRIMARY KEY,
+                tokens REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_login_throttle_updated ON LoginThrottle (updated_at)")
+        return conn
+
+    @contextmanager
+    def _connection(self):
+        # One connection per thread; a forked worker opens its own
+        local = self._local
+        if getattr(local, 'pid', None) != os.getpid():
+            local.conn, local.pid = self._connect(), os.getpid()
+        conn = local.conn
+        cursor = conn.cursor()
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn, cursor
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
+
+
+BACKENDS = {'memory': MemoryBuckets, 'local': LocalBuckets, 'database': DatabaseBuckets}
+
+# ============================================
+# Throttle
+# ============================================
+
+class LoginThrottle:
+    """The IP and account buckets of login attempts, in one backend"""
+
+    def __init__(self, backend=None, limits=None):
+        self.backend = backend or MemoryBuckets()
+        self.limits = limits or LIMITS
+        # Used when a shared backend fails, so a database outage does not lift the limits
+        self.fallback = self.backend if isinstance(self.backend, MemoryBuckets) else MemoryBuckets()
+
+    def _keys(self, ip, email):
+        keys = [(f'ip:{ip}', *self.limits['ip'])]
+        email = (email or '').strip().lower()
+        if email:
+            keys.append((f'email:{email[:200]}', *self.limits['email']))
+        return keys
+
+    def _call(self, method, keys, now):
+        try:
+            return getattr(self.backend, method)(keys, now)
+        except Exception as e:
+            BACKEND_ERRORS.inc()
+            print(f"⚠️  Login throttle backend '{self.backend.name}' failed: {e}")
+            return getattr(self.fallback, method)(keys, now)
+
+    def take(self, ip, email):
+        """None if the attempt may go ahead; otherwise the seconds to wait (charged nothing)"""
+        with CHECK_SECONDS.time():
+            refused = self._call('take', self._keys(ip, email), time.time())
+        if refused is None:
+            return None
+        key, wait = refused
+        THROTTLED[key.split(':', 1)[0]].inc()
+        return max(1, math.ceil(wait))
+
+    def refund(self, ip, email):
+        """Give back the tokens of an attempt that succeeded"""
+        self._call('refund', self._keys(ip, email), time.time())
+
+
+_throttle = None
+_throttle_lock = threading.Lock()
+
+
+def get_throttle():
+    """The process's LoginThrottle, on LOGIN_THROTTLE_BACKEND"""
+    global _throttle
+    if _throttle is None:
+        with _throttle_lock:
+            if _throttle is None:
+                if BACKEND not in BACKENDS:
+                    raise ValueError(f"LOGIN_THROTTLE_BACKEND must be one of {', '.join(BACKENDS)}")
+                _throttle = LoginThrottle(BACKENDS[BACKEND]())
+    return _throttle
+
+
+def client_ip():
+    """The client's address: remote_addr, or X-Forwarded-For behind TRUSTED_PROXIES proxies"""
+    if TRUSTED_PROXIES:
+        forwarded = [a.strip() for a in request.headers.get('X-Forwarded-For', '').split(',')
+                     if a.strip()]
+        if len(forwarded) >= TRUSTED_PROXIES:
+            return forwarded[-TRUSTED_PROXIES]
+    return request.remote_addr or 'unknown'
+
+
+def check_login(email):
+    """Before a login's lookup and bcrypt: None to go ahead, else Retry-After seconds"""
+    if not LOGIN_THROTTLE:
+        return None
+    return get_throttle().take(client_ip(), email)
+
+
+def release_login(email):
+    """After a successful (or unchecked) login: its attempt does not count"""
+    if LOGIN_THROTTLE:
+        get_throttle().refund(client_ip(), email)
@@ -0,0 +1,506 @@
+"""
+============================================
+DBMS Project: In-Memory Matchmaking Engine
+Optional fast path for the dashboard match queries
+Works with both MySQL and PostgreSQL
+============================================
+
+The dashboards rank candidates with two range predicates and a
+comma-separated domain check, which the database answers by scanning
+every Investors / Startups row. This engine keeps both tables in memory:
+
+* every row gets a "rank" = its position in dashboard order
+  (portfolio_size ASC for investors, founded_date DESC for startups)
+* bitsets (Python ints, bit N = rank N) record which rows prefer / belong
+  to each domain
+* a sorted-endpoint index over the funding amounts keeps a cumulative
+  bitset every `block` entries, so "investment_min <= x" or
+  "funding_required <= y" is one checkpoint plus a few leftover rows
+
+A match query ANDs a handful of bitsets and reads the lowest set bits,
+which are already the best-ranked rows, so the top 10 comes out without
+sorting. Rows that change after a load go to a small overlay that is
+checked directly until the next rebuild.
+
+Run `python matchmaking.py` to compare the engine against the SQL
+queries in app.py for every startup and investor and to time both.
+"""
+
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from math import isqrt
+
+INVESTOR_COLUMNS = ('investor_id', 'name', 'investment_min', 'investment_max',
+                    'preferred_domains', 'location', 'portfolio_size')
+STARTUP_COLUMNS = ('startup_id', 'name', 'domain_name', 'funding_required',
+                   'location', 'description', 'is_funded', 'founded_date')
+
+TOP_N = 10
+
+
+def parse_domain_ids(preferred_domains):
+    """Domain ids in a comma-separated list, matched the way LIKE / FIND_IN_SET do"""
+    if not preferred_domains:
+        return frozenset()
+    ids = set()
+    for token in str(preferred_domains).split(','):
+        # '5' matches domain 5, but ' 5' or '05' never did in SQL either
+        if token.isdigit() and str(int(token)) == token:
+            ids.add(int(token))
+    return frozenset(ids)
+
+
+def _lowest_ranks(bits, limit):
+    """Positions of the `limit` lowest set bits"""
+    ranks = []
+    while bits and len(ranks) < limit:
+        low = bits & -bits
+        ranks.append(low.bit_length() - 1)
+        bits ^= low
+    return ranks
+
+
+def _bitset(ranks, size):
+    buf = bytearray((size + 7) // 8)
+    for r in ranks:
+        buf[r >> 3] |= 1 << (r & 7)
+    return int.from_bytes(buf, 'little')
+
+
+class _SortedEndpoints:
+    """Rows sorted by one numeric column, with cumulative rank bitsets.
+
+    checkpoints[j] holds the ranks of the first j * block rows in key
+    order, so any prefix/suffix of the sorted order is one checkpoint
+    plus fewer than `block` leftover rows.
+    """
+
+    def __init__(self, pairs, size, block):
+        pairs.sort(key=lambda p: p[0])
+        self.keys = [key for key, _ in pairs]
+        self.ranks = [rank for _, rank in pairs]
+        self.block = block
+        self.full = (1 << size) - 1
+
+        buf = bytearray((size + 7) // 8)
+        self.checkpoints = [0]
+        for start in range(0, len(self.ranks), block):
+            for r in self.ranks[start:start + block]:
+                buf[r >> 3] |= 1 << (r & 7)
+            self.checkpoints.append(int.from_bytes(buf, 'little'))
+
+    def prefix(self, i):
+        """Rows [0, i) in key order: bitset of [0, start) plus the start position"""
+        j = i // self.block
+        return self.checkpoints[j], j * self.block
+
+    def suffix(self, i):
+        """Rows [i, n) in key order: bitset of [end, n) plus the end position"""
+        j = -(-i // self.block)
+        return self.full & ~self.checkpoints[j], min(j * self.block, len(self.ranks))
+
+
+class _InvestorIndex:
+    """Immutable snapshot of all investors"""
+
+    def __init__(self, rows, block):
+        rows = sorted(rows, key=lambda r: (r['portfolio_size'] or 0, r['investor_id']))
+        self.rows = rows
+        self.rank_of = {row['investor_id']: rank for rank, row in enumerate(rows)}
+        self.domains = [parse_domain_ids(row['preferred_domains']) for row in rows]
+
+        by_domain = {}
+        for rank, ids in enumerate(self.domains):
+            for domain_id in ids:
+                by_domain.setdefault(domain_id, []).append(rank)
+        self.domain_bits = {d: _bitset(ranks, len(rows)) for d, ranks in by_domain.items()}
+
+        self.by_min = _SortedEndpoints(
+            [(row['investment_min'], rank) for rank, row in enumerate(rows)], len(rows), block)
+        self.by_max = _SortedEndpoints(
+            [(row['investment_max'], rank) for rank, row in enumerate(rows)], len(rows), block)
+
+    def covering(self, amount):
+        """Investors with investment_min <= amount <= investment_max"""
+        i = bisect_right(self.by_min.keys, amount)
+        bits_min, start = self.by_min.prefix(i)
+        j = bisect_left(self.by_max.keys, amount)
+        bits_max, end = self.by_max.suffix(j)
+        # Leftover rows satisfy one bound by position; check the other one
+        leftovers = set()
+        for rank in self.by_min.ranks[start:i]:
+            if self.rows[rank]['investment_max'] >= amount:
+                leftovers.add(rank)
+        for rank in self.by_max.ranks[j:end]:
+            if self.rows[rank]['investment_min'] <= amount:
+                leftovers.add(rank)
+        return bits_min & bits_max, leftovers
+
+
+class _StartupIndex:
+    """Immutable snapshot of unfunded startups"""
+
+    def __init__(self, rows, block, nulls_first):
+        self.nulls_first = nulls_first
+        rows = sorted(rows, key=self.order_key)
+        self.rows = rows
+        self.rank_of = {row['startup_id']: rank for rank, row in enumerate(rows)}
+
+        by_domain = {}
+        for rank, row in enumerate(rows):
+            by_domain.setdefault(row['domain_id'], []).append(rank)
+        self.domain_bits = {d: _bitset(ranks, len(rows)) for d, ranks in by_domain.items()}
+
+        self.by_funding = _SortedEndpoints(
+            [(row['funding_required'], rank) for rank, row in enumerate(rows)], len(rows), block)
+
+    def order_key(self, row):
+        """founded_date DESC with the backend's NULL placement, then startup_id"""
+        founded = row['founded_date']
+        if founded is None:
+            return (0 if self.nulls_first else 2, 0, row['startup_id'])
+        return (1, -founded.toordinal(), row['startup_id'])
+
+    def within(self, low, high):
+        """Startups with low <= funding_required <= high"""
+        keys = self.by_funding.keys
+        lo, hi = bisect_left(keys, low), bisect_right(keys, high)
+        if lo >= hi:
+            return 0, []
+        bits_hi, start = self.by_funding.prefix(hi)
+        bits_lo, end = self.by_funding.suffix(lo)
+        # Positions [lo, hi) are exactly the matches; the bitsets cover the
+        # middle, so only the two partial blocks at the edges are left over
+        start, end = max(lo, start), min(end, hi)
+        ranks = self.by_funding.ranks
+        if start <= end:
+            leftovers = ranks[lo:hi]
+        else:
+            leftovers = ranks[lo:end] + ranks[start:hi]
+        return bits_hi & bits_lo, leftovers
+
+
+class MatchEngine:
+    """In-process replacement for the two dashboard match queries.
+
+    Produces the same rows, in the same order, as the SQL in app.py
+    (find_matched_investors / find_matched_startups). Rows changed through
+    this worker are applied immediately via refresh_investor() /
+    refresh_startup(); changes made by other workers are picked up when the
+    snapshot is older than `max_age` seconds.
+    """
+
+    def __init__(self, db_type, max_age=60.0, overlay_limit=256, block=None):
+        self.db_type = db_type
+        self.max_age = max_age
+        self.overlay_limit = overlay_limit
+        self.block = block
+        self._lock = threading.RLock()
+        self._investors = None
+        self._startups = None
+        self._loaded_at = None
+        # Rows added/changed since the snapshot, keyed by id (None = deleted)
+        self._investor_overlay = {}
+        self._startup_overlay = {}
+        # Snapshot ranks hidden by the overlay
+        self._investor_dead = 0
+        self._startup_dead = 0
+
+    # ---------- loading ----------
+
+    def _block_size(self, n):
+        return self.block or max(64, isqrt(max(n, 1)))
+
+    def _build(self, investors, startups):
+        self._investors = _InvestorIndex(investors, self._block_size(len(investors)))
+        self._startups = _StartupIndex(startups, self._block_size(len(startups)),
+                                       nulls_first=(self.db_type == 'postgresql'))
+        self._investor_overlay = {}
+        self._startup_overlay = {}
+        self._investor_dead = 0
+        self._startup_dead = 0
+
+    def load(self, cursor):
+        """(Re)load every investor and unfunded startup from the database"""
+        cursor.execute("""
+            SELECT investor_id, name, investment_min, investment_max,
+                   preferred_domains, location, portfolio_size
+            FROM Investors
+        """)
+        investors = [dict(row) for row in cursor.fetchall()]
+        cursor.execute("""
+            SELECT s.startup_id, s.name, s.domain_id, d.domain_name, s.funding_required,
+                   s.location, s.description, s.is_funded, s.founded_date
+            FROM Startups s
+            JOIN Domains d ON s.domain_id = d.domain_id
+            WHERE s.is_funded = FALSE
+        """)
+        startups = [dict(row) for row in cursor.fetchall()]
+        with self._lock:
+            self._build(investors, startups)
+            self._loaded_at = time.monotonic()
+
+    def ensure_fresh(self, cursor):
+        """Load on first use and reload once the snapshot is older than max_age"""
+        loaded_at = self._loaded_at
+        if loaded_at is None or (self.max_age and time.monotonic() - loaded_at > self.max_age):
+            with self._lock:
+                if self._loaded_at is loaded_at:
+                    self.load(cursor)
+
+    def _compact_if_needed(self):
+        """Fold the overlay into a new snapshot once it gets large"""
+        if len(self._investor_overlay) + len(self._startup_overlay) <= self.overlay_limit:
+            return
+        investors = self._all_rows(self._investors, self._investor_overlay, 'investor_id')
+        startups = self._all_rows(self._startups, self._startup_overlay, 'startup_id')
+        self._build(investors, startups)
+
+    @staticmethod
+    def _all_rows(index, overlay, id_column):
+        rows = [row for row in index.rows if row[id_column] not in overlay]
+        rows.extend(row for row in overlay.values() if row is not None)
+        return rows
+
+    # ---------- incremental updates ----------
+
+    def upsert_investor(self, row):
+        with self._lock:
+            if self._investors is None:
+                return
+            row = dict(row)
+            investor_id = row['investor_id']
+            rank = self._investors.rank_of.get(investor_id)
+            if rank is not None:
+                self._investor_dead |= 1 << rank
+            self._investor_overlay[investor_id] = row
+            self._compact_if_needed()
+
+    def remove_investor(self, investor_id):
+        with self._lock:
+            if self._investors is None:
+                return
+            rank = self._investors.rank_of.get(investor_id)
+            if rank is not None:
+                self._investor_dead |= 1 << rank
+            self._investor_overlay[investor_id] = None
+            self._compact_if_needed()
+
+    def upsert_startup(self, row):
+        """Add/replace a startup; funded startups drop out of the index"""
+        if row['is_funded']:
+            self.remove_startup(row['startup_id'])
+            return
+        with self._lock:
+            if self._startups is None:
+                return
+            row = dict(row)
+            startup_id = row['startup_id']
+            rank = self._startups.rank_of.get(startup_id)
+            if rank is not None:
+                self._startup_dead |= 1 << rank
+            self._startup_overlay[startup_id] = row
+            self._compact_if_needed()
+
+    def remove_startup(self, startup_id):
+        with self._lock:
+            if self._startups is None:
+                return
+            rank = self._startups.rank_of.get(startup_id)
+            if rank is not None:
+                self._startup_dead |= 1 << rank
+            self._startup_overlay[startup_id] = None
+            self._compact_if_needed()
+
+    def refresh_investor(self, cursor, investor_id):
+        """Re-read one investor after it was inserted or changed"""
+        cursor.execute("""
+            SELECT investor_id, name, investment_min, investment_max,
+                   preferred_domains, location, portfolio_size
+            FROM Investors WHERE investor_id = %s
+        """, (investor_id,))
+        row = cursor.fetchone()
+        if row:
+            self.upsert_investor(row)
+        else:
+            self.remove_investor(investor_id)
+
+    def refresh_startup(self, cursor, startup_id):
+        """Re-read one startup after it was inserted, changed or funded"""
+        cursor.execute("""
+            SELECT s.startup_id, s.name, s.domain_id, d.domain_name, s.funding_required,
+                   s.location, s.description, s.is_funded, s.founded_date
+            FROM Startups s
+            JOIN Domains d ON s.domain_id = d.domain_id
+            WHERE s.startup_id = %s
+        """, (startup_id,))
+        row = cursor.fetchone()
+        if row:
+            self.upsert_startup(row)
+        else:
+            self.remove_startup(startup_id)
+
+    # ---------- queries ----------
+
+    def matched_investors(self, startup, limit=TOP_N):
+        """Top investors for a startup row (same result as the SQL query)"""
+        amount = startup['funding_required']
+        domain_id = startup['domain_id']
+        with self._lock:
+            index = self._investors
+            bits, leftovers = index.covering(amount)
+            bits &= ~self._investor_dead
+            preferred = index.domain_bits.get(domain_id, 0)
+
+            # Snapshot rows: lower rank = better, so merge by rank
+            by_score = {100: _lowest_ranks(bits & preferred, limit),
+                        50: _lowest_ranks(bits & ~preferred, limit)}
+            dead = self._investor_dead
+            for rank in leftovers:
+                if not dead >> rank & 1:
+                    by_score[100 if domain_id in index.domains[rank] else 50].append(rank)
+            candidates = []
+            for score, ranks in by_score.items():
+                ranks.sort()
+                candidates.extend((score, index.rows[rank]) for rank in ranks[:limit])
+
+            # Overlay rows are few; check them directly
+            for row in self._investor_overlay.values():
+                if row is not None and row['investment_min'] <= amount <= row['investment_max']:
+                    score = 100 if domain_id in parse_domain_ids(row['preferred_domains']) else 50
+                    candidates.append((score, row))
+
+        candidates.sort(key=lambda c: (-c[0], c[1]['portfolio_size'] or 0, c[1]['investor_id']))
+        results = []
+        for score, row in candidates[:limit]:
+            match = {column: row[column] for column in INVESTOR_COLUMNS}
+            match['match_score'] = score
+            match['match_reason'] = 'Perfect domain match' if score == 100 else 'Investment range compatible'
+            results.append(match)
+        return results
+
+    def matched_startups(self, investor, limit=TOP_N):
+        """Top unfunded startups for an investor row (same result as the SQL query)"""
+        low, high = investor['investment_min'], investor['investment_max']
+        domain_ids = parse_domain_ids(investor['preferred_domains'])
+        with self._lock:
+            index = self._startups
+            bits, leftovers = index.within(low, high)
+            bits &= ~self._startup_dead
+            preferred = 0
+            for domain_id in domain_ids:
+                preferred |= index.domain_bits.get(domain_id, 0)
+
+            by_score = {100: _lowest_ranks(bits & preferred, limit),
+                        50: _lowest_ranks(bits & ~preferred, limit)}
+            dead = self._startup_dead
+            for rank in leftovers:
+                if not dead >> rank & 1:
+                    by_score[100 if index.rows[rank]['domain_id'] in domain_ids else 50].append(rank)
+            candidates = []
+            for score, ranks in by_score.items():
+                ranks.sort()
+                candidates.extend((score, index.rows[rank]) for rank in ranks[:limit])
+
+            for row in self._startup_overlay.values():
+                if row is not None and low <= row['funding_required'] <= high:
+                    candidates.append((100 if row['domain_id'] in domain_ids else 50, row))
+            order_key = index.order_key
+
+        candidates.sort(key=lambda c: (-c[0], order_key(c[1])))
+        results = []
+        for score, row in candidates[:limit]:
+            match = {column: row[column] for column in STARTUP_COLUMNS}
+            match['match_score'] = score
+            results.append(match)
+        return results
+
+    def stats(self):
+        with self._lock:
+            return {
+                'investors': len(self._investors.rows) if self._investors else 0,
+                'startups': len(self._startups.rows) if self._startups else 0,
+                'overlay': len(self._investor_overlay) + len(self._startup_overlay),
+                'age_seconds': round(time.monotonic() - self._loaded_at, 1) if self._loaded_at else None,
+            }
+
+
+# ============================================
+# Verification & Timing (SQL is the oracle)
+# ============================================
+
+def _percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def verify(limit=None):
+    """Compare the engine with the SQL queries for every startup and investor"""
+    from app import find_matched_investors_sql, find_matched_startups_sql
+    from database import DB_TYPE, get_db_connection, get_cursor
+
+    with get_db_connection() as conn:
+        if not conn:
+            print("❌ Could not connect to database")
+            return False
+        cursor = get_cursor(conn)
+        engine = MatchEngine(DB_TYPE)
+        started = time.perf_counter()
+        engine.load(cursor)
+        print(f"✅ Loaded engine in {(time.perf_counter() - started) * 1000:.1f} ms: {engine.stats()}")
+
+        mismatches = 0
+        timings = {'startup': ([], []), 'investor': ([], [])}
+
+        cursor.execute("SELECT * FROM Startups ORDER BY startup_id")
+        startups = cursor.fetchall()[:limit]
+        for startup in startups:
+            t0 = time.perf_counter()
+            expected = [dict(r) for r in find_matched_investors_sql(cursor, startup)]
+            t1 = time.perf_counter()
+            actual = engine.matched_investors(startup)
+            t2 = time.perf_counter()
+            timings['startup'][0].append(t1 - t0)
+            timings['startup'][1].append(t2 - t1)
+            if expected != actual:
+                mismatches += 1
+                print(f"  ✗ startup {startup['startup_id']}: SQL {[r['investor_id'] for r in expected]} "
+                      f"vs engine {[r['investor_id'] for r in actual]}")
+
+        cursor.execute("SELECT * FROM Investors ORDER BY investor_id")
+        investors = cursor.fetchall()[:limit]
+        for investor in investors:
+            t0 = time.perf_counter()
+            expected = [dict(r) for r in find_matched_startups_sql(cursor, investor)]
+            t1 = time.perf_counter()
+            actual = engine.matched_startups(investor)
+            t2 = time.perf_counter()
+            timings['investor'][0].append(t1 - t0)
+            timings['investor'][1].append(t2 - t1)
+            if expected != actual:
+                mismatches += 1
+                print(f"  ✗ investor {investor['investor_id']}: SQL {[r['startup_id'] for r in expected]} "
+                      f"vs engine {[r['startup_id'] for r in actual]}")
+        cursor.close()
+
+    for kind, (sql_times, engine_times) in timings.items():
+        if not sql_times:
+            continue
+        print(f"📊 {kind} dashboards ({len(sql_times)} checked): "
+              f"SQL p50 {_percentile(sql_times, 50) * 1000:.3f} ms / p99 {_percentile(sql_times, 99) * 1000:.3f} ms, "
+              f"engine p50 {_percentile(engine_times, 50) * 1000:.3f} ms / p99 {_percentile(engine_times, 99) * 1000:.3f} ms")
+    if mismatches:
+        print(f"❌ {mismatches} result(s) differ from SQL")
+        return False
+    print("✅ Engine results match SQL")
+    return True
+
+
+if __name__ == '__main__':
+    import sys
+    print("=" * 50)
+    print("🎯 Matchmaking Engine - Verification against SQL")
+    print("=" * 50)
+    sample = int(sys.argv[1]) if len(sys.argv) > 1 else None
+    sys.exit(0 if verify(sample) else 1)
@@ -0,0 +1,633 @@
+"""
+============================================
+DBMS Project: Materialized Matches
+Keeps the Matches table filled with each startup's and investor's top matches
+Works with both MySQL and PostgreSQL
+============================================
+
+With MATCH_STRATEGY=materialized the dashboards read their match lists
+from Matches instead of ranking candidates on every page view. The table
+holds, for every startup, its top TOP_K investors and, for every investor,
+its top TOP_K unfunded startups. It may also hold extra valid pairs: a
+dashboard reads its own rows in ranked order, so extra pairs never change
+what it shows.
+
+Scores follow calculate_match_score: +50 when the funding range fits and
++50 when the domain is preferred.
+
+* Full rebuild: `python materialized_matches.py`. Pairs are scored with the
+  bitset MatchEngine from matchmaking.py, one whole entity (all candidates
+  at once) per lookup, instead of calling the score function per pair. The
+  results are staged in batches and merged into Matches with a few
+  set-based statements.
+* Incremental refresh: triggers put changed startups and investors into
+  MatchRefreshQueue (registration, profile changes, InvestorDomains, and the
+  Funding triggers that mark a startup funded or grow a portfolio).
+  refresh_matches() recomputes only the lists that entity can affect; run
+  `python materialized_matches.py --refresh` from cron to drain the queue.
+  The registration routes refresh their own row straight away.
+* `python materialized_matches.py --verify` compares every dashboard list
+  with the live SQL queries in app.py.
+"""
+
+import io
+import os
+import sys
+import time
+
+from database import DB_TYPE, get_db_connection, get_cursor
+from matchmaking import MatchEngine, TOP_N
+
+# Rows kept per startup / investor list (the dashboards show TOP_N)
+TOP_K = max(TOP_N, int(os.environ.get('MATCHES_TOP_K', TOP_N)))
+BATCH_SIZE = int(os.environ.get('MATCHES_BATCH_SIZE', 5000))
+
+REASONS = {100: 'Perfect domain match', 50: 'Investment range compatible'}
+
+# ============================================
+# SQL Building Blocks
+# ============================================
+
+_RANGE_FITS = "i.investment_min <= s.funding_required AND i.investment_max >= s.funding_required"
+_DOMAIN_PREFERRED = ("EXISTS (SELECT 1 FROM InvestorDomains idm "
+                     "WHERE idm.investor_id = i.investor_id AND idm.domain_id = s.domain_id)")
+
+# "s2 is listed before s" / "i2 is listed before i" in dashboard order.
+# NULLs sort differently per backend (PostgreSQL: largest, MySQL: smallest),
+# and this has to agree with the ORDER BY the dashboards use.
+_STARTUP_BEFORE = {
+    'postgresql': """((s2.founded_date IS NULL AND s.founded_date IS NOT NULL)
+                      OR s2.founded_date > s.founded_date
+                      OR (s2.founded_date IS NOT DISTINCT FROM s.founded_date
+                          AND s2.startup_id < s.startup_id))""",
+    'mysql': """((s2.founded_date IS NOT NULL AND s.founded_date IS NULL)
+                 OR s2.founded_date > s.founded_date
+                 OR (s2.founded_date <=> s.founded_date AND s2.startup_id < s.startup_id))""",
+}
+_INVESTOR_BEFORE = {
+    'postgresql': """((i2.portfolio_size IS NOT NULL AND i.portfolio_size IS NULL)
+                      OR i2.portfolio_size < i.portfolio_size
+                      OR (i2.portfolio_size IS NOT DISTINCT FROM i.portfolio_size
+                          AND i2.investor_id < i.investor_id))""",
+    'mysql': """((i2.portfolio_size IS NULL AND i.portfolio_size IS NOT NULL)
+                 OR i2.portfolio_size < i.portfolio_size
+                 OR (i2.portfolio_size <=> i.portfolio_size AND i2.investor_id < i.investor_id))""",
+}
+
+
+def _insert_missing(sql):
+    """INSERT that silently skips pairs another session added first"""
+    if DB_TYPE == 'postgresql':
+        return f"INSERT INTO {sql} ON CONFLICT (investor_id, startup_id) DO NOTHING"
+    return f"INSERT IGNORE INTO {sql}"
+
+
+def _rescore(cursor, where, params):
+    """Recompute score/reason of existing rows with the calculate_match_score rules"""
+    score = f"""CASE WHEN {_RANGE_FITS} THEN 50 ELSE 0 END
+              + CASE WHEN {_DOMAIN_PREFERRED} THEN 50 ELSE 0 END"""
+    reason = f"""CASE WHEN {_RANGE_FITS} AND {_DOMAIN_PREFERRED} THEN 'Perfect domain match'
+                  WHEN {_RANGE_FITS} THEN 'Investment range compatible'
+                  WHEN {_DOMAIN_PREFERRED} THEN 'Domain match only'
+                  ELSE 'No longer compatible' END"""
+    if DB_TYPE == 'postgresql':
+        cursor.execute(f"""
+            UPDATE Matches m
+            SET match_score = {score}, match_reason = {reason}
+            FROM Investors i, Startups s
+            WHERE i.investor_id = m.investor_id AND s.startup_id = m.startup_id
+              AND {where}
+        """, params)
+    else:
+        cursor.execute(f"""
+            UPDATE Matches m
+            JOIN Investors i ON i.investor_id = m.investor_id
+            JOIN Startups s ON s.startup_id = m.startup_id
+            SET m.match_score = {score}, m.match_reason = {reason}
+            WHERE {where}
+        """, params)
+
+
+def _delete_incompatible(cursor, where, params):
+    """Drop pairs whose funding range no longer fits (contacted pairs are kept)"""
+    if DB_TYPE == 'postgresql':
+        cursor.execute(f"""
+            DELETE FROM Matches m
+            USING Investors i, Startups s
+            WHERE i.investor_id = m.investor_id AND s.startup_id = m.startup_id
+              AND m.is_contacted = FALSE AND NOT ({_RANGE_FITS})
+              AND {where}
+        """, params)
+    else:
+        cursor.execute(f"""
+            DELETE m FROM Matches m
+            JOIN Investors i ON i.investor_id = m.investor_id
+            JOIN Startups s ON s.startup_id = m.startup_id
+            WHERE m.is_contacted = FALSE AND NOT ({_RANGE_FITS})
+              AND {where}
+        """, params)
+
+
+# ============================================
+# Filling One List
+# ============================================
+
+def _fill_startup_list(cursor, startup, top_k=TOP_K):
+    """Make sure the startup's top_k investors are stored"""
+    cursor.execute(_insert_missing("""
+        Matches (investor_id, startup_id, match_score, match_reason)
+        SELECT t.investor_id, %(startup_id)s, t.match_score, t.match_reason
+        FROM ((SELECT i.investor_id, i.portfolio_size,
+                      100 AS match_score, 'Perfect domain match' AS match_reason
+               FROM Investors i
+               WHERE i.investment_min <= %(amount)s AND i.investment_max >= %(amount)s
+                 AND EXISTS (SELECT 1 FROM InvestorDomains idm
+                             WHERE idm.investor_id = i.investor_id AND idm.domain_id = %(domain_id)s)
+               ORDER BY i.portfolio_size ASC, i.investor_id ASC
+               LIMIT %(k)s)
+              UNION ALL
+              (SELECT i.investor_id, i.portfolio_size,
+                      50 AS match_score, 'Investment range compatible' AS match_reason
+               FROM Investors i
+               WHERE i.investment_min <= %(amount)s AND i.investment_max >= %(amount)s
+                 AND NOT EXISTS (SELECT 1 FROM InvestorDomains idm
+                                 WHERE idm.investor_id = i.investor_id AND idm.domain_id = %(domain_id)s)
+               ORDER BY i.portfolio_size ASC, i.investor_id ASC
+               LIMIT %(k)s)
+              ORDER BY match_score DESC, portfolio_size ASC, investor_id ASC
+              LIMIT %(k)s) t
+        WHERE NOT EXISTS (SELECT 1 FROM Matches m
+                          WHERE m.investor_id = t.investor_id AND m.startup_id = %(startup_id)s)
+    """), {'startup_id': startup['startup_id'], 'amount': startup['funding_required'],
+           'domain_id': startup['domain_id'], 'k': top_k})
+
+
+def _fill_investor_list(cursor, investor, top_k=TOP_K):
+    """Make sure the investor's top_k unfunded startups are stored"""
+    cursor.execute(_insert_missing("""
+        Matches (investor_id, startup_id, match_score, match_reason)
+        SELECT %(investor_id)s, t.startup_id, t.match_score,
+               CASE t.match_score WHEN 100 THEN 'Perfect domain match'
+                    ELSE 'Investment range compatible' END
+        FROM ((SELECT s.startup_id, s.founded_date, 100 AS match_score
+               FROM Startups s
+               WHERE s.funding_required BETWEEN %(low)s AND %(high)s
+                 AND s.is_funded = FALSE
+                 AND EXISTS (SELECT 1 FROM InvestorDomains idm
+                             WHERE idm.investor_id = %(investor_id)s AND idm.domain_id = s.domain_id)
+               ORDER BY s.founded_date DESC, s.startup_id ASC
+               LIMIT %(k)s)
+              UNION ALL
+              (SELECT s.startup_id, s.founded_date, 50 AS match_score
+               FROM Startups s
+               WHERE s.funding_required BETWEEN %(low)s AND %(high)s
+                 AND s.is_funded = FALSE
+                 AND NOT EXISTS (SELECT 1 FROM InvestorDomains idm
+                                 WHERE idm.investor_id = %(investor_id)s AND idm.domain_id = s.domain_id)
+               ORDER BY s.founded_date DESC, s.startup_id ASC
+               LIMIT %(k)s)
+              ORDER BY match_score DESC, founded_date DESC, startup_id ASC
+              LIMIT %(k)s) t
+        WHERE NOT EXISTS (SELECT 1 FROM Matches m
+                          WHERE m.investor_id = %(investor_id)s AND m.startup_id = t.startup_id)
+    """), {'investor_id': investor['investor_id'], 'low': investor['investment_min'],
+           'high': investor['investment_max'], 'k': top_k})
+
+
+# ============================================
+# Incremental Refresh
+# ============================================
+
+def refresh_startup_matches(cursor, startup_id, top_k=TOP_K):
+    """Recompute the lists one startup can affect after it was added or changed
+
+    1. rescore its stored pairs and drop the ones whose range no longer fits
+    2. refill its own investor list
+    3. add it to investor lists it now ranks into (unfunded only)
+    4. refill the investor lists that held it, since it may have moved down
+       or been funded
+
+    A new startup holds no pairs yet, so registration only pays for 2 and 3.
+    """
+    cursor.execute("""
+        SELECT startup_id, domain_id, funding_required, is_funded, founded_date
+        FROM Startups WHERE startup_id = %s
+    """, (startup_id,))
+    startup = cursor.fetchone()
+    if not startup:
+        return {'affected_lists': 0}  # ON DELETE CASCADE already removed its pairs
+
+    _rescore(cursor, "m.startup_id = %s", (startup_id,))
+
+    # Every investor list that holds this startup: if it moved down (or was
+    # funded) a startup that is not stored may now belong in that list
+    cursor.execute("""
+        SELECT i.investor_id, i.investment_min, i.investment_max
+        FROM Matches m
+        JOIN Investors i ON i.investor_id = m.investor_id
+        WHERE m.startup_id = %s
+    """, (startup_id,))
+    affected = cursor.fetchall()
+
+    _delete_incompatible(cursor, "m.startup_id = %s", (startup_id,))
+    _fill_startup_list(cursor, startup, top_k)
+
+    if not startup['is_funded']:
+        # Investors whose list has fewer than top_k valid rows ranked above it
+        cursor.execute(_insert_missing(f"""
+            Matches (investor_id, startup_id, match_score, match_reason)
+            SELECT c.investor_id, s.startup_id, c.match_score,
+                   CASE c.match_score WHEN 100 THEN 'Perfect domain match'
+                        ELSE 'Investment range compatible' END
+            FROM Startups s
+            JOIN (SELECT i.investor_id, i.investment_min, i.investment_max,
+                         CASE WHEN EXISTS (SELECT 1 FROM InvestorDomains idm
+                                           WHERE idm.investor_id = i.investor_id
+                                             AND idm.domain_id = %(domain_id)s)
+                              THEN 100 ELSE 50 END AS match_score
+                  FROM Investors i
+                  WHERE i.investment_min <= %(amount)s AND i.investment_max >= %(amount)s) c
+              ON s.startup_id = %(startup_id)s
+            WHERE NOT EXISTS (SELECT 1 FROM Matches m0
+                              WHERE m0.investor_id = c.investor_id AND m0.startup_id = s.startup_id)
+              AND (SELECT COUNT(*) FROM Matches m2
+                   JOIN Startups s2 ON s2.startup_id = m2.startup_id
+                   WHERE m2.investor_id = c.investor_id
+                     AND s2.is_funded = FALSE
+                     AND s2.funding_required BETWEEN c.investment_min AND c.investment_max
+                     AND (m2.match_score > c.match_score
+                          OR (m2.match_score = c.match_score AND {_STARTUP_BEFORE[DB_TYPE]}))) < %(k)s
+        """), {'startup_id': startup_id, 'domain_id': startup['domain_id'],
+               'amount': startup['funding_required'], 'k': top_k})
+
+    for investor in affected:
+        _fill_investor_list(cursor, investor, top_k)
+    return {'affected_lists': len(affected)}
+
+
+def refresh_investor_matches(cursor, investor_id, top_k=TOP_K):
+    """Recompute the lists one investor can affect after it was added or changed
+
+    Mirror image of refresh_startup_matches(): its own startup list, the
+    startup lists it now ranks into, and a refill of every startup list
+    that held it (a growing portfolio_size moves it down in all of them).
+    """
+    cursor.execute("""
+        SELECT investor_id, investment_min, investment_max, portfolio_size
+        FROM Investors WHERE investor_id = %s
+    """, (investor_id,))
+    investor = cursor.fetchone()
+    if not investor:
+        return {'affected_lists': 0}
+
+    _rescore(cursor, "m.investor_id = %s", (investor_id,))
+
+    cursor.execute("""
+        SELECT s.startup_id, s.domain_id, s.funding_required
+        FROM Matches m
+        JOIN Startups s ON s.startup_id = m.startup_id
+        WHERE m.investor_id = %s
+    """, (investor_id,))
+    affected = cursor.fetchall()
+
+    _delete_incompatible(cursor, "m.investor_id = %s", (investor_id,))
+    _fill_investor_list(cursor, investor, top_k)
+
+    # Startups (funded or not) whose list has fewer than top_k valid rows ranked above it
+    cursor.execute(_insert_missing(f"""
+        Matches (investor_id, startup_id, match_score, match_reason)
+        SELECT i.investor_id, c.startup_id, c.match_score,
+               CASE c.match_score WHEN 100 THEN 'Perfect domain match'
+                    ELSE 'Investment range compatible' END
+        FROM Investors i
+        JOIN (SELECT s.startup_id, s.funding_required,
+                     CASE WHEN EXISTS (SELECT 1 FROM InvestorDomains idm
+                                       WHERE idm.investor_id = %(investor_id)s
+                                         AND idm.domain_id = s.domain_id)
+                          THEN 100 ELSE 50 END AS match_score
+              FROM Startups s
+              WHERE s.funding_required BETWEEN %(low)s AND %(high)s) c
+          ON i.investor_id = %(investor_id)s
+        WHERE NOT EXISTS (SELECT 1 FROM Matches m0
+                          WHERE m0.investor_id = i.investor_id AND m0.startup_id = c.startup_id)
+          AND (SELECT COUNT(*) FROM Matches m2
+               JOIN Investors i2 ON i2.investor_id = m2.investor_id
+               WHERE m2.startup_id = c.startup_id
+                 AND i2.investment_min <= c.funding_required
+                 AND i2.investment_max >= c.funding_required
+                 AND (m2.match_score > c.match_score
+                      OR (m2.match_score = c.match_score AND {_INVESTOR_BEFORE[DB_TYPE]}))) < %(k)s
+    """), {'investor_id': investor_id, 'low': investor['investment_min'],
+           'high': investor['investment_max'], 'k': top_k})
+
+    for startup in affected:
+        _fill_startup_list(cursor, startup, top_k)
+    return {'affected_lists': len(affected)}
+
+
+_REFRESHERS = {'startup': refresh_startup_matches, 'investor': refresh_investor_matches}
+
+
+def refresh_matches(conn, entity_type, entity_id):
+    """Refresh one startup/investor now and clear its queue entry (one transaction)"""
+    cursor = get_cursor(conn)
+    try:
+        cursor.execute("DELETE FROM MatchRefreshQueue WHERE entity_type = %s AND entity_id = %s",
+                       (entity_type, entity_id))
+        result = _REFRESHERS[entity_type](cursor, entity_id)
+        conn.commit()
+        return result
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+
+
+def process_refresh_queue(conn, limit=None):
+    """Drain MatchRefreshQueue one entry per transaction; returns entries processed
+
+    Entries are claimed with SKIP LOCKED so several workers can drain
+    the queue at once. The entry is deleted before the refresh runs, so a
+    change committed meanwhile queues the entity again instead of being lost.
+    """
+    processed = 0
+    cursor = get_cursor(conn)
+    try:
+        while limit is None or processed < limit:
+            cursor.execute("""
+                SELECT entity_type, entity_id FROM MatchRefreshQueue
+                ORDER BY queued_at
+                LIMIT 1
+                FOR UPDATE SKIP LOCKED
+            """)
+            entry = cursor.fetchone()
+            if not entry:
+                conn.rollback()
+                break
+            cursor.execute("DELETE FROM MatchRefreshQueue WHERE entity_type = %s AND entity_id = %s",
+                           (entry['entity_type'], entry['entity_id']))
+            _REFRESHERS[entry['entity_type']](cursor, entry['entity_id'])
+            conn.commit()
+            processed += 1
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+    return processed
+
+
+# ============================================
+# Full Rebuild
+# ============================================
+
+def _stage_rows(cursor, rows, batch_size):
+    """Load (investor_id, startup_id, score, reason) rows into match_stage"""
+    if DB_TYPE == 'postgresql':
+        cursor.execute("""
+            CREATE TEMP TABLE match_stage (
+                investor_id INTEGER NOT NULL,
+                startup_id INTEGER NOT NULL,
+                match_score INTEGER NOT NULL,
+                match_reason VARCHAR(255),
+                PRIMARY KEY (investor_id, startup_id)
+            ) ON COMMIT DROP
+        """)
+        for start in range(0, len(rows), batch_size):
+            buffer = io.StringIO()
+            for row in rows[start:start + batch_size]:
+                buffer.write('%d\t%d\t%d\t%s\n' % row)
+            buffer.seek(0)
+            cursor.copy_expert("COPY match_stage FROM STDIN", buffer)
+        cursor.execute("ANALYZE match_stage")
+    else:
+        cursor.execute("DROP TEMPORARY TABLE IF EXISTS match_stage")
+        cursor.execute("""
+            CREATE TEMPORARY TABLE match_stage (
+                investor_id INT NOT NULL,
+                startup_id INT NOT NULL,
+                match_score INT NOT NULL,
+                match_reason VARCHAR(255),
+                PRIMARY KEY (investor_id, startup_id)
+            )
+        """)
+        for start in range(0, len(rows), batch_size):
+            # mysql.connector turns this into one multi-row INSERT per batch
+            cursor.executemany("INSERT INTO match_stage VALUES (%s, %s, %s, %s)",
+                               rows[start:start + batch_size])
+
+
+def _merge_stage(cursor):
+    """Apply match_stage to Matches; returns (deleted, updated, inserted)
+
+    UPDATE + INSERT of missing pairs instead of an upsert, so rebuilds do
+    not burn through the match_id sequence on every existing pair.
+    """
+    if DB_TYPE == 'postgresql':
+        cursor.execute("""
+            DELETE FROM Matches m
+            WHERE m.is_contacted = FALSE
+              AND NOT EXISTS (SELECT 1 FROM match_stage t
+                              WHERE t.investor_id = m.investor_id AND t.startup_id = m.startup_id)
+        """)
+        deleted = cursor.rowcount
+        cursor.execute("""
+            UPDATE Matches m
+            SET match_score = t.match_score, match_reason = t.match_reason
+            FROM match_stage t
+            WHERE t.investor_id = m.investor_id AND t.startup_id = m.startup_id
+              AND (m.match_score IS DISTINCT FROM t.match_score
+                   OR m.match_reason IS DISTINCT FROM t.match_reason)
+        """)
+        updated = cursor.rowcount
+        cursor.execute("""
+            INSERT INTO Matches (investor_id, startup_id, match_score, match_reason)
+            SELECT t.investor_id, t.startup_id, t.match_score, t.match_reason
+            FROM match_stage t
+            WHERE NOT EXISTS (SELECT 1 FROM Matches m
+                              WHERE m.investor_id = t.investor_id AND m.startup_id = t.startup_id)
+        """)
+        inserted = cursor.rowcount
+    else:
+        cursor.execute("""
+            DELETE m FROM Matches m
+            LEFT JOIN match_stage t
+              ON t.investor_id = m.investor_id AND t.startup_id = m.startup_id
+            WHERE m.is_contacted = FALSE AND t.investor_id IS NULL
+        """)
+        deleted = cursor.rowcount
+        cursor.execute("""
+            UPDATE Matches m
+            JOIN match_stage t ON t.investor_id = m.investor_id AND t.startup_id = m.startup_id
+            SET m.match_score = t.match_score, m.match_reason = t.match_reason
+        """)
+        updated = cursor.rowcount  # MySQL only counts rows that actually changed
+        cursor.execute("""
+            INSERT INTO Matches (investor_id, startup_id, match_score, match_reason)
+            SELECT t.investor_id, t.startup_id, t.match_score, t.match_reason
+            FROM match_stage t
+            LEFT JOIN Matches m ON m.investor_id = t.investor_id AND m.startup_id = t.startup_id
+            WHERE m.match_id IS NULL
+        """)
+        inserted = cursor.rowcount
+        cursor.execute("DROP TEMPORARY TABLE match_stage")
+    return deleted, updated, inserted
+
+
+def rebuild_matches(conn, top_k=TOP_K, batch_size=BATCH_SIZE):
+    """Recompute every list from scratch and merge it into Matches"""
+    timings = {}
+    started = time.perf_counter()
+    cursor = get_cursor(conn)
+    try:
+        engine = MatchEngine(DB_TYPE, max_age=0)
+        engine.load(cursor)
+        cursor.execute("SELECT startup_id, domain_id, funding_required FROM Startups")
+        startups = cursor.fetchall()
+        cursor.execute("SELECT investor_id, investment_min, investment_max, preferred_domains FROM Investors")
+        investors = cursor.fetchall()
+        timings['load_s'] = time.perf_counter() - started
+
+        t0 = time.perf_counter()
+        pairs = {}
+        for startup in startups:
+            for match in engine.matched_investors(startup, top_k):
+                pairs[(match['investor_id'], startup['startup_id'])] = match['match_score']
+        for investor in investors:
+            for match in engine.matched_startups(investor, top_k):
+                pairs[(investor['investor_id'], match['startup_id'])] = match['match_score']
+        rows = [(investor_id, startup_id, score, REASONS[score])
+                for (investor_id, startup_id), score in pairs.items()]
+        timings['score_s'] = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        _stage_rows(cursor, rows, batch_size)
+        deleted, updated, inserted = _merge_stage(cursor)
+        # Contacted pairs are kept even when they fall out of every list
+        _rescore(cursor, "m.is_contacted = TRUE", ())
+        cursor.execute("DELETE FROM MatchRefreshQueue")
+        conn.commit()
+        timings['write_s'] = time.perf_counter() - t0
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+
+    timings['total_s'] = time.perf_counter() - started
+    return {
+        'startups': len(startups),
+        'investors': len(investors),
+        'pairs': len(startups) * len(investors),
+        'rows': len(rows),
+        'deleted': deleted,
+        'updated': updated,
+        'inserted': inserted,
+        **{key: round(value, 2) for key, value in timings.items()},
+    }
+
+
+# ============================================
+# Dashboard Reads (MATCH_STRATEGY=materialized)
+# ============================================
+
+def materialized_investors(cursor, startup):
+    """Matched investors for a startup, read from Matches"""
+    cursor.execute("""
+        SELECT i.investor_id, i.name, i.investment_min, i.investment_max,
+               i.preferred_domains, i.location, i.portfolio_size,
+               m.match_score, m.match_reason
+        FROM Matches m
+        JOIN Investors i ON i.investor_id = m.investor_id
+        WHERE m.startup_id = %s
+          AND i.investment_min <= %s
+          AND i.investment_max >= %s
+        ORDER BY m.match_score DESC, i.portfolio_size ASC, i.investor_id ASC
+        LIMIT 10
+    """, (startup['startup_id'], startup['funding_required'], startup['funding_required']))
+    return cursor.fetchall()
+
+
+def materialized_startups(cursor, investor):
+    """Matched unfunded startups for an investor, read from Matches"""
+    cursor.execute("""
+        SELECT s.startup_id, s.name, d.domain_name, s.funding_required,
+               s.location, s.description, s.is_funded, s.founded_date,
+               m.match_score
+        FROM Matches m
+        JOIN Startups s ON s.startup_id = m.startup_id
+        JOIN Domains d ON d.domain_id = s.domain_id
+        WHERE m.investor_id = %s
+          AND s.is_funded = FALSE
+          AND s.funding_required BETWEEN %s AND %s
+        ORDER BY m.match_score DESC, s.founded_date DESC, s.startup_id ASC
+        LIMIT 10
+    """, (investor['investor_id'], investor['investment_min'], investor['investment_max']))
+    return cursor.fetchall()
+
+
+# ============================================
+# Verification (SQL is the oracle)
+# ============================================
+
+def verify(limit=None):
+    """Compare every materialized dashboard list with the live SQL query"""
+    from app import find_matched_investors_sql, find_matched_startups_sql
+
+    with get_db_connection() as conn:
+        if not conn:
+            print("❌ Could not connect to database")
+            return False
+        cursor = get_cursor(conn)
+        mismatches = 0
+        cursor.execute("SELECT * FROM Startups ORDER BY startup_id")
+        for startup in cursor.fetchall()[:limit]:
+            expected = [dict(r) for r in find_matched_investors_sql(cursor, startup)]
+            actual = [dict(r) for r in materialized_investors(cursor, startup)]
+            if expected != actual:
+                mismatches += 1
+                print(f"  ✗ startup {startup['startup_id']}: SQL {[r['investor_id'] for r in expected]} "
+                      f"vs Matches {[r['investor_id'] for r in actual]}")
+        cursor.execute("SELECT * FROM Investors ORDER BY investor_id")
+        for investor in cursor.fetchall()[:limit]:
+            expected = [dict(r) for r in find_matched_startups_sql(cursor, investor)]
+            actual = [dict(r) for r in materialized_startups(cursor, investor)]
+            if expected != actual:
+                mismatches += 1
+                print(f"  ✗ investor {investor['investor_id']}: SQL {[r['startup_id'] for r in expected]} "
+                      f"vs Matches {[r['startup_id'] for r in actual]}")
+        cursor.close()
+
+    if mismatches:
+        print(f"❌ {mismatches} list(s) differ from SQL")
+        return False
+    print("✅ Materialized matches agree with SQL")
+    return True
+
+
+if __name__ == '__main__':
+    print("=" * 50)
+    print("🧩 Startup Funding System - Materialized Matches")
+    print("=" * 50)
+
+    if '--verify' in sys.argv:
+        args = [a for a in sys.argv[1:] if a.isdigit()]
+        sys.exit(0 if verify(int(args[0]) if args else None) else 1)
+
+    with get_db_connection() as conn:
+        if not conn:
+            print("❌ Could not connect to database")
+            sys.exit(1)
+        if '--refresh' in sys.argv:
+            started = time.perf_counter()
+            count = process_refresh_queue(conn)
+            print(f"✅ Refreshed {count} queued startup(s)/investor(s) "
+                  f"in {time.perf_counter() - started:.2f}s")
+        else:
+            print(f"  → Rebuilding top {TOP_K} matches per startup and investor...")
+            stats = rebuild_matches(conn)
+            print(f"✅ Rebuilt {stats['rows']} matches from {stats['startups']} startups × "
+                  f"{stats['investors']} investors ({stats['pairs']} pairs) in {stats['total_s']}s "
+                  f"(load {stats['load_s']}s, score {stats['score_s']}s, write {stats['write_s']}s)")
+            print(f"   • {stats['inserted']} inserted, {stats['updated']} updated, {stats['deleted']} deleted")
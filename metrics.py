@@ -0,0 +1,258 @@
+"""
+============================================
+DBMS Project: In-Process Metrics
+Thread-safe counters and latency histograms for the monitoring endpoints
+Works with both MySQL and PostgreSQL
+============================================
+
+Metrics live in the worker process that records them; each gunicorn
+worker reports its own numbers.
+
+    from metrics import histogram
+    VERIFY_SECONDS = histogram('password_verify_seconds', 'bcrypt checkpw time')
+    with VERIFY_SECONDS.time():
+        ...
+
+A metric can carry labels; each label set is its own series:
+
+    histogram('sql_statement_seconds', 'Statement time', labels={'fingerprint': 'a1b2c3d4'})
+
+render_prometheus() serves every series in the Prometheus text format.
+
+track_phase() adds the time of a block to the current request's phase
+totals (connect, sql, password, render), which app.py reports per route.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+# Upper bounds in seconds (the last bucket is +Inf)
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_registry = {}
+_registry_lock = threading.Lock()
+
+
+def _series_name(name, labels):
+    if not labels:
+        return name
+    pairs = ','.join(f'{key}="{_escape(value)}"' for key, value in labels)
+    return f'{name}{{{pairs}}}'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class Counter:
+    """A monotonically increasing count"""
+
+    kind = 'counter'
+
+    def __init__(self, name, help_text='', labels=()):
+        self.name = name
+        self.help = help_text
+        self.labels = labels
+        self._lock = threading.Lock()
+        self._value = 0
+
+    def inc(self, amount=1):
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self):
+        return self._value
+
+    def snapshot(self):
+        return {'type': 'counter', 'value': self._value}
+
+    def prometheus_lines(self):
+        return [f"{_series_name(self.name, self.labels)} {self._value}"]
+
+
+class Gauge:
+    """A value that is set, e.g. from pool statistics at scrape time"""
+
+    kind = 'gauge'
+
+    def __init__(self, name, help_text='', labels=()):
+        self.name = name
+        self.help = help_text
+        self.labels = labels
+        self._value = 0
+
+    def set(self, value):
+        self._value = value
+
+    @property
+    def value(self):
+        return self._value
+
+    def snapshot(self):
+        return {'type': 'gauge', 'value': self._value}
+
+    def prometheus_lines(self):
+        return [f"{_series_name(self.name, self.labels)} {self._value}"]
+
+
+class Histogram:
+    """Observations counted into fixed buckets, plus count and sum"""
+
+    kind = 'histogram'
+
+    def __init__(self, name, help_text='', labels=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labels = labels
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._count = 0
+        self._sum = 0.0
+
+    def observe(self, value):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._count += 1
+            self._sum += value
+
+    @contextmanager
+    def time(self):
+        """Observe the wall time of a `with` block"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started)
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-th observation"""
+        with self._lock:
+            counts, total = list(self._counts), self._count
+        if not total:
+            return None
+        rank = q * total
+        seen = 0
+        for bound, count in zip(self.buckets + (float('inf'),), counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float('inf')
+
+    def snapshot(self):
+        with self._lock:
+            counts, total, value_sum = list(self._counts), self._count, self._sum
+        cumulative, running = {}, 0
+        for bound, count in zip(self.buckets + (float('inf'),), counts):
+            running += count
+            cumulative['+Inf' if bound == float('inf') else str(bound)] = running
+        return {
+            'type': 'histogram',
+            'count': total,
+            'sum': round(value_sum, 6),
+            'avg_ms': round(value_sum * 1000 / total, 3) if total else None,
+            'p50_le': self.quantile(0.5),
+            'p95_le': self.quantile(0.95),
+            'p99_le': self.quantile(0.99),
+            'buckets': cumulative,
+        }
+
+    def prometheus_lines(self):
+        with self._lock:
+            counts, total, value_sum = list(self._counts), self._count, self._sum
+        lines, running = [], 0
+        for bound, count in zip(self.buckets + (float('inf'),), counts):
+            running += count
+            le = '+Inf' if bound == float('inf') else repr(bound)
+            lines.append(f"{_series_name(self.name + '_bucket', self.labels + (('le', le),))} {running}")
+        lines.append(f"{_series_name(self.name + '_sum', self.labels)} {value_sum}")
+        lines.append(f"{_series_name(self.name + '_count', self.labels)} {total}")
+        return lines
+
+
+def _register(cls, name, help_text, labels, **kwargs):
+    labels = tuple(sorted((labels or {}).items()))
+    with _registry_lock:
+        metric = _registry.get((name, labels))
+        if metric is None:
+            metric = _registry[(name, labels)] = cls(name, help_text, labels, **kwargs)
+        elif not isinstance(metric, cls):
+            raise ValueError(f"metric {name!r} is already registered as {type(metric).__name__}")
+        return metric
+
+
+def counter(name, help_text='', labels=None):
+    """Get or create the Counter called `name` (one series per label set)"""
+    return _register(Counter, name, help_text, labels)
+
+
+def gauge(name, help_text='', labels=None):
+    """Get or create the Gauge called `name` (one series per label set)"""
+    return _register(Gauge, name, help_text, labels)
+
+
+def histogram(name, help_text='', buckets=DEFAULT_BUCKETS, labels=None):
+    """Get or create the Histogram called `name` (one series per label set)"""
+    return _register(Histogram, name, help_text, labels, buckets=buckets)
+
+
+def snapshot(prefix=''):
+    """{series name: metric snapshot} for every metric whose name starts with prefix"""
+    with _registry_lock:
+        metrics = [m for (name, _), m in sorted(_registry.items()) if name.startswith(prefix)]
+    return {_series_name(m.name, m.labels): m.snapshot() for m in metrics}
+
+
+def render_prometheus():
+    """Every series in the Prometheus text exposition format (version 0.0.4)"""
+    with _registry_lock:
+        metrics = [m for _, m in sorted(_registry.items())]
+    lines, seen = [], set()
+    for metric in metrics:
+        if metric.name not in seen:
+            seen.add(metric.name)
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+        lines.extend(metric.prometheus_lines())
+    return '\n'.join(lines) + '\n'
+
+# ============================================
+# Per-request phases
+# ============================================
+
+_request = threading.local()
+
+
+def begin_request():
+    """Start collecting phase times for the request handled by this thread"""
+    _request.phases = {}
+
+
+def end_request():
+    """{phase: seconds} collected since begin_request()"""
+    phases = getattr(_request, 'phases', None) or {}
+    _request.phases = None
+    return phases
+
+
+def add_phase_time(phase, seconds):
+    phases = getattr(_request, 'phases', None)
+    if phases is not None:
+        phases[phase] = phases.get(phase, 0.0) + seconds
+
+
+@contextmanager
+def track_phase(phase, histogram_metric=None):
+    """Time a block into the current request's `phase` (and optionally a histogram)"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        add_phase_time(phase, elapsed)
+        if histogram_metric is not None:
+            histogram_metric.observe(elapsed)
@@ -0,0 +1,180 @@
+"""
+============================================
+DBMS Project: Schema Migration Runner
+Applies migrations/*.sql to an existing database
+Works with both MySQL and PostgreSQL
+============================================
+
+Each migration has one file per backend:
+
+    migrations/001_investor_domains.sql             (MySQL)
+    migrations/001_investor_domains_postgresql.sql  (PostgreSQL)
+
+Applied versions are recorded in the SchemaMigrations table, so running
+the script again only applies what is new. The full schema files already
+contain every migration and record them as applied.
+
+A file whose first line is `-- migrate: no-transaction` runs in autocommit
+mode (needed for CREATE INDEX CONCURRENTLY on PostgreSQL), one statement at
+a time. A DO $$ ... $$ block in such a file can check the data first and
+RAISE EXCEPTION to stop the migration before anything is built.
+"""
+
+import os
+import re
+import sys
+
+from database import DB_TYPE, get_db_connection, get_cursor
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'migrations')
+NO_TRANSACTION_MARKER = '-- migrate: no-transaction'
+
+
+def list_migrations(db_type=DB_TYPE):
+    """[(version, path)] for the given backend, in version order"""
+    migrations = []
+    for filename in sorted(os.listdir(MIGRATIONS_DIR)):
+        match = re.match(r'^(\d+_\w+?)(_postgresql)?\.sql$', filename)
+        if not match:
+            continue
+        is_postgresql = bool(match.group(2))
+        if is_postgresql == (db_type == 'postgresql'):
+            migrations.append((match.group(1), os.path.join(MIGRATIONS_DIR, filename)))
+    return migrations
+
+
+def split_mysql_statements(sql):
+    """Split a MySQL script into statements, honouring DELIMITER lines.
+
+    mysql.connector cannot run `DELIMITER //` blocks (they are a mysql
+    client feature), so triggers and procedures are sent one by one.
+    """
+    statements = []
+    delimiter = ';'
+    buffer = []
+    for line in sql.splitlines():
+        stripped = line.strip()
+        if stripped.upper().startswith('DELIMITER '):
+            delimiter = stripped.split(None, 1)[1]
+            continue
+        if not buffer and (not stripped or stripped.startswith('--')):
+            continue
+        buffer.append(line)
+        if stripped.endswith(delimiter):
+            statement = '\n'.join(buffer).rstrip()
+            statement = statement[:-len(delimiter)].strip()
+            if statement:
+                statements.append(statement)
+            buffer = []
+    tail = '\n'.join(buffer).strip()
+    if tail:
+        statements.append(tail)
+    return statements
+
+
+def split_postgresql_statements(sql):
+    """Split a PostgreSQL script on `;`, except inside $$-quoted bodies (DO blocks)"""
+    statements, buffer = [], ''
+    for part in re.split(r'(\$\$.*?\$\$)', sql, flags=re.S):
+        if part.startswith('$$'):
+            buffer += part
+            continue
+        *complete, buffer_tail = part.split(';')
+        for piece in complete:
+            statements.append(buffer + piece)
+            buffer = ''
+        buffer += buffer_tail
+    statements.append(buffer)
+    return [statement for statement in map(_strip_comments, statements) if statement]
+
+
+def _strip_comments(statement):
+    return '\n'.join(line for line in statement.splitlines()
+                     if not line.strip().startswith('--')).strip()
+
+
+def ensure_migrations_table(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS SchemaMigrations (
+            version VARCHAR(100) PRIMARY KEY,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+
+def applied_versions(cursor):
+    cursor.execute("SELECT version FROM SchemaMigrations")
+    return {row['version'] for row in cursor.fetchall()}
+
+
+def apply_migration(conn, version, path):
+    """Run one migration file and record it"""
+    with open(path, encoding='utf-8') as f:
+        sql = f.read()
+    no_transaction = sql.lstrip().startswith(NO_TRANSACTION_MARKER)
+
+    cursor = get_cursor(conn)
+    try:
+        if DB_TYPE == 'postgresql':
+            if no_transaction:
+                conn.rollback()
+                conn.autocommit = True
+                try:
+                    # CONCURRENTLY statements must run one at a time
+                    for statement in split_postgresql_statements(sql):
+                        cursor.execute(statement)
+                finally:
+                    conn.autocommit = False
+            else:
+                cursor.execute(sql)
+        else:
+            for statement in split_mysql_statements(sql):
+                cursor.execute(statement)
+                if cursor.with_rows:
+                    cursor.fetchall()
+        cursor.execute("INSERT INTO SchemaMigrations (version) VALUES (%s)", (version,))
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+
+
+def migrate(dry_run=False):
+    """Apply every pending migration, in order"""
+    with get_db_connection() as conn:
+        if not conn:
+            print("❌ Could not connect to database")
+            return False
+        cursor = get_cursor(conn)
+        ensure_migrations_table(cursor)
+        conn.commit()
+        done = applied_versions(cursor)
+        cursor.close()
+
+        pending = [(v, p) for v, p in list_migrations() if v not in done]
+        if not pending:
+            print("✅ Database schema is up to date")
+            return True
+
+        for version, path in pending:
+            if dry_run:
+                print(f"  • pending: {version}")
+                continue
+            print(f"  → Applying {version}...")
+            try:
+                apply_migration(conn, version, path)
+            except Exception as e:
+                print(f"❌ Migration {version} failed: {e}")
+                return False
+        if not dry_run:
+            print(f"✅ Applied {len(pending)} migration(s)")
+        return True
+
+
+if __name__ == '__main__':
+    print("=" * 50)
+    print("🛠️  Startup Funding System - Schema Migrations")
+    print("=" * 50)
+    sys.exit(0 if migrate(dry_run='--status' in sys.argv) else 1)
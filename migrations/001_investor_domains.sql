@@ -0,0 +1,31 @@
+-- ============================================
+-- Migration 001: InvestorDomains junction table (MySQL)
+-- Normalizes Investors.preferred_domains ('1,3,5') into indexed rows
+-- ============================================
+
+CREATE TABLE IF NOT EXISTS InvestorDomains (
+    investor_id INT NOT NULL,
+    domain_id INT NOT NULL,
+    
+    PRIMARY KEY (investor_id, domain_id),
+    KEY idx_investor_domains_domain (domain_id, investor_id),
+    FOREIGN KEY (investor_id) REFERENCES Investors(investor_id)
+        ON DELETE CASCADE
+        ON UPDATE CASCADE,
+    FOREIGN KEY (domain_id) REFERENCES Domains(domain_id)
+        ON DELETE CASCADE
+        ON UPDATE CASCADE
+);
+
+-- Dashboard-order indexes: the match queries read these in ORDER BY order
+-- and stop after 10 rows instead of sorting every row in range
+CREATE INDEX idx_investor_rank ON Investors(portfolio_size, investor_id);
+CREATE INDEX idx_startup_unfunded_recent ON Startups(is_funded, founded_date DESC, startup_id);
+
+-- Backfill: FIND_IN_SET matches exact ids, and Domains is tiny
+INSERT IGNORE INTO InvestorDomains (investor_id, domain_id)
+SELECT i.investor_id, d.domain_id
+FROM Investors i
+JOIN Domains d ON FIND_IN_SET(d.domain_id, i.preferred_domains) > 0;
+
+ANALYZE TABLE InvestorDomains, Investors, Startups;
@@ -0,0 +1,71 @@
+-- ============================================
+-- Migration 001: InvestorDomains junction table (PostgreSQL)
+-- Normalizes Investors.preferred_domains ('1,3,5') into indexed rows
+-- ============================================
+
+CREATE TABLE IF NOT EXISTS InvestorDomains (
+    investor_id INTEGER NOT NULL,
+    domain_id INTEGER NOT NULL,
+    
+    PRIMARY KEY (investor_id, domain_id),
+    FOREIGN KEY (investor_id) REFERENCES Investors(investor_id)
+        ON DELETE CASCADE
+        ON UPDATE CASCADE,
+    FOREIGN KEY (domain_id) REFERENCES Domains(domain_id)
+        ON DELETE CASCADE
+        ON UPDATE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS idx_investor_domains_domain ON InvestorDomains(domain_id, investor_id);
+
+-- Dashboard-order indexes: the match queries read these in ORDER BY order
+-- and stop after 10 rows instead of sorting every row in range
+CREATE INDEX IF NOT EXISTS idx_investor_rank ON Investors(portfolio_size, investor_id);
+CREATE INDEX IF NOT EXISTS idx_startup_unfunded_recent ON Startups(is_funded, founded_date DESC, startup_id);
+
+COMMENT ON TABLE InvestorDomains IS 'Preferred domains per investor (normalized preferred_domains)';
+
+-- Backfill: one row per exact domain id in the comma-separated list
+INSERT INTO InvestorDomains (investor_id, domain_id)
+SELECT i.investor_id, d.domain_id
+FROM Investors i
+CROSS JOIN LATERAL unnest(string_to_array(i.preferred_domains, ',')) AS t(token)
+JOIN Domains d ON d.domain_id::TEXT = t.token
+ON CONFLICT DO NOTHING;
+
+-- Match score now checks the junction table (LIKE '%1%' also matched '11')
+CREATE OR REPLACE FUNCTION calculate_match_score(
+    p_investor_id INTEGER,
+    p_startup_id INTEGER
+) RETURNS INTEGER AS $$
+DECLARE
+    v_score INTEGER := 0;
+    v_funding_required NUMERIC;
+    v_investment_min NUMERIC;
+    v_investment_max NUMERIC;
+    v_startup_domain INTEGER;
+BEGIN
+    SELECT funding_required, domain_id 
+    INTO v_funding_required, v_startup_domain
+    FROM Startups WHERE startup_id = p_startup_id;
+    
+    SELECT investment_min, investment_max
+    INTO v_investment_min, v_investment_max
+    FROM Investors WHERE investor_id = p_investor_id;
+    
+    IF v_funding_required BETWEEN v_investment_min AND v_investment_max THEN
+        v_score := v_score + 50;
+    END IF;
+    
+    IF EXISTS (SELECT 1 FROM InvestorDomains
+               WHERE investor_id = p_investor_id AND domain_id = v_startup_domain) THEN
+        v_score := v_score + 50;
+    END IF;
+    
+    RETURN v_score;
+END;
+$$ LANGUAGE plpgsql;
+
+ANALYZE InvestorDomains;
+ANALYZE Investors;
+ANALYZE Startups;
@@ -0,0 +1,76 @@
+-- ============================================
+-- Migration 002: Materialized matches (MySQL)
+-- Per-entity Matches indexes and the refresh queue fed by triggers
+-- Run `python materialized_matches.py` afterwards to fill Matches
+-- ============================================
+
+-- Dashboards read one startup's / investor's rows best-first
+CREATE INDEX idx_matches_startup_score ON Matches(startup_id, match_score DESC);
+CREATE INDEX idx_matches_investor_score ON Matches(investor_id, match_score DESC);
+
+CREATE TABLE IF NOT EXISTS MatchRefreshQueue (
+    entity_type VARCHAR(10) NOT NULL CHECK (entity_type IN ('startup', 'investor')),
+    entity_id INT NOT NULL,
+    queued_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    
+    PRIMARY KEY (entity_type, entity_id)
+);
+
+DELIMITER //
+
+CREATE TRIGGER trg_startup_match_insert
+AFTER INSERT ON Startups
+FOR EACH ROW
+BEGIN
+    INSERT IGNORE INTO MatchRefreshQueue (entity_type, entity_id) VALUES ('startup', NEW.startup_id);
+END//
+
+-- Also fires when RecordFunding marks the startup funded
+CREATE TRIGGER trg_startup_match_update
+AFTER UPDATE ON Startups
+FOR EACH ROW
+BEGIN
+    IF NOT (OLD.funding_required <=> NEW.funding_required
+            AND OLD.domain_id <=> NEW.domain_id
+            AND OLD.is_funded <=> NEW.is_funded
+            AND OLD.founded_date <=> NEW.founded_date) THEN
+        INSERT IGNORE INTO MatchRefreshQueue (entity_type, entity_id) VALUES ('startup', NEW.startup_id);
+    END IF;
+END//
+
+CREATE TRIGGER trg_investor_match_insert
+AFTER INSERT ON Investors
+FOR EACH ROW
+BEGIN
+    INSERT IGNORE INTO MatchRefreshQueue (entity_type, entity_id) VALUES ('investor', NEW.investor_id);
+END//
+
+-- portfolio_size changes the investor's rank in every startup list
+CREATE TRIGGER trg_investor_match_update
+AFTER UPDATE ON Investors
+FOR EACH ROW
+BEGIN
+    IF NOT (OLD.investment_min <=> NEW.investment_min
+            AND OLD.investment_max <=> NEW.investment_max
+            AND OLD.portfolio_size <=> NEW.portfolio_size) THEN
+        INSERT IGNORE INTO MatchRefreshQueue (entity_type, entity_id) VALUES ('investor', NEW.investor_id);
+    END IF;
+END//
+
+CREATE TRIGGER trg_investor_domains_match_insert
+AFTER INSERT ON InvestorDomains
+FOR EACH ROW
+BEGIN
+    INSERT IGNORE INTO MatchRefreshQueue (entity_type, entity_id) VALUES ('investor', NEW.investor_id);
+END//
+
+CREATE TRIGGER trg_investor_domains_match_delete
+AFTER DELETE ON InvestorDomains
+FOR EACH ROW
+BEGIN
+    INSERT IGNORE INTO MatchRefreshQueue (entity_type, entity_id) VALUES ('investor', OLD.investor_id);
+END//
+
+DELIMITER ;
+
+ANALYZE TABLE Matches;
@@ -0,0 +1,82 @@
+-- ============================================
+-- Migration 002: Materialized matches (PostgreSQL)
+-- Per-entity Matches indexes and the refresh queue fed by triggers
+-- Run `python materialized_matches.py` afterwards to fill Matches
+-- ============================================
+
+-- Dashboards read one startup's / investor's rows best-first
+CREATE INDEX IF NOT EXISTS idx_matches_startup_score ON Matches(startup_id, match_score DESC);
+CREATE INDEX IF NOT EXISTS idx_matches_investor_score ON Matches(investor_id, match_score DESC);
+
+CREATE TABLE IF NOT EXISTS MatchRefreshQueue (
+    entity_type VARCHAR(10) NOT NULL CHECK (entity_type IN ('startup', 'investor')),
+    entity_id INTEGER NOT NULL,
+    queued_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    
+    PRIMARY KEY (entity_type, entity_id)
+);
+
+COMMENT ON TABLE MatchRefreshQueue IS 'Startups/investors whose Matches rows need recomputing';
+
+CREATE OR REPLACE FUNCTION queue_startup_match_refresh()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO MatchRefreshQueue (entity_type, entity_id)
+    VALUES ('startup', NEW.startup_id)
+    ON CONFLICT DO NOTHING;
+    
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION queue_investor_match_refresh()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO MatchRefreshQueue (entity_type, entity_id)
+    VALUES ('investor', CASE WHEN TG_OP = 'DELETE' THEN OLD.investor_id ELSE NEW.investor_id END)
+    ON CONFLICT DO NOTHING;
+    
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_startup_match_insert ON Startups;
+CREATE TRIGGER trg_startup_match_insert
+AFTER INSERT ON Startups
+FOR EACH ROW
+EXECUTE FUNCTION queue_startup_match_refresh();
+
+-- Fires for trg_update_funded_status too (a Funding row marks the startup funded)
+DROP TRIGGER IF EXISTS trg_startup_match_update ON Startups;
+CREATE TRIGGER trg_startup_match_update
+AFTER UPDATE OF funding_required, domain_id, is_funded, founded_date ON Startups
+FOR EACH ROW
+WHEN (OLD.funding_required IS DISTINCT FROM NEW.funding_required
+      OR OLD.domain_id IS DISTINCT FROM NEW.domain_id
+      OR OLD.is_funded IS DISTINCT FROM NEW.is_funded
+      OR OLD.founded_date IS DISTINCT FROM NEW.founded_date)
+EXECUTE FUNCTION queue_startup_match_refresh();
+
+DROP TRIGGER IF EXISTS trg_investor_match_insert ON Investors;
+CREATE TRIGGER trg_investor_match_insert
+AFTER INSERT ON Investors
+FOR EACH ROW
+EXECUTE FUNCTION queue_investor_match_refresh();
+
+-- portfolio_size changes the investor's rank in every startup list
+DROP TRIGGER IF EXISTS trg_investor_match_update ON Investors;
+CREATE TRIGGER trg_investor_match_update
+AFTER UPDATE OF investment_min, investment_max, portfolio_size ON Investors
+FOR EACH ROW
+WHEN (OLD.investment_min IS DISTINCT FROM NEW.investment_min
+      OR OLD.investment_max IS DISTINCT FROM NEW.investment_max
+      OR OLD.portfolio_size IS DISTINCT FROM NEW.portfolio_size)
+EXECUTE FUNCTION queue_investor_match_refresh();
+
+DROP TRIGGER IF EXISTS trg_investor_domains_match ON InvestorDomains;
+CREATE TRIGGER trg_investor_domains_match
+AFTER INSERT OR DELETE ON InvestorDomains
+FOR EACH ROW
+EXECUTE FUNCTION queue_investor_match_refresh();
+
+ANALYZE Matches;
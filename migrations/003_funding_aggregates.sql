@@ -0,0 +1,151 @@
+-- ============================================
+-- Migration 003: Funding totals (MySQL)
+-- Running totals on Startups/Investors kept by Funding triggers
+-- Check them with `python funding_totals.py`
+-- ============================================
+
+ALTER TABLE Startups
+    ADD COLUMN total_funding_received DECIMAL(15,2) NOT NULL DEFAULT 0;
+
+ALTER TABLE Investors
+    ADD COLUMN total_invested DECIMAL(15,2) NOT NULL DEFAULT 0,
+    ADD COLUMN startups_funded INT NOT NULL DEFAULT 0;
+
+-- The triggers ask "does this investor have another row for this startup?"
+CREATE INDEX idx_funding_investor_startup ON Funding(investor_id, startup_id);
+
+-- Backfill from the existing Funding rows
+UPDATE Startups s SET total_funding_received = COALESCE((
+    SELECT SUM(f.amount) FROM Funding f WHERE f.startup_id = s.startup_id
+), 0);
+
+UPDATE Investors i SET
+    total_invested = COALESCE((
+        SELECT SUM(f.amount) FROM Funding f WHERE f.investor_id = i.investor_id
+    ), 0),
+    startups_funded = (
+        SELECT COUNT(DISTINCT f.startup_id) FROM Funding f WHERE f.investor_id = i.investor_id
+    ),
+    portfolio_size = (
+        SELECT COUNT(*) FROM Funding f WHERE f.investor_id = i.investor_id
+    );
+
+DELIMITER //
+
+-- Add (p_sign = 1) or remove (p_sign = -1) one Funding row from the totals
+CREATE PROCEDURE apply_funding_delta(
+    IN p_funding_id INT,
+    IN p_investor_id INT,
+    IN p_startup_id INT,
+    IN p_amount DECIMAL(15,2),
+    IN p_sign INT
+)
+BEGIN
+    DECLARE v_other_rows INT;
+
+    UPDATE Startups
+    SET total_funding_received = total_funding_received + p_sign * p_amount
+    WHERE startup_id = p_startup_id;
+
+    -- Locks the investor row first; the locking read below then sees every
+    -- committed Funding row of concurrent transactions for this investor
+    UPDATE Investors
+    SET total_invested = total_invested + p_sign * p_amount,
+        portfolio_size = portfolio_size + p_sign
+    WHERE investor_id = p_investor_id;
+
+    -- startups_funded only moves for the first / last row of a pair
+    SELECT COUNT(*) INTO v_other_rows
+    FROM Funding
+    WHERE investor_id = p_investor_id
+      AND startup_id = p_startup_id
+      AND funding_id <> p_funding_id
+    FOR SHARE;
+
+    IF v_other_rows = 0 THEN
+        UPDATE Investors
+        SET startups_funded = startups_funded + p_sign
+        WHERE investor_id = p_investor_id;
+    END IF;
+END//
+
+CREATE TRIGGER trg_funding_totals_insert
+AFTER INSERT ON Funding
+FOR EACH ROW
+BEGIN
+    CALL apply_funding_delta(NEW.funding_id, NEW.investor_id, NEW.startup_id, NEW.amount, 1);
+END//
+
+CREATE TRIGGER trg_funding_totals_update
+AFTER UPDATE ON Funding
+FOR EACH ROW
+BEGIN
+    IF NOT (OLD.investor_id <=> NEW.investor_id
+            AND OLD.startup_id <=> NEW.startup_id
+            AND OLD.amount <=> NEW.amount) THEN
+        CALL apply_funding_delta(OLD.funding_id, OLD.investor_id, OLD.startup_id, OLD.amount, -1);
+        CALL apply_funding_delta(NEW.funding_id, NEW.investor_id, NEW.startup_id, NEW.amount, 1);
+    END IF;
+END//
+
+CREATE TRIGGER trg_funding_totals_delete
+AFTER DELETE ON Funding
+FOR EACH ROW
+BEGIN
+    CALL apply_funding_delta(OLD.funding_id, OLD.investor_id, OLD.startup_id, OLD.amount, -1);
+END//
+
+-- MySQL does not fire triggers for ON DELETE CASCADE, so take the
+-- cascaded Funding rows off the other side's totals up front
+CREATE TRIGGER trg_startup_delete_funding_totals
+BEFORE DELETE ON Startups
+FOR EACH ROW
+BEGIN
+    UPDATE Investors i
+    JOIN (SELECT investor_id, SUM(amount) AS amount, COUNT(*) AS deals
+          FROM Funding
+          WHERE startup_id = OLD.startup_id
+          GROUP BY investor_id) f ON f.investor_id = i.investor_id
+    SET i.total_invested = i.total_invested - f.amount,
+        i.portfolio_size = i.portfolio_size - f.deals,
+        i.startups_funded = i.startups_funded - 1;
+END//
+
+CREATE TRIGGER trg_investor_delete_funding_totals
+BEFORE DELETE ON Investors
+FOR EACH ROW
+BEGIN
+    UPDATE Startups s
+    JOIN (SELECT startup_id, SUM(amount) AS amount
+          FROM Funding
+          WHERE investor_id = OLD.investor_id
+          GROUP BY startup_id) f ON f.startup_id = s.startup_id
+    SET s.total_funding_received = s.total_funding_received - f.amount;
+END//
+
+DELIMITER ;
+
+-- Views read the stored totals instead of grouping Funding
+CREATE OR REPLACE VIEW v_startup_details AS
+SELECT
+    s.startup_id,
+    s.name AS startup_name,
+    d.domain_name,
+    s.funding_required,
+    s.location,
+    s.is_funded,
+    s.total_funding_received
+FROM Startups s
+JOIN Domains d ON s.domain_id = d.domain_id;
+
+CREATE OR REPLACE VIEW v_investor_portfolio AS
+SELECT
+    i.investor_id,
+    i.name AS investor_name,
+    i.investment_min,
+    i.investment_max,
+    i.portfolio_size,
+    i.total_invested
+FROM Investors i;
+
+ANALYZE TABLE Funding;
@@ -0,0 +1,125 @@
+-- ============================================
+-- Migration 003: Funding totals (PostgreSQL)
+-- Running totals on Startups/Investors kept by a Funding trigger
+-- Check them with `python funding_totals.py`
+-- ============================================
+
+ALTER TABLE Startups
+    ADD COLUMN IF NOT EXISTS total_funding_received NUMERIC(15,2) NOT NULL DEFAULT 0;
+
+ALTER TABLE Investors
+    ADD COLUMN IF NOT EXISTS total_invested NUMERIC(15,2) NOT NULL DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS startups_funded INTEGER NOT NULL DEFAULT 0;
+
+-- The trigger asks "does this investor have another row for this startup?"
+CREATE INDEX IF NOT EXISTS idx_funding_investor_startup ON Funding(investor_id, startup_id);
+
+-- Backfill from the existing Funding rows
+UPDATE Startups s SET total_funding_received = COALESCE((
+    SELECT SUM(f.amount) FROM Funding f WHERE f.startup_id = s.startup_id
+), 0);
+
+UPDATE Investors i SET
+    total_invested = COALESCE((
+        SELECT SUM(f.amount) FROM Funding f WHERE f.investor_id = i.investor_id
+    ), 0),
+    startups_funded = (
+        SELECT COUNT(DISTINCT f.startup_id) FROM Funding f WHERE f.investor_id = i.investor_id
+    ),
+    portfolio_size = (
+        SELECT COUNT(*) FROM Funding f WHERE f.investor_id = i.investor_id
+    );
+
+-- The recount trigger is replaced by trg_funding_totals
+DROP TRIGGER IF EXISTS trg_update_portfolio_size ON Funding;
+DROP FUNCTION IF EXISTS update_portfolio_size();
+
+-- Add (p_sign = 1) or remove (p_sign = -1) one Funding row from the totals
+CREATE OR REPLACE FUNCTION apply_funding_delta(
+    p_funding_id INTEGER,
+    p_investor_id INTEGER,
+    p_startup_id INTEGER,
+    p_amount NUMERIC,
+    p_sign INTEGER
+)
+RETURNS VOID AS $$
+BEGIN
+    UPDATE Startups
+    SET total_funding_received = total_funding_received + p_sign * p_amount
+    WHERE startup_id = p_startup_id;
+
+    -- Locks the investor row first, so the check below sees every
+    -- committed Funding row of concurrent transactions for this investor
+    UPDATE Investors
+    SET total_invested = total_invested + p_sign * p_amount,
+        portfolio_size = portfolio_size + p_sign
+    WHERE investor_id = p_investor_id;
+
+    -- startups_funded only moves for the first / last row of a pair
+    IF NOT EXISTS (
+        SELECT 1 FROM Funding
+        WHERE investor_id = p_investor_id
+          AND startup_id = p_startup_id
+          AND funding_id <> p_funding_id
+    ) THEN
+        UPDATE Investors
+        SET startups_funded = startups_funded + p_sign
+        WHERE investor_id = p_investor_id;
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION maintain_funding_totals()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM apply_funding_delta(OLD.funding_id, OLD.investor_id, OLD.startup_id, OLD.amount, -1);
+    END IF;
+    IF TG_OP = 'DELETE' THEN
+        RETURN OLD;
+    END IF;
+
+    PERFORM apply_funding_delta(NEW.funding_id, NEW.investor_id, NEW.startup_id, NEW.amount, 1);
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+-- BEFORE, not AFTER: row-level AFTER triggers run once the whole statement
+-- is done, so a multi-row DELETE (e.g. ON DELETE CASCADE) would see every
+-- row of a pair gone at once and miscount startups_funded
+CREATE TRIGGER trg_funding_totals
+BEFORE INSERT OR DELETE OR UPDATE OF investor_id, startup_id, amount ON Funding
+FOR EACH ROW
+EXECUTE FUNCTION maintain_funding_totals();
+
+-- Views read the stored totals instead of grouping Funding
+DROP VIEW IF EXISTS v_startup_details;
+DROP VIEW IF EXISTS v_investor_portfolio;
+
+CREATE VIEW v_startup_details AS
+SELECT
+    s.startup_id,
+    s.name AS startup_name,
+    d.domain_name,
+    s.funding_required,
+    s.location,
+    s.is_funded,
+    s.total_funding_received
+FROM Startups s
+JOIN Domains d ON s.domain_id = d.domain_id;
+
+CREATE VIEW v_investor_portfolio AS
+SELECT
+    i.investor_id,
+    i.name AS investor_name,
+    i.investment_min,
+    i.investment_max,
+    i.portfolio_size,
+    i.total_invested
+FROM Investors i;
+
+COMMENT ON COLUMN Startups.total_funding_received IS 'SUM(Funding.amount), maintained by trg_funding_totals';
+COMMENT ON COLUMN Investors.total_invested IS 'SUM(Funding.amount), maintained by trg_funding_totals';
+COMMENT ON COLUMN Investors.startups_funded IS 'COUNT(DISTINCT Funding.startup_id), maintained by trg_funding_totals';
+
+ANALYZE Funding;
@@ -0,0 +1,38 @@
+-- ============================================
+-- Migration 004: Reference data versions (MySQL)
+-- Lets every app worker notice Domains changes without a restart
+-- (reference_cache.py polls the version row)
+-- ============================================
+
+CREATE TABLE IF NOT EXISTS ReferenceDataVersions (
+    table_name VARCHAR(64) PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 1,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+);
+
+INSERT IGNORE INTO ReferenceDataVersions (table_name) VALUES ('Domains');
+
+DELIMITER //
+
+CREATE TRIGGER trg_domains_version_insert
+AFTER INSERT ON Domains
+FOR EACH ROW
+BEGIN
+    UPDATE ReferenceDataVersions SET version = version + 1 WHERE table_name = 'Domains';
+END//
+
+CREATE TRIGGER trg_domains_version_update
+AFTER UPDATE ON Domains
+FOR EACH ROW
+BEGIN
+    UPDATE ReferenceDataVersions SET version = version + 1 WHERE table_name = 'Domains';
+END//
+
+CREATE TRIGGER trg_domains_version_delete
+AFTER DELETE ON Domains
+FOR EACH ROW
+BEGIN
+    UPDATE ReferenceDataVersions SET version = version + 1 WHERE table_name = 'Domains';
+END//
+
+DELIMITER ;
@@ -0,0 +1,36 @@
+-- ============================================
+-- Migration 004: Reference data versions (PostgreSQL)
+-- Lets every app worker notice Domains changes without a restart
+-- (reference_cache.py: LISTEN reference_data, version-row poll as fallback)
+-- ============================================
+
+CREATE TABLE IF NOT EXISTS ReferenceDataVersions (
+    table_name VARCHAR(64) PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 1,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+INSERT INTO ReferenceDataVersions (table_name) VALUES ('Domains')
+ON CONFLICT DO NOTHING;
+
+COMMENT ON TABLE ReferenceDataVersions IS 'Change counter per cached reference table (see reference_cache.py)';
+
+-- TG_ARGV[0] is the table name used by the cache (NOTIFY payload)
+CREATE OR REPLACE FUNCTION bump_reference_data_version()
+RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE ReferenceDataVersions
+    SET version = version + 1, updated_at = CURRENT_TIMESTAMP
+    WHERE table_name = TG_ARGV[0];
+
+    -- Delivered when the transaction commits
+    PERFORM pg_notify('reference_data', TG_ARGV[0]);
+    
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER trg_domains_reference_version
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON Domains
+FOR EACH STATEMENT
+EXECUTE FUNCTION bump_reference_data_version('Domains');
@@ -0,0 +1,210 @@
+-- ============================================
+-- Migration 005: Report rollups (MySQL)
+-- Per-domain / per-month / per-location totals for the reports.sql analytics,
+-- kept up to date from a delta log written by triggers
+-- Run `python report_rollups.py --rebuild` afterwards to fill the rollups
+-- ============================================
+
+CREATE TABLE IF NOT EXISTS ReportDomainStats (
+    domain_id INT PRIMARY KEY,
+    total_startups INT NOT NULL DEFAULT 0,
+    funded_startups INT NOT NULL DEFAULT 0,
+    funding_deals INT NOT NULL DEFAULT 0,
+    total_funding DECIMAL(20,2) NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS ReportMonthlyFunding (
+    month CHAR(7) PRIMARY KEY, -- 'YYYY-MM'
+    investments INT NOT NULL DEFAULT 0,
+    total_amount DECIMAL(20,2) NOT NULL DEFAULT 0,
+    active_investors INT NOT NULL DEFAULT 0,
+    startups_funded INT NOT NULL DEFAULT 0
+);
+
+-- '' stands for startups without a location
+CREATE TABLE IF NOT EXISTS ReportLocationStats (
+    location VARCHAR(100) PRIMARY KEY,
+    total_startups INT NOT NULL DEFAULT 0,
+    total_investors INT NOT NULL DEFAULT 0,
+    funding_deals INT NOT NULL DEFAULT 0,
+    total_funding DECIMAL(20,2) NOT NULL DEFAULT 0
+);
+
+-- Deals per (group, member) pair: the COUNT(DISTINCT ...) columns above
+-- only move when a pair appears or disappears
+CREATE TABLE IF NOT EXISTS ReportMonthInvestors (
+    month CHAR(7) NOT NULL,
+    investor_id INT NOT NULL,
+    deals INT NOT NULL,
+    PRIMARY KEY (month, investor_id)
+);
+
+CREATE TABLE IF NOT EXISTS ReportMonthStartups (
+    month CHAR(7) NOT NULL,
+    startup_id INT NOT NULL,
+    deals INT NOT NULL,
+    PRIMARY KEY (month, startup_id)
+);
+
+CREATE TABLE IF NOT EXISTS ReportLocationInvestors (
+    location VARCHAR(100) NOT NULL,
+    investor_id INT NOT NULL,
+    deals INT NOT NULL,
+    PRIMARY KEY (location, investor_id)
+);
+
+-- One row per change: +1 / -1 of a Funding row, Startup or Investor, with the
+-- attributes it is grouped by at the time of the change
+CREATE TABLE IF NOT EXISTS ReportRollupDeltas (
+    delta_id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    kind VARCHAR(10) NOT NULL CHECK (kind IN ('funding', 'startup', 'investor')),
+    sign SMALLINT NOT NULL CHECK (sign IN (-1, 1)),
+    investor_id INT,
+    startup_id INT,
+    domain_id INT,
+    location VARCHAR(100),
+    is_funded BOOLEAN,
+    funding_date DATE,
+    amount DECIMAL(15,2),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- rebuilt_at IS NULL makes the next refresh run a full rebuild
+CREATE TABLE IF NOT EXISTS ReportRollupState (
+    rollup_name VARCHAR(30) PRIMARY KEY,
+    total_investors INT NOT NULL DEFAULT 0,
+    rebuilt_at TIMESTAMP NULL,
+    refreshed_at TIMESTAMP NULL
+);
+
+INSERT IGNORE INTO ReportRollupState (rollup_name) VALUES ('reports');
+
+-- Top investors read the trigger-kept totals; MIN/MAX per investor are index lookups
+CREATE INDEX idx_investor_total_invested ON Investors(total_invested);
+CREATE INDEX idx_funding_investor_amount ON Funding(investor_id, amount);
+
+DELIMITER //
+
+-- MySQL does not fire triggers for ON DELETE CASCADE, so the Startups and
+-- Investors delete triggers log the Funding rows that go with them
+CREATE TRIGGER trg_funding_report_insert
+AFTER INSERT ON Funding
+FOR EACH ROW
+BEGIN
+    INSERT INTO ReportRollupDeltas (kind, sign, investor_id, startup_id, domain_id, location,
+                                    funding_date, amount)
+    SELECT 'funding', 1, NEW.investor_id, NEW.startup_id, s.domain_id, s.location,
+           NEW.funding_date, NEW.amount
+    FROM Startups s
+    WHERE s.startup_id = NEW.startup_id;
+END//
+
+CREATE TRIGGER trg_funding_report_update
+AFTER UPDATE ON Funding
+FOR EACH ROW
+BEGIN
+    IF NOT (OLD.investor_id <=> NEW.investor_id
+            AND OLD.startup_id <=> NEW.startup_id
+            AND OLD.amount <=> NEW.amount
+            AND OLD.funding_date <=> NEW.funding_date) THEN
+        INSERT INTO ReportRollupDeltas (kind, sign, investor_id, startup_id, domain_id, location,
+                                        funding_date, amount)
+        SELECT 'funding', -1, OLD.investor_id, OLD.startup_id, s.domain_id, s.location,
+               OLD.funding_date, OLD.amount
+        FROM Startups s
+        WHERE s.startup_id = OLD.startup_id;
+        INSERT INTO ReportRollupDeltas (kind, sign, investor_id, startup_id, domain_id, location,
+                                        funding_date, amount)
+        SELECT 'funding', 1, NEW.investor_id, NEW.startup_id, s.domain_id, s.location,
+               NEW.funding_date, NEW.amount
+        FROM Startups s
+        WHERE s.startup_id = NEW.startup_id;
+    END IF;
+END//
+
+CREATE TRIGGER trg_funding_report_delete
+AFTER DELETE ON Funding
+FOR EACH ROW
+BEGIN
+    INSERT INTO ReportRollupDeltas (kind, sign, investor_id, startup_id, domain_id, location,
+                                    funding_date, amount)
+    SELECT 'funding', -1, OLD.investor_id, OLD.startup_id, s.domain_id, s.location,
+           OLD.funding_date, OLD.amount
+    FROM Startups s
+    WHERE s.startup_id = OLD.startup_id;
+END//
+
+CREATE TRIGGER trg_startup_report_insert
+AFTER INSERT ON Startups
+FOR EACH ROW
+BEGIN
+    INSERT INTO ReportRollupDeltas (kind, sign, startup_id, domain_id, location, is_funded)
+    VALUES ('startup', 1, NEW.startup_id, NEW.domain_id, NEW.location, NEW.is_funded);
+END//
+
+-- A Funding row locks its startup first (trg_funding_totals_insert), so a
+-- domain or location change and a new deal of the same startup never interleave
+CREATE TRIGGER trg_startup_report_update
+AFTER UPDATE ON Startups
+FOR EACH ROW
+BEGIN
+    IF NOT (OLD.domain_id <=> NEW.domain_id
+            AND OLD.location <=> NEW.location
+            AND OLD.is_funded <=> NEW.is_funded) THEN
+        INSERT INTO ReportRollupDeltas (kind, sign, startup_id, domain_id, location, is_funded)
+        VALUES ('startup', -1, OLD.startup_id, OLD.domain_id, OLD.location, OLD.is_funded),
+               ('startup', 1, NEW.startup_id, NEW.domain_id, NEW.location, NEW.is_funded);
+    END IF;
+    -- Its Funding rows move to the new domain/location with it
+    IF NOT (OLD.domain_id <=> NEW.domain_id AND OLD.location <=> NEW.location) THEN
+        INSERT INTO ReportRollupDeltas (kind, sign, investor_id, startup_id, domain_id, location,
+                                        funding_date, amount)
+        SELECT 'funding', -1, f.investor_id, f.startup_id, OLD.domain_id, OLD.location,
+               f.funding_date, f.amount
+        FROM Funding f
+        WHERE f.startup_id = NEW.startup_id;
+        INSERT INTO ReportRollupDeltas (kind, sign, investor_id, startup_id, domain_id, location,
+                                        funding_date, amount)
+        SELECT 'funding', 1, f.investor_id, f.startup_id, NEW.domain_id, NEW.location,
+               f.funding_date, f.amount
+        FROM Funding f
+        WHERE f.startup_id = NEW.startup_id;
+    END IF;
+END//
+
+CREATE TRIGGER trg_startup_report_delete
+BEFORE DELETE ON Startups
+FOR EACH ROW
+BEGIN
+    INSERT INTO ReportRollupDeltas (kind, sign, startup_id, domain_id, location, is_funded)
+    VALUES ('startup', -1, OLD.startup_id, OLD.domain_id, OLD.location, OLD.is_funded);
+    INSERT INTO ReportRollupDeltas (kind, sign, investor_id, startup_id, domain_id, location,
+                                    funding_date, amount)
+    SELECT 'funding', -1, f.investor_id, f.startup_id, OLD.domain_id, OLD.location,
+           f.funding_date, f.amount
+    FROM Funding f
+    WHERE f.startup_id = OLD.startup_id;
+END//
+
+CREATE TRIGGER trg_investor_report_insert
+AFTER INSERT ON Investors
+FOR EACH ROW
+BEGIN
+    INSERT INTO ReportRollupDeltas (kind, sign, investor_id) VALUES ('investor', 1, NEW.investor_id);
+END//
+
+CREATE TRIGGER trg_investor_report_delete
+BEFORE DELETE ON Investors
+FOR EACH ROW
+BEGIN
+    INSERT INTO ReportRollupDeltas (kind, sign, investor_id) VALUES ('investor', -1, OLD.investor_id);
+    INSERT INTO ReportRollupDeltas (kind, sign, investor_id, startup_id, domain_id, location,
+                                    funding_date, amount)
+    SELECT 'funding', -1, f.investor_id, f.startup_id, s.domain_id, s.location,
+           f.funding_date, f.amount
+    FROM Funding f
+    JOIN Startups s ON s.startup_id = f.startup_id
+    WHERE f.investor_id = OLD.investor_id;
+END//
+
+DELIMITER ;
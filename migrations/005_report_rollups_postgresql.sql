@@ -0,0 +1,211 @@
+-- ============================================
+-- Migration 005: Report rollups (PostgreSQL)
+-- Per-domain / per-month / per-location totals for the reports.sql analytics,
+-- kept up to date from a delta log written by triggers
+-- Run `python report_rollups.py --rebuild` afterwards to fill the rollups
+-- ============================================
+
+CREATE TABLE IF NOT EXISTS ReportDomainStats (
+    domain_id INTEGER PRIMARY KEY,
+    total_startups INTEGER NOT NULL DEFAULT 0,
+    funded_startups INTEGER NOT NULL DEFAULT 0,
+    funding_deals INTEGER NOT NULL DEFAULT 0,
+    total_funding NUMERIC(20,2) NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS ReportMonthlyFunding (
+    month CHAR(7) PRIMARY KEY, -- 'YYYY-MM'
+    investments INTEGER NOT NULL DEFAULT 0,
+    total_amount NUMERIC(20,2) NOT NULL DEFAULT 0,
+    active_investors INTEGER NOT NULL DEFAULT 0,
+    startups_funded INTEGER NOT NULL DEFAULT 0
+);
+
+-- '' stands for startups without a location
+CREATE TABLE IF NOT EXISTS ReportLocationStats (
+    location VARCHAR(100) PRIMARY KEY,
+    total_startups INTEGER NOT NULL DEFAULT 0,
+    total_investors INTEGER NOT NULL DEFAULT 0,
+    funding_deals INTEGER NOT NULL DEFAULT 0,
+    total_funding NUMERIC(20,2) NOT NULL DEFAULT 0
+);
+
+-- Deals per (group, member) pair: the COUNT(DISTINCT ...) columns above
+-- only move when a pair appears or disappears
+CREATE TABLE IF NOT EXISTS ReportMonthInvestors (
+    month CHAR(7) NOT NULL,
+    investor_id INTEGER NOT NULL,
+    deals INTEGER NOT NULL,
+    PRIMARY KEY (month, investor_id)
+);
+
+CREATE TABLE IF NOT EXISTS ReportMonthStartups (
+    month CHAR(7) NOT NULL,
+    startup_id INTEGER NOT NULL,
+    deals INTEGER NOT NULL,
+    PRIMARY KEY (month, startup_id)
+);
+
+CREATE TABLE IF NOT EXISTS ReportLocationInvestors (
+    location VARCHAR(100) NOT NULL,
+    investor_id INTEGER NOT NULL,
+    deals INTEGER NOT NULL,
+    PRIMARY KEY (location, investor_id)
+);
+
+-- One row per change: +1 / -1 of a Funding row, Startup or Investor, with the
+-- attributes it is grouped by at the time of the change
+CREATE TABLE IF NOT EXISTS ReportRollupDeltas (
+    delta_id BIGSERIAL PRIMARY KEY,
+    kind VARCHAR(10) NOT NULL CHECK (kind IN ('funding', 'startup', 'investor')),
+    sign SMALLINT NOT NULL CHECK (sign IN (-1, 1)),
+    investor_id INTEGER,
+    startup_id INTEGER,
+    domain_id INTEGER,
+    location VARCHAR(100),
+    is_funded BOOLEAN,
+    funding_date DATE,
+    amount NUMERIC(15,2),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- rebuilt_at IS NULL makes the next refresh run a full rebuild
+CREATE TABLE IF NOT EXISTS ReportRollupState (
+    rollup_name VARCHAR(30) PRIMARY KEY,
+    total_investors INTEGER NOT NULL DEFAULT 0,
+    rebuilt_at TIMESTAMP,
+    refreshed_at TIMESTAMP
+);
+
+INSERT INTO ReportRollupState (rollup_name) VALUES ('reports')
+ON CONFLICT (rollup_name) DO NOTHING;
+
+-- Top investors read the trigger-kept totals; MIN/MAX per investor are index lookups
+CREATE INDEX IF NOT EXISTS idx_investor_total_invested ON Investors(total_invested);
+CREATE INDEX IF NOT EXISTS idx_funding_investor_amount ON Funding(investor_id, amount);
+
+CREATE OR REPLACE FUNCTION queue_funding_report_delta()
+RETURNS TRIGGER AS $$
+BEGIN
+    -- During ON DELETE CASCADE the parent row is already gone and its own
+    -- trigger has logged the Funding rows, so nothing is logged here
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        INSERT INTO ReportRollupDeltas (kind, sign, investor_id, startup_id, domain_id, location,
+                                        funding_date, amount)
+        SELECT 'funding', -1, OLD.investor_id, OLD.startup_id, s.domain_id, s.location,
+               OLD.funding_date, OLD.amount
+        FROM Startups s
+        WHERE s.startup_id = OLD.startup_id
+          AND EXISTS (SELECT 1 FROM Investors i WHERE i.investor_id = OLD.investor_id);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO ReportRollupDeltas (kind, sign, investor_id, startup_id, domain_id, location,
+                                        funding_date, amount)
+        SELECT 'funding', 1, NEW.investor_id, NEW.startup_id, s.domain_id, s.location,
+               NEW.funding_date, NEW.amount
+        FROM Startups s
+        WHERE s.startup_id = NEW.startup_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION queue_startup_report_delta()
+RETURNS TRIGGER AS $$
+DECLARE
+    v_moved BOOLEAN := TG_OP = 'DELETE'
+        OR (TG_OP = 'UPDATE' AND (OLD.domain_id IS DISTINCT FROM NEW.domain_id
+                                  OR OLD.location IS DISTINCT FROM NEW.location));
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        INSERT INTO ReportRollupDeltas (kind, sign, startup_id, domain_id, location, is_funded)
+        VALUES ('startup', -1, OLD.startup_id, OLD.domain_id, OLD.location, OLD.is_funded);
+    END IF;
+    -- Its Funding rows leave the old domain/location with it
+    IF v_moved THEN
+        INSERT INTO ReportRollupDeltas (kind, sign, investor_id, startup_id, domain_id, location,
+                                        funding_date, amount)
+        SELECT 'funding', -1, f.investor_id, f.startup_id, OLD.domain_id, OLD.location,
+               f.funding_date, f.amount
+        FROM Funding f
+        WHERE f.startup_id = OLD.startup_id;
+    END IF;
+    IF TG_OP = 'DELETE' THEN
+        RETURN OLD;
+    END IF;
+
+    INSERT INTO ReportRollupDeltas (kind, sign, startup_id, domain_id, location, is_funded)
+    VALUES ('startup', 1, NEW.startup_id, NEW.domain_id, NEW.location, NEW.is_funded);
+    IF v_moved THEN
+        INSERT INTO ReportRollupDeltas (kind, sign, investor_id, startup_id, domain_id, location,
+                                        funding_date, amount)
+        SELECT 'funding', 1, f.investor_id, f.startup_id, NEW.domain_id, NEW.location,
+               f.funding_date, f.amount
+        FROM Funding f
+        WHERE f.startup_id = NEW.startup_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION queue_investor_report_delta()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO ReportRollupDeltas (kind, sign, investor_id) VALUES ('investor', 1, NEW.investor_id);
+        RETURN NULL;
+    END IF;
+
+    INSERT INTO ReportRollupDeltas (kind, sign, investor_id) VALUES ('investor', -1, OLD.investor_id);
+    INSERT INTO ReportRollupDeltas (kind, sign, investor_id, startup_id, domain_id, location,
+                                    funding_date, amount)
+    SELECT 'funding', -1, f.investor_id, f.startup_id, s.domain_id, s.location,
+           f.funding_date, f.amount
+    FROM Funding f
+    JOIN Startups s ON s.startup_id = f.startup_id
+    WHERE f.investor_id = OLD.investor_id;
+    RETURN OLD;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_funding_report_delta ON Funding;
+CREATE TRIGGER trg_funding_report_delta
+AFTER INSERT OR DELETE OR UPDATE OF investor_id, startup_id, amount, funding_date ON Funding
+FOR EACH ROW
+EXECUTE FUNCTION queue_funding_report_delta();
+
+DROP TRIGGER IF EXISTS trg_startup_report_insert ON Startups;
+CREATE TRIGGER trg_startup_report_insert
+AFTER INSERT ON Startups
+FOR EACH ROW
+EXECUTE FUNCTION queue_startup_report_delta();
+
+-- A Funding row locks its startup first (trg_funding_totals), so a domain or
+-- location change and a new deal of the same startup never interleave
+DROP TRIGGER IF EXISTS trg_startup_report_update ON Startups;
+CREATE TRIGGER trg_startup_report_update
+AFTER UPDATE OF domain_id, location, is_funded ON Startups
+FOR EACH ROW
+WHEN (OLD.domain_id IS DISTINCT FROM NEW.domain_id
+      OR OLD.location IS DISTINCT FROM NEW.location
+      OR OLD.is_funded IS DISTINCT FROM NEW.is_funded)
+EXECUTE FUNCTION queue_startup_report_delta();
+
+-- BEFORE: the Funding rows are still there to be logged
+DROP TRIGGER IF EXISTS trg_startup_report_delete ON Startups;
+CREATE TRIGGER trg_startup_report_delete
+BEFORE DELETE ON Startups
+FOR EACH ROW
+EXECUTE FUNCTION queue_startup_report_delta();
+
+DROP TRIGGER IF EXISTS trg_investor_report_insert ON Investors;
+CREATE TRIGGER trg_investor_report_insert
+AFTER INSERT ON Investors
+FOR EACH ROW
+EXECUTE FUNCTION queue_investor_report_delta();
+
+DROP TRIGGER IF EXISTS trg_investor_report_delete ON Investors;
+CREATE TRIGGER trg_investor_report_delete
+BEFORE DELETE ON Investors
+FOR EACH ROW
+EXECUTE FUNCTION queue_investor_report_delta();
@@ -0,0 +1,13 @@
+-- ============================================
+-- Migration 006: Funding keyset indexes (PostgreSQL)
+-- Backs the paged funding history / portfolio lists (funding_pages.py):
+-- each page is one range scan in (funding_date DESC, funding_id DESC) order
+-- ============================================
+
+CREATE INDEX IF NOT EXISTS idx_funding_startup_recent
+    ON Funding(startup_id, funding_date DESC, funding_id DESC);
+CREATE INDEX IF NOT EXISTS idx_funding_investor_recent
+    ON Funding(investor_id, funding_date DESC, funding_id DESC);
+
+-- Superseded: idx_funding_startup_recent starts with startup_id
+DROP INDEX IF EXISTS idx_funding_startup;
@@ -0,0 +1,7 @@
+-- ============================================
+-- Migration 007: Full-text search (MySQL)
+-- FULLTEXT indexes behind /search (search.py); a MATCH must list exactly these columns
+-- ============================================
+
+CREATE FULLTEXT INDEX ft_startup_search ON Startups(name, description, location);
+CREATE FULLTEXT INDEX ft_investor_search ON Investors(name, location);
@@ -0,0 +1,21 @@
+-- ============================================
+-- Migration 007: Full-text search (PostgreSQL)
+-- Generated tsvector columns with GIN indexes behind /search (search.py)
+-- Weights: name A, description B, location C
+-- ============================================
+
+ALTER TABLE Startups
+    ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', COALESCE(name, '')), 'A') ||
+        setweight(to_tsvector('english', COALESCE(description, '')), 'B') ||
+        setweight(to_tsvector('english', COALESCE(location, '')), 'C')
+    ) STORED;
+
+ALTER TABLE Investors
+    ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', COALESCE(name, '')), 'A') ||
+        setweight(to_tsvector('english', COALESCE(location, '')), 'C')
+    ) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_startup_search ON Startups USING GIN (search_vector);
+CREATE INDEX IF NOT EXISTS idx_investor_search ON Investors USING GIN (search_vector);
@@ -0,0 +1,36 @@
+-- ============================================
+-- Migration 008: Set-based Funding inserts (MySQL)
+-- MySQL has no statement-level triggers: funding_ingest.py sets
+-- @funding_ingest for its INSERTs and applies their totals, funded flags
+-- and report deltas in one pass per chunk; the row triggers skip them
+-- ============================================
+
+DROP TRIGGER IF EXISTS trg_funding_totals_insert;
+DROP TRIGGER IF EXISTS trg_funding_report_insert;
+
+DELIMITER //
+
+CREATE TRIGGER trg_funding_totals_insert
+AFTER INSERT ON Funding
+FOR EACH ROW
+BEGIN
+    IF @funding_ingest IS NULL THEN
+        CALL apply_funding_delta(NEW.funding_id, NEW.investor_id, NEW.startup_id, NEW.amount, 1);
+    END IF;
+END//
+
+CREATE TRIGGER trg_funding_report_insert
+AFTER INSERT ON Funding
+FOR EACH ROW
+BEGIN
+    IF @funding_ingest IS NULL THEN
+        INSERT INTO ReportRollupDeltas (kind, sign, investor_id, startup_id, domain_id, location,
+                                        funding_date, amount)
+        SELECT 'funding', 1, NEW.investor_id, NEW.startup_id, s.domain_id, s.location,
+               NEW.funding_date, NEW.amount
+        FROM Startups s
+        WHERE s.startup_id = NEW.startup_id;
+    END IF;
+END//
+
+DELIMITER ;
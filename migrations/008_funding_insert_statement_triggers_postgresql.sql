@@ -0,0 +1,92 @@
+-- ============================================
+-- Migration 008: Set-based Funding insert triggers (PostgreSQL)
+-- Inserts update totals, funded flags and report deltas once per statement
+-- Bulk imports go through funding_ingest.py
+-- ============================================
+
+-- Rows added by one INSERT / COPY statement, applied in one pass: each
+-- touched startup and investor is updated once, however many deals the
+-- statement added. UPDATE and DELETE keep the row triggers of migration 003.
+CREATE OR REPLACE FUNCTION apply_funding_inserts()
+RETURNS TRIGGER AS $$
+BEGIN
+    -- Startups, then investors, each in id order: the order a single-row
+    -- insert locks them in, so concurrent imports and deals cannot deadlock
+    PERFORM 1 FROM Startups
+    WHERE startup_id IN (SELECT startup_id FROM new_funding)
+    ORDER BY startup_id
+    FOR NO KEY UPDATE;
+
+    UPDATE Startups s
+    SET total_funding_received = s.total_funding_received + n.amount,
+        is_funded = TRUE
+    FROM (SELECT startup_id, SUM(amount) AS amount
+          FROM new_funding GROUP BY startup_id) n
+    WHERE s.startup_id = n.startup_id;
+
+    PERFORM 1 FROM Investors
+    WHERE investor_id IN (SELECT investor_id FROM new_funding)
+    ORDER BY investor_id
+    FOR NO KEY UPDATE;
+
+    -- The investors are locked by the statement above, so this one sees
+    -- every committed Funding row of concurrent transactions for them. A
+    -- pair adds to startups_funded when its only Funding rows are new ones.
+    UPDATE Investors i
+    SET total_invested = i.total_invested + n.amount,
+        portfolio_size = i.portfolio_size + n.deals,
+        startups_funded = i.startups_funded + n.startups
+    FROM (SELECT p.investor_id, SUM(p.amount) AS amount, SUM(p.deals) AS deals,
+                 COUNT(*) FILTER (WHERE (SELECT COUNT(*) FROM Funding f
+                                         WHERE f.investor_id = p.investor_id
+                                           AND f.startup_id = p.startup_id) = p.deals) AS startups
+          FROM (SELECT investor_id, startup_id, SUM(amount) AS amount, COUNT(*) AS deals
+                FROM new_funding GROUP BY investor_id, startup_id) p
+          GROUP BY p.investor_id) n
+    WHERE i.investor_id = n.investor_id;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION queue_funding_report_inserts()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO ReportRollupDeltas (kind, sign, investor_id, startup_id, domain_id, location,
+                                    funding_date, amount)
+    SELECT 'funding', 1, n.investor_id, n.startup_id, s.domain_id, s.location,
+           n.funding_date, n.amount
+    FROM new_funding n
+    JOIN Startups s ON s.startup_id = n.startup_id;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- The row triggers no longer handle INSERT
+DROP TRIGGER IF EXISTS trg_funding_totals ON Funding;
+CREATE TRIGGER trg_funding_totals
+BEFORE DELETE OR UPDATE OF investor_id, startup_id, amount ON Funding
+FOR EACH ROW
+EXECUTE FUNCTION maintain_funding_totals();
+
+DROP TRIGGER IF EXISTS trg_funding_report_delta ON Funding;
+CREATE TRIGGER trg_funding_report_delta
+AFTER DELETE OR UPDATE OF investor_id, startup_id, amount, funding_date ON Funding
+FOR EACH ROW
+EXECUTE FUNCTION queue_funding_report_delta();
+
+-- is_funded is now set by apply_funding_inserts()
+DROP TRIGGER IF EXISTS trg_update_funded_status ON Funding;
+DROP FUNCTION IF EXISTS update_funded_status();
+
+CREATE TRIGGER trg_funding_totals_insert
+AFTER INSERT ON Funding
+REFERENCING NEW TABLE AS new_funding
+FOR EACH STATEMENT
+EXECUTE FUNCTION apply_funding_inserts();
+
+CREATE TRIGGER trg_funding_report_insert
+AFTER INSERT ON Funding
+REFERENCING NEW TABLE AS new_funding
+FOR EACH STATEMENT
+EXECUTE FUNCTION queue_funding_report_inserts();
@@ -0,0 +1,11 @@
+-- ============================================
+-- Migration 009: Setup markers (MySQL)
+-- Records one-time startup checks (bootstrap.py), so app workers
+-- skip the schema / seed check once it has passed
+-- ============================================
+
+CREATE TABLE IF NOT EXISTS SetupMarkers (
+    marker VARCHAR(100) PRIMARY KEY,
+    version VARCHAR(100) NOT NULL,
+    recorded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
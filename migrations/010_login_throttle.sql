@@ -0,0 +1,13 @@
+-- ============================================
+-- Migration 010: Login throttle buckets (MySQL)
+-- Token buckets of login attempts per client address and per account,
+-- shared by every app worker (login_throttle.py, LOGIN_THROTTLE_BACKEND=database)
+-- ============================================
+
+CREATE TABLE IF NOT EXISTS LoginThrottle (
+    bucket_key VARCHAR(255) PRIMARY KEY,
+    tokens DOUBLE NOT NULL,
+    updated_at DOUBLE NOT NULL,           -- Unix time of the last change
+
+    INDEX idx_login_throttle_updated (updated_at)
+);
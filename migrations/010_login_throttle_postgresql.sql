@@ -0,0 +1,15 @@
+-- ============================================
+-- Migration 010: Login throttle buckets (PostgreSQL)
+-- Token buckets of login attempts per client address and per account,
+-- shared by every app worker (login_throttle.py, LOGIN_THROTTLE_BACKEND=database)
+-- ============================================
+
+CREATE TABLE IF NOT EXISTS LoginThrottle (
+    bucket_key VARCHAR(255) PRIMARY KEY,
+    tokens DOUBLE PRECISION NOT NULL,
+    updated_at DOUBLE PRECISION NOT NULL      -- Unix time of the last change
+);
+
+CREATE INDEX IF NOT EXISTS idx_login_throttle_updated ON LoginThrottle (updated_at);
+
+COMMENT ON TABLE LoginThrottle IS 'Login attempt token buckets per IP / account (see login_throttle.py)';
@@ -0,0 +1,22 @@
+-- ============================================
+-- Migration 011: Access-path indexes (MySQL)
+-- Built online: ALGORITHM=INPLACE, LOCK=NONE keeps the tables readable
+-- and writable during the build (InnoDB refuses the statement rather
+-- than fall back to a locking copy)
+-- ============================================
+
+-- Unfunded startups by funding requirement: the investor match and
+-- "Search Startups by Funding Requirement" (funding_required BETWEEN ...
+-- AND is_funded = FALSE). MySQL has no partial indexes: is_funded leads,
+-- which also supersedes idx_startup_funded.
+ALTER TABLE Startups
+    ADD INDEX idx_startup_unfunded_amount (is_funded, funding_required),
+    DROP INDEX idx_startup_funded,
+    ALGORITHM=INPLACE, LOCK=NONE;
+
+-- Superseded: idx_funding_investor_recent starts with investor_id (and backs the foreign key)
+ALTER TABLE Funding DROP INDEX idx_funding_investor, ALGORITHM=INPLACE, LOCK=NONE;
+
+-- Login lookups need no new index here: the email columns use the
+-- server's case-insensitive default collation, so the UNIQUE email
+-- indexes already answer email = %s regardless of case.
@@ -0,0 +1,28 @@
+-- migrate: no-transaction
+-- ============================================
+-- Migration 011: Access-path indexes (PostgreSQL)
+-- Built online: CREATE INDEX CONCURRENTLY does not block writes, so it
+-- runs outside a transaction, one statement at a time. A concurrent
+-- build that fails leaves an INVALID index behind, so each index is
+-- dropped first so that re-running the migration rebuilds it.
+-- ============================================
+
+-- Unfunded startups by funding requirement: the investor match and
+-- "Search Startups by Funding Requirement" (funding_required BETWEEN ...
+-- AND is_funded = FALSE), without the funded half of the table
+DROP INDEX CONCURRENTLY IF EXISTS idx_startup_unfunded_amount;
+CREATE INDEX CONCURRENTLY idx_startup_unfunded_amount
+    ON Startups(funding_required) WHERE is_funded = FALSE;
+
+-- Case-insensitive login lookups (query_registry.py: LOWER(email) = LOWER(%s)).
+-- Not UNIQUE: existing rows may differ only in case, and the build must not fail on them.
+-- Migration 012 checks for those and replaces these with UNIQUE indexes.
+DROP INDEX CONCURRENTLY IF EXISTS idx_startup_email_lower;
+CREATE INDEX CONCURRENTLY idx_startup_email_lower ON Startups(LOWER(email));
+DROP INDEX CONCURRENTLY IF EXISTS idx_investor_email_lower;
+CREATE INDEX CONCURRENTLY idx_investor_email_lower ON Investors(LOWER(email));
+
+-- Superseded: each is the leading column of a wider index
+-- (idx_startup_unfunded_recent, idx_funding_investor_recent)
+DROP INDEX CONCURRENTLY IF EXISTS idx_startup_funded;
+DROP INDEX CONCURRENTLY IF EXISTS idx_funding_investor;
@@ -0,0 +1,6 @@
+-- ============================================
+-- Migration 012: Case-insensitive unique emails (MySQL)
+-- Nothing to do: the email columns use the default case-insensitive
+-- collation, so their UNIQUE constraints already reject dup@x.com next
+-- to DUP@x.com. The PostgreSQL migration adds UNIQUE (LOWER(email)).
+-- ============================================
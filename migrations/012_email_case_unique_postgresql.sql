@@ -0,0 +1,39 @@
+-- migrate: no-transaction
+-- ============================================
+-- Migration 012: Case-insensitive unique emails (PostgreSQL)
+-- Logins match LOWER(email) = LOWER(%s) (query_registry.py), but the
+-- email UNIQUE constraints compare case-sensitively, so dup@x.com and
+-- DUP@x.com could both register and then share one login lookup.
+-- The check below stops the migration, listing the conflicts, before
+-- anything is built. Merge or rename those accounts (README: Schema
+-- Migrations) and run migrate.py again.
+-- ============================================
+
+DO $$
+DECLARE
+    duplicates TEXT;
+BEGIN
+    SELECT string_agg(format('%s: %s (%s accounts)', kind, email, accounts), ', ' ORDER BY kind, email)
+    INTO duplicates
+    FROM (SELECT 'Startups' AS kind, LOWER(email) AS email, COUNT(*) AS accounts
+          FROM Startups GROUP BY LOWER(email) HAVING COUNT(*) > 1
+          UNION ALL
+          SELECT 'Investors', LOWER(email), COUNT(*)
+          FROM Investors GROUP BY LOWER(email) HAVING COUNT(*) > 1) conflicts;
+    IF duplicates IS NOT NULL THEN
+        RAISE EXCEPTION 'Emails that differ only in case: %', duplicates
+            USING HINT = 'Merge or rename these accounts, then run migrate.py again';
+    END IF;
+END $$;
+
+-- Built online next to the plain LOWER(email) indexes of migration 011,
+-- which logins keep using until they are dropped. A failed build (a
+-- duplicate registered meanwhile) leaves an INVALID index: it is dropped
+-- first, so re-running the migration rebuilds it.
+DROP INDEX CONCURRENTLY IF EXISTS idx_startup_email_lower_unique;
+CREATE UNIQUE INDEX CONCURRENTLY idx_startup_email_lower_unique ON Startups(LOWER(email));
+DROP INDEX CONCURRENTLY IF EXISTS idx_investor_email_lower_unique;
+CREATE UNIQUE INDEX CONCURRENTLY idx_investor_email_lower_unique ON Investors(LOWER(email));
+
+DROP INDEX CONCURRENTLY IF EXISTS idx_startup_email_lower;
+DROP INDEX CONCURRENTLY IF EXISTS idx_investor_email_lower;
@@ -0,0 +1,165 @@
+"""
+============================================
+DBMS Project: Password Hashing
+bcrypt on a bounded worker pool, with a configurable work factor
+Works with both MySQL and PostgreSQL
+============================================
+
+bcrypt is deliberately slow (about 250 ms at cost 12). Running it inline
+lets a burst of logins occupy every request thread. Password work
+therefore goes through a small pool of threads per worker process.
+bcrypt releases the GIL while hashing, so threads run in parallel.
+
+* At most PASSWORD_POOL_SIZE hashes run at once.
+* At most PASSWORD_QUEUE_LIMIT jobs (running + waiting) are accepted;
+  beyond that, and after waiting PASSWORD_WAIT_TIMEOUT seconds,
+  PasswordPoolBusy is raised so the route can answer "try again" at once.
+* New hashes use BCRYPT_ROUNDS. needs_rehash() tells the login routes
+  when a stored hash has a different cost, so it can be upgraded (or
+  downgraded) transparently on the next successful login.
+
+Timings are recorded in the password_* histograms (metrics.py).
+"""
+
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+import bcrypt
+
+from metrics import counter, histogram, snapshot, track_phase
+
+BCRYPT_ROUNDS = int(os.environ.get('BCRYPT_ROUNDS', 12))
+POOL_SIZE = int(os.environ.get('PASSWORD_POOL_SIZE', max(2, os.cpu_count() or 2)))
+QUEUE_LIMIT = int(os.environ.get('PASSWORD_QUEUE_LIMIT', POOL_SIZE * 4))
+WAIT_TIMEOUT = float(os.environ.get('PASSWORD_WAIT_TIMEOUT', 10))
+
+if not 4 <= BCRYPT_ROUNDS <= 31:
+    raise ValueError("BCRYPT_ROUNDS must be between 4 and 31")
+
+_HASH_PATTERN = re.compile(r'^\$2[abxy]?\$(\d{2})\$')
+
+HASH_SECONDS = histogram('password_hash_seconds', 'bcrypt hashpw time')
+VERIFY_SECONDS = histogram('password_verify_seconds', 'bcrypt checkpw time')
+QUEUE_WAIT_SECONDS = histogram('password_queue_wait_seconds', 'Time a job waited for a pool thread')
+REJECTED = counter('password_rejected_total', 'Jobs refused because the pool was saturated')
+REHASHED = counter('password_rehashed_total', 'Stored hashes upgraded to BCRYPT_ROUNDS at login')
+
+
+class PasswordPoolBusy(Exception):
+    """Raised when the password pool is saturated; ask the client to retry"""
+
+
+def _to_bytes(value):
+    return value.encode('utf-8') if isinstance(value, str) else value
+
+
+def _hash(password, rounds):
+    with HASH_SECONDS.time():
+        return bcrypt.hashpw(_to_bytes(password), bcrypt.gensalt(rounds)).decode('utf-8')
+
+
+def _verify(password, hashed):
+    with VERIFY_SECONDS.time():
+        try:
+            return bcrypt.checkpw(_to_bytes(password), _to_bytes(hashed))
+        except Exception as e:
+            print(f"Password verification error: {e}")
+            return False
+
+
+class PasswordHasher:
+    """Bounded per-process pool that runs the bcrypt calls"""
+
+    def __init__(self, rounds=BCRYPT_ROUNDS, pool_size=POOL_SIZE,
+                 queue_limit=QUEUE_LIMIT, timeout=WAIT_TIMEOUT):
+        self.rounds = rounds
+        self.pool_size = pool_size
+        self.queue_limit = max(queue_limit, pool_size)
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._executor = None
+        self._pid = None
+        self._pending = 0
+
+    def _get_executor(self):
+        # Threads do not survive a gunicorn fork; start a fresh pool per worker
+        if self._executor is None or self._pid != os.getpid():
+            self._executor = ThreadPoolExecutor(max_workers=self.pool_size,
+                                                thread_name_prefix='bcrypt')
+            self._pid = os.getpid()
+            self._pending = 0
+        return self._executor
+
+    def _done(self, _future):
+        with self._lock:
+            self._pending -= 1
+
+    def _run(self, fn, *args):
+        submitted = time.perf_counter()
+
+        def job():
+            QUEUE_WAIT_SECONDS.observe(time.perf_counter() - submitted)
+            return fn(*args)
+
+        with self._lock:
+            executor = self._get_executor()
+            if self._pending >= self.queue_limit:
+                REJECTED.inc()
+                raise PasswordPoolBusy(f"{self._pending} password jobs already queued")
+            self._pending += 1
+        future = executor.submit(job)
+        future.add_done_callback(self._done)
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeout:
+            # The job still runs (and still counts as pending) until bcrypt returns
+            REJECTED.inc()
+            raise PasswordPoolBusy(f"password job waited more than {self.timeout:.0f}s")
+
+    def hash(self, password):
+        with track_phase('password'):
+            return self._run(_hash, password, self.rounds)
+
+    def verify(self, password, hashed):
+        with track_phase('password'):
+            return self._run(_verify, password, hashed)
+
+    def needs_rehash(self, hashed):
+        """True when a valid bcrypt hash uses a cost other than self.rounds"""
+        match = _HASH_PATTERN.match(hashed or '')
+        return bool(match) and int(match.group(1)) != self.rounds
+
+    def stats(self):
+        with self._lock:
+            pending = self._pending
+        return {
+            'rounds': self.rounds,
+            'pool_size': self.pool_size,
+            'queue_limit': self.queue_limit,
+            'pending': pending,
+        }
+
+
+hasher = PasswordHasher()
+
+
+def hash_password(password):
+    """Hash password using bcrypt (raises PasswordPoolBusy when saturated)"""
+    return hasher.hash(password)
+
+
+def verify_password(password, hashed):
+    """Verify password against hash (raises PasswordPoolBusy when saturated)"""
+    return hasher.verify(password, hashed)
+
+
+def needs_rehash(hashed):
+    return hasher.needs_rehash(hashed)
+
+
+def password_stats():
+    """Pool settings plus the password_* metrics, for the monitoring endpoint"""
+    return {**hasher.stats(), 'metrics': snapshot('password_')}
@@ -36,22 +36,15 @@ WHERE email = ?;
 -- ============================================
 
 -- Get Startup Profile
-SELECT s.*, d.domain_name,
-       COALESCE(SUM(f.amount), 0) AS total_funding_received
+-- (total_funding_received is maintained by the Funding triggers)
+SELECT s.*, d.domain_name
 FROM Startups s
 JOIN Domains d ON s.domain_id = d.domain_id
-LEFT JOIN Funding f ON s.startup_id = f.startup_id
-WHERE s.startup_id = ?
-GROUP BY s.startup_id;
+WHERE s.startup_id = ?;
 
 -- Get Investor Profile
-SELECT i.*, 
-       COALESCE(SUM(f.amount), 0) AS total_invested,
-       COUNT(DISTINCT f.startup_id) AS startups_funded
-FROM Investors i
-LEFT JOIN Funding f ON i.investor_id = f.investor_id
-WHERE i.investor_id = ?
-GROUP BY i.investor_id;
+-- (total_invested and startups_funded are maintained by the Funding triggers)
+SELECT * FROM Investors WHERE investor_id = ?;
 
 -- Update Startup Profile
 UPDATE Startups 
@@ -63,36 +56,83 @@ UPDATE Investors
 SET name = ?, investment_min = ?, investment_max = ?, preferred_domains = ?, phone = ?, location = ?
 WHERE investor_id = ?;
 
+-- Keep InvestorDomains in sync with preferred_domains (same transaction)
+DELETE FROM InvestorDomains WHERE investor_id = ?;
+INSERT INTO InvestorDomains (investor_id, domain_id)
+SELECT ?, domain_id FROM Domains WHERE FIND_IN_SET(domain_id, ?) > 0;
+
 -- ============================================
 -- 4. MATCHMAKING QUERIES (COMPLEX)
 -- ============================================
 
 -- Find Top Investors for a Startup (Domain + Investment Range Match)
-SELECT 
+-- Each branch reads idx_investor_rank in order and stops after 10 rows
+-- Parameters: funding_required, funding_required, domain_id (twice)
+(SELECT 
     i.investor_id,
     i.name,
     i.investment_min,
     i.investment_max,
     i.preferred_domains,
     i.location,
-    CASE 
-        WHEN FIND_IN_SET(s.domain_id, i.preferred_domains) > 0 THEN 100
-        ELSE 50
-    END AS match_score,
-    CASE 
-        WHEN FIND_IN_SET(s.domain_id, i.preferred_domains) > 0 THEN 'Perfect domain match'
-        ELSE 'Investment range compatible'
-    END AS match_reason
+    i.portfolio_size,
+    100 AS match_score,
+    'Perfect domain match' AS match_reason
 FROM Investors i
-CROSS JOIN Startups s
-WHERE s.startup_id = ?
-  AND i.investment_min <= s.funding_required 
-  AND i.investment_max >= s.funding_required
-ORDER BY match_score DESC, i.portfolio_size ASC
+WHERE i.investment_min <= ? 
+  AND i.investment_max >= ?
+  AND EXISTS (SELECT 1 FROM InvestorDomains idm
+              WHERE idm.investor_id = i.investor_id AND idm.domain_id = ?)
+ORDER BY i.portfolio_size ASC, i.investor_id ASC
+LIMIT 10)
+UNION ALL
+(SELECT 
+    i.investor_id,
+    i.name,
+    i.investment_min,
+    i.investment_max,
+    i.preferred_domains,
+    i.location,
+    i.portfolio_size,
+    50 AS match_score,
+    'Investment range compatible' AS match_reason
+FROM Investors i
+WHERE i.investment_min <= ? 
+  AND i.investment_max >= ?
+  AND NOT EXISTS (SELECT 1 FROM InvestorDomains idm
+                  WHERE idm.investor_id = i.investor_id AND idm.domain_id = ?)
+ORDER BY i.portfolio_size ASC, i.investor_id ASC
+LIMIT 10)
+ORDER BY match_score DESC, portfolio_size ASC, investor_id ASC
 LIMIT 10;
 
 -- Find Top Startups for an Investor
-SELECT 
+-- Each branch reads idx_startup_unfunded_recent newest-first
+-- LIMIT 1 OFFSET 0 keeps each EXISTS a per-row probe on PostgreSQL (same
+-- result on MySQL): as a join it reads every startup of the investor's
+-- domains through idx_startup_domain and sorts them (check_query_plans.py)
+-- Parameters: investment_min, investment_max, investor_id (twice)
+(SELECT 
+    s.startup_id,
+    s.name,
+    d.domain_name,
+    s.funding_required,
+    s.location,
+    s.description,
+    s.is_funded,
+    s.founded_date,
+    100 AS match_score
+FROM Startups s
+JOIN Domains d ON s.domain_id = d.domain_id
+WHERE s.funding_required BETWEEN ? AND ?
+  AND s.is_funded = FALSE
+  AND EXISTS (SELECT 1 FROM InvestorDomains idm
+              WHERE idm.investor_id = ? AND idm.domain_id = s.domain_id
+              LIMIT 1 OFFSET 0)
+ORDER BY s.founded_date DESC, s.startup_id ASC
+LIMIT 10)
+UNION ALL
+(SELECT 
     s.startup_id,
     s.name,
     d.domain_name,
@@ -100,18 +140,18 @@ SELECT
     s.location,
     s.description,
     s.is_funded,
-    CASE 
-        WHEN FIND_IN_SET(s.domain_id, i.preferred_domains) > 0 THEN 100
-        ELSE 50
-    END AS match_score
+    s.founded_date,
+    50 AS match_score
 FROM Startups s
 JOIN Domains d ON s.domain_id = d.domain_id
-CROSS JOIN Investors i
-WHERE i.investor_id = ?
-  AND s.funding_required >= i.investment_min 
-  AND s.funding_required <= i.investment_max
+WHERE s.funding_required BETWEEN ? AND ?
   AND s.is_funded = FALSE
-ORDER BY match_score DESC, s.founded_date DESC
+  AND NOT EXISTS (SELECT 1 FROM InvestorDomains idm
+                  WHERE idm.investor_id = ? AND idm.domain_id = s.domain_id
+                  LIMIT 1 OFFSET 0)
+ORDER BY s.founded_date DESC, s.startup_id ASC
+LIMIT 10)
+ORDER BY match_score DESC, founded_date DESC, startup_id ASC
 LIMIT 10;
 
 -- ============================================
@@ -161,10 +201,7 @@ UPDATE Startups
 SET is_funded = TRUE 
 WHERE startup_id = ?;
 
--- Update Investor Portfolio Count
-UPDATE Investors 
-SET portfolio_size = portfolio_size + 1 
-WHERE investor_id = ?;
+-- (portfolio_size and the funding totals are updated by the Funding triggers)
 
 -- Get Funding History for Startup
 SELECT f.*, i.name AS investor_name, f.amount, f.funding_date, f.funding_round
@@ -245,8 +282,7 @@ BEGIN
     -- Update startup funded status
     UPDATE Startups SET is_funded = TRUE WHERE startup_id = p_startup_id;
     
-    -- Update investor portfolio size
-    UPDATE Investors SET portfolio_size = portfolio_size + 1 WHERE investor_id = p_investor_id;
+    -- Investor portfolio_size and totals are updated by trg_funding_totals_insert
     
     SELECT 'Success: Funding recorded' AS message, LAST_INSERT_ID() AS funding_id;
     COMMIT;
@@ -262,7 +298,6 @@ BEGIN
     DECLARE v_score INT DEFAULT 0;
     DECLARE v_startup_domain INT;
     DECLARE v_startup_funding DECIMAL(15,2);
-    DECLARE v_investor_domains VARCHAR(255);
     DECLARE v_investor_min DECIMAL(15,2);
     DECLARE v_investor_max DECIMAL(15,2);
     
@@ -271,8 +306,8 @@ BEGIN
     FROM Startups WHERE startup_id = p_startup_id;
     
     -- Get investor details
-    SELECT preferred_domains, investment_min, investment_max 
-    INTO v_investor_domains, v_investor_min, v_investor_max
+    SELECT investment_min, investment_max 
+    INTO v_investor_min, v_investor_max
     FROM Investors WHERE investor_id = p_investor_id;
     
     -- Check investment range match
@@ -281,7 +316,8 @@ BEGIN
     END IF;
     
     -- Check domain match
-    IF FIND_IN_SET(v_startup_domain, v_investor_domains) > 0 THEN
+    IF EXISTS (SELECT 1 FROM InvestorDomains
+               WHERE investor_id = p_investor_id AND domain_id = v_startup_domain) THEN
         SET v_score = v_score + 50;
     END IF;
     
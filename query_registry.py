@@ -0,0 +1,278 @@
+"""
+============================================
+DBMS Project: Query Registry
+Named SQL statements, compiled once per dialect and prepared on the server
+Works with both MySQL and PostgreSQL
+============================================
+
+app.py and funding_pages.py run their fixed statements by name:
+
+    row = fetch_one(cursor, 'startup.by_email', (email,))
+    new_id = insert(cursor, 'startup.insert', (...))
+
+Every statement is registered once, at import, and compiled for the
+database in use:
+
+* INSERTs registered with returning='<id column>' get RETURNING on
+  PostgreSQL; MySQL reads cursor.lastrowid. Nothing inspects the SQL
+  text per call any more.
+* prepare=True statements are the hot ones (logins, matches, dashboard
+  lists). They run as server-side prepared statements, cached per pooled
+  connection, so the server parses them once per connection instead of
+  once per call:
+  - PostgreSQL: PREPARE q_<name> AS ... ($1, $2, ...) the first time a
+    connection runs it, then EXECUTE q_<name> (...). Prepared statements
+    outlive the pool's rollback; they go away with the connection.
+  - MySQL: one prepared cursor per connection and statement
+    (binary protocol, ? placeholders).
+
+Set SQL_PREPARE=0 to send every statement as plain text, e.g. behind a
+transaction-mode PgBouncer, which does not keep prepared statements.
+Statements are written with %s placeholders (%% for a literal %), as
+for cursor.execute().
+"""
+
+import os
+import re
+import textwrap
+import threading
+import weakref
+
+from database import DB_TYPE, InstrumentedCursor, SQL_METRICS
+
+SQL_PREPARE = os.environ.get('SQL_PREPARE', '1') != '0'
+
+_queries = {}
+_prepared = weakref.WeakKeyDictionary()     # connection -> {statement name: prepared cursor or True}
+_prepared_lock = threading.Lock()
+
+
+class Query:
+    """One named statement, compiled for DB_TYPE"""
+
+    def __init__(self, name, sql, returning=None, prepare=False):
+        self.name = name
+        self.returning = returning
+        self.prepare = prepare
+        sql = textwrap.dedent(sql).strip()
+        if returning and DB_TYPE == 'postgresql':
+            sql += f"\nRETURNING {returning}"
+        self.sql = sql
+        self.params = sql.count('%s')
+
+        # Server-side forms
+        self.statement_name = 'q_' + re.sub(r'\W', '_', name)
+        if DB_TYPE == 'postgresql':
+            numbers = iter(range(1, self.params + 1))
+            body = re.sub(r'%s', lambda _: f"${next(numbers)}", sql).replace('%%', '%')
+            self.prepare_sql = f"PREPARE {self.statement_name} AS\n{body}"
+            self.execute_sql = f"EXECUTE {self.statement_name}" + (
+                f" ({', '.join(['%s'] * self.params)})" if self.params else '')
+        else:
+            self.prepare_sql = sql.replace('%s', '?').replace('%%', '%')
+            self.execute_sql = None
+
+
+def register(name, sql, returning=None, prepare=False, **dialects):
+    """Add a named statement; mysql=... / postgresql=... override sql for that dialect"""
+    if name in _queries:
+        raise ValueError(f"query {name!r} is already registered")
+    _queries[name] = Query(name, dialects.get(DB_TYPE, sql), returning, prepare)
+    return _queries[name]
+
+
+def get(name):
+    return _queries[name]
+
+
+def registered():
+    """Every registered Query, by name"""
+    return dict(_queries)
+
+# ============================================
+# Execution
+# ============================================
+
+def _connection(cursor):
+    # psycopg2 cursors and InstrumentedCursor (get_cursor) know their connection
+    return getattr(cursor, 'connection', None)
+
+
+def _prepared_for(conn):
+    with _prepared_lock:
+        cache = _prepared.get(conn)
+        if cache is None:
+            cache = _prepared[conn] = {}
+        return cache
+
+
+def execute(cursor, name, params=()):
+    """Run a registered statement; returns the cursor holding its result
+
+    That is `cursor` itself, except for prepared statements on MySQL,
+    whose rows come from the connection's prepared cursor.
+    """
+    query = _queries[name]
+    conn = _connection(cursor) if query.prepare and SQL_PREPARE else None
+    if conn is None:
+        cursor.execute(query.sql, params)
+        return cursor
+
+    cache = _prepared_for(conn)
+    if DB_TYPE == 'postgresql':
+        if name not in cache:
+            cursor.execute(query.prepare_sql)
+            cache[name] = True
+        cursor.execute(query.execute_sql, params)
+        return cursor
+
+    prepared = cache.get(name)
+    if prepared is None:
+        prepared = conn.cursor(prepared=True, dictionary=True)
+        if SQL_METRICS:
+            # No connection: it would be a strong reference from the value back to its
+            # weak key, keeping every closed connection (and its cursors) in _prepared
+            prepared = InstrumentedCursor(prepared)
+        cache[name] = prepared
+    prepared.execute(query.prepare_sql, params)
+    return prepared
+
+
+def fetch_one(cursor, name, params=()):
+    """First row of a registered statement (None if there is none)"""
+    rows = execute(cursor, name, params).fetchall()
+    return rows[0] if rows else None
+
+
+def fetch_all(cursor, name, params=()):
+    """All rows of a registered statement"""
+    return execute(cursor, name, params).fetchall()
+
+
+def insert(cursor, name, params=()):
+    """Run a registered INSERT (registered with returning=...) and return the new ID"""
+    query = _queries[name]
+    if DB_TYPE == 'postgresql':
+        row = fetch_one(cursor, name, params)
+        return row[query.returning] if row else None
+    execute(cursor, name, params)
+    return cursor.lastrowid
+
+# ============================================
+# Statements: accounts
+# ============================================
+
+for _kind, _table in (('startup', 'Startups'), ('investor', 'Investors')):
+    # Case-insensitive: MySQL's default collation already is; PostgreSQL
+    # matches LOWER(email) through UNIQUE idx_<kind>_email_lower_unique
+    # (migration 012), so at most one account matches. Registration checks it too.
+    register(f'{_kind}.by_email', f"""
+        SELECT {_kind}_id, name, email, password_hash
+        FROM {_table} WHERE email = %s
+    """, prepare=True, postgresql=f"""
+        SELECT {_kind}_id, name, email, password_hash
+        FROM {_table} WHERE LOWER(email) = LOWER(%s)
+    """)
+    register(f'{_kind}.by_id', f"SELECT * FROM {_table} WHERE {_kind}_id = %s", prepare=True)
+    # Only if nobody changed the password in the meantime
+    register(f'{_kind}.rehash', f"""
+        UPDATE {_table} SET password_hash = %s
+        WHERE {_kind}_id = %s AND password_hash = %s
+    """)
+
+register('startup.insert', """
+    INSERT INTO Startups
+    (name, email, password_hash, domain_id, funding_required,
+     description, founded_date, location, website)
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+""", returning='startup_id')
+
+register('investor.insert', """
+    INSERT INTO Investors
+    (name, email, password_hash, investment_min, investment_max,
+     preferred_domains, phone, location)
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+""", returning='investor_id')
+
+register('investor.clear_domains', "DELETE FROM InvestorDomains WHERE investor_id = %s")
+
+register('startup.funding_rounds', "SELECT COUNT(*) AS rounds FROM Funding WHERE startup_id = %s",
+         prepare=True)
+
+# ============================================
+# Statements: matchmaking (MATCH_STRATEGY=sql)
+# ============================================
+
+# Top 10 investors whose range covers a startup's funding requirement.
+# Params: amount, amount, domain_id, then the same three again. Each branch walks
+# idx_investor_rank in dashboard order and probes the InvestorDomains
+# primary key, so it stops after 10 qualifying rows.
+register('matches.investors_for_startup', """
+    (SELECT i.investor_id, i.name, i.investment_min, i.investment_max,
+            i.preferred_domains, i.location, i.portfolio_size,
+            100 AS match_score,
+            'Perfect domain match' AS match_reason
+     FROM Investors i
+     WHERE i.investment_min <= %s
+       AND i.investment_max >= %s
+       AND EXISTS (SELECT 1 FROM InvestorDomains idm
+                   WHERE idm.investor_id = i.investor_id AND idm.domain_id = %s)
+     ORDER BY i.portfolio_size ASC, i.investor_id ASC
+     LIMIT 10)
+    UNION ALL
+    (SELECT i.investor_id, i.name, i.investment_min, i.investment_max,
+            i.preferred_domains, i.location, i.portfolio_size,
+            50 AS match_score,
+            'Investment range compatible' AS match_reason
+     FROM Investors i
+     WHERE i.investment_min <= %s
+       AND i.investment_max >= %s
+       AND NOT EXISTS (SELECT 1 FROM InvestorDomains idm
+                       WHERE idm.investor_id = i.investor_id AND idm.domain_id = %s)
+     ORDER BY i.portfolio_size ASC, i.investor_id ASC
+     LIMIT 10)
+    ORDER BY match_score DESC, portfolio_size ASC, investor_id ASC
+    LIMIT 10
+""", prepare=True)
+
+# Top 10 unfunded startups inside an investor's range, newest first.
+# Params: low, high, investor_id, then the same three again. Both branches read
+# idx_startup_unfunded_recent (narrow ranges: idx_startup_unfunded_amount)
+# and check InvestorDomains by primary key. PostgreSQL: OFFSET 0 keeps the
+# EXISTS a probe. The plan it avoids: Nested Loop over InvestorDomains x
+# Index Scan on idx_startup_domain (every startup of the investor's domains,
+# ~15k rows at 200k startups), then a top-N Sort - 93 ms instead of 1 ms.
+# check_query_plans.py fails if app.match_startups_sql reads idx_startup_domain.
+# Not prepared on PostgreSQL: after five executions it may switch to a generic
+# plan, which does not know the range and takes the partial index for every
+# range - Bitmap Heap Scan on idx_startup_unfunded_amount plus a Sort of all
+# unfunded startups in range (15 ms instead of 1 ms at 20k startups).
+_FENCE = ' OFFSET 0' if DB_TYPE == 'postgresql' else ''
+
+register('matches.startups_for_investor', f"""
+    (SELECT s.startup_id, s.name, d.domain_name, s.funding_required,
+            s.location, s.description, s.is_funded, s.founded_date,
+            100 AS match_score
+     FROM Startups s
+     JOIN Domains d ON d.domain_id = s.domain_id
+     WHERE s.funding_required BETWEEN %s AND %s
+       AND s.is_funded = FALSE
+       AND EXISTS (SELECT 1 FROM InvestorDomains idm
+                   WHERE idm.investor_id = %s AND idm.domain_id = s.domain_id{_FENCE})
+     ORDER BY s.founded_date DESC, s.startup_id ASC
+     LIMIT 10)
+    UNION ALL
+    (SELECT s.startup_id, s.name, d.domain_name, s.funding_required,
+            s.location, s.description, s.is_funded, s.founded_date,
+            50 AS match_score
+     FROM Startups s
+     JOIN Domains d ON d.domain_id = s.domain_id
+     WHERE s.funding_required BETWEEN %s AND %s
+       AND s.is_funded = FALSE
+       AND NOT EXISTS (SELECT 1 FROM InvestorDomains idm
+                       WHERE idm.investor_id = %s AND idm.domain_id = s.domain_id{_FENCE})
+     ORDER BY s.founded_date DESC, s.startup_id ASC
+     LIMIT 10)
+    ORDER BY match_score DESC, founded_date DESC, startup_id ASC
+    LIMIT 10
+""", prepare=DB_TYPE != 'postgresql')
@@ -0,0 +1,241 @@
+"""
+============================================
+DBMS Project: Reference Data Cache
+Per-worker in-memory copies of small, rarely changing tables (Domains)
+Works with both MySQL and PostgreSQL
+============================================
+
+The registration forms and dashboards need the Domains list / names on
+every request. ReferenceTable loads a table once per worker process and
+serves it from memory until it changes:
+
+* Triggers on the table bump its row in ReferenceDataVersions
+  (migrations/004_reference_data_versions*.sql).
+* PostgreSQL: the same trigger sends NOTIFY reference_data '<table>'.
+  One listener thread per worker LISTENs on its own connection and marks
+  the table stale, so the next request reloads it.
+* MySQL (or PostgreSQL while the listener is disconnected): the cached
+  version is compared with ReferenceDataVersions at most every
+  REFERENCE_CACHE_POLL_INTERVAL seconds (default 5).
+
+Either way a change reaches every gunicorn worker within the poll
+interval, without a restart. If the database is unreachable the last
+loaded rows keep being served.
+"""
+
+import os
+import select
+import threading
+import time
+
+from database import DB_TYPE, DATABASE_URL, Error, get_db_connection, get_cursor
+
+POLL_INTERVAL = float(os.environ.get('REFERENCE_CACHE_POLL_INTERVAL', 5))
+LISTEN_ENABLED = os.environ.get('REFERENCE_CACHE_LISTEN', '1') != '0'
+NOTIFY_CHANNEL = 'reference_data'
+LISTENER_RETRY = 5.0        # seconds between listener reconnects
+LISTENER_KEEPALIVE = 60.0   # seconds of silence before the listener pings
+
+_tables = {}
+_listener = None
+_listener_lock = threading.Lock()
+
+
+class ReferenceTable:
+    """All rows of one reference table, plus a key -> row index"""
+
+    def __init__(self, name, query, key, poll_interval=POLL_INTERVAL):
+        self.name = name
+        self.query = query
+        self.key = key
+        self.poll_interval = poll_interval
+
+        self._lock = threading.Lock()
+        self._rows = None
+        self._by_key = {}
+        self._version = None
+        self._stale = True
+        self._checked_at = 0.0
+        self._loaded_at = None
+        self._loads = 0
+        _tables[name] = self
+
+    # ---------- public API ----------
+
+    def rows(self):
+        """Every row, in query order (treat as read-only)"""
+        self._refresh_if_needed()
+        return self._rows or []
+
+    def get(self, key, default=None):
+        """The row whose key column equals `key`"""
+        self._refresh_if_needed()
+        return self._by_key.get(key, default)
+
+    def invalidate(self):
+        """Reload on the next access (called by the NOTIFY listener)"""
+        self._stale = True
+
+    def stats(self):
+        return {
+            'rows': len(self._rows or []),
+            'version': self._version,
+            'loads': self._loads,
+            'stale': self._stale,
+            'loaded_seconds_ago': (round(time.monotonic() - self._loaded_at, 1)
+                                   if self._loaded_at is not None else None),
+        }
+
+    # ---------- internal helpers ----------
+
+    def _fresh(self):
+        if self._rows is None or self._stale:
+            return False
+        # A live listener reports every change; otherwise poll the version row
+        return _listener_connected() or time.monotonic() - self._checked_at < self.poll_interval
+
+    def _refresh_if_needed(self):
+        _ensure_listener()
+        if self._fresh():
+            return
+
+        if self._rows is None:
+            self._lock.acquire()        # nothing to serve yet - wait for the load
+        elif not self._lock.acquire(blocking=False):
+            return                      # another thread is refreshing; serve current rows
+        try:
+            if not self._fresh():
+                self._refresh()
+        finally:
+            self._lock.release()
+
+    def _refresh(self):
+        # Cleared before reading, so a NOTIFY that arrives mid-load is not lost
+        stale, self._stale = self._stale, False
+        try:
+            with get_db_connection() as conn:
+                if not conn:
+                    raise Error("no database connection")
+                cursor = get_cursor(conn)
+                try:
+                    cursor.execute("SELECT version FROM ReferenceDataVersions WHERE table_name = %s",
+                                   (self.name,))
+                    row = cursor.fetchone()
+                    version = row['version'] if row else None
+                    if stale or self._rows is None or version != self._version:
+                        cursor.execute(self.query)
+                        rows = [dict(r) for r in cursor.fetchall()]
+                        self._by_key = {r[self.key]: r for r in rows}
+                        self._rows = rows
+                        self._loaded_at = time.monotonic()
+                        self._loads += 1
+                    self._version = version
+                finally:
+                    cursor.close()
+        except Exception as e:
+            self._stale = self._stale or stale
+            print(f"⚠️  Could not refresh {self.name} cache: {e}")
+        self._checked_at = time.monotonic()
+
+
+# ============================================
+# PostgreSQL LISTEN/NOTIFY invalidation
+# ============================================
+
+class _NotifyListener(threading.Thread):
+    """Marks tables stale when their trigger sends NOTIFY reference_data"""
+
+    def __init__(self):
+        super().__init__(name='reference-cache-listener', daemon=True)
+        self.pid = os.getpid()
+        self.connected = False
+
+    def run(self):
+        import psycopg2
+
+        while True:
+            conn = None
+            try:
+                conn = psycopg2.connect(DATABASE_URL)
+                conn.autocommit = True
+                cursor = conn.cursor()
+                cursor.execute(f"LISTEN {NOTIFY_CHANNEL}")
+                self.connected = True
+                # Anything may have changed while we were not listening
+                for table in list(_tables.values()):
+                    table.invalidate()
+
+                while True:
+                    if select.select([conn], [], [], LISTENER_KEEPALIVE) == ([], [], []):
+                        cursor.execute("SELECT 1")
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        notify = conn.notifies.pop(0)
+                        table = _tables.get(notify.payload)
+                        targets = [table] if table else list(_tables.values())
+                        for target in targets:
+                            target.invalidate()
+            except Exception as e:
+                print(f"⚠️  Reference cache listener disconnected: {e}")
+            finally:
+                self.connected = False
+                if conn is not None:
+                    try:
+                        conn.close()
+                    except Exception:
+                        pass
+            time.sleep(LISTENER_RETRY)
+
+
+def _ensure_listener():
+    """Start this process's listener thread (again after a gunicorn fork)"""
+    global _listener
+    if DB_TYPE != 'postgresql' or not LISTEN_ENABLED:
+        return
+    if _listener is not None and _listener.pid == os.getpid():
+        return
+    with _listener_lock:
+        if _listener is None or _listener.pid != os.getpid():
+            _listener = _NotifyListener()
+            _listener.start()
+
+
+def _listener_connected():
+    return _listener is not None and _listener.pid == os.getpid() and _listener.connected
+
+
+def cache_stats():
+    """Cache state for the monitoring endpoint"""
+    return {
+        'listener_connected': _listener_connected(),
+        'poll_interval': POLL_INTERVAL,
+        'tables': {name: table.stats() for name, table in _tables.items()},
+    }
+
+# ============================================
+# Cached Tables
+# ============================================
+
+domains = ReferenceTable('Domains', "SELECT * FROM Domains ORDER BY domain_id", key='domain_id')
+
+
+def domain_name(domain_id):
+    """Cached counterpart of the get_domain_name() SQL function"""
+    row = domains.get(int(domain_id)) if domain_id is not None else None
+    return row['domain_name'] if row else None
+
+
+if __name__ == '__main__':
+    import sys
+
+    print("=" * 50)
+    print("📚 Startup Funding System - Reference Data Cache")
+    print("=" * 50)
+    rows = domains.rows()
+    if not rows:
+        print("❌ Could not load Domains")
+        sys.exit(1)
+    print(f"✅ Loaded {len(rows)} domains (version {domains.stats()['version']})")
+    for row in rows:
+        print(f"   • {row['domain_id']}: {row['domain_name']}")
@@ -0,0 +1,634 @@
+"""
+============================================
+DBMS Project: Report Rollups
+Pre-aggregated tables behind the reports.sql analytics (/reports/<name>)
+Works with both MySQL and PostgreSQL
+============================================
+
+Reports 2, 3, 4, 8 and 10 of reports.sql group the whole Funding table on
+every run, so they get slower as Funding grows. Migration 005 keeps their
+results in small rollup tables instead:
+
+    ReportDomainStats       per domain    (Report 3, domain pie chart)
+    ReportMonthlyFunding    per month     (Report 4, monthly bar chart)
+    ReportLocationStats     per location  (Report 8)
+    ReportRollupState       investor count, rebuilt_at / refreshed_at
+
+Top investors (Report 2) need no rollup of their own: they read the
+trigger-kept Investors.total_invested / portfolio_size (migration 003).
+
+* Triggers on Funding, Startups and Investors append one row per change
+  to ReportRollupDeltas (+1 / -1 with the domain, location and date it is
+  grouped by). refresh_rollups() folds the pending deltas into the
+  rollups; the COUNT(DISTINCT ...) columns are kept exact through the
+  per-pair deal counts in ReportMonthInvestors / ReportMonthStartups /
+  ReportLocationInvestors.
+* The report endpoints apply up to REPORT_REFRESH_ON_READ pending deltas
+  before they read; run `python report_rollups.py --refresh` from cron to
+  keep up with larger backlogs.
+* `python report_rollups.py --rebuild` recomputes everything from the base
+  tables (also done automatically the first time, and by bulk_seed.py).
+* `python report_rollups.py --verify` compares every rollup report with
+  the live reports.sql queries.
+
+Every report comes with refreshed_at: all changes committed before that
+time are included.
+"""
+
+import io
+import os
+import sys
+import time
+from collections import Counter, defaultdict
+from decimal import Decimal
+
+from database import DB_TYPE, Error, get_db_connection, get_cursor, is_replica
+
+REFRESH_BATCH_SIZE = int(os.environ.get('REPORT_REFRESH_BATCH_SIZE', 10000))
+REFRESH_ON_READ = int(os.environ.get('REPORT_REFRESH_ON_READ', 1000))
+DELETE_BATCH_SIZE = 1000
+
+ROLLUP_NAME = 'reports'
+UNKNOWN_LOCATION = 'Unknown'
+
+_MONTH = {
+    'postgresql': "TO_CHAR(funding_date, 'YYYY-MM')",
+    'mysql': "DATE_FORMAT(funding_date, '%Y-%m')",
+}
+
+# (pair table, group column, member column): the distinct counters they feed
+_PAIR_TABLES = {
+    'month_investor': ('ReportMonthInvestors', 'month', 'investor_id'),
+    'month_startup': ('ReportMonthStartups', 'month', 'startup_id'),
+    'location_investor': ('ReportLocationInvestors', 'location', 'investor_id'),
+}
+
+# ============================================
+# Applying Deltas
+# ============================================
+
+def _add_rows(cursor, table, key, columns, rows):
+    """Upsert rows of (key, *columns), adding the values to existing rows"""
+    if not rows:
+        return
+    names = ', '.join((key,) + columns)
+    placeholders = ', '.join(['%s'] * (len(columns) + 1))
+    if DB_TYPE == 'postgresql':
+        updates = ', '.join(f"{c} = {table}.{c} + EXCLUDED.{c}" for c in columns)
+        sql = f"INSERT INTO {table} ({names}) VALUES ({placeholders}) ON CONFLICT ({key}) DO UPDATE SET {updates}"
+    else:
+        updates = ', '.join(f"{c} = {c} + VALUES({c})" for c in columns)
+        sql = f"INSERT INTO {table} ({names}) VALUES ({placeholders}) ON DUPLICATE KEY UPDATE {updates}"
+    cursor.executemany(sql, rows)
+
+
+def _copy_text(value):
+    return str(value).replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n').replace('\r', '\\r')
+
+
+def _stage_pairs(cursor, pairs):
+    """Load (pair_kind, group_key, member_id, deals) rows into rollup_pair_stage"""
+    if DB_TYPE == 'postgresql':
+        cursor.execute("""
+            CREATE TEMP TABLE rollup_pair_stage (
+                pair_kind VARCHAR(20) NOT NULL,
+                group_key VARCHAR(100) NOT NULL,
+                member_id INTEGER NOT NULL,
+                deals INTEGER NOT NULL
+            ) ON COMMIT DROP
+        """)
+        buffer = io.StringIO()
+        for kind, group, member, deals in pairs:
+            buffer.write('%s\t%s\t%d\t%d\n' % (kind, _copy_text(group), member, deals))
+        buffer.seek(0)
+        cursor.copy_expert("COPY rollup_pair_stage FROM STDIN", buffer)
+    else:
+        cursor.execute("DROP TEMPORARY TABLE IF EXISTS rollup_pair_stage")
+        cursor.execute("""
+            CREATE TEMPORARY TABLE rollup_pair_stage (
+                pair_kind VARCHAR(20) NOT NULL,
+                group_key VARCHAR(100) NOT NULL,
+                member_id INT NOT NULL,
+                deals INT NOT NULL
+            )
+        """)
+        cursor.executemany("INSERT INTO rollup_pair_stage VALUES (%s, %s, %s, %s)", pairs)
+
+
+def _apply_pairs(cursor, kind):
+    """Add the staged deal counts of one pair table; returns {group: distinct change}
+
+    A group's distinct count goes up when a pair gets its first deal and
+    down when its last deal goes away.
+    """
+    table, group, member = _PAIR_TABLES[kind]
+    cursor.execute(f"""
+        SELECT t.group_key,
+               SUM(CASE WHEN COALESCE(p.deals, 0) <= 0 AND COALESCE(p.deals, 0) + t.deals > 0 THEN 1
+                        WHEN p.deals > 0 AND p.deals + t.deals <= 0 THEN -1
+                        ELSE 0 END) AS distinct_change
+        FROM rollup_pair_stage t
+        LEFT JOIN {table} p ON p.{group} = t.group_key AND p.{member} = t.member_id
+        WHERE t.pair_kind = %s
+        GROUP BY t.group_key
+    """, (kind,))
+    changes = {row['group_key']: int(row['distinct_change']) for row in cursor.fetchall()}
+
+    if DB_TYPE == 'postgresql':
+        cursor.execute(f"""
+            INSERT INTO {table} ({group}, {member}, deals)
+            SELECT group_key, member_id, deals FROM rollup_pair_stage WHERE pair_kind = %s
+            ON CONFLICT ({group}, {member}) DO UPDATE SET deals = {table}.deals + EXCLUDED.deals
+        """, (kind,))
+        cursor.execute(f"""
+            DELETE FROM {table} p
+            USING rollup_pair_stage t
+            WHERE t.pair_kind = %s AND p.{group} = t.group_key AND p.{member} = t.member_id
+              AND p.deals <= 0
+        """, (kind,))
+    else:
+        cursor.execute(f"""
+            INSERT INTO {table} ({group}, {member}, deals)
+            SELECT group_key, member_id, deals FROM rollup_pair_stage WHERE pair_kind = %s
+            ON DUPLICATE KEY UPDATE deals = {table}.deals + VALUES(deals)
+        """, (kind,))
+        cursor.execute(f"""
+            DELETE p FROM {table} p
+            JOIN rollup_pair_stage t ON p.{group} = t.group_key AND p.{member} = t.member_id
+            WHERE t.pair_kind = %s AND p.deals <= 0
+        """, (kind,))
+    return changes
+
+
+def apply_deltas(cursor, deltas):
+    """Fold a list of ReportRollupDeltas rows into the rollup tables"""
+    domains = defaultdict(lambda: [0, 0, 0, Decimal(0)])       # startups, funded, deals, amount
+    months = defaultdict(lambda: [0, Decimal(0), 0, 0])        # deals, amount, investors, startups
+    locations = defaultdict(lambda: [0, 0, 0, Decimal(0)])     # startups, investors, deals, amount
+    pairs = {kind: Counter() for kind in _PAIR_TABLES}
+    investors = 0
+
+    for delta in deltas:
+        sign = delta['sign']
+        if delta['kind'] == 'investor':
+            investors += sign
+            continue
+        location = delta['location'] or ''
+        if delta['kind'] == 'startup':
+            domain = domains[delta['domain_id']]
+            domain[0] += sign
+            domain[1] += sign if delta['is_funded'] else 0
+            locations[location][0] += sign
+            continue
+
+        amount = sign * delta['amount']
+        month = delta['funding_date'].strftime('%Y-%m')
+        domain = domains[delta['domain_id']]
+        domain[2] += sign
+        domain[3] += amount
+        months[month][0] += sign
+        months[month][1] += amount
+        locations[location][2] += sign
+        locations[location][3] += amount
+        pairs['month_investor'][(month, delta['investor_id'])] += sign
+        pairs['month_startup'][(month, delta['startup_id'])] += sign
+        pairs['location_investor'][(location, delta['investor_id'])] += sign
+
+    staged = [(kind, group, member, deals)
+              for kind, counts in pairs.items()
+              for (group, member), deals in counts.items() if deals]
+    if staged:
+        _stage_pairs(cursor, staged)
+        for month, change in _apply_pairs(cursor, 'month_investor').items():
+            months[month][2] += change
+        for month, change in _apply_pairs(cursor, 'month_startup').items():
+            months[month][3] += change
+        for location, change in _apply_pairs(cursor, 'location_investor').items():
+            locations[location][1] += change
+
+    _add_rows(cursor, 'ReportDomainStats', 'domain_id',
+              ('total_startups', 'funded_startups', 'funding_deals', 'total_funding'),
+              [(key, *values) for key, values in domains.items() if any(values)])
+    _add_rows(cursor, 'ReportMonthlyFunding', 'month',
+              ('investments', 'total_amount', 'active_investors', 'startups_funded'),
+              [(key, *values) for key, values in months.items() if any(values)])
+    _add_rows(cursor, 'ReportLocationStats', 'location',
+              ('total_startups', 'total_investors', 'funding_deals', 'total_funding'),
+              [(key, *values) for key, values in locations.items() if any(values)])
+    if months:
+        cursor.execute("DELETE FROM ReportMonthlyFunding WHERE investments <= 0")
+    if locations:
+        cursor.execute("DELETE FROM ReportLocationStats WHERE total_startups <= 0 AND funding_deals <= 0")
+    if investors:
+        cursor.execute("UPDATE ReportRollupState SET total_investors = total_investors + %s "
+                       "WHERE rollup_name = %s", (investors, ROLLUP_NAME))
+
+
+def _delete_deltas(cursor, ids):
+    for start in range(0, len(ids), DELETE_BATCH_SIZE):
+        batch = ids[start:start + DELETE_BATCH_SIZE]
+        cursor.execute(f"DELETE FROM ReportRollupDeltas WHERE delta_id IN ({', '.join(['%s'] * len(batch))})",
+                       tuple(batch))
+
+
+def refresh_rollups(conn, limit=None, batch_size=REFRESH_BATCH_SIZE):
+    """Apply pending deltas, one batch per transaction; returns deltas applied
+
+    The ReportRollupState row is the refresher lock: it is claimed with
+    SKIP LOCKED, so a request that finds another refresh running serves
+    the rollups as they are instead of waiting. Runs a full rebuild if the
+    rollups were never built.
+    """
+    applied = 0
+    cursor = get_cursor(conn)
+    try:
+        while limit is None or applied < limit:
+            cursor.execute("""
+                SELECT rebuilt_at, CURRENT_TIMESTAMP AS now FROM ReportRollupState
+                WHERE rollup_name = %s
+                FOR UPDATE SKIP LOCKED
+            """, (ROLLUP_NAME,))
+            state = cursor.fetchone()
+            if not state:
+                conn.rollback()
+                break
+            if state['rebuilt_at'] is None:
+                conn.rollback()
+                rebuild_rollups(conn)
+                break
+
+            size = batch_size if limit is None else min(batch_size, limit - applied)
+            cursor.execute("SELECT * FROM ReportRollupDeltas ORDER BY delta_id LIMIT %s", (size,))
+            deltas = cursor.fetchall()
+            apply_deltas(cursor, deltas)
+            _delete_deltas(cursor, [d['delta_id'] for d in deltas])
+            if len(deltas) < size:
+                # Drained: everything committed before this transaction began is in
+                cursor.execute("UPDATE ReportRollupState SET refreshed_at = %s WHERE rollup_name = %s",
+                               (state['now'], ROLLUP_NAME))
+            conn.commit()
+            applied += len(deltas)
+            if len(deltas) < size:
+                break
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+    return applied
+
+
+# ============================================
+# Full Rebuild
+# ============================================
+
+def _rebuild_statements():
+    month = _MONTH[DB_TYPE]
+    return [
+        ("""
+            INSERT INTO ReportDomainStats (domain_id, total_startups, funded_startups,
+                                           funding_deals, total_funding)
+            SELECT d.domain_id, COALESCE(s.startups, 0), COALESCE(s.funded, 0),
+                   COALESCE(f.deals, 0), COALESCE(f.total, 0)
+            FROM Domains d
+            LEFT JOIN (SELECT domain_id, COUNT(*) AS startups,
+                              SUM(CASE WHEN is_funded = TRUE THEN 1 ELSE 0 END) AS funded
+                       FROM Startups GROUP BY domain_id) s ON s.domain_id = d.domain_id
+            LEFT JOIN (SELECT s.domain_id, COUNT(*) AS deals, SUM(f.amount) AS total
+                       FROM Funding f JOIN Startups s ON s.startup_id = f.startup_id
+                       GROUP BY s.domain_id) f ON f.domain_id = d.domain_id
+        """),
+        (f"""
+            INSERT INTO ReportMonthInvestors (month, investor_id, deals)
+            SELECT {month}, investor_id, COUNT(*) FROM Funding GROUP BY 1, 2
+        """),
+        (f"""
+            INSERT INTO ReportMonthStartups (month, startup_id, deals)
+            SELECT {month}, startup_id, COUNT(*) FROM Funding GROUP BY 1, 2
+        """),
+        (f"""
+            INSERT INTO ReportMonthlyFunding (month, investments, total_amount,
+                                              active_investors, startups_funded)
+            SELECT f.month, f.deals, f.total, i.investors, s.startups
+            FROM (SELECT {month} AS month, COUNT(*) AS deals, SUM(amount) AS total
+                  FROM Funding GROUP BY 1) f
+            JOIN (SELECT month, COUNT(*) AS investors FROM ReportMonthInvestors GROUP BY month) i
+              ON i.month = f.month
+            JOIN (SELECT month, COUNT(*) AS startups FROM ReportMonthStartups GROUP BY month) s
+              ON s.month = f.month
+        """),
+        ("""
+            INSERT INTO ReportLocationInvestors (location, investor_id, deals)
+            SELECT COALESCE(s.location, ''), f.investor_id, COUNT(*)
+            FROM Funding f JOIN Startups s ON s.startup_id = f.startup_id
+            GROUP BY 1, 2
+        """),
+        ("""
+            INSERT INTO ReportLocationStats (location, total_startups, total_investors,
+                                             funding_deals, total_funding)
+            SELECT s.location, s.startups, COALESCE(i.investors, 0),
+                   COALESCE(f.deals, 0), COALESCE(f.total, 0)
+            FROM (SELECT COALESCE(location, '') AS location, COUNT(*) AS startups
+                  FROM Startups GROUP BY 1) s
+            LEFT JOIN (SELECT location, COUNT(*) AS investors
+                       FROM ReportLocationInvestors GROUP BY location) i ON i.location = s.location
+            LEFT JOIN (SELECT COALESCE(s.location, '') AS location, COUNT(*) AS deals,
+                              SUM(f.amount) AS total
+                       FROM Funding f JOIN Startups s ON s.startup_id = f.startup_id
+                       GROUP BY 1) f ON f.location = s.location
+        """),
+    ]
+
+
+ROLLUP_TABLES = ('ReportDomainStats', 'ReportMonthlyFunding', 'ReportLocationStats',
+                 'ReportMonthInvestors', 'ReportMonthStartups', 'ReportLocationInvestors')
+
+
+def _rebuild(cursor):
+    if DB_TYPE == 'postgresql':
+        cursor.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ")
+    # Refreshers skip the locked state row, so reports keep being served
+    cursor.execute("""
+        SELECT CURRENT_TIMESTAMP AS now FROM ReportRollupState
+        WHERE rollup_name = %s
+        FOR UPDATE
+    """, (ROLLUP_NAME,))
+    now = cursor.fetchone()['now']
+    if DB_TYPE == 'postgresql':
+        cursor.execute("DELETE FROM ReportRollupDeltas")
+    else:
+        cursor.execute("SELECT MAX(delta_id) AS last_id FROM ReportRollupDeltas")
+        last_id = cursor.fetchone()['last_id']
+        if last_id is not None:
+            cursor.execute("DELETE FROM ReportRollupDeltas WHERE delta_id <= %s", (last_id,))
+
+    for table in ROLLUP_TABLES:
+        cursor.execute(f"DELETE FROM {table}")
+    for sql in _rebuild_statements():
+        cursor.execute(sql)
+    cursor.execute("""
+        UPDATE ReportRollupState
+        SET total_investors = (SELECT COUNT(*) FROM Investors),
+            rebuilt_at = %s, refreshed_at = %s
+        WHERE rollup_name = %s
+    """, (now, now, ROLLUP_NAME))
+
+
+def rebuild_rollups(conn, attempts=3):
+    """Recompute every rollup from the base tables (one transaction); returns seconds
+
+    Deltas written while the rebuild reads are kept for the next refresh:
+    PostgreSQL reads and deletes under one REPEATABLE READ snapshot (and
+    starts over if a refresh committed in between); MySQL deletes only the
+    deltas up to the highest id its snapshot saw.
+    """
+    started = time.perf_counter()
+    for attempt in range(1, attempts + 1):
+        cursor = get_cursor(conn)
+        try:
+            _rebuild(cursor)
+            conn.commit()
+            break
+        except Error as e:
+            conn.rollback()
+            if getattr(e, 'pgcode', None) != '40001' or attempt == attempts:
+                raise
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
+    return time.perf_counter() - started
+
+
+# ============================================
+# Reports
+# ============================================
+
+REPORT_QUERIES = {
+    # Report 2 / top investors bar chart
+    'top-investors': """
+        SELECT i.name AS Investor_Name, i.location AS Location,
+               i.portfolio_size AS Startups_Funded,
+               i.total_invested AS Total_Investment,
+               i.total_invested / i.portfolio_size AS Avg_Investment_Per_Startup,
+               (SELECT MIN(f.amount) FROM Funding f WHERE f.investor_id = i.investor_id) AS Min_Investment,
+               (SELECT MAX(f.amount) FROM Funding f WHERE f.investor_id = i.investor_id) AS Max_Investment
+        FROM Investors i
+        WHERE i.portfolio_size > 0
+        ORDER BY i.total_invested DESC
+        LIMIT 10
+    """,
+    # Report 3 / domain pie chart
+    'domains': """
+        SELECT d.domain_name AS Domain,
+               COALESCE(r.total_startups, 0) AS Total_Startups,
+               COALESCE(r.funded_startups, 0) AS Funded_Startups,
+               COALESCE(r.total_startups - r.funded_startups, 0) AS Unfunded_Startups,
+               COALESCE(r.total_funding, 0) AS Total_Funding,
+               COALESCE(r.total_funding / NULLIF(r.funding_deals, 0), 0) AS Avg_Funding_Per_Startup,
+               ROUND(r.funded_startups * 100.0 / NULLIF(r.total_startups, 0), 2) AS Funding_Success_Rate
+        FROM Domains d
+        LEFT JOIN ReportDomainStats r ON r.domain_id = d.domain_id
+        ORDER BY Total_Funding DESC
+    """,
+    # Report 4 / monthly bar chart
+    'monthly': """
+        SELECT month AS Month,
+               investments AS Number_of_Investments,
+               total_amount AS Total_Amount_Invested,
+               total_amount / investments AS Average_Investment,
+               active_investors AS Active_Investors,
+               startups_funded AS Startups_Funded
+        FROM ReportMonthlyFunding
+        ORDER BY month DESC
+    """,
+    # Report 8
+    'locations': f"""
+        SELECT CASE WHEN location = '' THEN '{UNKNOWN_LOCATION}' ELSE location END AS City,
+               total_startups AS Total_Startups,
+               total_investors AS Total_Investors,
+               funding_deals AS Total_Funding_Deals,
+               total_funding AS Total_Funding_Amount
+        FROM ReportLocationStats
+        ORDER BY total_funding DESC
+    """,
+}
+
+
+def _summary(cursor):
+    """Report 10: system statistics, from the rollups (Matches is still counted)"""
+    cursor.execute("""
+        SELECT COALESCE(SUM(total_startups), 0) AS startups,
+               COALESCE(SUM(funded_startups), 0) AS funded,
+               COALESCE(SUM(funding_deals), 0) AS deals,
+               COALESCE(SUM(total_funding), 0) AS amount,
+               COALESCE(SUM(CASE WHEN total_startups > 0 THEN 1 ELSE 0 END), 0) AS domains
+        FROM ReportDomainStats
+    """)
+    totals = cursor.fetchone()
+    cursor.execute("SELECT total_investors FROM ReportRollupState WHERE rollup_name = %s", (ROLLUP_NAME,))
+    state = cursor.fetchone()
+    cursor.execute("SELECT COUNT(*) AS matches FROM Matches")
+    matches = cursor.fetchone()['matches']
+    deals = int(totals['deals'])
+    return [
+        {'Metric': 'Total Startups', 'Value': int(totals['startups'])},
+        {'Metric': 'Funded Startups', 'Value': int(totals['funded'])},
+        {'Metric': 'Unfunded Startups', 'Value': int(totals['startups']) - int(totals['funded'])},
+        {'Metric': 'Total Investors', 'Value': state['total_investors'] if state else 0},
+        {'Metric': 'Total Funding Deals', 'Value': deals},
+        {'Metric': 'Total Funding Amount (₹)', 'Value': totals['amount'] if deals else None},
+        {'Metric': 'Average Funding Per Deal (₹)', 'Value': totals['amount'] / deals if deals else None},
+        {'Metric': 'Total Matches Generated', 'Value': matches},
+        {'Metric': 'Active Domains', 'Value': int(totals['domains'])},
+    ]
+
+
+REPORTS = tuple(REPORT_QUERIES) + ('summary',)
+
+
+def report_freshness(cursor):
+    """refreshed_at / rebuilt_at of the rollups and the oldest change not yet applied"""
+    cursor.execute("SELECT rebuilt_at, refreshed_at FROM ReportRollupState WHERE rollup_name = %s",
+                   (ROLLUP_NAME,))
+    state = cursor.fetchone() or {'rebuilt_at': None, 'refreshed_at': None}
+    cursor.execute("SELECT created_at FROM ReportRollupDeltas ORDER BY delta_id LIMIT 1")
+    oldest = cursor.fetchone()
+    return {
+        'rebuilt_at': state['rebuilt_at'],
+        'refreshed_at': state['refreshed_at'],
+        'oldest_pending_change': oldest['created_at'] if oldest else None,
+    }
+
+
+def run_report(conn, name, refresh_limit=REFRESH_ON_READ):
+    """Rows of one rollup report plus its freshness; applies pending deltas first
+
+    On a read replica the deltas cannot be applied before reading: when
+    some are pending, the primary applies them afterwards, for the next
+    request (the replica shows them once it has replayed that).
+    """
+    if name not in REPORTS:
+        raise KeyError(name)
+    replica = is_replica(conn)
+    if refresh_limit and not replica:
+        refresh_rollups(conn, limit=refresh_limit)
+    cursor = get_cursor(conn)
+    try:
+        if name == 'summary':
+            rows = _summary(cursor)
+        else:
+            cursor.execute(REPORT_QUERIES[name])
+            rows = cursor.fetchall()
+        # Same column names on both backends (PostgreSQL folds aliases to lower case)
+        rows = [{key.lower(): value for key, value in row.items()} for row in rows]
+        report = {'report': name, 'rows': rows, **report_freshness(cursor)}
+    finally:
+        cursor.close()
+    if refresh_limit and replica and report['oldest_pending_change'] is not None:
+        with get_db_connection() as primary:
+            if primary:
+                refresh_rollups(primary, limit=refresh_limit)
+    return report
+
+
+# ============================================
+# Verification
+# ============================================
+
+def _live_reports():
+    """The matching reports.sql queries, in this backend's dialect"""
+    from benchmark_queries import load_sql_blocks
+    path = 'reports_postgresql.sql' if DB_TYPE == 'postgresql' else 'reports.sql'
+    blocks = load_sql_blocks(os.path.join(os.path.dirname(os.path.abspath(__file__)), path))
+    # The rollup keeps blank and missing locations in one 'Unknown' group
+    locations = (blocks['REPORT 8: Location-wise Analysis']
+                 .replace("COALESCE(s.location, 'Unknown')", "COALESCE(NULLIF(COALESCE(s.location, ''), ''), 'Unknown')")
+                 .replace("GROUP BY s.location", "GROUP BY COALESCE(s.location, '')"))
+    return {
+        'top-investors': blocks['REPORT 2: Top Investors by Investment Amount'],
+        'domains': blocks['REPORT 3: Domain-wise Funding Statistics'],
+        'monthly': blocks['REPORT 4: Monthly Funding Trends'],
+        'locations': locations,
+        'summary': blocks['REPORT 10: System Statistics Summary'],
+    }
+
+
+def _row_key(name, row):
+    values = [round(Decimal(v), 2) if isinstance(v, (int, float, Decimal)) and not isinstance(v, bool)
+              else v for v in row.values()]
+    # Investors tied at 10th place may differ by name; compare their figures only
+    return tuple(values[2:] if name == 'top-investors' else values)
+
+
+def verify_reports(conn):
+    """Apply every pending delta, then compare each rollup report with its
+    live reports.sql query; returns mismatches
+
+    Rows are compared as multisets, since ties in the ORDER BY can come
+    back in either order.
+    """
+    refresh_rollups(conn)
+    mismatches = {}
+    cursor = get_cursor(conn)
+    try:
+        for name, sql in _live_reports().items():
+            cursor.execute(sql)
+            live = Counter(_row_key(name, row) for row in cursor.fetchall())
+            rollup = Counter(_row_key(name, row) for row in run_report(conn, name, refresh_limit=0)['rows'])
+            if live != rollup:
+                mismatches[name] = (live - rollup, rollup - live)
+    finally:
+        cursor.close()
+    return mismatches
+
+
+# ============================================
+# Command Line
+# ============================================
+
+def main(argv):
+    with get_db_connection() as conn:
+        if not conn:
+            print("❌ Could not connect to database")
+            return False
+
+        if '--rebuild' in argv:
+            elapsed = rebuild_rollups(conn)
+            print(f"✅ Rebuilt report rollups ({elapsed:.2f}s)")
+        elif '--refresh' in argv:
+            started = time.perf_counter()
+            applied = refresh_rollups(conn)
+            print(f"✅ Applied {applied} pending change(s) ({time.perf_counter() - started:.2f}s)")
+
+        if '--verify' in argv:
+            started = time.perf_counter()
+            mismatches = verify_reports(conn)
+            elapsed = time.perf_counter() - started
+            for name, (missing, extra) in mismatches.items():
+                print(f"  ✗ {name}: {sum(missing.values())} live row(s) missing, "
+                      f"{sum(extra.values())} unexpected")
+                for row in list(missing)[:3]:
+                    print(f"      live:   {row}")
+                for row in list(extra)[:3]:
+                    print(f"      rollup: {row}")
+            if mismatches:
+                print(f"❌ {len(mismatches)} report(s) differ from reports.sql ({elapsed:.2f}s)")
+                return False
+            print(f"✅ All {len(REPORTS)} rollup reports match reports.sql ({elapsed:.2f}s)")
+
+        cursor = get_cursor(conn)
+        freshness = report_freshness(cursor)
+        cursor.close()
+        print(f"🕒 Rebuilt at {freshness['rebuilt_at']}, refreshed at {freshness['refreshed_at']}")
+        if freshness['oldest_pending_change']:
+            print(f"   Oldest change not applied yet: {freshness['oldest_pending_change']}")
+        return True
+
+
+if __name__ == '__main__':
+    print("=" * 50)
+    print("📊 Startup Funding System - Report Rollups")
+    print("=" * 50)
+    sys.exit(0 if main(sys.argv[1:]) else 1)
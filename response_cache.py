@@ -0,0 +1,242 @@
+"""
+============================================
+DBMS Project: Response Cache & Compression
+Pre-rendered public pages, conditional GETs and gzip/brotli responses
+Works with both MySQL and PostgreSQL
+============================================
+
+The landing and about pages are the same for every anonymous visitor,
+yet Jinja rendered them on every hit, and every response went out
+uncompressed. This module:
+
+* Caches anonymous pages (@cached_page): the first anonymous GET of the
+  route renders it once per worker. The body is stored together with its
+  gzip (and brotli) encodings, compressed once at the highest level.
+  - Entries are keyed by path and the mtimes of the page's templates
+    (the page and everything it extends or includes), so editing a
+    template re-renders the page on the next request.
+  - Logged-in visitors and visitors with pending flash messages get a
+    normally rendered page: their HTML differs.
+  - Responses carry an ETag and Last-Modified (the newest template), so
+    a browser revalidating its copy gets a bodiless 304.
+* Compresses other responses on the fly (compress_response, an
+  after_request hook): text, JSON and JS bodies of COMPRESS_MIN_SIZE
+  bytes or more (default 1024) go out as br or gzip when the client
+  accepts it. Streamed responses (CSV exports) are left alone.
+
+Brotli is used when the `brotli` package is installed, gzip otherwise.
+PAGE_CACHE=0 / COMPRESS_RESPONSES=0 turn either part off;
+`python benchmark_pages.py` measures both.
+"""
+
+import gzip
+import hashlib
+import os
+import threading
+from functools import lru_cache, wraps
+
+from flask import current_app, request, session
+from jinja2 import meta
+from werkzeug.http import http_date, parse_accept_header, parse_date, parse_etags
+
+from metrics import counter
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+PAGE_CACHE = os.environ.get('PAGE_CACHE', '1') != '0'
+COMPRESS_RESPONSES = os.environ.get('COMPRESS_RESPONSES', '1') != '0'
+COMPRESS_MIN_SIZE = int(os.environ.get('COMPRESS_MIN_SIZE', 1024))
+# On the fly: gzip level 1 already saves ~80% of an HTML page, at a third
+# of level 6's CPU time. Cached pages are compressed once, at the maximum.
+COMPRESS_LEVEL = int(os.environ.get('COMPRESS_LEVEL', 1))
+BROTLI_QUALITY = int(os.environ.get('BROTLI_QUALITY', 4))
+
+COMPRESSIBLE_TYPES = ('text/html', 'text/plain', 'text/css', 'text/csv',
+                      'application/json', 'application/javascript', 'text/javascript')
+
+CACHE_HITS = counter('page_cache_hits_total', 'Anonymous page views served from the page cache')
+CACHE_MISSES = counter('page_cache_misses_total', 'Anonymous page views rendered into the page cache')
+NOT_MODIFIED = counter('http_not_modified_total', 'Conditional GETs answered with 304')
+
+
+def _encodings():
+    return ('br', 'gzip') if BROTLI_AVAILABLE else ('gzip',)
+
+
+def _compress(body, encoding, best=False):
+    if encoding == 'br':
+        return brotli.compress(body, quality=11 if best else BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=9 if best else COMPRESS_LEVEL, mtime=0)
+
+
+@lru_cache(maxsize=256)
+def _best_encoding(accept_encoding, available):
+    # Browsers send a handful of distinct Accept-Encoding values; parse each once
+    return parse_accept_header(accept_encoding).best_match(available)
+
+
+def _negotiate(available):
+    """Best encoding of `available` the client accepts (None: send it as is)"""
+    header = request.headers.get('Accept-Encoding')
+    return _best_encoding(header, available) if header else None
+
+# ============================================
+# Page Cache
+# ============================================
+
+class CachedPage:
+    """One rendered page: its encodings and the headers that go with them"""
+
+    def __init__(self, body, mimetype, last_modified):
+        self.mimetype = mimetype
+        self.last_modified = int(last_modified)         # HTTP dates have whole seconds
+        # One weak ETag for every encoding: they are the same page
+        self.etag = hashlib.sha1(body).hexdigest()[:20]
+        common = [('ETag', f'W/"{self.etag}"'),
+                  ('Last-Modified', http_date(self.last_modified)),
+                  # Revalidate every time: the same URL shows logged-in visitors another page
+                  ('Cache-Control', 'no-cache'),
+                  ('Vary', 'Accept-Encoding')]
+        self.encodings = _encodings()
+        self.variants = {None: (body, common)}
+        for encoding in self.encodings:
+            self.variants[encoding] = (_compress(body, encoding, best=True),
+                                       common + [('Content-Encoding', encoding)])
+        self.not_modified_headers = common
+
+    def not_modified(self):
+        """True if the request's validators match this page (If-None-Match wins)"""
+        if_none_match = request.headers.get('If-None-Match')
+        if if_none_match is not None:
+            return parse_etags(if_none_match).contains_weak(self.etag)
+        if_modified_since = request.headers.get('If-Modified-Since')
+        if if_modified_since:
+            since = parse_date(if_modified_since)
+            return since is not None and since.timestamp() >= self.last_modified
+        return False
+
+
+class PageCache:
+    """Rendered anonymous pages of this worker, by path"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pages = {}              # path -> (template mtimes, CachedPage)
+        self._templates = {}          # template name -> every file it extends / includes
+
+    def _template_files(self, app, name):
+        """Files of `name` and of every template it extends, includes or imports"""
+        files = self._templates.get(name)
+        if files is None:
+            env = app.jinja_env
+            files, seen, pending = [], set(), [name]
+            while pending:
+                current = pending.pop()
+                if current in seen:
+                    continue
+                seen.add(current)
+                source, filename, _ = env.loader.get_source(env, current)
+                files.append(filename)
+                # Dynamic names (None) cannot be followed; none of our templates use them
+                pending.extend(n for n in meta.find_referenced_templates(env.parse(source)) if n)
+            self._templates[name] = files
+        return files
+
+    def _mtimes(self, app, template):
+        return tuple(os.path.getmtime(filename) for filename in self._template_files(app, template))
+
+    def get(self, app, path, template):
+        mtimes = self._mtimes(app, template)
+        with self._lock:
+            entry = self._pages.get(path)
+        if entry and entry[0] == mtimes:
+            return entry[1]
+        return None
+
+    def put(self, app, path, template, body, mimetype):
+        mtimes = self._mtimes(app, template)
+        page = CachedPage(body, mimetype, max(mtimes))
+        with self._lock:
+            self._pages[path] = (mtimes, page)
+        return page
+
+    def clear(self):
+        with self._lock:
+            self._pages.clear()
+            self._templates.clear()
+
+
+page_cache = PageCache()
+
+
+def _anonymous():
+    """True if the page would render the same for anyone (no login, no flashes)"""
+    return 'user_type' not in session and not session.get('_flashes')
+
+
+def _page_response(page):
+    response_class = current_app.response_class
+    if page.not_modified():
+        NOT_MODIFIED.inc()
+        return response_class(status=304, headers=page.not_modified_headers)
+    body, headers = page.variants[_negotiate(page.encodings)]
+    return response_class(body, mimetype=page.mimetype, headers=headers)
+
+
+def cached_page(template):
+    """Serve a view's anonymous GETs from the page cache; `template` is the page it renders"""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if not PAGE_CACHE or request.method not in ('GET', 'HEAD') or not _anonymous():
+                return view(*args, **kwargs)
+            app = current_app._get_current_object()
+            page = page_cache.get(app, request.path, template)
+            if page is None:
+                result = view(*args, **kwargs)
+                if not isinstance(result, str):
+                    return result            # redirects, errors: not cached
+                CACHE_MISSES.inc()
+                page = page_cache.put(app, request.path, template, result.encode('utf-8'),
+                                      'text/html')
+            else:
+                CACHE_HITS.inc()
+            return _page_response(page)
+        return wrapper
+    return decorator
+
+# ============================================
+# On-the-fly Compression
+# ============================================
+
+def compress_response(response):
+    """after_request hook: gzip / brotli a large enough text response the client accepts"""
+    if (not COMPRESS_RESPONSES
+            or response.direct_passthrough or response.is_streamed
+            or response.status_code < 200 or response.status_code in (204, 304)
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE_TYPES):
+        return response
+    response.vary.add('Accept-Encoding')
+    body = response.get_data()
+    if len(body) < COMPRESS_MIN_SIZE:
+        return response
+    encoding = _negotiate(_encodings())
+    if encoding is None:
+        return response
+    response.set_data(_compress(body, encoding))
+    response.headers['Content-Encoding'] = encoding
+    # A strong ETag names the uncompressed bytes; this is another representation
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+
+def init_app(app):
+    """Register the on-the-fly compression hook"""
+    app.after_request(compress_response)
@@ -0,0 +1,128 @@
+"""
+============================================
+DBMS Project: Search
+Ranked full-text search over startups and investors
+Works with both MySQL and PostgreSQL
+============================================
+
+The LIKE '%...%' searches of queries.sql cannot use an index. /search
+matches words against an index instead:
+
+* PostgreSQL: Startups.search_vector and Investors.search_vector are
+  generated tsvector columns (name weighted A, description B, location C)
+  with GIN indexes. The text is parsed with websearch_to_tsquery, so
+  "quoted phrases", OR and -word work, and results are ranked by ts_rank.
+* MySQL: FULLTEXT indexes on the same columns, MATCH ... AGAINST in
+  BOOLEAN MODE with every word required ("phrases" and -word work too),
+  ranked by its relevance score.
+
+Both are added by migration 007. The funding filters are applied with the
+text match: startups by funding_required, investors whose investment range
+overlaps the requested range. Results come in pages of SEARCH_PAGE_SIZE,
+most relevant first; ranking reads every match, so a page is cheap to skip
+and deep pages are capped at SEARCH_MAX_PAGE.
+"""
+
+import os
+import re
+
+from database import DB_TYPE
+
+SEARCH_PAGE_SIZE = int(os.environ.get('SEARCH_PAGE_SIZE', 20))
+SEARCH_MAX_PAGE = int(os.environ.get('SEARCH_MAX_PAGE', 50))
+
+SEARCH_KINDS = ('startups', 'investors')
+
+# (FROM item, key, result columns, MySQL FULLTEXT columns - exactly the index's)
+_TABLES = {
+    'startups': ('Startups s', 's.startup_id',
+                 """s.startup_id, s.name, s.description, s.location, s.website,
+                    s.domain_id, s.funding_required, s.is_funded""",
+                 's.name, s.description, s.location'),
+    'investors': ('Investors i', 'i.investor_id',
+                  """i.investor_id, i.name, i.location, i.investment_min, i.investment_max,
+                     i.portfolio_size""",
+                  'i.name, i.location'),
+}
+
+
+def _boolean_query(text):
+    """MySQL BOOLEAN MODE query: every word or "phrase" required, -word excluded
+
+    Empty unless there is at least one required term (an exclusion alone
+    matches nothing in BOOLEAN MODE).
+    """
+    terms, required = [], False
+    for sign, phrase, word in re.findall(r'(-?)(?:"([^"]*)"|(\w+))', text):
+        words = re.findall(r'\w+', phrase or word)
+        if not words:
+            continue
+        term = f'"{" ".join(words)}"' if phrase else word
+        terms.append(('-' if sign else '+') + term)
+        required = required or not sign
+    return ' '.join(terms) if required else ''
+
+
+def _filters(kind, funding_min, funding_max, is_funded):
+    """Extra WHERE conditions and their parameters"""
+    conditions, params = [], []
+    if kind == 'startups':
+        if funding_min is not None:
+            conditions.append("s.funding_required >= %s")
+            params.append(funding_min)
+        if funding_max is not None:
+            conditions.append("s.funding_required <= %s")
+            params.append(funding_max)
+        if is_funded is not None:
+            conditions.append("s.is_funded = %s")
+            params.append(is_funded)
+    else:
+        if funding_min is not None:
+            conditions.append("i.investment_max >= %s")
+            params.append(funding_min)
+        if funding_max is not None:
+            conditions.append("i.investment_min <= %s")
+            params.append(funding_max)
+    return ''.join(f"\n          AND {condition}" for condition in conditions), params
+
+
+def search(cursor, kind, text, funding_min=None, funding_max=None, is_funded=None,
+           page=1, page_size=SEARCH_PAGE_SIZE):
+    """One page of startups or investors matching `text`, most relevant first
+
+    Returns (rows, has_more). is_funded only applies to startups. Text
+    without a word to look up in the index (empty, stop words only, only
+    -excluded words) matches nothing instead of scanning the table.
+    """
+    table, key, columns, fulltext = _TABLES[kind]
+    alias = table.split()[1]
+    page = min(max(page, 1), SEARCH_MAX_PAGE)
+    conditions, filter_params = _filters(kind, funding_min, funding_max, is_funded)
+
+    if DB_TYPE == 'postgresql':
+        sql = f"""
+            SELECT {columns}, ts_rank({alias}.search_vector, q) AS relevance
+            FROM {table}, websearch_to_tsquery('english', %s) q
+            WHERE querytree(q) <> 'T' AND {alias}.search_vector @@ q{conditions}
+            ORDER BY relevance DESC, {key}
+            LIMIT %s OFFSET %s
+        """
+        params = [text]
+    else:
+        text = _boolean_query(text)
+        if not text:
+            return [], False
+        match = f"MATCH({fulltext}) AGAINST (%s IN BOOLEAN MODE)"
+        sql = f"""
+            SELECT {columns}, {match} AS relevance
+            FROM {table}
+            WHERE {match}{conditions}
+            ORDER BY relevance DESC, {key}
+            LIMIT %s OFFSET %s
+        """
+        params = [text, text]
+
+    # One extra row tells whether there is a next page
+    cursor.execute(sql, params + filter_params + [page_size + 1, (page - 1) * page_size])
+    rows = cursor.fetchall()
+    return rows[:page_size], len(rows) > page_size and page < SEARCH_MAX_PAGE
@@ -10,20 +10,6 @@ import bcrypt
 import os
 from datetime import datetime
 
-# Import both database connectors
-try:
-    import mysql.connector
-    MYSQL_AVAILABLE = True
-except ImportError:
-    MYSQL_AVAILABLE = False
-
-try:
-    import psycopg2
-    from psycopg2.extras import RealDictCursor
-    POSTGRESQL_AVAILABLE = True
-except ImportError:
-    POSTGRESQL_AVAILABLE = False
-
 
 def hash_password(password):
     """Hash password using bcrypt"""
@@ -43,8 +29,11 @@ def get_db_connection():
     DATABASE_URL = os.environ.get('DATABASE_URL')
     
     try:
+        # Only the connector in use is imported (the other need not be installed)
         if DATABASE_URL:
             # PostgreSQL connection for Render
+            import psycopg2
+            from psycopg2.extras import RealDictCursor
             connection = psycopg2.connect(DATABASE_URL, cursor_factory=RealDictCursor)
             return connection, 'postgresql'
         else:
@@ -55,6 +44,7 @@ def get_db_connection():
                 'password': '',
                 'database': 'funding_system'
             }
+            import mysql.connector
             connection = mysql.connector.connect(**DB_CONFIG)
             return connection, 'mysql'
     except Exception as e:
@@ -120,6 +110,7 @@ def seed_database():
         
         # 2. Insert Sample Startups
         print("  → Inserting startups...")
+        password_hash = hash_password('password123')  # bcrypt once, not per account
         startups = [
             ('AI Insights', 'contact@aiinsights.com', 'password123', 1, 5000000.00, 
              'AI-powered business analytics platform', '2024-01-15', 'Bangalore', 'https://aiinsights.com'),
@@ -141,7 +132,7 @@ def seed_database():
         
         for startup in startups:
             data = list(startup)
-            data[2] = hash_password(data[2])  # Hash the password
+            data[2] = password_hash  # Same demo password for every account
             cursor.execute(
                 """INSERT INTO Startups 
                 (name, email, password_hash, domain_id, funding_required, 
@@ -174,7 +165,7 @@ def seed_database():
         
         for investor in investors:
             data = list(investor)
-            data[2] = hash_password(data[2])  # Hash the password
+            data[2] = password_hash  # Same demo password for every account
             cursor.execute(
                 """INSERT INTO Investors 
                 (name, email, password_hash, investment_min, investment_max, 
@@ -183,6 +174,24 @@ def seed_database():
                 tuple(data)
             )
         
+        # Normalize preferred domains into InvestorDomains
+        if db_type == 'postgresql':
+            cursor.execute(
+                """INSERT INTO InvestorDomains (investor_id, domain_id)
+                SELECT i.investor_id, d.domain_id
+                FROM Investors i
+                CROSS JOIN LATERAL unnest(string_to_array(i.preferred_domains, ',')) AS t(token)
+                JOIN Domains d ON d.domain_id::TEXT = t.token
+                ON CONFLICT DO NOTHING"""
+            )
+        else:
+            cursor.execute(
+                """INSERT IGNORE INTO InvestorDomains (investor_id, domain_id)
+                SELECT i.investor_id, d.domain_id
+                FROM Investors i
+                JOIN Domains d ON FIND_IN_SET(d.domain_id, i.preferred_domains) > 0"""
+            )
+
         # Commit investors before inserting funding records
         conn.commit()
         
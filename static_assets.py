@@ -0,0 +1,314 @@
+"""
+============================================
+DBMS Project: Static Assets
+Minified, fingerprinted CSS/JS and self-hosted fonts, cached for a year
+Works with both MySQL and PostgreSQL
+============================================
+
+base.html used to inline ~650 lines of CSS and its script, and the form
+and dashboard pages their own <style> blocks, so every navigation
+downloaded all of it again. The sources now live in assets/ and the
+build step turns them into static/dist/:
+
+* CSS and JS are minified and named after a hash of their content
+  (base.3f9c2a1b7d04.css), precompressed to .gz (and .br with brotli).
+* The fonts in assets/fonts/ (Poppins-SemiBold.ttf, the variable
+  PlayfairDisplay[wght].ttf: Google Fonts' OFL downloads) are subset to
+  Latin and converted to WOFF2 with fontTools; their @font-face rules are
+  prepended to base.css. Fonts with an OFL Reserved Font Name are only
+  converted, never subset. Without fontTools (or fonts), base.html keeps
+  loading Google Fonts.
+* static/dist/manifest.json maps each source name to its built file.
+
+Templates link assets with {{ asset_url('base.css') }}. They are served
+from /assets/ with `Cache-Control: immutable` and a one-year max-age: a
+changed file gets a new name, so browsers never need to revalidate.
+The app builds on startup when the manifest is missing or older than a
+source file; deployments can also build ahead:
+
+    python static_assets.py             # build static/dist/
+    python benchmark_assets.py          # per-page transfer size / first render
+"""
+
+import hashlib
+import importlib.util
+import io
+import json
+import os
+import re
+
+from flask import abort, current_app, url_for
+
+from response_cache import _compress, _encodings, _negotiate
+
+# fontTools takes ~100 ms to import and is only needed when fonts are
+# (re)built, not by a worker that loads an up-to-date manifest
+FONTTOOLS_AVAILABLE = importlib.util.find_spec('fontTools') is not None
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+ASSETS_DIR = os.path.join(BASE_DIR, 'assets')
+DIST_DIR = os.path.join(BASE_DIR, 'static', 'dist')
+MANIFEST_FILE = 'manifest.json'
+MAX_AGE = 365 * 24 * 3600
+# The stylesheet every page loads: it carries the @font-face rules
+FONT_FACES_INTO = 'base.css'
+
+MIMETYPES = {'.css': 'text/css', '.js': 'text/javascript',
+             '.woff2': 'font/woff2', '.woff': 'font/woff'}
+FONT_SOURCES = ('.ttf', '.otf', '.woff', '.woff2')
+FONT_WEIGHTS = {'Thin': 100, 'ExtraLight': 200, 'Light': 300, 'Regular': 400, 'Medium': 500,
+                'SemiBold': 600, 'Bold': 700, 'ExtraBold': 800, 'Black': 900}
+# Google Fonts' "latin" subset, plus the rupee sign the amounts are shown in
+LATIN = ('U+0000-00FF,U+0131,U+0152-0153,U+02BB-02BC,U+02C6,U+02DA,U+02DC,U+0304,U+0308,'
+         'U+0329,U+2000-206F,U+20AC,U+20B9,U+2122,U+2191,U+2193,U+2212,U+2215,U+FEFF,U+FFFD')
+
+_manifest = {'assets': {}, 'fonts': []}
+_files = {}                         # built name -> {encoding or None: bytes}
+
+# ============================================
+# Minification
+# ============================================
+
+_CSS_TOKENS = re.compile(r'("(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\')|/\*.*?\*/', re.S)
+
+
+def _squeeze_css(css):
+    css = re.sub(r'\s+', ' ', css)
+    css = re.sub(r' ?([{};,>]) ?', r'\1', css)
+    # Only after a colon: before one it may be a descendant selector (.a :hover)
+    return css.replace(': ', ':').replace(';}', '}')
+
+
+def minify_css(css):
+    """Drop comments and whitespace; quoted strings are kept as they are"""
+    parts, pending, position = [], '', 0
+    for match in _CSS_TOKENS.finditer(css):
+        pending += css[position:match.start()]
+        position = match.end()
+        if match.group(1):
+            parts += [_squeeze_css(pending), match.group(1)]
+            pending = ''
+        else:
+            pending += ' '               # a comment separates like whitespace
+    parts.append(_squeeze_css(pending + css[position:]))
+    return ''.join(parts).strip()
+
+
+def minify_js(js):
+    """Drop indentation, blank lines and whole-line // comments; line breaks stay (ASI)"""
+    lines = (line.strip() for line in js.splitlines())
+    return '\n'.join(line for line in lines if line and not line.startswith('//'))
+
+# ============================================
+# Build
+# ============================================
+
+def _source_files(source_dir):
+    """Every source file, and the directories (their mtime changes when a file is removed)"""
+    for root, _, names in os.walk(source_dir):
+        yield root
+        for name in names:
+            yield os.path.join(root, name)
+
+
+def _write(dist_dir, name, body, compress):
+    """Write `body` as <stem>.<hash><ext> (plus its compressed copies); return that name"""
+    stem, ext = os.path.splitext(name)
+    built = f"{stem}.{hashlib.sha256(body).hexdigest()[:12]}{ext}"
+    outputs = [(built, body)]
+    if compress:
+        outputs += [(f"{built}.{'br' if encoding == 'br' else 'gz'}",
+                     _compress(body, encoding, best=True)) for encoding in _encodings()]
+    for filename, data in outputs:
+        path = os.path.join(dist_dir, filename)
+        if not os.path.exists(path):
+            # Workers may build at the same time: never expose a half-written file
+            temp = f"{path}.{os.getpid()}.tmp"
+            with open(temp, 'wb') as f:
+                f.write(data)
+            os.replace(temp, path)
+    return built
+
+
+def _font_face(filename):
+    """(family, weight, style) from a Google Fonts file name: PlayfairDisplay-BoldItalic"""
+    stem = _font_stem(filename)
+    family, _, variant = stem.partition('-')
+    family = re.sub(r'(?<=[a-z])(?=[A-Z])', ' ', family)
+    style = 'italic' if variant.endswith('Italic') else 'normal'
+    weight = FONT_WEIGHTS.get(variant[:-len('Italic')] if style == 'italic' else variant, 400)
+    return family, weight, style
+
+
+def _font_stem(filename):
+    # Variable fonts name their axes: PlayfairDisplay[wght].ttf -> PlayfairDisplay
+    return re.sub(r'\[[^]]*\]', '', os.path.splitext(os.path.basename(filename))[0])
+
+
+def _reserved_font_name(font):
+    """Whether the font's copyright / license notice declares an OFL Reserved Font Name"""
+    return any('Reserved Font Name' in record.toUnicode(errors='ignore')
+               for record in font['name'].names if record.nameID in (0, 13))
+
+
+def _weight_range(font):
+    """'400 900' for a variable font with a weight axis, else None"""
+    if 'fvar' not in font:
+        return None
+    for axis in font['fvar'].axes:
+        if axis.axisTag == 'wght':
+            return f"{axis.minValue:g} {axis.maxValue:g}"
+    return None
+
+
+def _build_fonts(source_dir, dist_dir, warnings):
+    """Subset and write every font of assets/fonts/; return (built names, @font-face CSS)"""
+    fonts_dir = os.path.join(source_dir, 'fonts')
+    if not os.path.isdir(fonts_dir):
+        return [], ''
+    if FONTTOOLS_AVAILABLE:
+        from fontTools import subset as font_subset
+    built, rules = [], []
+    for name in sorted(os.listdir(fonts_dir)):
+        path = os.path.join(fonts_dir, name)
+        ext = os.path.splitext(name)[1].lower()
+        if ext not in FONT_SOURCES:
+            continue
+        weights = None
+        if FONTTOOLS_AVAILABLE:
+            options = font_subset.Options()
+            # WOFF2 needs brotli; WOFF (zlib) is the fallback
+            options.flavor = 'woff2' if 'br' in _encodings() else 'woff'
+            font = font_subset.load_font(path, options)
+            weights = _weight_range(font)
+            # Under the OFL a subset is a Modified Version, which may not keep a
+            # Reserved Font Name: such fonts (Playfair Display) only change container
+            if not _reserved_font_name(font):
+                subsetter = font_subset.Subsetter(options)
+                subsetter.populate(unicodes=font_subset.parse_unicodes(LATIN))
+                subsetter.subset(font)
+            buffer = io.BytesIO()
+            font_subset.save_font(font, buffer, options)
+            body, ext = buffer.getvalue(), f'.{options.flavor}'
+        elif ext in ('.woff', '.woff2'):
+            with open(path, 'rb') as f:
+                body = f.read()          # used as is, not subset
+        else:
+            warnings.append(f"{name}: fontTools is not installed, cannot convert it")
+            continue
+        filename = _write(dist_dir, _font_stem(name) + ext, body, compress=False)
+        family, weight, style = _font_face(name)
+        weight = weights or weight
+        built.append(filename)
+        # Relative to the stylesheet, which is served from the same directory
+        rules.append(f"@font-face{{font-family:'{family}';font-style:{style};"
+                     f"font-weight:{weight};font-display:swap;"
+                     f"src:url({filename}) format('{ext[1:]}');unicode-range:{LATIN}}}")
+    return built, ''.join(rules)
+
+
+def build(source_dir=ASSETS_DIR, dist_dir=DIST_DIR):
+    """Minify, fingerprint and precompress every asset; write and return the manifest"""
+    os.makedirs(dist_dir, exist_ok=True)
+    warnings = []
+    fonts, font_faces = _build_fonts(source_dir, dist_dir, warnings)
+    assets = {}
+    for name in sorted(os.listdir(source_dir)):
+        ext = os.path.splitext(name)[1]
+        if ext not in ('.css', '.js'):
+            continue
+        with open(os.path.join(source_dir, name), encoding='utf-8') as f:
+            source = f.read()
+        if ext == '.css':
+            body = minify_css(source)
+            if name == FONT_FACES_INTO:
+                body = font_faces + body
+        else:
+            body = minify_js(source)
+        assets[name] = _write(dist_dir, name, body.encode('utf-8'), compress=True)
+    manifest = {'assets': assets, 'fonts': fonts, 'warnings': warnings}
+    path = os.path.join(dist_dir, MANIFEST_FILE)
+    temp = f"{path}.{os.getpid()}.tmp"
+    with open(temp, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(temp, path)
+    return manifest
+
+
+def load_manifest(source_dir=ASSETS_DIR, dist_dir=DIST_DIR):
+    """The built manifest, rebuilding first if it is missing or older than a source"""
+    path = os.path.join(dist_dir, MANIFEST_FILE)
+    newest = max(os.path.getmtime(p) for p in _source_files(source_dir))
+    if os.path.exists(path) and os.path.getmtime(path) >= newest:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    return build(source_dir, dist_dir)
+
+# ============================================
+# Serving
+# ============================================
+
+def asset_url(name):
+    """URL of the built, fingerprinted file of assets/<name> (template global)"""
+    try:
+        built = _manifest['assets'][name]
+    except KeyError:
+        raise KeyError(f"assets/{name} does not exist (or static_assets.build() has not seen it)")
+    return url_for('asset', filename=built)
+
+
+def serve_asset(filename):
+    variants = _files.get(filename)
+    if variants is None:
+        abort(404)
+    encoding = _negotiate(tuple(e for e in _encodings() if e in variants))
+    response = current_app.response_class(
+        variants[encoding], mimetype=MIMETYPES[os.path.splitext(filename)[1]])
+    response.headers['Cache-Control'] = f'public, max-age={MAX_AGE}, immutable'
+    if len(variants) > 1:
+        response.vary.add('Accept-Encoding')
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    return response
+
+
+def _load_files(manifest, dist_dir):
+    files = {}
+    for built in list(manifest['assets'].values()) + manifest['fonts']:
+        variants = {}
+        for encoding, suffix in ((None, ''), ('gzip', '.gz'), ('br', '.br')):
+            path = os.path.join(dist_dir, built + suffix)
+            if os.path.exists(path):
+                with open(path, 'rb') as f:
+                    variants[encoding] = f.read()
+        files[built] = variants
+    return files
+
+
+def init_app(app):
+    """Build if needed, load static/dist/ into memory and register /assets/ and asset_url"""
+    global _manifest, _files
+    _manifest = load_manifest()
+    _files = _load_files(_manifest, DIST_DIR)
+    for warning in _manifest.get('warnings', []):
+        print(f"⚠️  Static assets: {warning}")
+    app.add_url_rule('/assets/<filename>', 'asset', serve_asset)
+    app.jinja_env.globals.update(asset_url=asset_url,
+                                 self_hosted_fonts=bool(_manifest['fonts']))
+
+
+if __name__ == '__main__':
+    print("=" * 50)
+    print("📦 Startup Funding System - Static Assets")
+    print("=" * 50)
+    result = build()
+    for name, built in result['assets'].items():
+        size = os.path.getsize(os.path.join(DIST_DIR, built))
+        print(f"   {name:<26} -> {built} ({size:,} bytes)")
+    for built in result['fonts']:
+        print(f"   font {built} ({os.path.getsize(os.path.join(DIST_DIR, built)):,} bytes)")
+    if not result['fonts']:
+        print("   no fonts in assets/fonts/: pages load Google Fonts")
+    for warning in result['warnings']:
+        print(f"⚠️  {warning}")
+    print(f"✅ Built {len(result['assets'])} assets and {len(result['fonts'])} fonts into {DIST_DIR}")